@@ -0,0 +1,4 @@
+"""Benchmarks for the `JobQueue` backends in `fair_platform.backend.services.job_queue`.
+
+Run `python -m benchmarks.job_queue --help` from the repository root.
+"""
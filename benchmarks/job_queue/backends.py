@@ -0,0 +1,147 @@
+"""Queue backends the benchmark can drive.
+
+Each backend is an async context manager factory yielding a fresh `JobQueue`.
+Register new backends with `@backend("name")`; they are picked up by the CLI
+(`--backends`) automatically.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fair_platform.backend.services.job_queue import (
+    JobQueue,
+    LocalJobQueue,
+    RedisJobQueue,
+    RedisStreamJobQueue,
+)
+
+BACKENDS: dict[str, Callable[[dict[str, Any]], Any]] = {}
+
+
+class BackendUnavailable(RuntimeError):
+    """Raised when a backend's dependency or server is not available."""
+
+
+def backend(name: str):
+    def register(factory):
+        BACKENDS[name] = asynccontextmanager(factory)
+        return factory
+
+    return register
+
+
+def _fake_redis() -> Any:
+    try:
+        import fakeredis
+    except ImportError as exc:
+        raise BackendUnavailable("fakeredis is not installed") from exc
+    return fakeredis.FakeAsyncRedis()
+
+
+async def _real_redis(options: dict[str, Any]) -> Any:
+    url = options.get("redis_url") or os.getenv("FAIR_REDIS_URL", "redis://127.0.0.1:6379/15")
+    try:
+        import redis.asyncio as redis_asyncio
+    except ImportError as exc:
+        raise BackendUnavailable("redis is not installed") from exc
+    client = redis_asyncio.from_url(url, decode_responses=False)
+    try:
+        await client.ping()
+    except Exception as exc:
+        await client.aclose()
+        raise BackendUnavailable(f"Redis is not reachable at {url}") from exc
+    return client
+
+
+def _redis_names(run_id: str) -> dict[str, str]:
+    # Unique keys so runs against a shared server never see each other's jobs.
+    prefix = f"fair-bench:{run_id}"
+    return {
+        "queue_name": f"{prefix}:jobs",
+        "updates_prefix": f"{prefix}:updates",
+        "state_prefix": f"{prefix}:states",
+    }
+
+
+@backend("local")
+async def local_backend(options: dict[str, Any]) -> AsyncIterator[JobQueue]:
+    queue = LocalJobQueue(subscriber_queue_size=options["subscriber_queue_size"])
+    try:
+        yield queue
+    finally:
+        await queue.close()
+
+
+@backend("fakeredis")
+async def fakeredis_backend(options: dict[str, Any]) -> AsyncIterator[JobQueue]:
+    queue = RedisJobQueue(_fake_redis(), delayed_poll_interval_s=60.0, **_redis_names(options["run_id"]))
+    try:
+        yield queue
+    finally:
+        await queue.close()
+
+
+@backend("fakeredis-streams")
+async def fakeredis_streams_backend(options: dict[str, Any]) -> AsyncIterator[JobQueue]:
+    queue = RedisStreamJobQueue(
+        _fake_redis(),
+        delayed_poll_interval_s=60.0,
+        **_redis_names(options["run_id"]),
+    )
+    try:
+        yield queue
+    finally:
+        await queue.close()
+
+
+@backend("redis")
+async def redis_backend(options: dict[str, Any]) -> AsyncIterator[JobQueue]:
+    client = await _real_redis(options)
+    queue = RedisJobQueue(client, delayed_poll_interval_s=60.0, **_redis_names(options["run_id"]))
+    try:
+        yield queue
+    finally:
+        await queue.close()
+
+
+@backend("redis-streams")
+async def redis_streams_backend(options: dict[str, Any]) -> AsyncIterator[JobQueue]:
+    client = await _real_redis(options)
+    queue = RedisStreamJobQueue(client, delayed_poll_interval_s=60.0, **_redis_names(options["run_id"]))
+    try:
+        yield queue
+    finally:
+        await queue.close()
+
+
+@backend("sql")
+async def sql_backend(options: dict[str, Any]) -> AsyncIterator[JobQueue]:
+    from sqlalchemy import create_engine
+
+    from fair_platform.backend.data.database import Base
+    from fair_platform.backend.services.sql_job_queue import SqlJobQueue
+
+    url = options.get("database_url")
+    db_path = None
+    if not url:
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
+            db_path = tmp_file.name
+        url = f"sqlite:///{db_path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    queue = SqlJobQueue(engine, poll_interval_s=0.01)
+    try:
+        yield queue
+    finally:
+        await queue.close()
+        engine.dispose()
+        if db_path is not None:
+            os.unlink(db_path)
+
+
+__all__ = ["BACKENDS", "BackendUnavailable", "backend"]
@@ -0,0 +1,279 @@
+"""Run job queue workloads against one or more backends and report the numbers.
+
+Examples:
+    python -m benchmarks.job_queue
+    python -m benchmarks.job_queue --backends local,fakeredis,sql --concurrency 1,16 --operations 5000
+    python -m benchmarks.job_queue --backends redis --redis-url redis://127.0.0.1:6379/15 --output results.json
+    python -m benchmarks.job_queue --compare baseline.json --output results.json
+
+Each result reports throughput (operations per second over the wall time of
+the workload), latency percentiles and memory: `rss_delta_bytes` is how much
+the resident set grew during the run and, with `--trace-memory`,
+`peak_traced_bytes` is the Python heap peak seen by `tracemalloc` (which
+slows every allocation, so throughput from such runs is not comparable).
+JSON output has stable keys and ordering so two runs can be diffed or
+compared with `--compare`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from benchmarks.job_queue.backends import BACKENDS, BackendUnavailable
+from benchmarks.job_queue.workloads import WORKLOADS
+
+SCHEMA_VERSION = 1
+DEFAULT_BACKENDS = ("local", "fakeredis", "fakeredis-streams", "sql")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list (`fraction` in 0..1)."""
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size, or the high-water mark where that is unknown."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+async def run_case(
+    backend_name: str,
+    workload_name: str,
+    operations: int,
+    concurrency: int,
+    options: dict[str, Any],
+) -> dict[str, Any]:
+    """Run one workload on a fresh queue and return its result record."""
+    options = {**options, "run_id": uuid4().hex[:8]}
+    trace_memory = bool(options.get("trace_memory"))
+    peak_traced = None
+    async with BACKENDS[backend_name](options) as queue:
+        rss_before = _rss_bytes()
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = await WORKLOADS[workload_name](queue, operations, concurrency)
+        elapsed_s = time.perf_counter() - started
+        if trace_memory:
+            _, peak_traced = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        rss_after = _rss_bytes()
+
+    latencies = sorted(result.latencies_s)
+    completed = len(latencies)
+    return {
+        "backend": backend_name,
+        "workload": workload_name,
+        "operations": operations,
+        "concurrency": concurrency,
+        "completed": completed,
+        "elapsed_s": round(elapsed_s, 6),
+        "throughput_ops_s": round(completed / elapsed_s, 2) if elapsed_s > 0 else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 4) if latencies else None,
+            "p99": round(percentile(latencies, 0.99) * 1000, 4) if latencies else None,
+            "max": round(latencies[-1] * 1000, 4) if latencies else None,
+        },
+        "memory": {
+            "rss_delta_bytes": None if rss_before is None or rss_after is None else rss_after - rss_before,
+            "rss_bytes": rss_after,
+            "peak_traced_bytes": peak_traced,
+        },
+        "counters": dict(sorted(result.counters.items())),
+    }
+
+
+async def run_suite(
+    backends: list[str],
+    workloads: list[str],
+    concurrencies: list[int],
+    operations: int,
+    options: dict[str, Any],
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    skipped: list[dict[str, str]] = []
+    for backend_name in backends:
+        cases = [(workload_name, concurrency) for workload_name in workloads for concurrency in concurrencies]
+        try:
+            for workload_name, concurrency in cases:
+                record = await run_case(backend_name, workload_name, operations, concurrency, options)
+                results.append(record)
+                print(_format_row(record), file=sys.stderr)
+        except BackendUnavailable as exc:
+            skipped.append({"backend": backend_name, "reason": str(exc)})
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "operations": operations,
+            "concurrency": concurrencies,
+            "backends": backends,
+            "workloads": workloads,
+            "trace_memory": bool(options.get("trace_memory")),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def _format_row(record: dict[str, Any]) -> str:
+    latency = record["latency_ms"]
+    memory = record["memory"]
+    peak = memory["peak_traced_bytes"] if memory["peak_traced_bytes"] is not None else memory["rss_delta_bytes"]
+    return (
+        f"{record['backend']:<18} {record['workload']:<18} c={record['concurrency']:<4} "
+        f"{record['throughput_ops_s'] or 0:>12,.0f} ops/s  "
+        f"p50={latency['p50'] or 0:>9.3f}ms  p99={latency['p99'] or 0:>9.3f}ms  "
+        f"mem={(peak or 0) / 1024:>9,.0f}KiB"
+    )
+
+
+def _case_key(record: dict[str, Any]) -> tuple[str, str, int]:
+    return record["backend"], record["workload"], record["concurrency"]
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Describe throughput and p99 changes of `current` against `baseline`."""
+    previous = {_case_key(record): record for record in baseline.get("results", [])}
+    lines = []
+    for record in current["results"]:
+        before = previous.get(_case_key(record))
+        if before is None:
+            continue
+        changes = []
+        for label, now, then in (
+            ("throughput", record["throughput_ops_s"], before["throughput_ops_s"]),
+            ("p99", record["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+        ):
+            if now is None or not then:
+                continue
+            changes.append(f"{label} {100 * (now - then) / then:+.1f}%")
+        backend_name, workload_name, concurrency = _case_key(record)
+        lines.append(f"{backend_name:<18} {workload_name:<18} c={concurrency:<4} {'  '.join(changes)}")
+    return lines
+
+
+def _csv(raw: str) -> list[str]:
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the FAIR job queue backends")
+    parser.add_argument(
+        "--backends",
+        default=",".join(DEFAULT_BACKENDS),
+        help=f"Comma separated backends ({', '.join(BACKENDS)})",
+    )
+    parser.add_argument(
+        "--workloads",
+        default=",".join(WORKLOADS),
+        help=f"Comma separated workloads ({', '.join(WORKLOADS)})",
+    )
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma separated concurrency levels")
+    parser.add_argument("--operations", type=int, default=2000, help="Operations per workload run")
+    parser.add_argument("--redis-url", default=None, help="Redis URL for the redis backends")
+    parser.add_argument("--database-url", default=None, help="Database URL for sql (default: temp SQLite)")
+    parser.add_argument(
+        "--subscriber-queue-size",
+        type=int,
+        default=100_000,
+        help="Bound of local update subscribers, large so nothing is dropped",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also record the tracemalloc heap peak (slows the run down)",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier JSON results to compare with")
+    args = parser.parse_args(argv)
+
+    args.backends = _csv(args.backends)
+    args.workloads = _csv(args.workloads)
+    args.concurrency = [int(value) for value in _csv(args.concurrency)]
+    unknown = [name for name in args.backends if name not in BACKENDS]
+    unknown += [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"Unknown backend or workload: {', '.join(unknown)}")
+    if args.operations < 1 or any(value < 1 for value in args.concurrency):
+        parser.error("--operations and --concurrency must be positive")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(
+        run_suite(
+            args.backends,
+            args.workloads,
+            args.concurrency,
+            args.operations,
+            {
+                "redis_url": args.redis_url,
+                "database_url": args.database_url,
+                "subscriber_queue_size": args.subscriber_queue_size,
+                "trace_memory": args.trace_memory,
+            },
+        )
+    )
+    for skipped in report["skipped"]:
+        print(f"skipped {skipped['backend']}: {skipped['reason']}", file=sys.stderr)
+
+    document = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(f"\nCompared with {args.compare} ({baseline.get('git_commit') or 'unknown commit'}):", file=sys.stderr)
+        for line in compare(baseline, report):
+            print(line, file=sys.stderr)
+    return 0
+
+
+__all__ = ["percentile", "run_case", "run_suite", "compare", "main"]
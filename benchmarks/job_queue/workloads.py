@@ -0,0 +1,140 @@
+"""Workloads run against a `JobQueue`.
+
+Every workload receives a fresh queue, the number of operations and the
+concurrency, and returns the per-operation latencies in seconds plus extra
+counters. Register new workloads with `@workload("name")`.
+
+- `enqueue`: `concurrency` producers enqueue `operations` jobs; latency is
+  the time of one `enqueue` call.
+- `enqueue_dequeue`: `concurrency` producers and as many consumers; latency
+  is the time from `enqueue` until a consumer dequeued the job.
+- `publish_subscribe`: `concurrency` jobs, each with one subscriber, share
+  `operations` updates; latency is the time from `publish_update` until the
+  subscriber received the update.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fair_platform.backend.services.job_queue import JobMessage, JobQueue, JobUpdate
+
+# Give up on a workload whose consumers stall for this long.
+RECEIVE_TIMEOUT_S = 10.0
+
+
+@dataclass
+class WorkloadResult:
+    latencies_s: list[float]
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+Workload = Callable[[JobQueue, int, int], Awaitable[WorkloadResult]]
+WORKLOADS: dict[str, Workload] = {}
+
+
+def workload(name: str):
+    def register(func: Workload) -> Workload:
+        WORKLOADS[name] = func
+        return func
+
+    return register
+
+
+def _split(total: int, parts: int) -> list[int]:
+    base, extra = divmod(total, parts)
+    return [base + (1 if index < extra else 0) for index in range(parts)]
+
+
+def _job(index: int) -> JobMessage:
+    return JobMessage(
+        job_id=f"bench-{index}",
+        target="bench.extension",
+        payload={"sent_at": time.perf_counter(), "submission_id": index},
+    )
+
+
+@workload("enqueue")
+async def enqueue(queue: JobQueue, operations: int, concurrency: int) -> WorkloadResult:
+    latencies: list[float] = []
+    counter = iter(range(operations))
+
+    async def produce(count: int) -> None:
+        for _ in range(count):
+            started = time.perf_counter()
+            await queue.enqueue(_job(next(counter)))
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(produce(count) for count in _split(operations, concurrency)))
+    return WorkloadResult(latencies)
+
+
+@workload("enqueue_dequeue")
+async def enqueue_dequeue(queue: JobQueue, operations: int, concurrency: int) -> WorkloadResult:
+    latencies: list[float] = []
+    counter = iter(range(operations))
+
+    async def produce(count: int) -> None:
+        for _ in range(count):
+            await queue.enqueue(_job(next(counter)))
+
+    async def consume() -> None:
+        while len(latencies) < operations:
+            job = await queue.dequeue(timeout=0.05)
+            if job is None:
+                continue
+            latencies.append(time.perf_counter() - job.payload["sent_at"])
+            await queue.ack(job)
+
+    consumers = [asyncio.create_task(consume()) for _ in range(concurrency)]
+    await asyncio.gather(*(produce(count) for count in _split(operations, concurrency)))
+    try:
+        await asyncio.wait_for(asyncio.gather(*consumers), timeout=RECEIVE_TIMEOUT_S)
+    except TimeoutError:
+        for consumer in consumers:
+            consumer.cancel()
+    return WorkloadResult(latencies, {"lost": operations - len(latencies)})
+
+
+@workload("publish_subscribe")
+async def publish_subscribe(queue: JobQueue, operations: int, concurrency: int) -> WorkloadResult:
+    latencies: list[float] = []
+    counts = _split(operations, concurrency)
+    job_ids = [f"bench-updates-{index}" for index in range(concurrency)]
+    subscriptions = [await queue.subscribe_updates(job_id) for job_id in job_ids]
+
+    async def receive(subscription: Any, expected: int) -> None:
+        received = 0
+        while received < expected:
+            update = await subscription.get(timeout=RECEIVE_TIMEOUT_S)
+            if update is None:
+                return
+            latencies.append(time.perf_counter() - update.payload["sent_at"])
+            received += 1
+
+    async def publish(job_id: str, count: int) -> None:
+        for sequence in range(count):
+            await queue.publish_update(
+                JobUpdate(
+                    job_id=job_id,
+                    event="progress",
+                    payload={"sent_at": time.perf_counter(), "sequence": sequence},
+                )
+            )
+
+    receivers = [
+        asyncio.create_task(receive(subscription, count))
+        for subscription, count in zip(subscriptions, counts)
+    ]
+    await asyncio.gather(*(publish(job_id, count) for job_id, count in zip(job_ids, counts)))
+    await asyncio.gather(*receivers)
+    for subscription in subscriptions:
+        await subscription.close()
+    return WorkloadResult(latencies, {"lost": operations - len(latencies)})
+
+
+__all__ = ["WORKLOADS", "WorkloadResult", "workload"]
@@ -0,0 +1,38 @@
+"""Add job_state_archive table for expired terminal job states.
+
+Revision ID: 20260320_0017
+Revises: 20260307_0013
+Create Date: 2026-03-20
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "20260320_0017"
+down_revision = "20260307_0013"
+branch_labels = None
+depends_on = None
+
+
+def _json_document_type() -> sa.JSON:
+    return sa.JSON().with_variant(JSONB, "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_state_archive",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("details", _json_document_type(), nullable=False),
+        sa.Column("updated_at", sa.String(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_state_archive")
@@ -0,0 +1,76 @@
+"""Add tables backing the SQL job queue backend.
+
+Revision ID: 20260322_0018
+Revises: 20260320_0017
+Create Date: 2026-03-22
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "20260322_0018"
+down_revision = "20260320_0017"
+branch_labels = None
+depends_on = None
+
+
+def _json_document_type() -> sa.JSON:
+    return sa.JSON().with_variant(JSONB, "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_queue_entries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("lane", sa.String(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("message", _json_document_type(), nullable=False),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_job_queue_entries_job_id", "job_queue_entries", ["job_id"])
+    op.create_index(
+        "ix_job_queue_entries_lane_priority_id",
+        "job_queue_entries",
+        ["lane", "priority", "id"],
+    )
+
+    op.create_table(
+        "job_queue_states",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("details", _json_document_type(), nullable=False),
+        sa.Column("updated_at", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index("ix_job_queue_states_expires_at", "job_queue_states", ["expires_at"])
+
+    op.create_table(
+        "job_queue_updates",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("event", sa.String(), nullable=False),
+        sa.Column("payload", _json_document_type(), nullable=False),
+        sa.Column("created_at", sa.String(), nullable=False),
+        sa.Column("stored_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_job_queue_updates_job_id", "job_queue_updates", ["job_id"])
+    op.create_index("ix_job_queue_updates_stored_at", "job_queue_updates", ["stored_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_queue_updates_stored_at", table_name="job_queue_updates")
+    op.drop_index("ix_job_queue_updates_job_id", table_name="job_queue_updates")
+    op.drop_table("job_queue_updates")
+    op.drop_index("ix_job_queue_states_expires_at", table_name="job_queue_states")
+    op.drop_table("job_queue_states")
+    op.drop_index("ix_job_queue_entries_lane_priority_id", table_name="job_queue_entries")
+    op.drop_index("ix_job_queue_entries_job_id", table_name="job_queue_entries")
+    op.drop_table("job_queue_entries")
@@ -0,0 +1,27 @@
+"""Add available_at to job_queue_entries for delayed jobs.
+
+Revision ID: 20260325_0019
+Revises: 20260322_0018
+Create Date: 2026-03-25
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260325_0019"
+down_revision = "20260322_0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("job_queue_entries") as batch_op:
+        batch_op.add_column(sa.Column("available_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_queue_entries") as batch_op:
+        batch_op.drop_column("available_at")
@@ -0,0 +1,33 @@
+"""Add idempotency_key to job_queue_states for deduplicated enqueue.
+
+Revision ID: 20260327_0020
+Revises: 20260325_0019
+Create Date: 2026-03-27
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260327_0020"
+down_revision = "20260325_0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("job_queue_states") as batch_op:
+        batch_op.add_column(sa.Column("idempotency_key", sa.String(), nullable=True))
+        batch_op.create_index(
+            "ix_job_queue_states_idempotency_key",
+            ["idempotency_key"],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_queue_states") as batch_op:
+        batch_op.drop_index("ix_job_queue_states_idempotency_key")
+        batch_op.drop_column("idempotency_key")
@@ -0,0 +1,45 @@
+"""Add dead-letter table for the SQL job queue backend.
+
+Revision ID: 20260329_0021
+Revises: 20260327_0020
+Create Date: 2026-03-29
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "20260329_0021"
+down_revision = "20260327_0020"
+branch_labels = None
+depends_on = None
+
+
+def _json_document_type() -> sa.JSON:
+    return sa.JSON().with_variant(JSONB, "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_queue_dead_letters",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("target", sa.String(), nullable=False),
+        sa.Column("message", _json_document_type(), nullable=False),
+        sa.Column("error", sa.String(), nullable=False),
+        sa.Column("code", sa.String(), nullable=True),
+        sa.Column("attempts", _json_document_type(), nullable=False),
+        sa.Column("details", _json_document_type(), nullable=False),
+        sa.Column("dead_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index("ix_job_queue_dead_letters_target", "job_queue_dead_letters", ["target"])
+    op.create_index("ix_job_queue_dead_letters_dead_at", "job_queue_dead_letters", ["dead_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_queue_dead_letters_dead_at", table_name="job_queue_dead_letters")
+    op.drop_index("ix_job_queue_dead_letters_target", table_name="job_queue_dead_letters")
+    op.drop_table("job_queue_dead_letters")
@@ -0,0 +1,45 @@
+"""Add extension_registrations so standalone dispatchers see registered extensions.
+
+Revision ID: 20260402_0022
+Revises: 20260329_0021
+Create Date: 2026-04-02
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "20260402_0022"
+down_revision = "20260329_0021"
+branch_labels = None
+depends_on = None
+
+
+def _json_document_type() -> sa.JSON:
+    return sa.JSON().with_variant(JSONB, "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extension_registrations",
+        sa.Column("extension_id", sa.String(), nullable=False),
+        sa.Column("webhook_url", sa.String(), nullable=False),
+        sa.Column("intents", _json_document_type(), nullable=False),
+        sa.Column("capabilities", _json_document_type(), nullable=False),
+        sa.Column("metadata", _json_document_type(), nullable=False),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+        sa.Column("max_concurrency", sa.Integer(), nullable=True),
+        sa.Column("rate_limit_per_s", sa.Float(), nullable=True),
+        sa.Column("rate_limit_burst", sa.Integer(), nullable=True),
+        sa.Column("batch_max_jobs", sa.Integer(), nullable=True),
+        sa.Column("batch_max_wait_ms", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("extension_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("extension_registrations")
@@ -0,0 +1,32 @@
+"""Add instances to extension_registrations so replicas of an extension share it.
+
+Revision ID: 20260405_0023
+Revises: 20260402_0022
+Create Date: 2026-04-05
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "20260405_0023"
+down_revision = "20260402_0022"
+branch_labels = None
+depends_on = None
+
+
+def _json_document_type() -> sa.JSON:
+    return sa.JSON().with_variant(JSONB, "postgresql")
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("extension_registrations") as batch_op:
+        batch_op.add_column(sa.Column("instances", _json_document_type(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("extension_registrations") as batch_op:
+        batch_op.drop_column("instances")
@@ -1,3 +1,4 @@
+from fair_platform.backend.api.dependencies.job_dispatcher import get_job_dispatcher
 from fair_platform.backend.api.dependencies.job_queue import get_job_queue
 
-__all__ = ["get_job_queue"]
+__all__ = ["get_job_dispatcher", "get_job_queue"]
@@ -0,0 +1,10 @@
+from fastapi import Request
+
+from fair_platform.backend.services.job_dispatcher import JobDispatcher
+
+
+async def get_job_dispatcher(request: Request) -> JobDispatcher | None:
+    return getattr(request.app.state, "job_dispatcher", None)
+
+
+__all__ = ["get_job_dispatcher"]
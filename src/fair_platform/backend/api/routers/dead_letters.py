@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from fair_platform.backend.api.dependencies import get_job_queue
+from fair_platform.backend.api.routers.auth import get_current_user
+from fair_platform.backend.api.schema.job import (
+    DeadLetterRead,
+    DeadLetterRequeueRequest,
+    DeadLetterRequeueResponse,
+)
+from fair_platform.backend.core.security.permissions import has_capability
+from fair_platform.backend.data.models import User
+from fair_platform.backend.services.dead_letters import requeue_dead_letters
+from fair_platform.backend.services.job_queue import DeadLetter, JobQueue
+
+router = APIRouter()
+
+
+def _require_queue_manager(user: User, action: str) -> None:
+    if not has_capability(user, "manage_job_queue"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only admin users can {action} dead-lettered jobs",
+        )
+
+
+def _to_read(entry: DeadLetter) -> DeadLetterRead:
+    return DeadLetterRead(
+        job_id=entry.job.job_id,
+        target=entry.job.target,
+        lane=entry.job.lane,
+        error=entry.error,
+        code=entry.code,
+        attempts=entry.attempts,
+        details=entry.details,
+        dead_at=entry.dead_at,
+    )
+
+
+@router.get("/", response_model=list[DeadLetterRead])
+async def list_dead_letters(
+    target: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    _require_queue_manager(current_user, "list")
+    entries = await queue.list_dead_letters(limit=limit, target=target)
+    return [_to_read(entry) for entry in entries]
+
+
+@router.get("/{job_id}", response_model=DeadLetterRead)
+async def get_dead_letter(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    _require_queue_manager(current_user, "inspect")
+    entry = await queue.get_dead_letter(job_id)
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dead letter not found",
+        )
+    return _to_read(entry)
+
+
+@router.post("/requeue", response_model=DeadLetterRequeueResponse)
+async def requeue(
+    payload: DeadLetterRequeueRequest,
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    _require_queue_manager(current_user, "requeue")
+    requeued = await requeue_dead_letters(
+        queue,
+        payload.job_ids,
+        target=payload.target,
+        limit=payload.limit,
+        rate_per_s=payload.rate_per_s,
+    )
+    return DeadLetterRequeueResponse(requeued=requeued)
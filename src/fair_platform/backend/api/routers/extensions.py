@@ -8,6 +8,8 @@ from fair_platform.backend.api.schema.extension import (
     ExtensionClientRead,
     ExtensionClientSecretRead,
     ExtensionClientUpdateRequest,
+    ExtensionHeartbeatRequest,
+    ExtensionInstanceRead,
     ExtensionRead,
     ExtensionRegisterRequest,
 )
@@ -18,6 +20,7 @@ from fair_platform.backend.data.models import ExtensionClient
 from fair_platform.backend.data.models.user import User
 from fair_platform.backend.services.extension_auth import issue_extension_secret
 from fair_platform.backend.services.extension_registry import (
+    ExtensionInstance,
     ExtensionRegistration,
     LocalExtensionRegistry,
 )
@@ -37,6 +40,24 @@ def get_extension_registry(request: Request) -> LocalExtensionRegistry:
     return registry
 
 
+def _instance_read(instance: ExtensionInstance) -> ExtensionInstanceRead:
+    return ExtensionInstanceRead(
+        instance_id=instance.instance_id,
+        webhook_url=instance.webhook_url,
+        weight=instance.weight,
+        heartbeat_interval_s=instance.heartbeat_interval_s,
+        last_seen_at=datetime.fromtimestamp(instance.last_seen_at, timezone.utc)
+        if instance.last_seen_at is not None
+        else None,
+        in_flight=instance.in_flight,
+        queue_length=instance.queue_length,
+    )
+
+
+def _instances_read(registration: ExtensionRegistration) -> list[ExtensionInstanceRead]:
+    return [_instance_read(instance) for instance in registration.instances]
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=ExtensionRead)
 @router.post("/connect", status_code=status.HTTP_201_CREATED, response_model=ExtensionRead)
 async def register_extension(
@@ -122,6 +143,19 @@ async def register_extension(
             intents=payload.intents,
             capabilities=payload.capabilities,
             metadata=metadata,
+            max_concurrency=payload.max_concurrency,
+            rate_limit_per_s=payload.rate_limit_per_s,
+            rate_limit_burst=payload.rate_limit_burst,
+            batch_max_jobs=payload.batch_max_jobs,
+            batch_max_wait_ms=payload.batch_max_wait_ms,
+            instances=[
+                ExtensionInstance(
+                    instance_id=payload.instance_id or payload.webhook_url,
+                    webhook_url=payload.webhook_url,
+                    weight=payload.weight,
+                    heartbeat_interval_s=payload.heartbeat_interval_s,
+                )
+            ],
         )
     )
     return ExtensionRead(
@@ -132,7 +166,39 @@ async def register_extension(
         requested_scopes=requested_scopes,
         metadata=registration.metadata,
         enabled=registration.enabled,
+        max_concurrency=registration.max_concurrency,
+        rate_limit_per_s=registration.rate_limit_per_s,
+        rate_limit_burst=registration.rate_limit_burst,
+        batch_max_jobs=registration.batch_max_jobs,
+        batch_max_wait_ms=registration.batch_max_wait_ms,
+        instances=_instances_read(registration),
+    )
+
+
+@router.post("/heartbeat", response_model=ExtensionInstanceRead)
+async def extension_heartbeat(
+    payload: ExtensionHeartbeatRequest,
+    extension_client: ExtensionClient = Depends(require_extension_client(("extensions:connect",))),
+    registry: LocalExtensionRegistry = Depends(get_extension_registry),
+):
+    if extension_client.extension_id != payload.extension_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Extension id does not match authenticated extension",
+        )
+    instance = await registry.heartbeat(
+        payload.extension_id,
+        payload.instance_id,
+        in_flight=payload.in_flight,
+        queue_length=payload.queue_length,
     )
+    if instance is None:
+        # Expired or never connected; the SDK reconnects on 404.
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Extension instance is not registered",
+        )
+    return _instance_read(instance)
 
 
 @router.get("/", response_model=list[ExtensionRead])
@@ -151,6 +217,12 @@ async def list_extensions(
             else [],
             metadata=record.metadata,
             enabled=record.enabled,
+            max_concurrency=record.max_concurrency,
+            rate_limit_per_s=record.rate_limit_per_s,
+            rate_limit_burst=record.rate_limit_burst,
+            batch_max_jobs=record.batch_max_jobs,
+            batch_max_wait_ms=record.batch_max_wait_ms,
+            instances=_instances_read(record),
         )
         for record in records
     ]
@@ -4,12 +4,12 @@ from dataclasses import asdict
 import json
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.sse import EventSourceResponse, format_sse_event
 from pydantic import ValidationError
 
-from fair_platform.backend.api.dependencies import get_job_queue
+from fair_platform.backend.api.dependencies import get_job_dispatcher, get_job_queue
 from fair_platform.backend.api.routers.auth import get_current_user, create_extension_job_token
 from fair_platform.backend.api.schema.job import (
     JobCreateRequest,
@@ -19,50 +19,70 @@ from fair_platform.backend.api.schema.job import (
     JobUpdateResponse,
 )
 from fair_platform.backend.api.schema.rubric import RubricGenerateResponse
+from fair_platform.backend.services.job_dispatcher import JobDispatcher
 from fair_platform.backend.services.job_queue import (
+    JOB_UPDATES_FROM_START,
+    TERMINAL_JOB_STATUSES,
+    DuplicateReason,
+    JobLane,
     JobMessage,
     JobQueue,
+    JobQueueConflict,
+    JobStateWatch,
     JobStatus,
     JobUpdate,
 )
 from fair_platform.backend.core.security.dependencies import require_extension_client
 from fair_platform.backend.data.models import ExtensionClient, User
+from fair_platform.extension_sdk.tracing import TraceContext, get_tracer, inject_trace_context
 
 router = APIRouter()
-TERMINAL_JOB_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+# Actions a user actively waits on; they skip ahead of bulk work by default.
+INTERACTIVE_JOB_ACTIONS = {"rubric.create"}
 
 
 @router.post("/", status_code=status.HTTP_202_ACCEPTED, response_model=JobCreateResponse)
 async def create_job(
     payload: JobCreateRequest,
+    idempotency_key_header: str | None = Header(default=None, alias="Idempotency-Key"),
+    traceparent: str | None = Header(default=None),
     current_user: User = Depends(get_current_user),
     queue: JobQueue = Depends(get_job_queue),
 ):
     job_id = payload.job_id or str(uuid4())
-    existing = await queue.get_state(job_id)
-    if existing is not None:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Job with id {job_id!r} already exists",
-        )
+    client_key = payload.idempotency_key or idempotency_key_header
+    # Keys are scoped per user so clients cannot collide with each other.
+    idempotency_key = f"user:{current_user.id}:{client_key}" if client_key else None
 
     delegation_token = create_extension_job_token(
         user_id=str(current_user.id),
         job_id=job_id,
         extension_id=payload.target,
     )
-    job_metadata = {**payload.metadata, "_delegation_token": delegation_token}
+    # The job's trace continues the caller's, if it sent a `traceparent`.
+    tracer = get_tracer()
+    submit_span = tracer.start_span(
+        "job.submit",
+        parent=TraceContext.parse(traceparent),
+        attributes={"job_id": job_id, "target": payload.target, "action": payload.payload.action},
+    )
+    job_metadata = inject_trace_context(
+        {**payload.metadata, "_delegation_token": delegation_token},
+        submit_span.context,
+    )
 
     job = JobMessage(
         job_id=job_id,
         target=payload.target,
         payload=payload.payload.model_dump(),
         metadata=job_metadata,
+        lane=payload.lane
+        or (JobLane.INTERACTIVE if payload.payload.action in INTERACTIVE_JOB_ACTIONS else JobLane.DEFAULT),
+        priority=payload.priority,
+        idempotency_key=idempotency_key,
     )
-    await queue.enqueue(job)
-    await queue.set_state(
-        job_id=job_id,
-        status=JobStatus.QUEUED,
+    duplicate = await queue.enqueue_if_absent(
+        job,
         details={
             "target": payload.target,
             "action": payload.payload.action,
@@ -70,6 +90,16 @@ async def create_job(
             "owner_extension_id": payload.target,
         },
     )
+    tracer.end_span(submit_span)
+    if duplicate is not None:
+        existing = await queue.get_state(duplicate.job_id)
+        if duplicate.reason == DuplicateReason.JOB_ID or existing is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job with id {job_id!r} already exists",
+            )
+        # Retried submission: hand back the job the first attempt created.
+        return JobCreateResponse(job_id=duplicate.job_id, status=existing.status)
     return JobCreateResponse(job_id=job_id, status=JobStatus.QUEUED)
 
 
@@ -99,12 +129,12 @@ async def get_job_state(
     )
 
 
-@router.post("/{job_id}/updates", response_model=JobUpdateResponse)
-async def publish_job_update(
+@router.post("/{job_id}/cancel", response_model=JobStateRead)
+async def cancel_job(
     job_id: str,
-    payload: JobUpdateRequest,
-    _extension_client: ExtensionClient = Depends(require_extension_client(("jobs:write",))),
+    current_user: User = Depends(get_current_user),
     queue: JobQueue = Depends(get_job_queue),
+    dispatcher: JobDispatcher | None = Depends(get_job_dispatcher),
 ):
     state = await queue.get_state(job_id)
     if state is None:
@@ -112,49 +142,122 @@ async def publish_job_update(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found",
         )
-    owner_extension_id = state.details.get("owner_extension_id")
-    if owner_extension_id and owner_extension_id != _extension_client.extension_id:
+    owner_user_id = state.details.get("owner_user_id")
+    if owner_user_id and owner_user_id != str(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Authenticated extension cannot update this job",
+            detail="Authenticated user cannot cancel this job",
+        )
+    if state.status in TERMINAL_JOB_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already finished with status {state.status}",
+        )
+
+    removed = await queue.remove_pending(job_id)
+    cancelled = await queue.transition_state(
+        job_id,
+        JobStatus.CANCELLED,
+        details={"cancelled_by": str(current_user.id)},
+    )
+    if cancelled is None:
+        # The job finished between the check above and the transition.
+        finished = await queue.get_state(job_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already finished with status {finished.status if finished else 'unknown'}",
         )
+    # A job that could not be removed may already be at the extension (or
+    # mid-dispatch), so tell the extension to stop it; unknown jobs are a no-op.
+    if not removed and dispatcher is not None:
+        target = state.details.get("target") or state.details.get("owner_extension_id")
+        if target:
+            await dispatcher.send_cancel(job_id, target)
+    return JobStateRead(
+        job_id=cancelled.job_id,
+        status=cancelled.status,
+        updated_at=cancelled.updated_at,
+        details=cancelled.details,
+    )
+
 
-    normalized_update_payload = payload.update.payload.model_dump()
-    job_action = state.details.get("action")
-    if job_action == "rubric.create" and payload.update.event == "result":
-        try:
-            rubric_result = RubricGenerateResponse.model_validate(normalized_update_payload["data"])
-        except (KeyError, ValidationError) as exc:
+@router.post("/{job_id}/updates", response_model=JobUpdateResponse)
+async def publish_job_update(
+    job_id: str,
+    payload: JobUpdateRequest,
+    traceparent: str | None = Header(default=None),
+    _extension_client: ExtensionClient = Depends(require_extension_client(("jobs:write",))),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    # Continues the extension's `job.update` span, so ingestion and
+    # persistence show up in the job's trace.
+    with get_tracer().span(
+        "job.update.ingest",
+        parent=TraceContext.parse(traceparent),
+        attributes={"job_id": job_id, "event": payload.update.event, "status": payload.status},
+    ):
+        state = await queue.get_state(job_id)
+        if state is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            )
+        owner_extension_id = state.details.get("owner_extension_id")
+        if owner_extension_id and owner_extension_id != _extension_client.extension_id:
             raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="Rubric result payload must match RubricGenerateResponse schema",
-            ) from exc
-        normalized_update_payload = {"data": rubric_result.model_dump()}
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Authenticated extension cannot update this job",
+            )
 
-    update = JobUpdate(
-        job_id=job_id,
-        event=payload.update.event,
-        payload=normalized_update_payload,
-    )
-    await queue.publish_update(update)
+        normalized_update_payload = payload.update.payload.model_dump()
+        job_action = state.details.get("action")
+        if job_action == "rubric.create" and payload.update.event == "result":
+            try:
+                rubric_result = RubricGenerateResponse.model_validate(normalized_update_payload["data"])
+            except (KeyError, ValidationError) as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Rubric result payload must match RubricGenerateResponse schema",
+                ) from exc
+            normalized_update_payload = {"data": rubric_result.model_dump()}
 
-    next_status = None
-    if payload.status is not None:
-        merged_details = dict(state.details)
-        merged_details.update(payload.details)
-        next_state = await queue.set_state(
+        update = JobUpdate(
             job_id=job_id,
-            status=payload.status,
-            details=merged_details,
+            event=payload.update.event,
+            payload=normalized_update_payload,
         )
-        next_status = next_state.status
+        await queue.publish_update(update)
+
+        next_status = None
+        # Terminal states are final and jobs never move backwards; late or
+        # out-of-order updates are still streamed but leave the state alone.
+        if payload.status is not None:
+            try:
+                next_state = await queue.transition_state(
+                    job_id,
+                    payload.status,
+                    details=payload.details,
+                )
+            except JobQueueConflict as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Job state is changing too often; retry the update",
+                    headers={"Retry-After": "1"},
+                ) from exc
+            if next_state is not None:
+                next_status = next_state.status
 
-    return JobUpdateResponse(job_id=job_id, accepted=True, status=next_status)
+        return JobUpdateResponse(job_id=job_id, accepted=True, status=next_status)
 
 
 @router.get("/{job_id}/stream")
 async def stream_job_updates(
     job_id: str,
+    cursor: str | None = Query(
+        default=None,
+        description="Resume after this update cursor. Defaults to the start of the update log.",
+    ),
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
     current_user: User = Depends(get_current_user),
     queue: JobQueue = Depends(get_job_queue),
 ):
@@ -171,52 +274,41 @@ async def stream_job_updates(
             detail="Authenticated user cannot stream this job",
         )
 
-    def _sse(event: str, data: dict) -> bytes:
+    # Browsers resend the last `id:` they saw as `Last-Event-ID` on reconnect.
+    from_cursor = last_event_id or cursor or JOB_UPDATES_FROM_START
+
+    def _sse(event: str, data: dict, event_id: str | None = None) -> bytes:
         data_str = json.dumps(jsonable_encoder(data))
-        return format_sse_event(event=event, data_str=data_str)
+        return format_sse_event(event=event, data_str=data_str, id=event_id)
+
+    def _update_sse(update: JobUpdate) -> bytes:
+        return _sse(event=update.event, data=asdict(update), event_id=update.cursor)
 
     async def event_stream() -> AsyncIterable[bytes]:
-        subscription = await queue.subscribe_updates(job_id)
-        async with subscription:
+        subscription = await queue.subscribe_updates(job_id, from_cursor=from_cursor)
+        async with subscription, JobStateWatch(queue, job_id) as watch:
             try:
-                initial_state = await queue.get_state(job_id)
-                if initial_state is not None and initial_state.status in TERMINAL_JOB_STATUSES:
-                    yield _sse(
-                        event="end",
-                        data={
-                            "job_id": job_id,
-                            "status": initial_state.status,
-                            "updated_at": initial_state.updated_at,
-                        },
-                    )
-                    return
+                # Once the job is terminal, `next_update` only flushes replayed
+                # or in-flight updates, then returns `None`.
                 while True:
-                    update = await subscription.get(timeout=15.0)
-                    if update is None:
-                        latest_state = await queue.get_state(job_id)
-                        if latest_state is not None and latest_state.status in TERMINAL_JOB_STATUSES:
-                            yield _sse(
-                                event="end",
-                                data={
-                                    "job_id": job_id,
-                                    "status": latest_state.status,
-                                    "updated_at": latest_state.updated_at,
-                                },
-                            )
-                            return
-                        continue
-                    yield _sse(event=update.event, data=asdict(update))
-                    latest_state = await queue.get_state(job_id)
-                    if latest_state is not None and latest_state.status in TERMINAL_JOB_STATUSES:
-                        yield _sse(
-                            event="end",
-                            data={
-                                "job_id": job_id,
-                                "status": latest_state.status,
-                                "updated_at": latest_state.updated_at,
-                            },
-                        )
+                    update = await watch.next_update(subscription)
+                    if update is not None:
+                        yield _update_sse(update)
+                    elif watch.terminal.is_set():
+                        break
+                    elif subscription.disconnected:
+                        # Dropped for falling behind; the client reconnects
+                        # with Last-Event-ID and replays what it missed.
                         return
+                latest_state = watch.latest
+                yield _sse(
+                    event="end",
+                    data={
+                        "job_id": job_id,
+                        "status": latest_state.status,
+                        "updated_at": latest_state.updated_at,
+                    },
+                )
             except asyncio.CancelledError:
                 return
 
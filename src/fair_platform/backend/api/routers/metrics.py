@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
+
+from fair_platform.backend.api.dependencies import get_job_queue
+from fair_platform.backend.services.job_metrics import PROMETHEUS_CONTENT_TYPE, metrics_enabled
+from fair_platform.backend.services.job_queue import JobQueue
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(queue: JobQueue = Depends(get_job_queue)):
+    if not metrics_enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    # Depth is read from the backend on every scrape so it is shared by all processes.
+    queue.metrics.set_queue_depth(await queue.queue_depth())
+    return Response(content=queue.metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+__all__ = ["router"]
@@ -23,6 +23,7 @@ from fair_platform.backend.core.security.permissions import (
     has_capability_and_owner,
 )
 from fair_platform.backend.services.job_queue import (
+    JobLane,
     JobMessage,
     JobQueue,
     JobStatus,
@@ -99,12 +100,6 @@ async def generate_rubric(
 
     job_id = str(uuid4())
     target = _rubric_extension_target()
-    existing = await queue.get_state(job_id)
-    if existing is not None:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Job with id {job_id!r} already exists",
-        )
 
     job = JobMessage(
         job_id=job_id,
@@ -114,11 +109,10 @@ async def generate_rubric(
             "params": payload.model_dump(),
         },
         metadata={"source": "rubrics.generate"},
+        lane=JobLane.INTERACTIVE,
     )
-    await queue.enqueue(job)
-    await queue.set_state(
-        job_id=job_id,
-        status=JobStatus.QUEUED,
+    duplicate = await queue.enqueue_if_absent(
+        job,
         details={
             "target": target,
             "action": "rubric.create",
@@ -126,6 +120,11 @@ async def generate_rubric(
             "owner_extension_id": target,
         },
     )
+    if duplicate is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job with id {job_id!r} already exists",
+        )
     return JobCreateResponse(job_id=job_id, status=JobStatus.QUEUED)
 
 
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from collections.abc import AsyncIterable
 from uuid import UUID, uuid4
@@ -36,8 +37,19 @@ from fair_platform.backend.services.settings_validator import (
 
 router = APIRouter()
 
+# How often streams of runs executed by `fair runner` re-read the run history.
+REMOTE_RUN_POLL_INTERVAL_S = 1.0
+_TERMINAL_RUN_STATUSES = {WorkflowRunStatus.success, WorkflowRunStatus.failure, WorkflowRunStatus.cancelled}
 
-def get_workflow_runner(request: Request) -> WorkflowRunner:
+
+def _runs_in_process(request: Request) -> bool:
+    return getattr(request.app.state, "workflow_runner_enabled", True)
+
+
+def get_workflow_runner(request: Request) -> WorkflowRunner | None:
+    """The API's runner, or `None` when runs are left to `fair runner`."""
+    if not _runs_in_process(request):
+        return None
     runner = getattr(request.app.state, "workflow_runner", None)
     if runner is None:
         broker = getattr(request.app.state, "workflow_run_event_broker", None)
@@ -116,7 +128,7 @@ async def create_workflow_run(
     payload: WorkflowRunCreateRequest,
     db: Session = Depends(session_dependency),
     current_user: User = Depends(get_current_user),
-    runner: WorkflowRunner = Depends(get_workflow_runner),
+    runner: WorkflowRunner | None = Depends(get_workflow_runner),
 ):
     if not payload.submission_ids:
         raise HTTPException(status_code=400, detail="At least one submission must be provided")
@@ -183,12 +195,13 @@ async def create_workflow_run(
     db.commit()
     db.refresh(workflow_run)
 
-    runner.start_run(
-        workflow_run_id=workflow_run.id,
-        workflow_id=workflow.id,
-        user_id=current_user.id,
-        submission_ids=payload.submission_ids,
-    )
+    if runner is not None:
+        runner.start_run(
+            workflow_run_id=workflow_run.id,
+            workflow_id=workflow.id,
+            user_id=current_user.id,
+            submission_ids=payload.submission_ids,
+        )
     return _serialize_run(workflow_run)
 
 
@@ -297,12 +310,37 @@ async def stream_workflow_run(
         history = ((run.logs or {}).get("history", [])) if isinstance(run.logs, dict) else []
         for entry in history:
             yield _sse(entry.get("type", "log"), entry)
+        if not _runs_in_process(request):
+            # `fair runner` publishes to its own broker; follow the persisted history.
+            sent = len(history)
+            while not await request.is_disconnected():
+                await asyncio.sleep(REMOTE_RUN_POLL_INTERVAL_S)
+                with get_session() as poll_db:
+                    latest = poll_db.get(WorkflowRun, workflow_run_id)
+                    if latest is None:
+                        return
+                    logs = latest.logs if isinstance(latest.logs, dict) else {}
+                    entries = list(logs.get("history", []))
+                    latest_status, finished_at = latest.status, latest.finished_at
+                for entry in entries[sent:]:
+                    yield _sse(entry.get("type", "log"), entry)
+                sent = len(entries)
+                if latest_status in _TERMINAL_RUN_STATUSES:
+                    yield _sse(
+                        "end",
+                        {"workflow_run_id": str(workflow_run_id), "status": latest_status, "finished_at": finished_at},
+                    )
+                    return
+            return
         subscription = await broker.subscribe(workflow_run_id)
         async with subscription:
             while True:
                 if await request.is_disconnected():
                     return
                 event = await subscription.get(timeout=15.0)
+                if event is None and subscription.disconnected:
+                    # Dropped for falling behind; reconnecting replays history.
+                    return
                 if event is None:
                     with get_session() as poll_db:
                         latest = poll_db.get(WorkflowRun, workflow_run_id)
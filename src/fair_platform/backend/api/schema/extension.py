@@ -4,6 +4,8 @@ from pydantic import BaseModel, Field
 
 from fair_platform.backend.api.schema.utils import schema_config
 from fair_platform.extension_sdk.contracts.extension import (
+    ExtensionHeartbeatRequest,
+    ExtensionInstanceRead,
     ExtensionRead,
     ExtensionRegisterRequest,
 )
@@ -45,6 +47,8 @@ class ExtensionClientUpdateRequest(BaseModel):
 
 __all__ = [
     "ExtensionRegisterRequest",
+    "ExtensionHeartbeatRequest",
+    "ExtensionInstanceRead",
     "ExtensionRead",
     "ExtensionClientIssueRequest",
     "ExtensionClientSecretRead",
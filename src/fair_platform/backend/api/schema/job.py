@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field
 
 from fair_platform.backend.api.schema.rubric import RubricGenerateResponse
 from fair_platform.backend.api.schema.utils import schema_config
-from fair_platform.backend.services.job_queue import JobStatus
+from fair_platform.backend.services.job_queue import JobLane, JobStatus
 from fair_platform.extension_sdk.contracts.job import (
     ActionPayload,
     ErrorPayload,
@@ -30,6 +30,9 @@ class JobCreateRequest(BaseModel):
     payload: "ActionPayload"
     metadata: dict[str, Any] = Field(default_factory=dict)
     job_id: str | None = None
+    lane: JobLane | None = None
+    priority: int = Field(default=0, ge=-100, le=100)
+    idempotency_key: str | None = Field(default=None, min_length=1, max_length=255)
 
 
 class JobCreateResponse(BaseModel):
@@ -48,6 +51,34 @@ class JobStateRead(BaseModel):
     details: dict[str, Any] = Field(default_factory=dict)
 
 
+class DeadLetterRead(BaseModel):
+    model_config = schema_config
+
+    job_id: str
+    target: str
+    lane: JobLane
+    error: str
+    code: str | None = None
+    attempts: list[dict[str, Any]] = Field(default_factory=list)
+    details: dict[str, Any] = Field(default_factory=dict)
+    dead_at: str
+
+
+class DeadLetterRequeueRequest(BaseModel):
+    model_config = schema_config
+
+    job_ids: list[str] | None = None
+    target: str | None = None
+    limit: int = Field(default=100, ge=1, le=1000)
+    rate_per_s: float = Field(default=10.0, ge=0)
+
+
+class DeadLetterRequeueResponse(BaseModel):
+    model_config = schema_config
+
+    requeued: list[str] = Field(default_factory=list)
+
+
 class RubricResultPayload(BaseModel):
     model_config = schema_config
 
@@ -89,6 +120,9 @@ __all__ = [
     "JobCreateRequest",
     "JobCreateResponse",
     "JobStateRead",
+    "DeadLetterRead",
+    "DeadLetterRequeueRequest",
+    "DeadLetterRequeueResponse",
     "JobUpdateRequest",
     "JobUpdateResponse",
 ]
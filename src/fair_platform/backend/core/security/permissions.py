@@ -10,6 +10,7 @@ Capability = str
 ADMIN_CAPABILITIES: set[Capability] = {
     "admin",
     "manage_users",
+    "manage_job_queue",
     "create_course",
     "update_any_course",
     "delete_any_course",
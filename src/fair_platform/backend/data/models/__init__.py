@@ -11,6 +11,9 @@ from .artifact import Artifact, ArtifactDerivative
 from .submission_result import SubmissionResult
 from .rubric import Rubric
 from .extension_client import ExtensionClient
+from .extension_registration import ExtensionRegistrationRecord
+from .job_state_archive import JobStateArchive
+from .job_queue import JobQueueDeadLetter, JobQueueEntry, JobQueueState, JobQueueUpdate
 
 __all__ = [
     "User",
@@ -31,4 +34,10 @@ __all__ = [
     "SubmissionResult",
     "Rubric",
     "ExtensionClient",
+    "ExtensionRegistrationRecord",
+    "JobStateArchive",
+    "JobQueueDeadLetter",
+    "JobQueueEntry",
+    "JobQueueState",
+    "JobQueueUpdate",
 ]
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+from .types import json_document_type
+
+
+class ExtensionRegistrationRecord(Base):
+    """An `ExtensionRegistration` shared by API and dispatcher processes."""
+
+    __tablename__ = "extension_registrations"
+
+    extension_id: Mapped[str] = mapped_column(String, primary_key=True)
+    webhook_url: Mapped[str] = mapped_column(String, nullable=False)
+    intents: Mapped[list[str]] = mapped_column(json_document_type(), nullable=False, default=list)
+    capabilities: Mapped[list[str]] = mapped_column(json_document_type(), nullable=False, default=list)
+    metadata_: Mapped[dict[str, Any]] = mapped_column(
+        "metadata", json_document_type(), nullable=False, default=dict
+    )
+    enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    max_concurrency: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    rate_limit_per_s: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rate_limit_burst: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    batch_max_jobs: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    batch_max_wait_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # `ExtensionInstance` fields per replica; NULL for rows written before replicas.
+    instances: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(json_document_type(), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ExtensionRegistrationRecord extension_id={self.extension_id!r} enabled={self.enabled}>"
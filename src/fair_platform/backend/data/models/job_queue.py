@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+from .types import json_document_type
+
+
+class JobQueueEntry(Base):
+    """A pending job for `SqlJobQueue`; the row is deleted when dequeued.
+
+    `available_at` is set for delayed jobs, which are not dequeued before it.
+    """
+
+    __tablename__ = "job_queue_entries"
+    __table_args__ = (
+        Index("ix_job_queue_entries_lane_priority_id", "lane", "priority", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    lane: Mapped[str] = mapped_column(String, nullable=False)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    message: Mapped[dict] = mapped_column(json_document_type(), nullable=False)
+    enqueued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    available_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<JobQueueEntry id={self.id} job_id={self.job_id!r} lane={self.lane!r}>"
+
+
+class JobQueueState(Base):
+    """Current `JobState` of a job handled by `SqlJobQueue`."""
+
+    __tablename__ = "job_queue_states"
+    __table_args__ = (
+        Index("ix_job_queue_states_idempotency_key", "idempotency_key", unique=True),
+    )
+
+    job_id: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    details: Mapped[dict] = mapped_column(json_document_type(), nullable=False, default=dict)
+    updated_at: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<JobQueueState job_id={self.job_id!r} status={self.status!r}>"
+
+
+class JobQueueUpdate(Base):
+    """A published `JobUpdate`; subscribers read rows past their cursor."""
+
+    __tablename__ = "job_queue_updates"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    event: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(json_document_type(), nullable=False)
+    created_at: Mapped[str] = mapped_column(String, nullable=False)
+    stored_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<JobQueueUpdate id={self.id} job_id={self.job_id!r} event={self.event!r}>"
+
+
+class JobQueueDeadLetter(Base):
+    """A `DeadLetter` kept by `SqlJobQueue` until it is requeued or deleted."""
+
+    __tablename__ = "job_queue_dead_letters"
+
+    job_id: Mapped[str] = mapped_column(String, primary_key=True)
+    target: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    message: Mapped[dict] = mapped_column(json_document_type(), nullable=False)
+    error: Mapped[str] = mapped_column(String, nullable=False)
+    code: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    attempts: Mapped[list] = mapped_column(json_document_type(), nullable=False, default=list)
+    details: Mapped[dict] = mapped_column(json_document_type(), nullable=False, default=dict)
+    dead_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<JobQueueDeadLetter job_id={self.job_id!r} target={self.target!r}>"
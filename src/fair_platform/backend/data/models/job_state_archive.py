@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+from .types import json_document_type
+
+
+class JobStateArchive(Base):
+    """Terminal job states moved out of the hot job queue state store."""
+
+    __tablename__ = "job_state_archive"
+
+    job_id: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    details: Mapped[dict] = mapped_column(json_document_type(), nullable=False, default=dict)
+    updated_at: Mapped[str] = mapped_column(String, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<JobStateArchive job_id={self.job_id!r} status={self.status!r}>"
@@ -28,10 +28,16 @@ from fair_platform.backend.api.routers.version import router as version_router
 from fair_platform.backend.api.routers.rubrics import router as rubrics_router
 from fair_platform.backend.api.routers.enrollments import router as enrollments_router
 from fair_platform.backend.api.routers.jobs import router as jobs_router
+from fair_platform.backend.api.routers.dead_letters import router as dead_letters_router
+from fair_platform.backend.api.routers.metrics import router as metrics_router
 from fair_platform.backend.api.routers.extensions import router as extensions_router
 from fair_platform.backend.api.routers.system import router as system_router
-from fair_platform.backend.services.extension_registry import LocalExtensionRegistry
-from fair_platform.backend.services.job_dispatcher import JobDispatcher
+from fair_platform.backend.services.extension_registry import create_extension_registry
+from fair_platform.backend.services.fanout import (
+    overflow_policy_from_env,
+    subscriber_queue_size_from_env,
+)
+from fair_platform.backend.services.job_dispatcher import JobDispatcher, dispatcher_options_from_env
 from fair_platform.backend.services.job_queue import create_job_queue
 from fair_platform.backend.services.workflow_runner import (
     WorkflowRunEventBroker,
@@ -75,6 +81,11 @@ def _is_job_dispatcher_enabled() -> bool:
     return raw in {"1", "true", "yes", "on"}
 
 
+def _is_workflow_runner_enabled() -> bool:
+    raw = os.getenv("FAIR_ENABLE_WORKFLOW_RUNNER", "1").strip().lower()
+    return raw in {"1", "true", "yes", "on"}
+
+
 def _is_core_extension_enabled() -> bool:
     if os.getenv("PYTEST_CURRENT_TEST"):
         return False
@@ -160,16 +171,26 @@ async def lifespan(_ignored: FastAPI):
             "Set FAIR_AUTO_MIGRATE=1 (recommended) or FAIR_ALLOW_CREATE_ALL=1 for local-only bootstrap."
         )
     app.state.job_queue = await create_job_queue()
-    app.state.extension_registry = LocalExtensionRegistry()
-    app.state.workflow_run_event_broker = WorkflowRunEventBroker()
+    app.state.extension_registry = create_extension_registry()
+    app.state.workflow_run_event_broker = WorkflowRunEventBroker(
+        max_queue_size=subscriber_queue_size_from_env(),
+        overflow_policy=overflow_policy_from_env(),
+    )
     app.state.job_dispatcher = JobDispatcher(
         queue=app.state.job_queue,
         registry=app.state.extension_registry,
+        **dispatcher_options_from_env(),
     )
-    app.state.workflow_runner = WorkflowRunner(
-        job_queue=app.state.job_queue,
-        event_broker=app.state.workflow_run_event_broker,
+    # With the runner disabled, runs stay `pending` for `fair runner`.
+    app.state.workflow_runner = (
+        WorkflowRunner(
+            job_queue=app.state.job_queue,
+            event_broker=app.state.workflow_run_event_broker,
+        )
+        if _is_workflow_runner_enabled()
+        else None
     )
+    app.state.workflow_runner_enabled = app.state.workflow_runner is not None
     app.state.core_extension_process = None
     if _is_core_extension_enabled():
         _ensure_core_extension_client()
@@ -226,8 +247,10 @@ app.include_router(version_router, prefix="/api", tags=["version"])
 app.include_router(rubrics_router, prefix="/api/rubrics", tags=["rubrics"])
 app.include_router(enrollments_router, prefix="/api/enrollments", tags=["enrollments"])
 app.include_router(jobs_router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(dead_letters_router, prefix="/api/dead-letters", tags=["jobs"])
 app.include_router(extensions_router, prefix="/api/extensions", tags=["extensions"])
 app.include_router(system_router, prefix="/api/v1/system", tags=["system"])
+app.include_router(metrics_router, tags=["metrics"])
 
 
 @app.get("/health")
@@ -13,10 +13,18 @@ from .job_queue import (
     JobUpdateSubscription,
     LocalJobQueue,
     RedisJobQueue,
+    RedisStreamJobQueue,
     create_job_queue,
     get_job_queue_backend,
 )
-from .extension_registry import ExtensionRegistration, LocalExtensionRegistry
+from .sql_job_queue import SqlJobQueue
+from .extension_registry import (
+    ExtensionInstance,
+    ExtensionRegistration,
+    LocalExtensionRegistry,
+    create_extension_registry,
+)
+from .sql_extension_registry import SqlExtensionRegistry
 from .job_dispatcher import DispatchResult, JobDispatcher
 
 __all__ = [
@@ -37,10 +45,15 @@ __all__ = [
     "JobUpdateSubscription",
     "LocalJobQueue",
     "RedisJobQueue",
+    "RedisStreamJobQueue",
+    "SqlJobQueue",
     "create_job_queue",
     "get_job_queue_backend",
+    "ExtensionInstance",
     "ExtensionRegistration",
     "LocalExtensionRegistry",
+    "SqlExtensionRegistry",
+    "create_extension_registry",
     "DispatchResult",
     "JobDispatcher",
 ]
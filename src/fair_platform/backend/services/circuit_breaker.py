@@ -0,0 +1,182 @@
+"""Circuit breakers for extension webhooks, one per extension instance.
+
+The dispatcher keys its breakers by `extension_id` and `instance_id`, so a
+failing replica is taken out of rotation while its healthy siblings keep
+receiving jobs; a target's jobs are only deferred once every instance's
+breaker is open.
+
+A breaker starts `closed` and records every webhook call in a rolling
+window of `window_s` seconds. A call fails when it raises or takes longer
+than `slow_call_s`. Once the window holds at least `min_calls` calls and
+the failed share reaches `failure_rate_threshold`, the breaker opens: for
+`open_s` seconds `try_acquire` refuses calls and the dispatcher routes the
+target's jobs to other instances, or defers them, instead of waiting on
+timeouts. After that the breaker is
+`half_open` and lets one probe call through at a time; `probe_successes`
+good probes in a row close it, a failed probe opens it again.
+
+`try_acquire` hands out a `BreakerPermit` per call, which goes back to
+`record` or `abandon`. Only the permit of the current probe can settle the
+probe, so a call that started while the breaker was closed, or a stale
+probe from before the breaker reopened, never decides a half-open breaker.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class BreakerState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+DEFAULT_WINDOW_S = 30.0
+DEFAULT_MIN_CALLS = 5
+DEFAULT_FAILURE_RATE_THRESHOLD = 0.5
+DEFAULT_SLOW_CALL_S = 10.0
+DEFAULT_OPEN_S = 15.0
+DEFAULT_PROBE_SUCCESSES = 1
+# Deferral while a probe is in flight; its result decides what happens next.
+_PROBE_WAIT_S = 1.0
+
+
+@dataclass(eq=False)
+class BreakerPermit:
+    """One call let through by `CircuitBreaker.try_acquire`.
+
+    `probe` marks the single trial call of a half-open breaker. `settled`
+    turns true once the permit was passed to `record` or `abandon`.
+    """
+
+    probe: bool = False
+    settled: bool = False
+
+
+class CircuitBreaker:
+    """Breaker for one target; see the module docstring."""
+
+    def __init__(
+        self,
+        *,
+        window_s: float = DEFAULT_WINDOW_S,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        failure_rate_threshold: float = DEFAULT_FAILURE_RATE_THRESHOLD,
+        slow_call_s: float = DEFAULT_SLOW_CALL_S,
+        open_s: float = DEFAULT_OPEN_S,
+        probe_successes: int = DEFAULT_PROBE_SUCCESSES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._window_s = window_s
+        self._min_calls = max(1, min_calls)
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_s = slow_call_s
+        self._open_s = open_s
+        self._probe_successes = max(1, probe_successes)
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        # (finished_at, failed) per call inside the window.
+        self._calls: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probe: BreakerPermit | None = None
+        self._good_probes = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == BreakerState.OPEN and self._clock() - self._opened_at >= self._open_s:
+            self._state = BreakerState.HALF_OPEN
+            self._good_probes = 0
+        return self._state
+
+    def retry_after_s(self) -> float:
+        """Seconds until an open breaker lets a probe through; `0.0` otherwise."""
+        if self.state != BreakerState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_s - self._clock())
+
+    def try_acquire(self) -> tuple[BreakerPermit | None, float]:
+        """Return a permit if a call may go out now, otherwise `None` and seconds to wait."""
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return BreakerPermit(), 0.0
+        if state == BreakerState.OPEN:
+            return None, self.retry_after_s()
+        if self._probe is not None:
+            return None, _PROBE_WAIT_S
+        self._probe = BreakerPermit(probe=True)
+        return self._probe, 0.0
+
+    def abandon(self, permit: BreakerPermit) -> None:
+        """Give back a permitted call that was never made."""
+        permit.settled = True
+        if permit is self._probe:
+            self._probe = None
+
+    def record(self, permit: BreakerPermit, ok: bool, latency_s: float) -> None:
+        """Record the outcome of the call made with `permit`."""
+        permit.settled = True
+        failed = not ok or latency_s > self._slow_call_s
+        now = self._clock()
+        if permit.probe:
+            if permit is not self._probe:
+                # Abandoned, or the breaker reopened since it was taken.
+                return
+            self._probe = None
+            if failed:
+                self._open(now)
+                return
+            self._good_probes += 1
+            if self._good_probes >= self._probe_successes:
+                self._state = BreakerState.CLOSED
+                self._calls.clear()
+            return
+        if self.state != BreakerState.CLOSED:
+            # A call that started before the breaker opened.
+            return
+        self._calls.append((now, failed))
+        while self._calls and self._calls[0][0] < now - self._window_s:
+            self._calls.popleft()
+        failures = sum(1 for _, call_failed in self._calls if call_failed)
+        if len(self._calls) >= self._min_calls and failures / len(self._calls) >= self._failure_rate_threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = BreakerState.OPEN
+        self._opened_at = now
+        self._probe = None
+        self._calls.clear()
+
+
+class CircuitBreakers:
+    """Creates and keeps one `CircuitBreaker` per key (an extension instance) with shared settings."""
+
+    def __init__(self, **breaker_options: object):
+        self._options = breaker_options
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, target: str) -> CircuitBreaker:
+        breaker = self._breakers.get(target)
+        if breaker is None:
+            breaker = self._breakers[target] = CircuitBreaker(**self._options)  # type: ignore[arg-type]
+        return breaker
+
+    def states(self) -> dict[str, BreakerState]:
+        return {target: breaker.state for target, breaker in self._breakers.items()}
+
+
+__all__ = [
+    "BreakerPermit",
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "DEFAULT_FAILURE_RATE_THRESHOLD",
+    "DEFAULT_MIN_CALLS",
+    "DEFAULT_OPEN_S",
+    "DEFAULT_SLOW_CALL_S",
+    "DEFAULT_WINDOW_S",
+]
@@ -0,0 +1,97 @@
+"""Requeue jobs from a `JobQueue`'s dead letters.
+
+Requeued jobs start over with a fresh retry budget and, when the job was
+submitted by a user, a fresh delegation token. `requeue_dead_letters` paces
+itself (`rate_per_s`) so replaying a large backlog does not flood the
+extensions that failed in the first place.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from fair_platform.backend.api.routers.auth import create_extension_job_token
+from fair_platform.backend.services.job_dispatcher import _dispatch_details
+from fair_platform.backend.services.job_queue import JobQueue, JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUEUE_RATE_PER_S = 10.0
+# Metadata the dispatcher keeps between attempts; dropped so retries start over.
+_DISPATCH_METADATA_KEYS = frozenset({"_dispatch_attempt", "_dispatch_errors", "_offline_since"})
+
+
+async def requeue_dead_letter(queue: JobQueue, job_id: str) -> bool:
+    """Move the dead letter for `job_id` back onto the queue.
+
+    Returns `False` if there is no such dead letter, including when another
+    caller requeued it first, or if the job's state is no longer `FAILED`.
+    """
+    entry = await queue.get_dead_letter(job_id)
+    if entry is None or not await queue.delete_dead_letter(job_id):
+        return False
+
+    metadata = {
+        key: value
+        for key, value in entry.job.metadata.items()
+        if key not in _DISPATCH_METADATA_KEYS
+    }
+    owner_user_id = entry.details.get("owner_user_id")
+    if owner_user_id and "_delegation_token" in metadata:
+        metadata["_delegation_token"] = create_extension_job_token(
+            user_id=str(owner_user_id),
+            job_id=entry.job.job_id,
+            extension_id=entry.job.target,
+        )
+
+    # Move the state first: a dispatcher refuses jobs whose state is terminal.
+    # A state that already expired is recreated from the dead letter.
+    requeued = await queue.transition_state(
+        job_id,
+        JobStatus.QUEUED,
+        details={**entry.details, **_dispatch_details(requeued_at=datetime.now(timezone.utc).isoformat())},
+        expected={JobStatus.FAILED, None},
+    )
+    if requeued is None:
+        await queue.add_dead_letter(entry)
+        return False
+    await queue.enqueue(replace(entry.job, metadata=metadata))
+    logger.info("Requeued dead-lettered job %s for %s", job_id, entry.job.target)
+    return True
+
+
+async def requeue_dead_letters(
+    queue: JobQueue,
+    job_ids: list[str] | None = None,
+    *,
+    target: str | None = None,
+    limit: int = 100,
+    rate_per_s: float = DEFAULT_REQUEUE_RATE_PER_S,
+) -> list[str]:
+    """Requeue `job_ids`, or the oldest `limit` dead letters (for `target`).
+
+    At most `rate_per_s` jobs are requeued per second (`0` disables pacing).
+    Returns the ids that were requeued.
+    """
+    if job_ids is None:
+        entries = await queue.list_dead_letters(limit=limit, target=target)
+        job_ids = [entry.job.job_id for entry in entries]
+
+    interval_s = 1.0 / rate_per_s if rate_per_s > 0 else 0.0
+    requeued: list[str] = []
+    for index, job_id in enumerate(job_ids):
+        if index and interval_s:
+            await asyncio.sleep(interval_s)
+        if await requeue_dead_letter(queue, job_id):
+            requeued.append(job_id)
+    return requeued
+
+
+__all__ = [
+    "DEFAULT_REQUEUE_RATE_PER_S",
+    "requeue_dead_letter",
+    "requeue_dead_letters",
+]
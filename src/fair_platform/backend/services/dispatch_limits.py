@@ -0,0 +1,120 @@
+"""Per-extension concurrency and rate limits enforced by `JobDispatcher`.
+
+Extensions advertise their capacity when they register
+(`ExtensionRegistration.max_concurrency`, `rate_limit_per_s`,
+`rate_limit_burst`). `ExtensionLimiter` keeps, per target, the number of
+jobs holding a concurrency slot and a token bucket for the delivery rate.
+Acquiring never waits: when a target is at its limit the dispatcher holds
+or defers the job and tries again later, so a burst queues up instead of
+collapsing the extension or burning through retries.
+
+Limits are per dispatcher process. With several dispatchers, divide the
+advertised numbers between them.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from fair_platform.backend.services.extension_registry import ExtensionRegistration
+
+# How long a job waits before retrying when its target has no free slot; slots
+# free up when jobs finish, which cannot be predicted like token refills.
+DEFAULT_CONCURRENCY_DEFER_S = 0.5
+
+
+class TokenBucket:
+    """Allows `rate_per_s` takes per second on average and up to `burst` at once."""
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_s = rate_per_s
+        self.capacity = float(max(1, burst if burst is not None else int(rate_per_s) or 1))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+
+    def try_take(self) -> float:
+        """Take a token; return `0.0`, or the seconds until one is available."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_s)
+        self._updated_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_per_s
+
+
+class ExtensionLimiter:
+    """Concurrency slots and token buckets per `extension_id`.
+
+    Limits are read from the registration on every acquire, so an extension
+    that reconnects with new limits takes effect right away.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency_defer_s: float = DEFAULT_CONCURRENCY_DEFER_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._concurrency_defer_s = concurrency_defer_s
+        self._clock = clock
+        self._in_flight: dict[str, int] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @property
+    def concurrency_defer_s(self) -> float:
+        return self._concurrency_defer_s
+
+    def in_flight(self, extension_id: str) -> int:
+        return self._in_flight.get(extension_id, 0)
+
+    def at_concurrency_limit(self, extension: ExtensionRegistration) -> bool:
+        """Whether every concurrency slot of `extension` is taken."""
+        limit = extension.max_concurrency
+        return limit is not None and self.in_flight(extension.extension_id) >= limit
+
+    def try_acquire(self, extension: ExtensionRegistration) -> float:
+        """Take a slot and a token for `extension`.
+
+        Returns `0.0` when both were taken (call `release` once the job no
+        longer needs its slot), otherwise the seconds to wait before trying
+        again; nothing is taken in that case.
+        """
+        extension_id = extension.extension_id
+        if self.at_concurrency_limit(extension):
+            return self._concurrency_defer_s
+        bucket = self._bucket(extension)
+        if bucket is not None:
+            wait_s = bucket.try_take()
+            if wait_s > 0:
+                return wait_s
+        self._in_flight[extension_id] = self.in_flight(extension_id) + 1
+        return 0.0
+
+    def release(self, extension_id: str) -> None:
+        remaining = self.in_flight(extension_id) - 1
+        if remaining > 0:
+            self._in_flight[extension_id] = remaining
+        else:
+            self._in_flight.pop(extension_id, None)
+
+    def _bucket(self, extension: ExtensionRegistration) -> TokenBucket | None:
+        rate = extension.rate_limit_per_s
+        if not rate:
+            self._buckets.pop(extension.extension_id, None)
+            return None
+        bucket = self._buckets.get(extension.extension_id)
+        burst = extension.rate_limit_burst
+        if bucket is None or bucket.rate_per_s != rate or (burst is not None and bucket.capacity != burst):
+            bucket = self._buckets[extension.extension_id] = TokenBucket(rate, burst, clock=self._clock)
+        return bucket
+
+
+__all__ = ["DEFAULT_CONCURRENCY_DEFER_S", "ExtensionLimiter", "TokenBucket"]
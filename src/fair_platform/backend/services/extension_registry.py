@@ -1,15 +1,69 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fair_platform.backend.services.sql_extension_registry import SqlExtensionRegistry
+
+logger = logging.getLogger(__name__)
+
+# Heartbeat intervals an instance may miss before it expires.
+DEFAULT_HEARTBEAT_MISSES = 3
+
+
+@dataclass
+class ExtensionInstance:
+    """One running replica of an extension.
+
+    Replicas connect separately; each is reached through its own webhook.
+    `weight` is its share of the extension's jobs relative to the other
+    replicas (see `instance_balancing`).
+
+    Instances that advertise `heartbeat_interval_s` report `in_flight` and
+    `queue_length` that often; `last_seen_at` (Unix time) is their last
+    connect or heartbeat. One that misses `DEFAULT_HEARTBEAT_MISSES`
+    heartbeats is expired and no longer gets jobs. Instances without an
+    interval never expire.
+    """
+
+    instance_id: str
+    webhook_url: str
+    weight: int = 1
+    heartbeat_interval_s: float | None = None
+    last_seen_at: float | None = None
+    in_flight: int | None = None
+    queue_length: int | None = None
+
+    def expired(self, now: float) -> bool:
+        if self.heartbeat_interval_s is None or self.last_seen_at is None:
+            return False
+        return now - self.last_seen_at > self.heartbeat_interval_s * DEFAULT_HEARTBEAT_MISSES
 
 
 @dataclass
 class ExtensionRegistration:
-    """Represents one registered extension instance.
+    """Represents one registered extension and its running instances.
 
     This is intentionally generic so future SDK clients can register additional
     metadata without breaking dispatcher behavior.
+
+    `max_concurrency` caps the extension's jobs that are delivered and not
+    yet finished; `rate_limit_per_s` (with bursts of `rate_limit_burst`)
+    caps how fast jobs are delivered. `None` means unlimited. The dispatcher
+    defers jobs over either limit.
+
+    `batch_max_jobs` opts in to batched delivery: up to that many jobs, or
+    whatever arrived within `batch_max_wait_ms`, are posted to the webhook
+    in one request (see `webhook_batches`).
+
+    `instances` lists every replica that connected; `webhook_url` is the one
+    that connected last. Without explicit instances the registration stands
+    for a single instance at `webhook_url`, identified by that URL.
     """
 
     extension_id: str
@@ -18,6 +72,81 @@ class ExtensionRegistration:
     capabilities: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
     enabled: bool = True
+    max_concurrency: int | None = None
+    rate_limit_per_s: float | None = None
+    rate_limit_burst: int | None = None
+    batch_max_jobs: int | None = None
+    batch_max_wait_ms: int | None = None
+    instances: list[ExtensionInstance] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if not self.instances:
+            self.instances = [ExtensionInstance(instance_id=self.webhook_url, webhook_url=self.webhook_url)]
+
+
+def merge_registration(
+    current: ExtensionRegistration | None,
+    incoming: ExtensionRegistration,
+    *,
+    seen_at: float | None = None,
+) -> ExtensionRegistration:
+    """Combine a new `connect` with what is already registered.
+
+    The incoming instances are added to the current ones (or replace those
+    with the same `instance_id`), so a second replica does not take the
+    first one's place. Extension-wide settings such as intents, metadata and
+    limits come from the latest connect. `seen_at` stamps the incoming
+    instances' `last_seen_at`.
+    """
+    incoming_instances = incoming.instances
+    if seen_at is not None:
+        incoming_instances = [replace(instance, last_seen_at=seen_at) for instance in incoming_instances]
+    instances = {instance.instance_id: instance for instance in (current.instances if current else [])}
+    instances.update((instance.instance_id, instance) for instance in incoming_instances)
+    return replace(incoming, instances=list(instances.values()))
+
+
+def expire_instances(registration: ExtensionRegistration, now: float) -> ExtensionRegistration:
+    """Drop the instances that missed their heartbeats.
+
+    An extension whose instances all expired keeps its registration with an
+    empty `instances` list: it is offline, not unknown, so the dispatcher
+    holds its jobs until an instance reconnects.
+    """
+    live = [instance for instance in registration.instances if not instance.expired(now)]
+    if len(live) == len(registration.instances):
+        return registration
+    for instance in registration.instances:
+        if instance.expired(now):
+            logger.info(
+                "Extension %s instance %s missed its heartbeats; expiring it",
+                registration.extension_id,
+                instance.instance_id,
+            )
+    if not live:
+        # `replace` would fill in a default instance for an empty list.
+        offline = replace(registration)
+        offline.instances = []
+        return offline
+    return replace(registration, instances=live)
+
+
+def record_heartbeat(
+    registration: ExtensionRegistration,
+    instance_id: str,
+    *,
+    in_flight: int,
+    queue_length: int,
+    seen_at: float,
+) -> tuple[ExtensionRegistration, ExtensionInstance | None]:
+    """Store an instance's reported load; the instance is `None` if it is not registered."""
+    for index, instance in enumerate(registration.instances):
+        if instance.instance_id == instance_id:
+            updated = replace(instance, in_flight=in_flight, queue_length=queue_length, last_seen_at=seen_at)
+            instances = list(registration.instances)
+            instances[index] = updated
+            return replace(registration, instances=instances), updated
+    return registration, None
 
 
 class LocalExtensionRegistry:
@@ -26,29 +155,108 @@ class LocalExtensionRegistry:
     This is the first minimal implementation used by the dispatcher.
     It can later be replaced with a DB-backed registry while keeping
     the same public async methods.
+
+    Instances that missed their heartbeats are dropped on read; an
+    extension without live instances stays registered (see
+    `expire_instances`) but is left out of `list`.
     """
 
-    def __init__(self):
+    def __init__(self, *, clock: Callable[[], float] = time.time):
         self._extensions: dict[str, ExtensionRegistration] = {}
+        self._clock = clock
 
     async def register(
         self,
         registration: ExtensionRegistration,
     ) -> ExtensionRegistration:
+        registration = merge_registration(
+            self._live(registration.extension_id),
+            registration,
+            seen_at=self._clock(),
+        )
         self._extensions[registration.extension_id] = registration
         return registration
 
+    async def heartbeat(
+        self,
+        extension_id: str,
+        instance_id: str,
+        *,
+        in_flight: int = 0,
+        queue_length: int = 0,
+    ) -> ExtensionInstance | None:
+        """Record a heartbeat; `None` when the instance is unknown or expired."""
+        extension = self._live(extension_id)
+        if extension is None or not extension.instances:
+            return None
+        extension, instance = record_heartbeat(
+            extension,
+            instance_id,
+            in_flight=in_flight,
+            queue_length=queue_length,
+            seen_at=self._clock(),
+        )
+        self._extensions[extension_id] = extension
+        return instance
+
     async def get(self, extension_id: str) -> ExtensionRegistration | None:
-        extension = self._extensions.get(extension_id)
+        extension = self._live(extension_id)
         if extension is None or not extension.enabled:
             return None
         return extension
 
     async def list(self) -> list[ExtensionRegistration]:
-        return [e for e in self._extensions.values() if e.enabled]
+        extensions = [self._live(extension_id) for extension_id in list(self._extensions)]
+        return [e for e in extensions if e is not None and e.enabled and e.instances]
+
+    def _live(self, extension_id: str) -> ExtensionRegistration | None:
+        extension = self._extensions.get(extension_id)
+        if extension is None:
+            return None
+        live = expire_instances(extension, self._clock())
+        if live is not extension:
+            self._extensions[extension_id] = live
+        return live
 
     async def unregister(self, extension_id: str) -> None:
         self._extensions.pop(extension_id, None)
 
 
-__all__ = ["ExtensionRegistration", "LocalExtensionRegistry"]
+def get_extension_registry_backend() -> str:
+    """Return `local` or `sql` from `FAIR_EXTENSION_REGISTRY_BACKEND`.
+
+    Unset, the registry follows the job queue: `local` with the `local`
+    queue, otherwise `sql` so standalone dispatchers see the extensions that
+    connected through any API process.
+    """
+    raw = os.getenv("FAIR_EXTENSION_REGISTRY_BACKEND", "").strip().lower()
+    if raw:
+        return raw
+    from fair_platform.backend.services.job_queue import get_job_queue_backend
+
+    return "local" if get_job_queue_backend() == "local" else "sql"
+
+
+def create_extension_registry() -> LocalExtensionRegistry | SqlExtensionRegistry:
+    """Factory that builds the configured registry backend."""
+    backend = get_extension_registry_backend()
+    if backend == "local":
+        return LocalExtensionRegistry()
+    if backend == "sql":
+        from fair_platform.backend.services.sql_extension_registry import SqlExtensionRegistry
+
+        return SqlExtensionRegistry()
+    raise ValueError(f"Unsupported FAIR_EXTENSION_REGISTRY_BACKEND={backend!r}. Expected 'local' or 'sql'.")
+
+
+__all__ = [
+    "DEFAULT_HEARTBEAT_MISSES",
+    "ExtensionInstance",
+    "ExtensionRegistration",
+    "LocalExtensionRegistry",
+    "create_extension_registry",
+    "expire_instances",
+    "get_extension_registry_backend",
+    "merge_registration",
+    "record_heartbeat",
+]
@@ -0,0 +1,146 @@
+"""Bounded, non-blocking fan-out queues for in-process event subscribers.
+
+Publishers hand every event to each subscriber with `SubscriberQueue.offer`,
+which never awaits. When a subscriber falls `maxsize` events behind, its
+`OverflowPolicy` decides what happens:
+
+- `drop-oldest`: discard the oldest pending event to make room.
+- `coalesce`: drop pending events that share the new event's coalesce key
+  (e.g. older progress updates for the same job); falls back to
+  `drop-oldest` when nothing can be coalesced.
+- `disconnect`: drop everything pending and mark the subscriber
+  disconnected. Its consumer should end the stream so the client reconnects
+  and catches up from persisted history.
+
+Both `LocalJobQueue` and `WorkflowRunEventBroker` share one `FanoutStats`
+per publisher so dropped events can be observed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class OverflowPolicy(StrEnum):
+    DROP_OLDEST = "drop-oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+@dataclass
+class FanoutStats:
+    """Counters for one publisher, across all of its subscribers."""
+
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    disconnected: int = 0
+
+
+class SubscriberQueue(Generic[T]):
+    """Bounded queue for one subscriber with a non-blocking `offer`."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        *,
+        coalesce_key: Callable[[T], Hashable | None] | None = None,
+        stats: FanoutStats | None = None,
+    ):
+        self._maxsize = max(1, maxsize)
+        self._policy = OverflowPolicy(policy)
+        self._coalesce_key = coalesce_key
+        self._stats = stats if stats is not None else FanoutStats()
+        self._items: deque[T] = deque()
+        self._not_empty = asyncio.Event()
+        self._disconnected = False
+
+    @property
+    def disconnected(self) -> bool:
+        return self._disconnected
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def offer(self, item: T) -> bool:
+        """Queue `item` without waiting; return `False` if it was not queued."""
+        if self._disconnected:
+            return False
+        if len(self._items) >= self._maxsize and not self._make_room(item):
+            return False
+        self._items.append(item)
+        self._stats.delivered += 1
+        self._not_empty.set()
+        return True
+
+    def get_nowait(self) -> T | None:
+        if not self._items:
+            return None
+        item = self._items.popleft()
+        if not self._items:
+            self._not_empty.clear()
+        return item
+
+    async def get(self, timeout: float | None = None) -> T | None:
+        """Return the next item, or `None` on timeout or once disconnected."""
+        if not self._items and not self._disconnected:
+            if timeout is not None and timeout <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout=timeout)
+            except TimeoutError:
+                return None
+        return self.get_nowait()
+
+    def _make_room(self, item: T) -> bool:
+        if self._policy == OverflowPolicy.DISCONNECT:
+            self._stats.dropped += len(self._items) + 1
+            self._stats.disconnected += 1
+            self._items.clear()
+            self._disconnected = True
+            # Wake the consumer so it notices the disconnect.
+            self._not_empty.set()
+            return False
+        if self._policy == OverflowPolicy.COALESCE and self._coalesce_key is not None:
+            key = self._coalesce_key(item)
+            if key is not None:
+                kept = deque(pending for pending in self._items if self._coalesce_key(pending) != key)
+                if len(kept) < len(self._items):
+                    self._stats.coalesced += len(self._items) - len(kept)
+                    self._items = kept
+                    return True
+        self._items.popleft()
+        self._stats.dropped += 1
+        return True
+
+
+def subscriber_queue_size_from_env() -> int:
+    """`FAIR_SUBSCRIBER_QUEUE_SIZE`: pending events kept per subscriber."""
+    return int(os.getenv("FAIR_SUBSCRIBER_QUEUE_SIZE", str(DEFAULT_SUBSCRIBER_QUEUE_SIZE)))
+
+
+def overflow_policy_from_env() -> OverflowPolicy:
+    """`FAIR_SUBSCRIBER_OVERFLOW_POLICY`: `drop-oldest` (default), `coalesce` or `disconnect`."""
+    raw = os.getenv("FAIR_SUBSCRIBER_OVERFLOW_POLICY", OverflowPolicy.DROP_OLDEST)
+    return OverflowPolicy(raw.strip().lower())
+
+
+__all__ = [
+    "DEFAULT_SUBSCRIBER_QUEUE_SIZE",
+    "OverflowPolicy",
+    "FanoutStats",
+    "SubscriberQueue",
+    "subscriber_queue_size_from_env",
+    "overflow_policy_from_env",
+]
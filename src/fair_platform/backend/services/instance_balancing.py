@@ -0,0 +1,90 @@
+"""Spreads an extension's jobs over its connected instances.
+
+An extension may run several replicas, each registered as an
+`ExtensionInstance` with its own webhook and `weight`. `InstanceBalancer`
+picks the instance for each delivery and counts the jobs every instance is
+running, from delivery until the job is terminal:
+
+- `least-in-flight` (default): the instance with the least load per unit of
+  weight, so a replica stuck on slow jobs gets fewer new ones. Ties go
+  round-robin. Load is the larger of the jobs this dispatcher has running
+  there and what the instance last reported in its heartbeat (`in_flight`
+  plus `queue_length`), which includes work from other dispatchers.
+- `weighted-round-robin`: instances take turns in proportion to their
+  weight, interleaved ("smooth" weighted round-robin), whatever they are
+  running.
+
+Counts are per dispatcher process, like the limits in `dispatch_limits`.
+Instances that missed their heartbeats never get here; the registry
+expires them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from enum import StrEnum
+
+from fair_platform.backend.services.extension_registry import ExtensionInstance
+
+
+class BalancingStrategy(StrEnum):
+    LEAST_IN_FLIGHT = "least-in-flight"
+    WEIGHTED_ROUND_ROBIN = "weighted-round-robin"
+
+
+class InstanceBalancer:
+    """Chooses instances and tracks their in-flight jobs; see the module docstring."""
+
+    def __init__(self, strategy: BalancingStrategy | str = BalancingStrategy.LEAST_IN_FLIGHT):
+        self.strategy = BalancingStrategy(strategy)
+        self._in_flight: dict[tuple[str, str], int] = {}
+        self._current_weights: dict[tuple[str, str], int] = {}
+        self._turns: dict[str, int] = {}
+
+    def in_flight(self, extension_id: str, instance_id: str) -> int:
+        return self._in_flight.get((extension_id, instance_id), 0)
+
+    def choose(self, extension_id: str, instances: Sequence[ExtensionInstance]) -> ExtensionInstance:
+        """Pick one of `instances` (not empty) for the next job of `extension_id`."""
+        if len(instances) == 1:
+            return instances[0]
+        if self.strategy == BalancingStrategy.WEIGHTED_ROUND_ROBIN:
+            return self._next_weighted(extension_id, instances)
+        turn = self._turns.get(extension_id, 0)
+        self._turns[extension_id] = turn + 1
+        # Rotating the start makes `min` break ties round-robin.
+        start = turn % len(instances)
+        rotated = [*instances[start:], *instances[:start]]
+        return min(rotated, key=lambda instance: self.load(extension_id, instance) / max(1, instance.weight))
+
+    def load(self, extension_id: str, instance: ExtensionInstance) -> int:
+        reported = (instance.in_flight or 0) + (instance.queue_length or 0)
+        return max(self.in_flight(extension_id, instance.instance_id), reported)
+
+    def acquire(self, extension_id: str, instance_id: str) -> None:
+        key = (extension_id, instance_id)
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def release(self, extension_id: str, instance_id: str) -> None:
+        key = (extension_id, instance_id)
+        remaining = self._in_flight.get(key, 0) - 1
+        if remaining > 0:
+            self._in_flight[key] = remaining
+        else:
+            self._in_flight.pop(key, None)
+
+    def _next_weighted(self, extension_id: str, instances: Sequence[ExtensionInstance]) -> ExtensionInstance:
+        # Every instance gains its weight per pick; the one with the highest
+        # running total is chosen and pays back the sum of all weights.
+        total = 0
+        for instance in instances:
+            weight = max(1, instance.weight)
+            total += weight
+            key = (extension_id, instance.instance_id)
+            self._current_weights[key] = self._current_weights.get(key, 0) + weight
+        best = max(instances, key=lambda instance: self._current_weights[(extension_id, instance.instance_id)])
+        self._current_weights[(extension_id, best.instance_id)] -= total
+        return best
+
+
+__all__ = ["BalancingStrategy", "InstanceBalancer"]
@@ -0,0 +1,220 @@
+"""Wire codecs for job queue messages, states and updates stored in Redis.
+
+`FrameCodec` turns the dicts built from `JobMessage`, `JobState` and
+`JobUpdate` into bytes and back. The body is produced by a `JobCodec`
+(`json`, `orjson` or `msgpack`) and bodies of at least
+`compression_threshold` bytes can be compressed with zstd.
+
+Frames are self-describing so processes with different codec settings can
+share a queue during a rollout:
+
+- Plain JSON frames are untagged JSON documents, exactly what older releases
+  wrote. The `json` and `orjson` codecs write them when nothing is compressed.
+- Every other frame starts with a 4-byte header: `FRAME_MAGIC`, the frame
+  version, the body format (`WireFormat`) and flags (`FrameFlag`).
+
+Any codec decodes any frame whose format library is installed, so switch
+codecs only after every process runs a release that understands frames.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from abc import ABC, abstractmethod
+from enum import IntEnum, IntFlag
+from typing import Any
+
+FRAME_MAGIC = 0xFA
+FRAME_VERSION = 1
+DEFAULT_COMPRESSION_LEVEL = 3
+_HEADER_SIZE = 4
+
+
+class WireFormat(IntEnum):
+    JSON = 1
+    MSGPACK = 2
+
+
+class FrameFlag(IntFlag):
+    NONE = 0
+    ZSTD = 1
+
+
+def _import_optional(module_name: str, purpose: str) -> Any:
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as exc:
+        raise RuntimeError(f"{module_name} is required for {purpose}") from exc
+
+
+class JobCodec(ABC):
+    """Serializes one JSON-compatible dict to a frame body and back."""
+
+    name: str
+    wire_format: WireFormat
+
+    @abstractmethod
+    def dumps(self, obj: dict[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: bytes) -> dict[str, Any]:
+        raise NotImplementedError
+
+
+class JsonCodec(JobCodec):
+    """Standard library JSON; the format every release can read."""
+
+    name = "json"
+    wire_format = WireFormat.JSON
+
+    def dumps(self, obj: dict[str, Any]) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: bytes) -> dict[str, Any]:
+        return json.loads(data)
+
+
+class OrjsonCodec(JobCodec):
+    """JSON through `orjson`; its output is readable by `JsonCodec`."""
+
+    name = "orjson"
+    wire_format = WireFormat.JSON
+
+    def __init__(self) -> None:
+        self._orjson = _import_optional("orjson", "the orjson job codec")
+
+    def dumps(self, obj: dict[str, Any]) -> bytes:
+        # Non-string keys are stringified, as `json.dumps` does.
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes) -> dict[str, Any]:
+        return self._orjson.loads(data)
+
+
+class MsgpackCodec(JobCodec):
+    """Binary MessagePack bodies through `msgpack`."""
+
+    name = "msgpack"
+    wire_format = WireFormat.MSGPACK
+
+    def __init__(self) -> None:
+        self._msgpack = _import_optional("msgpack", "the msgpack job codec")
+
+    def dumps(self, obj: dict[str, Any]) -> bytes:
+        return self._msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data: bytes) -> dict[str, Any]:
+        return self._msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+_CODECS: dict[str, type[JobCodec]] = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def get_job_codec(name: str) -> JobCodec:
+    """Build the codec called `name` (`json`, `orjson` or `msgpack`)."""
+    try:
+        codec_cls = _CODECS[name.strip().lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported job codec {name!r}. Expected one of: {', '.join(_CODECS)}."
+        ) from None
+    return codec_cls()
+
+
+class FrameCodec:
+    """Encodes dicts as version-tagged frames and decodes any known frame.
+
+    `compression_threshold` is the body size in bytes from which bodies are
+    zstd-compressed (`None` disables compression, which needs the
+    `zstandard` package).
+    """
+
+    def __init__(
+        self,
+        codec: JobCodec | None = None,
+        *,
+        compression_threshold: int | None = None,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ):
+        self.codec = codec or JsonCodec()
+        self.compression_threshold = compression_threshold
+        self._decoders: dict[WireFormat, JobCodec] = {self.codec.wire_format: self.codec}
+        self._compressor: Any = None
+        self._decompressor: Any = None
+        if compression_threshold is not None:
+            zstd = _import_optional("zstandard", "job frame compression")
+            self._compressor = zstd.ZstdCompressor(level=compression_level)
+
+    def encode(self, obj: dict[str, Any]) -> bytes:
+        body = self.codec.dumps(obj)
+        flags = FrameFlag.NONE
+        if self._compressor is not None and len(body) >= self.compression_threshold:
+            body = self._compressor.compress(body)
+            flags |= FrameFlag.ZSTD
+        if flags == FrameFlag.NONE and self.codec.wire_format == WireFormat.JSON:
+            # Untagged, so releases without frame support can still read it.
+            return body
+        return bytes((FRAME_MAGIC, FRAME_VERSION, self.codec.wire_format, flags)) + body
+
+    def decode(self, frame: bytes | str) -> dict[str, Any]:
+        if isinstance(frame, str):
+            frame = frame.encode("utf-8")
+        if not frame or frame[0] != FRAME_MAGIC:
+            return self._decoder(WireFormat.JSON).loads(frame)
+        if len(frame) < _HEADER_SIZE:
+            raise ValueError("Truncated job frame header")
+        version, wire_format, flags = frame[1], frame[2], FrameFlag(frame[3])
+        if version != FRAME_VERSION:
+            raise ValueError(f"Unsupported job frame version {version}")
+        body = frame[_HEADER_SIZE:]
+        if flags & FrameFlag.ZSTD:
+            body = self._decompress(body)
+        return self._decoder(WireFormat(wire_format)).loads(body)
+
+    def _decoder(self, wire_format: WireFormat) -> JobCodec:
+        decoder = self._decoders.get(wire_format)
+        if decoder is None:
+            decoder = JsonCodec() if wire_format == WireFormat.JSON else MsgpackCodec()
+            self._decoders[wire_format] = decoder
+        return decoder
+
+    def _decompress(self, body: bytes) -> bytes:
+        if self._decompressor is None:
+            zstd = _import_optional("zstandard", "reading compressed job frames")
+            self._decompressor = zstd.ZstdDecompressor()
+        # Frames written by `ZstdCompressor.compress` carry their content size.
+        return self._decompressor.decompress(body)
+
+
+def frame_codec_from_env() -> FrameCodec:
+    """Build the `FrameCodec` configured by the environment.
+
+    - `FAIR_JOB_QUEUE_CODEC`: `json` (default), `orjson` or `msgpack`
+    - `FAIR_JOB_QUEUE_COMPRESSION_THRESHOLD`: body size in bytes from which
+      frames are zstd-compressed (unset or `0` disables compression)
+    """
+    codec = get_job_codec(os.getenv("FAIR_JOB_QUEUE_CODEC", JsonCodec.name))
+    threshold = int(os.getenv("FAIR_JOB_QUEUE_COMPRESSION_THRESHOLD", "0") or 0)
+    return FrameCodec(codec, compression_threshold=threshold or None)
+
+
+__all__ = [
+    "FRAME_MAGIC",
+    "FRAME_VERSION",
+    "WireFormat",
+    "FrameFlag",
+    "JobCodec",
+    "JsonCodec",
+    "OrjsonCodec",
+    "MsgpackCodec",
+    "get_job_codec",
+    "FrameCodec",
+    "frame_codec_from_env",
+]
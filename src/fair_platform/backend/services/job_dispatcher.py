@@ -1,12 +1,82 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import logging
+import os
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import httpx
 
-from fair_platform.backend.services.extension_registry import LocalExtensionRegistry
-from fair_platform.backend.services.job_queue import JobMessage, JobQueue, JobStatus
+from fair_platform.backend.services.circuit_breaker import (
+    DEFAULT_FAILURE_RATE_THRESHOLD,
+    DEFAULT_OPEN_S,
+    DEFAULT_SLOW_CALL_S,
+    BreakerPermit,
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakers,
+)
+from fair_platform.backend.services.dispatch_limits import DEFAULT_CONCURRENCY_DEFER_S, ExtensionLimiter
+from fair_platform.backend.services.extension_registry import (
+    ExtensionInstance,
+    ExtensionRegistration,
+    LocalExtensionRegistry,
+)
+from fair_platform.backend.services.instance_balancing import BalancingStrategy, InstanceBalancer
+from fair_platform.backend.services.job_metrics import DISPATCHED_AT_KEY, JobMetrics
+from fair_platform.backend.services.job_queue import DeadLetter, JobMessage, JobQueue, JobStatus
+from fair_platform.backend.services.webhook_batches import BatchJobRejected, WebhookBatcher, raise_for_rejection
+from fair_platform.extension_sdk.tracing import (
+    TraceContext,
+    Tracer,
+    extract_trace_context,
+    get_tracer,
+    inject_trace_context,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISPATCH_CONCURRENCY = 16
+DEFAULT_DRAIN_TIMEOUT_S = 30.0
+DEFAULT_SLOT_TIMEOUT_S = 60 * 60.0
+# How long jobs wait before checking again whether an offline extension is back.
+DEFAULT_OFFLINE_DEFER_S = 5.0
+# How long a job waits for an offline extension before it is dead-lettered.
+DEFAULT_MAX_OFFLINE_S = 10 * 60.0
+# Jobs held per extension while it is at its concurrency limit, and for how
+# long; keep the latter below the queue's visibility timeout.
+DEFAULT_MAX_PARKED_JOBS = 64
+DEFAULT_MAX_PARK_S = 30.0
+
+# When the job first found its extension without a live instance.
+_OFFLINE_SINCE_KEY = "_offline_since"
+
+# Detail keys written by the dispatcher. They are replaced on every transition;
+# everything else (target, owners, workflow ids) is kept from the submitter.
+_DISPATCH_DETAIL_KEYS = frozenset(
+    {
+        "attempt",
+        "retrying",
+        "retry_at",
+        "dispatch_status",
+        "instance_id",
+        "error",
+        "code",
+        "dead_lettered",
+        DISPATCHED_AT_KEY,
+    }
+)
+
+
+def _dispatch_details(**values: object) -> dict:
+    """A details patch that clears earlier dispatcher keys and sets `values`."""
+    return {**{key: None for key in _DISPATCH_DETAIL_KEYS}, **values}
 
 
 @dataclass
@@ -15,10 +85,95 @@ class DispatchResult:
     ok: bool
     status_code: int | None = None
     error: str | None = None
+    # Put back because the target was at its limit or its circuit breaker
+    # was open; it was not attempted.
+    deferred: bool = False
+    # Held by the dispatcher until the target frees a concurrency slot; not
+    # acknowledged yet.
+    parked: bool = False
+    # Delivered and moved to `RUNNING` (not cancelled or finished meanwhile).
+    running: bool = False
+
+
+def retry_backoff_s(
+    attempt: int,
+    base_delay_s: float,
+    max_delay_s: float,
+    rng: random.Random | None = None,
+) -> float:
+    """Exponential backoff with "equal jitter" for the given retry attempt (1-based).
+
+    The delay doubles per attempt up to `max_delay_s`; half of it is fixed and
+    the other half random, so retries spread out without collapsing to zero.
+    """
+    ceiling = min(max_delay_s, base_delay_s * (2 ** max(0, attempt - 1)))
+    return ceiling / 2 + (rng or random).uniform(0, ceiling / 2)
 
 
 class JobDispatcher:
-    """Pull jobs from the queue and forward them to registered extensions."""
+    """Pull jobs from the queue and forward them to registered extensions.
+
+    Failed deliveries are re-enqueued with `not_before` set by
+    `retry_backoff_s`, so an extension that is down is not hammered.
+
+    Every state change is a `JobQueue.transition_state`, so a job cancelled
+    or finished by someone else is never moved back: jobs cancelled while
+    queued are dropped instead of dispatched, and `send_cancel` tells an
+    extension to stop a job it is already running.
+
+    Jobs that run out of retries, or whose extension is not registered, are
+    stored with `JobQueue.add_dead_letter` together with every failed attempt
+    (carried between retries in `job.metadata["_dispatch_errors"]`). Jobs
+    for a registered extension whose instances all missed their heartbeats
+    are deferred by `offline_defer_s` until one reconnects, and dead-lettered
+    as `extension_offline` once they waited `max_offline_s` (counted from
+    `job.metadata["_offline_since"]`).
+
+    `run` keeps up to `concurrency` deliveries in flight: it only dequeues
+    as many jobs as there are free slots and hands each to its own task, so
+    a slow webhook holds one slot instead of the whole dispatcher. `stop`
+    stops dequeueing and waits up to `drain_timeout_s` for in-flight
+    deliveries; those still running after that are cancelled (at-least-once
+    backends redeliver them, since they were never acknowledged).
+
+    Extensions that advertise `max_concurrency` or `rate_limit_per_s` get no
+    more than that (see `dispatch_limits`). Jobs over the rate limit are
+    deferred: re-enqueued once a token is due, without spending a retry.
+    Jobs over the concurrency limit are parked in arrival order and
+    dispatched again as soon as a slot is released; more than
+    `max_parked_jobs` per extension, or one parked for `max_park_s`, go back
+    to the queue instead. A concurrency slot is held from delivery until the
+    job is terminal, or at most `slot_timeout_s`.
+
+    Extensions with several connected instances get each job delivered to
+    one of them, chosen by `balancer` (see `instance_balancing`). An
+    instance counts a job as in flight until it is terminal; the instance
+    that took it is kept in the job's `instance_id` detail.
+
+    Each extension instance has a circuit breaker (see `circuit_breaker`)
+    fed with the outcome and latency of every webhook call. Jobs go to the
+    instances whose breaker is closed; once all are open the target's jobs
+    are deferred until a breaker lets a probe through, so a webhook that is
+    down costs one timeout per probe instead of one per job and retry, and
+    other extensions keep their dispatch slots. Only transport errors, 5xx
+    and 429 responses count as failures; other 4xx responses mean the
+    extension is up and rejected that job.
+
+    Extensions that register `batch_max_jobs` receive their jobs in batched
+    webhook calls (see `webhook_batches`); retries, limits and the breaker
+    still apply per job, and a job the extension rejects in its batch
+    response is retried or failed on its own.
+
+    Dispatch outcomes and the wait between enqueue and the first attempt are
+    recorded in `metrics` (the queue's `JobMetrics` by default). Delivered
+    jobs get `dispatched_at` in their details so the time until they finish
+    can be measured wherever the terminal state is set.
+
+    With a `traceparent` in the job's metadata, the queue wait and every
+    delivery attempt become spans of that trace (see
+    `extension_sdk.tracing`); the extension receives the delivery span as
+    its parent in the webhook body's `metadata`.
+    """
 
     def __init__(
         self,
@@ -29,89 +184,504 @@ class JobDispatcher:
         request_timeout_s: float = 20.0,
         dequeue_timeout_s: float = 1.0,
         max_retries: int = 2,
+        batch_size: int = 16,
+        retry_base_delay_s: float = 1.0,
+        retry_max_delay_s: float = 60.0,
+        metrics: JobMetrics | None = None,
+        concurrency: int = DEFAULT_DISPATCH_CONCURRENCY,
+        drain_timeout_s: float = DEFAULT_DRAIN_TIMEOUT_S,
+        limiter: ExtensionLimiter | None = None,
+        slot_timeout_s: float = DEFAULT_SLOT_TIMEOUT_S,
+        offline_defer_s: float = DEFAULT_OFFLINE_DEFER_S,
+        max_offline_s: float = DEFAULT_MAX_OFFLINE_S,
+        max_parked_jobs: int = DEFAULT_MAX_PARKED_JOBS,
+        max_park_s: float = DEFAULT_MAX_PARK_S,
+        circuit_breakers: CircuitBreakers | None = None,
+        balancer: InstanceBalancer | None = None,
+        tracer: Tracer | None = None,
     ):
         self._queue = queue
+        self._metrics = metrics or queue.metrics
         self._registry = registry
         self._request_timeout_s = request_timeout_s
         self._dequeue_timeout_s = dequeue_timeout_s
         self._max_retries = max_retries
+        self._batch_size = max(1, batch_size)
+        self._retry_base_delay_s = retry_base_delay_s
+        self._retry_max_delay_s = retry_max_delay_s
         self._owns_client = http_client is None
         self._http = http_client or httpx.AsyncClient(timeout=request_timeout_s)
+        self._batcher = WebhookBatcher(self._http)
+        self._concurrency = max(1, concurrency)
+        self._drain_timeout_s = drain_timeout_s
+        self._in_flight: set[asyncio.Task[DispatchResult]] = set()
+        self._limits = limiter or ExtensionLimiter(concurrency_defer_s=DEFAULT_CONCURRENCY_DEFER_S)
+        self._slot_timeout_s = slot_timeout_s
+        self._offline_defer_s = offline_defer_s
+        self._max_offline_s = max_offline_s
+        self._max_parked_jobs = max(0, max_parked_jobs)
+        self._max_park_s = max_park_s
+        self._parked: dict[str, deque[_ParkedJob]] = {}
+        self._stopping = False
+        self._slot_holders: set[asyncio.Task[None]] = set()
+        self._breakers = circuit_breakers or CircuitBreakers()
+        self._balancer = balancer or InstanceBalancer()
+        self._tracer = tracer or get_tracer()
+        self._slot_freed = asyncio.Event()
         self._task: asyncio.Task[None] | None = None
         self._running = False
 
+    @property
+    def in_flight(self) -> int:
+        """Deliveries currently running in `run`'s worker tasks."""
+        return len(self._in_flight)
+
     async def start(self) -> None:
         if self._running:
             return
         self._running = True
+        self._stopping = False
         self._task = asyncio.create_task(self.run())
 
     async def stop(self) -> None:
         self._running = False
+        self._stopping = True
+        self._slot_freed.set()
         if self._task is not None:
-            self._task.cancel()
+            # The loop notices `_running` after its current dequeue times out;
+            # cancelling it instead could drop a job it just dequeued.
             try:
-                await self._task
-            except asyncio.CancelledError:
+                await asyncio.wait_for(self._task, timeout=self._dequeue_timeout_s + 5.0)
+            except TimeoutError:
                 pass
+            except Exception:
+                logger.exception("Job dispatcher loop failed")
             self._task = None
+        await self._drain()
+        for holder in list(self._slot_holders):
+            holder.cancel()
+        await asyncio.gather(*self._slot_holders, return_exceptions=True)
+        await self._requeue_parked()
         if self._owns_client:
             await self._http.aclose()
 
     async def run(self) -> None:
         while self._running:
-            await self.run_once(timeout=self._dequeue_timeout_s)
+            free_slots = await self._wait_for_slots()
+            if not free_slots:
+                break
+            jobs = await self._queue.dequeue_batch(
+                min(self._batch_size, free_slots),
+                timeout=self._dequeue_timeout_s,
+            )
+            for job in jobs:
+                self._spawn(job)
+
+    async def _wait_for_slots(self) -> int:
+        while self._running and len(self._in_flight) >= self._concurrency:
+            self._slot_freed.clear()
+            await self._slot_freed.wait()
+        return self._concurrency - len(self._in_flight) if self._running else 0
+
+    def _spawn(self, job: JobMessage, *, resumed: bool = False) -> None:
+        self._track(self._handle_job(job, resumed=resumed))
+
+    def _track(self, delivery: Awaitable[DispatchResult]) -> None:
+        task = asyncio.ensure_future(delivery)
+        self._in_flight.add(task)
+        task.add_done_callback(self._delivery_done)
+
+    def _delivery_done(self, task: asyncio.Task[DispatchResult]) -> None:
+        self._in_flight.discard(task)
+        self._slot_freed.set()
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Dispatching a job failed", exc_info=task.exception())
+
+    async def _drain(self) -> None:
+        if not self._in_flight:
+            return
+        pending = set(self._in_flight)
+        _, still_running = await asyncio.wait(pending, timeout=self._drain_timeout_s)
+        if still_running:
+            logger.warning("Cancelling %d job deliveries still running after the drain timeout", len(still_running))
+            for task in still_running:
+                task.cancel()
+            await asyncio.gather(*still_running, return_exceptions=True)
 
     async def run_once(self, timeout: float | None = None) -> DispatchResult | None:
         job = await self._queue.dequeue(timeout=timeout)
         if job is None:
             return None
-        return await self._dispatch_job(job)
+        return await self._handle_job(job)
 
-    async def _dispatch_job(self, job: JobMessage) -> DispatchResult:
+    async def run_batch(self, timeout: float | None = None) -> list[DispatchResult]:
+        """Dequeue up to `batch_size` jobs in one call and dispatch each of them."""
+        jobs = await self._queue.dequeue_batch(self._batch_size, timeout=timeout)
+        return list(await asyncio.gather(*(self._handle_job(job) for job in jobs)))
+
+    async def send_cancel(self, job_id: str, target: str) -> bool:
+        """Ask the extension running `job_id` to stop it; return whether it accepted.
+
+        The signal is posted to the webhook of every instance as
+        `{"type": "cancel", "job_id": ...}`, since another dispatcher may
+        have delivered the job; instances not running it ignore it.
+        """
+        extension = await self._registry.get(target)
+        if extension is None:
+            return False
+        sent = await asyncio.gather(
+            *(self._post_cancel(instance, job_id, target) for instance in extension.instances)
+        )
+        return any(sent)
+
+    async def _post_cancel(self, instance: ExtensionInstance, job_id: str, target: str) -> bool:
+        try:
+            response = await self._http.post(
+                instance.webhook_url,
+                json={"type": "cancel", "job_id": job_id, "target": target},
+            )
+            response.raise_for_status()
+        except Exception:
+            logger.warning(
+                "Failed to deliver cancel signal for job %s to %s (%s)",
+                job_id,
+                target,
+                instance.instance_id,
+                exc_info=True,
+            )
+            return False
+        return True
+
+    async def _handle_job(self, job: JobMessage, *, resumed: bool = False) -> DispatchResult:
+        result = await self._dispatch_job(job, resumed=resumed)
+        if result.parked:
+            # Acknowledged once it is dispatched or put back after parking.
+            return result
+        # Only acknowledge once the job was delivered, re-enqueued or failed so
+        # at-least-once backends redeliver it if this worker dies mid-dispatch.
+        await self._queue.ack(job)
+        return result
+
+    async def _dispatch_job(self, job: JobMessage, *, resumed: bool = False) -> DispatchResult:
         try:
             attempts = int(job.metadata.get("_dispatch_attempt", 0))
         except (ValueError, TypeError):
             attempts = 0
-        await self._queue.set_state(
+        extension = await self._registry.get(job.target)
+        if extension is None:
+            return await self._deliver_job(job, attempts, None)
+        if not extension.instances:
+            return await self._hold_while_offline(job, attempts)
+        instance, breaker, permit, wait_s = self._choose_instance(extension)
+        if instance is None or breaker is None or permit is None:
+            return await self._defer_job(job, wait_s, circuit_open=True)
+        if self._limits.at_concurrency_limit(extension) or (
+            not resumed and extension.extension_id in self._parked
+        ):
+            breaker.abandon(permit)
+            return await self._wait_for_slot(job, extension, resumed=resumed)
+        wait_s = self._limits.try_acquire(extension)
+        if wait_s > 0:
+            breaker.abandon(permit)
+            return await self._defer_job(job, wait_s)
+        self._balancer.acquire(extension.extension_id, instance.instance_id)
+        holds_slot = False
+        try:
+            result = await self._deliver_job(job, attempts, extension, instance, breaker, permit)
+            if result.running and (extension.max_concurrency is not None or len(extension.instances) > 1):
+                # Extensions run jobs after accepting the webhook, so the slot
+                # is only free again once the job finished.
+                self._hold_slot(job.job_id, extension.extension_id, instance.instance_id)
+                holds_slot = True
+            return result
+        finally:
+            if not permit.settled:
+                # No webhook call was made (cancelled job, failed claim);
+                # give a half-open probe back.
+                breaker.abandon(permit)
+            if not holds_slot:
+                self._release(extension.extension_id, instance.instance_id)
+
+    def _choose_instance(
+        self,
+        extension: ExtensionRegistration,
+    ) -> tuple[ExtensionInstance | None, CircuitBreaker | None, BreakerPermit | None, float]:
+        """Pick an instance whose breaker lets a call through.
+
+        Returns the instance, its breaker and the breaker's permit, or `None`s
+        and the seconds until the first breaker lets a probe through.
+        """
+        extension_id = extension.extension_id
+        breakers = {
+            instance.instance_id: self._breakers.get(_breaker_key(extension_id, instance.instance_id))
+            for instance in extension.instances
+        }
+        candidates: list[ExtensionInstance] = []
+        waits: list[float] = []
+        for instance in extension.instances:
+            breaker = breakers[instance.instance_id]
+            if breaker.state == BreakerState.OPEN:
+                waits.append(breaker.retry_after_s())
+                self._metrics.set_circuit_state(extension_id, instance.instance_id, breaker.state)
+                continue
+            candidates.append(instance)
+        while candidates:
+            instance = self._balancer.choose(extension_id, candidates)
+            breaker = breakers[instance.instance_id]
+            permit, wait_s = breaker.try_acquire()
+            self._metrics.set_circuit_state(extension_id, instance.instance_id, breaker.state)
+            if permit is not None:
+                return instance, breaker, permit, 0.0
+            # Half-open with its probe already in flight.
+            waits.append(wait_s)
+            candidates.remove(instance)
+        return None, None, None, min(waits)
+
+    def _release(self, extension_id: str, instance_id: str) -> None:
+        self._limits.release(extension_id)
+        self._balancer.release(extension_id, instance_id)
+        self._resume_parked(extension_id)
+
+    async def _wait_for_slot(
+        self,
+        job: JobMessage,
+        extension: ExtensionRegistration,
+        *,
+        resumed: bool,
+    ) -> DispatchResult:
+        """Park a job behind those already waiting for a slot of its extension.
+
+        A resumed job that lost its slot to another one goes back to the
+        front. When the extension has too many jobs parked, the job is
+        deferred through the queue instead.
+        """
+        extension_id = extension.extension_id
+        if not self._limits.at_concurrency_limit(extension):
+            # A slot is free but other jobs were waiting first; wake the oldest.
+            self._resume_parked(extension_id)
+        parked = self._parked.setdefault(extension_id, deque())
+        if len(parked) >= self._max_parked_jobs and not resumed:
+            if not parked:
+                del self._parked[extension_id]
+            return await self._defer_job(job, self._limits.concurrency_defer_s)
+        entry = _ParkedJob(job)
+        entry.timer = asyncio.get_running_loop().call_later(
+            self._max_park_s, self._park_expired, extension_id, entry
+        )
+        if resumed:
+            parked.appendleft(entry)
+        else:
+            parked.append(entry)
+        self._metrics.record_dispatch(job.target, "deferred")
+        return DispatchResult(
+            job_id=job.job_id,
+            ok=False,
+            error=f"Extension {job.target!r} is at its concurrency limit",
+            deferred=True,
+            parked=True,
+        )
+
+    def _resume_parked(self, extension_id: str) -> None:
+        """Dispatch the longest parked job of `extension_id` again."""
+        parked = self._parked.get(extension_id)
+        if not parked or self._stopping:
+            return
+        entry = parked.popleft()
+        if not parked:
+            del self._parked[extension_id]
+        if entry.timer is not None:
+            entry.timer.cancel()
+        self._spawn(entry.job, resumed=True)
+
+    def _park_expired(self, extension_id: str, entry: _ParkedJob) -> None:
+        parked = self._parked.get(extension_id)
+        if parked is None or entry not in parked:
+            return
+        parked.remove(entry)
+        if not parked:
+            del self._parked[extension_id]
+        self._track(self._put_back(entry.job))
+
+    async def _put_back(self, job: JobMessage) -> DispatchResult:
+        """Return a parked job to the queue and acknowledge the parked copy."""
+        await self._queue.enqueue(job)
+        await self._queue.ack(job)
+        return DispatchResult(
+            job_id=job.job_id,
+            ok=False,
+            error=f"Extension {job.target!r} is at its concurrency limit",
+            deferred=True,
+        )
+
+    async def _requeue_parked(self) -> None:
+        parked = [entry for entries in self._parked.values() for entry in entries]
+        self._parked.clear()
+        for entry in parked:
+            if entry.timer is not None:
+                entry.timer.cancel()
+            await self._put_back(entry.job)
+
+    async def _hold_while_offline(self, job: JobMessage, attempts: int) -> DispatchResult:
+        """Defer a job whose extension has no live instance, for at most `max_offline_s`."""
+        now = datetime.now(timezone.utc)
+        since = _parse_timestamp(job.metadata.get(_OFFLINE_SINCE_KEY))
+        if since is None:
+            job = replace(job, metadata={**job.metadata, _OFFLINE_SINCE_KEY: now.isoformat()})
+        elif (now - since).total_seconds() >= self._max_offline_s:
+            state = await self._queue.get_state(job.job_id)
+            submitted = (
+                {key: value for key, value in state.details.items() if key not in _DISPATCH_DETAIL_KEYS}
+                if state is not None
+                else {}
+            )
+            return await self._fail_job(
+                job,
+                error=f"Extension {job.target!r} has had no live instance since {since.isoformat()}",
+                code="extension_offline",
+                details=submitted,
+                attempt=attempts + 1,
+            )
+        return await self._defer_job(job, self._offline_defer_s, offline=True)
+
+    async def _defer_job(
+        self,
+        job: JobMessage,
+        wait_s: float,
+        *,
+        circuit_open: bool = False,
+        offline: bool = False,
+    ) -> DispatchResult:
+        """Put a job whose target cannot take it now back without spending an attempt."""
+        await self._queue.enqueue(job, not_before=datetime.now(timezone.utc) + timedelta(seconds=wait_s))
+        if offline:
+            self._metrics.record_dispatch(job.target, "offline")
+            error = f"Extension {job.target!r} has no live instance"
+        elif circuit_open:
+            self._metrics.record_dispatch(job.target, "circuit_open")
+            error = f"Circuit breaker for extension {job.target!r} is open"
+        else:
+            self._metrics.record_dispatch(job.target, "deferred")
+            error = f"Extension {job.target!r} is at its concurrency or rate limit"
+        return DispatchResult(job_id=job.job_id, ok=False, error=error, deferred=True)
+
+    def _hold_slot(self, job_id: str, extension_id: str, instance_id: str) -> None:
+        task = asyncio.create_task(self._release_when_finished(job_id, extension_id, instance_id))
+        self._slot_holders.add(task)
+        task.add_done_callback(self._slot_holders.discard)
+
+    async def _release_when_finished(self, job_id: str, extension_id: str, instance_id: str) -> None:
+        try:
+            async with asyncio.timeout(self._slot_timeout_s):
+                async for _state in self._queue.watch_state(job_id):
+                    pass
+        except TimeoutError:
+            logger.warning(
+                "Job %s did not finish within %.0fs; freeing its slot on %s",
+                job_id,
+                self._slot_timeout_s,
+                extension_id,
+            )
+        except Exception:
+            logger.warning("Lost track of job %s; freeing its slot on %s", job_id, extension_id, exc_info=True)
+        finally:
+            self._release(extension_id, instance_id)
+
+    async def _deliver_job(
+        self,
+        job: JobMessage,
+        attempts: int,
+        extension: ExtensionRegistration | None,
+        instance: ExtensionInstance | None = None,
+        breaker: CircuitBreaker | None = None,
+        permit: BreakerPermit | None = None,
+    ) -> DispatchResult:
+        # Claiming the job is a transition, so a cancellation (or a copy of
+        # the job that is already running) is never overwritten.
+        state = await self._queue.transition_state(
             job.job_id,
             JobStatus.DISPATCHED,
-            details={"attempt": attempts + 1},
+            details=_dispatch_details(attempt=attempts + 1),
         )
+        if state is None:
+            current = await self._queue.get_state(job.job_id)
+            if current is None or current.status == JobStatus.CANCELLED:
+                self._metrics.record_dispatch(job.target, "cancelled")
+                return DispatchResult(job_id=job.job_id, ok=False, error="Job was cancelled")
+            return DispatchResult(job_id=job.job_id, ok=False, error=f"Job is already {current.status}")
+        trace_parent = extract_trace_context(job.metadata)
+        if attempts == 0:
+            # Retries wait on purpose, so only the first attempt measures queueing.
+            self._metrics.observe_dispatch_wait(job.target, job.lane, job.created_at)
+            self._trace_queue_wait(job, trace_parent)
+        submitted = {key: value for key, value in state.details.items() if key not in _DISPATCH_DETAIL_KEYS}
 
-        extension = await self._registry.get(job.target)
-        if extension is None:
+        if extension is None or instance is None:
             return await self._fail_job(
                 job,
                 error=f"Extension {job.target!r} is not registered or is disabled",
                 code="extension_not_found",
+                details=submitted,
+                attempt=attempts + 1,
             )
 
+        span = self._tracer.start_span(
+            "job.deliver",
+            parent=trace_parent,
+            attributes={
+                "job_id": job.job_id,
+                "target": job.target,
+                "instance_id": instance.instance_id,
+                "attempt": attempts + 1,
+            },
+        )
         body = {
             "job_id": job.job_id,
             "target": job.target,
             "payload": job.payload,
-            "metadata": job.metadata,
+            "metadata": inject_trace_context(job.metadata, span.context),
         }
 
+        started = time.monotonic()
         try:
-            response = await self._http.post(extension.webhook_url, json=body)
+            response = await self._post_job(extension, instance, body)
             response.raise_for_status()
         except Exception as exc:
+            self._tracer.end_span(span, error=exc)
+            if breaker is not None and permit is not None:
+                breaker.record(permit, not _is_target_failure(exc), time.monotonic() - started)
+                self._metrics.set_circuit_state(extension.extension_id, instance.instance_id, breaker.state)
             if attempts < self._max_retries:
-                retry_job = JobMessage(
-                    job_id=job.job_id,
-                    target=job.target,
-                    payload=job.payload,
-                    created_at=job.created_at,
-                    metadata={**job.metadata, "_dispatch_attempt": attempts + 1},
+                retry_job = replace(
+                    job,
+                    metadata={
+                        **{key: value for key, value in job.metadata.items() if key != _OFFLINE_SINCE_KEY},
+                        "_dispatch_attempt": attempts + 1,
+                        "_dispatch_errors": _attempt_history(job, attempts + 1, str(exc)),
+                    },
                 )
-                await self._queue.enqueue(retry_job)
-                await self._queue.set_state(
+                delay_s = retry_backoff_s(
+                    attempts + 1,
+                    self._retry_base_delay_s,
+                    self._retry_max_delay_s,
+                )
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay_s)
+                # Move the state back before re-enqueueing, and only if nobody
+                # cancelled the job meanwhile.
+                requeued = await self._queue.transition_state(
                     job.job_id,
                     JobStatus.QUEUED,
-                    details={"retrying": True, "attempt": attempts + 1},
+                    details=_dispatch_details(
+                        retrying=True,
+                        attempt=attempts + 1,
+                        retry_at=retry_at.isoformat(),
+                    ),
+                    expected={JobStatus.DISPATCHED},
                 )
+                if requeued is None:
+                    self._metrics.record_dispatch(job.target, "cancelled")
+                    return DispatchResult(job_id=job.job_id, ok=False, error="Job was cancelled")
+                await self._queue.enqueue(retry_job, not_before=retry_at)
+                self._metrics.record_dispatch(job.target, "retried")
                 return DispatchResult(
                     job_id=job.job_id,
                     ok=False,
@@ -121,24 +691,92 @@ class JobDispatcher:
                 job,
                 error=str(exc),
                 code="dispatch_error",
+                details=submitted,
+                attempt=attempts + 1,
             )
 
-        await self._queue.set_state(
+        span.set_attribute("http.status_code", response.status_code)
+        self._tracer.end_span(span)
+        if breaker is not None and permit is not None:
+            breaker.record(permit, True, time.monotonic() - started)
+            self._metrics.set_circuit_state(extension.extension_id, instance.instance_id, breaker.state)
+        # Refused when the job was cancelled or already finished while the
+        # webhook call was in flight.
+        running = await self._queue.transition_state(
             job.job_id,
             JobStatus.RUNNING,
-            details={"dispatch_status": response.status_code},
+            details={
+                "dispatch_status": response.status_code,
+                "instance_id": instance.instance_id,
+                DISPATCHED_AT_KEY: datetime.now(timezone.utc).isoformat(),
+            },
         )
+        self._metrics.record_dispatch(job.target, "delivered")
         return DispatchResult(
             job_id=job.job_id,
             ok=True,
             status_code=response.status_code,
+            running=running is not None,
+        )
+
+    def _trace_queue_wait(self, job: JobMessage, parent: TraceContext | None) -> None:
+        try:
+            enqueued_at = datetime.fromisoformat(job.created_at).timestamp()
+        except (TypeError, ValueError):
+            return
+        span = self._tracer.start_span(
+            "job.queue_wait",
+            parent=parent,
+            attributes={"job_id": job.job_id, "target": job.target, "lane": str(job.lane)},
+            start_time=enqueued_at,
         )
+        self._tracer.end_span(span)
 
-    async def _fail_job(self, job: JobMessage, error: str, code: str) -> DispatchResult:
-        await self._queue.set_state(
+    async def _post_job(
+        self,
+        extension: ExtensionRegistration,
+        instance: ExtensionInstance,
+        body: dict,
+    ) -> httpx.Response:
+        if extension.batch_max_jobs is not None and extension.batch_max_jobs > 1:
+            response = await self._batcher.post(
+                instance.webhook_url,
+                body,
+                max_jobs=extension.batch_max_jobs,
+                max_wait_ms=extension.batch_max_wait_ms,
+            )
+            response.raise_for_status()
+            raise_for_rejection(response, body["job_id"])
+            return response
+        return await self._http.post(instance.webhook_url, json=body)
+
+    async def _fail_job(
+        self,
+        job: JobMessage,
+        error: str,
+        code: str,
+        details: dict | None = None,
+        attempt: int = 1,
+    ) -> DispatchResult:
+        details = details or {}
+        failed = await self._queue.transition_state(
             job.job_id,
             JobStatus.FAILED,
-            details={"error": error, "code": code},
+            details=_dispatch_details(attempt=attempt, error=error, code=code, dead_lettered=True),
+        )
+        if failed is None:
+            # Cancelled meanwhile; there is nothing left to retry by hand.
+            self._metrics.record_dispatch(job.target, "cancelled")
+            return DispatchResult(job_id=job.job_id, ok=False, error=error)
+        self._metrics.record_dispatch(job.target, "failed")
+        await self._queue.add_dead_letter(
+            DeadLetter(
+                job=job,
+                error=error,
+                code=code,
+                attempts=_attempt_history(job, attempt, error),
+                details=details,
+            )
         )
         return DispatchResult(
             job_id=job.job_id,
@@ -147,4 +785,83 @@ class JobDispatcher:
         )
 
 
-__all__ = ["DispatchResult", "JobDispatcher"]
+def dispatcher_options_from_env() -> dict[str, Any]:
+    """`JobDispatcher` keyword arguments read from the environment.
+
+    - `FAIR_DISPATCHER_CONCURRENCY`: deliveries in flight per dispatcher
+    - `FAIR_DISPATCHER_DRAIN_TIMEOUT`: seconds `stop` waits for them
+    - `FAIR_DISPATCHER_SLOT_TIMEOUT`: seconds a job may hold its extension's
+      concurrency slot
+    - `FAIR_DISPATCHER_BREAKER_FAILURE_RATE`: failed share of recent webhook
+      calls (0..1) that opens an extension's circuit breaker
+    - `FAIR_DISPATCHER_BREAKER_SLOW_CALL`: seconds after which a webhook call
+      counts as failed
+    - `FAIR_DISPATCHER_BREAKER_OPEN_TIME`: seconds a breaker stays open before
+      it lets a probe through
+    - `FAIR_DISPATCHER_BALANCING`: how jobs are spread over an extension's
+      instances, `least-in-flight` (default) or `weighted-round-robin`
+    - `FAIR_DISPATCHER_MAX_OFFLINE_TIME`: seconds a job waits for an extension
+      without live instances before it is dead-lettered
+    """
+    return {
+        "concurrency": int(os.getenv("FAIR_DISPATCHER_CONCURRENCY", str(DEFAULT_DISPATCH_CONCURRENCY))),
+        "drain_timeout_s": float(os.getenv("FAIR_DISPATCHER_DRAIN_TIMEOUT", str(DEFAULT_DRAIN_TIMEOUT_S))),
+        "slot_timeout_s": float(os.getenv("FAIR_DISPATCHER_SLOT_TIMEOUT", str(DEFAULT_SLOT_TIMEOUT_S))),
+        "circuit_breakers": CircuitBreakers(
+            failure_rate_threshold=float(
+                os.getenv("FAIR_DISPATCHER_BREAKER_FAILURE_RATE", str(DEFAULT_FAILURE_RATE_THRESHOLD))
+            ),
+            slow_call_s=float(os.getenv("FAIR_DISPATCHER_BREAKER_SLOW_CALL", str(DEFAULT_SLOW_CALL_S))),
+            open_s=float(os.getenv("FAIR_DISPATCHER_BREAKER_OPEN_TIME", str(DEFAULT_OPEN_S))),
+        ),
+        "balancer": InstanceBalancer(
+            os.getenv("FAIR_DISPATCHER_BALANCING", BalancingStrategy.LEAST_IN_FLIGHT).strip().lower()
+        ),
+        "max_offline_s": float(os.getenv("FAIR_DISPATCHER_MAX_OFFLINE_TIME", str(DEFAULT_MAX_OFFLINE_S))),
+    }
+
+
+@dataclass(eq=False)
+class _ParkedJob:
+    job: JobMessage
+    timer: asyncio.TimerHandle | None = field(default=None)
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+
+
+def _breaker_key(extension_id: str, instance_id: str) -> str:
+    return f"{extension_id}@{instance_id}"
+
+
+def _is_target_failure(exc: Exception) -> bool:
+    """Whether a failed webhook call says the extension is unhealthy."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code >= 500 or status_code == 429
+    # The extension answered and turned down only this job.
+    return not isinstance(exc, BatchJobRejected)
+
+
+def _attempt_history(job: JobMessage, attempt: int, error: str) -> list[dict]:
+    history = list(job.metadata.get("_dispatch_errors") or [])
+    history.append(
+        {"attempt": attempt, "error": error, "failed_at": datetime.now(timezone.utc).isoformat()}
+    )
+    return history
+
+
+__all__ = [
+    "DEFAULT_DISPATCH_CONCURRENCY",
+    "DEFAULT_DRAIN_TIMEOUT_S",
+    "DEFAULT_MAX_OFFLINE_S",
+    "DEFAULT_SLOT_TIMEOUT_S",
+    "DispatchResult",
+    "JobDispatcher",
+    "dispatcher_options_from_env",
+    "retry_backoff_s",
+]
@@ -0,0 +1,268 @@
+"""Job path metrics rendered in the Prometheus text exposition format.
+
+`JobMetrics` holds the instruments fed by the job queue backends and the
+dispatcher:
+
+- `fair_job_queue_depth{lane}`: pending jobs per lane (delayed ones
+  included), refreshed from `JobQueue.queue_depth()` on every scrape.
+- `fair_job_dispatch_wait_seconds{target,lane}`: time from enqueue to the
+  first dispatch attempt.
+- `fair_job_dispatches_total{target,outcome}`: dispatch attempts by outcome
+  (`delivered`, `retried`, `failed`, `cancelled`, `deferred` for jobs
+  put back because their extension was at its limit, or `circuit_open` for
+  jobs put back because its circuit breaker was open, `offline` for jobs put
+  back because all of its instances expired); the `delivered` rate
+  is the dispatcher throughput.
+- `fair_dispatch_circuit_state{target,instance}`: the dispatcher's circuit
+  breaker per extension instance (0 closed, 1 half-open, 2 open).
+- `fair_job_run_seconds{target,status}`: time from delivery to the
+  extension until the job reached a terminal state.
+- `fair_jobs_finished_total{target,status}`: jobs that reached a terminal
+  state, i.e. per-target success and failure counts.
+
+Metrics are per process. Scrape every API and dispatcher process and sum
+them in Prometheus. The registry is small on purpose so the backend does not
+need `prometheus_client`.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+WAIT_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RUN_BUCKETS_S = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+# Stamped by the dispatcher into the state details when a job is delivered.
+DISPATCHED_AT_KEY = "dispatched_at"
+_CIRCUIT_STATE_VALUES = {"closed": 0.0, "half_open": 1.0, "open": 2.0}
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = WAIT_BUCKETS_S,
+    ):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: bucket counts (non-cumulative), sum, count.
+        self._series: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._series[key] = (counts, total + value, count + 1)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {count}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.label_names, key)} {count}"
+
+
+def _age_s(iso_timestamp: str | None) -> float | None:
+    if not iso_timestamp:
+        return None
+    try:
+        started = datetime.fromisoformat(iso_timestamp)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, time.time() - started.timestamp())
+
+
+class JobMetrics:
+    """Instruments for the job path; see the module docstring."""
+
+    def __init__(self) -> None:
+        self.queue_depth = Gauge(
+            "fair_job_queue_depth",
+            "Jobs waiting in the queue, per lane.",
+            ("lane",),
+        )
+        self.dispatch_wait = Histogram(
+            "fair_job_dispatch_wait_seconds",
+            "Time from enqueue to the first dispatch attempt.",
+            ("target", "lane"),
+            buckets=WAIT_BUCKETS_S,
+        )
+        self.dispatches = Counter(
+            "fair_job_dispatches_total",
+            "Dispatch attempts by outcome.",
+            ("target", "outcome"),
+        )
+        self.circuit_state = Gauge(
+            "fair_dispatch_circuit_state",
+            "Circuit breaker state per extension instance (0 closed, 1 half-open, 2 open).",
+            ("target", "instance"),
+        )
+        self.run_time = Histogram(
+            "fair_job_run_seconds",
+            "Time from delivery to the extension until the job finished.",
+            ("target", "status"),
+            buckets=RUN_BUCKETS_S,
+        )
+        self.finished = Counter(
+            "fair_jobs_finished_total",
+            "Jobs that reached a terminal state.",
+            ("target", "status"),
+        )
+
+    def instruments(self) -> list[_Metric]:
+        return [
+            self.queue_depth,
+            self.dispatch_wait,
+            self.dispatches,
+            self.circuit_state,
+            self.run_time,
+            self.finished,
+        ]
+
+    def observe_dispatch_wait(self, target: str, lane: str, enqueued_at: str) -> None:
+        wait_s = _age_s(enqueued_at)
+        if wait_s is not None:
+            self.dispatch_wait.observe(wait_s, target=target, lane=str(lane))
+
+    def record_dispatch(self, target: str, outcome: str) -> None:
+        self.dispatches.inc(target=target, outcome=outcome)
+
+    def set_circuit_state(self, target: str, instance: str, state: str) -> None:
+        self.circuit_state.set(_CIRCUIT_STATE_VALUES[str(state)], target=target, instance=instance)
+
+    def set_queue_depth(self, depth: dict[str, int]) -> None:
+        for lane, count in depth.items():
+            self.queue_depth.set(count, lane=str(lane))
+
+    def observe_finished(self, status: str, details: dict[str, Any]) -> None:
+        """Count a job that just reached the terminal `status`."""
+        target = str(details.get("target") or details.get("owner_extension_id") or "unknown")
+        self.finished.inc(target=target, status=status)
+        run_s = _age_s(details.get(DISPATCHED_AT_KEY))
+        if run_s is not None:
+            self.run_time.observe(run_s, target=target, status=status)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self.instruments():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+job_metrics = JobMetrics()
+
+
+def metrics_enabled() -> bool:
+    """`FAIR_ENABLE_METRICS`: serve `/metrics` (default: true)."""
+    raw = os.getenv("FAIR_ENABLE_METRICS", "1").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+__all__ = [
+    "PROMETHEUS_CONTENT_TYPE",
+    "WAIT_BUCKETS_S",
+    "RUN_BUCKETS_S",
+    "DISPATCHED_AT_KEY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "JobMetrics",
+    "job_metrics",
+    "metrics_enabled",
+]
@@ -1,30 +1,72 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import importlib
-import json
+import itertools
+import logging
 import os
+import random
+import socket
+import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from dataclasses import asdict, dataclass, field
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
 from enum import StrEnum
 from typing import Any
+from uuid import uuid4
 
 from dotenv import load_dotenv
 
+from fair_platform.backend.services.job_codec import FrameCodec, frame_codec_from_env
+from fair_platform.backend.services.job_metrics import JobMetrics, job_metrics
+from fair_platform.backend.services.redis_pubsub import (
+    DEFAULT_PUBSUB_CONNECTIONS,
+    PubSubSubscription,
+    RedisPubSubMultiplexer,
+)
+from fair_platform.backend.services.fanout import (
+    DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+    FanoutStats,
+    OverflowPolicy,
+    SubscriberQueue,
+    overflow_policy_from_env,
+    subscriber_queue_size_from_env,
+)
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 """Job queue primitives for the API control-plane.
 
 This module provides a backend-agnostic asynchronous interface that supports:
-1. Job submission and dispatch (`enqueue` / `dequeue`)
-2. Job state tracking (`set_state` / `get_state`)
-3. Real-time update streaming (`publish_update` / `subscribe_updates`)
-
-Two implementations are available:
+1. Job submission and dispatch (`enqueue` / `dequeue`, batched as
+   `enqueue_many` / `dequeue_batch`)
+2. Job state tracking (`transition_state` / `get_state`); transitions are
+   atomic, only move forward (queued -> dispatched -> running -> terminal)
+   and merge `details`. Terminal states expire after a TTL and can be copied
+   elsewhere through an archive hook
+3. Real-time update streaming (`publish_update` / `subscribe_updates`); each
+   job keeps a bounded update log so subscribers can replay from a cursor.
+   State transitions are pushed to `watch_state` iterators, so consumers
+   notice terminal states without polling `get_state`
+4. Priority lanes (`JobLane`): interactive work is never stuck behind bulk work
+5. Delayed delivery (`enqueue(job, not_before=...)`) for retries with backoff
+6. Deduplicated submission (`enqueue_if_absent`) keyed by job id or
+   `JobMessage.idempotency_key`
+7. Dead letters (`add_dead_letter` / `list_dead_letters`): jobs the dispatcher
+   gave up on, kept with their error and attempt history for requeueing
+
+Four implementations are available:
 - `LocalJobQueue`: in-process queue (`asyncio.Queue`) for local development/tests.
 - `RedisJobQueue`: cross-process queue + pub/sub for production scale.
+- `RedisStreamJobQueue`: Redis Streams consumer group with at-least-once
+  delivery; unacknowledged jobs are reclaimed after a visibility timeout.
+- `SqlJobQueue` (`sql_job_queue` module): tables in the platform database,
+  for multi-process deployments without Redis.
 
 Quick example (producer + dispatcher):
 
@@ -44,21 +86,22 @@ await queue.enqueue(job)
 
 # Dispatcher worker
 next_job = await queue.dequeue(timeout=1.0)
-if next_job:
-    await queue.set_state(next_job.job_id, JobStatus.RUNNING)
+if next_job and await queue.transition_state(next_job.job_id, JobStatus.RUNNING):
     await queue.publish_update(
         JobUpdate(job_id=next_job.job_id, event="progress", payload={"percent": 20})
     )
+    await queue.ack(next_job)
 ```
 
 Quick example (SSE-like consumer):
 
 ```python
-subscription = await queue.subscribe_updates("job_123")
+# Replay the job's update log, then keep receiving live updates.
+subscription = await queue.subscribe_updates("job_123", from_cursor=JOB_UPDATES_FROM_START)
 async with subscription:
     update = await subscription.get(timeout=5.0)
     if update:
-        print(update.event, update.payload)
+        print(update.event, update.payload, update.cursor)
 ```
 """
 
@@ -68,6 +111,15 @@ def _utc_now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+def _seconds_until(not_before: datetime | None) -> float:
+    """Seconds from now until `not_before` (naive datetimes are UTC), never negative."""
+    if not_before is None:
+        return 0.0
+    if not_before.tzinfo is None:
+        not_before = not_before.replace(tzinfo=timezone.utc)
+    return max(0.0, (not_before - datetime.now(timezone.utc)).total_seconds())
+
+
 class JobStatus(StrEnum):
     """Canonical lifecycle states for a job.
 
@@ -83,6 +135,54 @@ class JobStatus(StrEnum):
     CANCELLED = "cancelled"
 
 
+TERMINAL_JOB_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+# Lifecycle order; a job never moves to a lower rank and never leaves a terminal state.
+_JOB_STATUS_RANK: dict[JobStatus, int] = {
+    JobStatus.QUEUED: 0,
+    JobStatus.DISPATCHED: 1,
+    JobStatus.RUNNING: 2,
+    JobStatus.COMPLETED: 3,
+    JobStatus.FAILED: 3,
+    JobStatus.CANCELLED: 3,
+}
+DEFAULT_TERMINAL_STATE_TTL_S = 24 * 60 * 60
+DEFAULT_UPDATE_LOG_SIZE = 1000
+JOB_UPDATES_FROM_START = "0"
+"""Cursor that replays a job's whole retained update log."""
+STATE_WATCH_POLL_INTERVAL_S = 1.0
+"""Poll interval of the default `JobQueue.watch_state`."""
+STATE_WATCH_RESYNC_INTERVAL_S = 30.0
+"""How long a Redis state watch waits for a change before re-reading the state."""
+
+
+class JobLane(StrEnum):
+    """Routing lanes, listed from most to least latency-sensitive.
+
+    - `interactive`: a user is waiting on the result (e.g. `rubric.create`)
+    - `default`: regular API jobs
+    - `bulk`: fan-out work such as workflow steps over many submissions
+    """
+
+    INTERACTIVE = "interactive"
+    DEFAULT = "default"
+    BULK = "bulk"
+
+
+JOB_LANE_ORDER: tuple[JobLane, ...] = (JobLane.INTERACTIVE, JobLane.DEFAULT, JobLane.BULK)
+DEFAULT_LANE_WEIGHTS: dict[str, int] = {
+    JobLane.INTERACTIVE: 10,
+    JobLane.DEFAULT: 3,
+    JobLane.BULK: 1,
+}
+
+
+def _normalize_lane(lane: str | None) -> JobLane:
+    try:
+        return JobLane(lane or JobLane.DEFAULT)
+    except ValueError:
+        return JobLane.DEFAULT
+
+
 @dataclass
 class JobMessage:
     """A unit of work to be dispatched to an extension/service.
@@ -93,6 +193,11 @@ class JobMessage:
         payload: Extension-specific request data.
         created_at: UTC ISO timestamp (set automatically).
         metadata: Optional transport-level metadata (trace ids, actor info).
+        lane: `JobLane` the job is queued in. Unknown values fall back to `default`.
+        priority: Ordering hint inside a lane; higher runs first. Only
+            `LocalJobQueue` and `SqlJobQueue` honor it, Redis lanes are FIFO.
+        idempotency_key: Optional client-chosen key; `enqueue_if_absent`
+            enqueues at most one job per key while the key is retained.
     """
 
     job_id: str
@@ -100,6 +205,9 @@ class JobMessage:
     payload: dict[str, Any]
     created_at: str = field(default_factory=_utc_now_iso)
     metadata: dict[str, Any] = field(default_factory=dict)
+    lane: str = JobLane.DEFAULT
+    priority: int = 0
+    idempotency_key: str | None = None
 
 
 @dataclass
@@ -112,6 +220,66 @@ class JobState:
     details: dict[str, Any] = field(default_factory=dict)
 
 
+def can_transition(current: JobStatus | None, status: JobStatus) -> bool:
+    """Whether the lifecycle allows a job in `current` to move to `status`.
+
+    Jobs move forward through queued -> dispatched -> running -> a terminal
+    state. Staying in a non-terminal state is allowed (to merge details);
+    terminal states are final. A job without a state may take any status.
+    """
+    if current is None:
+        return True
+    if current in TERMINAL_JOB_STATUSES:
+        return False
+    return _JOB_STATUS_RANK[status] >= _JOB_STATUS_RANK[current]
+
+
+def merge_details(details: dict[str, Any], patch: dict[str, Any] | None) -> dict[str, Any]:
+    """Return `details` updated with `patch`; keys set to `None` are removed."""
+    merged = dict(details)
+    for key, value in (patch or {}).items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _next_state(
+    job_id: str,
+    current: JobState | None,
+    status: JobStatus,
+    details: dict[str, Any] | None,
+    expected: Collection[JobStatus | None] | None,
+) -> JobState | None:
+    """The state `transition_state` writes, or `None` if the transition is refused."""
+    current_status = current.status if current is not None else None
+    if expected is not None:
+        if current_status not in expected:
+            return None
+    elif not can_transition(current_status, status):
+        return None
+    return JobState(
+        job_id=job_id,
+        status=status,
+        details=merge_details(current.details if current is not None else {}, details),
+    )
+
+
+JobStateArchiveHook = Callable[[JobState], Awaitable[None]]
+"""Async callback receiving every terminal `JobState` before it expires."""
+
+
+async def _run_archive_hook(hook: JobStateArchiveHook | None, state: JobState) -> None:
+    if hook is None or state.status not in TERMINAL_JOB_STATUSES:
+        return
+    try:
+        await hook(state)
+    except Exception:
+        # Archival is best effort; it must never fail the state transition.
+        logger.exception("Failed to archive terminal state for job %s", state.job_id)
+
+
 @dataclass
 class JobUpdate:
     """Incremental event emitted while a job is processed.
@@ -121,12 +289,99 @@ class JobUpdate:
     - `token`: LLM token/text stream chunks
     - `log`: human-readable log lines
     - `result`: final structured output
+
+    `cursor` is assigned by the queue when the update is appended to the job's
+    update log. Pass it back as `subscribe_updates(..., from_cursor=...)` to
+    resume right after this update.
     """
 
     job_id: str
     event: str
     payload: dict[str, Any]
     created_at: str = field(default_factory=_utc_now_iso)
+    cursor: str | None = field(default=None, compare=False)
+
+
+@dataclass
+class DeadLetter:
+    """A job the dispatcher gave up on, kept so it can be inspected and requeued.
+
+    `attempts` lists every failed delivery (`attempt`, `error`, `failed_at`)
+    and `details` holds the job's state details from before it failed.
+    """
+
+    job: JobMessage
+    error: str
+    code: str | None = None
+    attempts: list[dict[str, Any]] = field(default_factory=list)
+    details: dict[str, Any] = field(default_factory=dict)
+    dead_at: str = field(default_factory=_utc_now_iso)
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "DeadLetter":
+        return cls(**{**payload, "job": JobMessage(**payload["job"])})
+
+
+class DuplicateReason(StrEnum):
+    IDEMPOTENCY_KEY = "idempotency_key"
+    JOB_ID = "job_id"
+
+
+@dataclass(frozen=True)
+class DuplicateJob:
+    """Why `enqueue_if_absent` did not enqueue a job.
+
+    `IDEMPOTENCY_KEY`: the key is bound to `job_id`, the job a retry of the
+    same submission should get. `JOB_ID`: the submitted job id is already
+    taken by another job (`job_id` is that id).
+    """
+
+    job_id: str
+    reason: DuplicateReason
+
+
+class JobQueueConflict(RuntimeError):
+    """A check-and-set kept losing to concurrent writers and was given up."""
+
+
+class LaneSelector:
+    """Smooth weighted round-robin over `JobLane`s.
+
+    Every call to `order()` returns all lanes, preferred lane first followed by
+    the rest in latency order. Backends pop from the first non-empty lane, so
+    an empty preferred lane never blocks the others, and with the default
+    weights `interactive` is tried first ten times out of fourteen. A weight of
+    0 means the lane is only served when every higher lane is empty.
+    """
+
+    def __init__(self, weights: dict[str, int] | None = None):
+        merged = {**DEFAULT_LANE_WEIGHTS, **(weights or {})}
+        self._weights = {lane: max(0, int(merged.get(lane, 0))) for lane in JOB_LANE_ORDER}
+        self._current = {lane: 0 for lane in JOB_LANE_ORDER}
+
+    def order(self) -> list[JobLane]:
+        total = sum(self._weights.values())
+        if total == 0:
+            return list(JOB_LANE_ORDER)
+        for lane, weight in self._weights.items():
+            self._current[lane] += weight
+        # `max` keeps the first lane on ties, which favors latency-sensitive lanes.
+        preferred = max(JOB_LANE_ORDER, key=lambda lane: self._current[lane])
+        self._current[preferred] -= total
+        return [preferred, *(lane for lane in JOB_LANE_ORDER if lane != preferred)]
+
+
+def parse_lane_weights(raw: str | None) -> dict[str, int]:
+    """Parse `interactive=10,default=3,bulk=1` into a weights mapping."""
+    weights: dict[str, int] = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        lane, _, weight = item.partition("=")
+        lane = lane.strip().lower()
+        if lane in JOB_LANE_ORDER:
+            weights[lane] = int(weight.strip())
+    return weights
 
 
 class JobUpdateSubscription(ABC):
@@ -144,6 +399,14 @@ class JobUpdateSubscription(ABC):
     async def close(self) -> None:
         raise NotImplementedError
 
+    @property
+    def disconnected(self) -> bool:
+        """`True` once the backend dropped this subscriber for falling behind.
+
+        Consumers should stop reading and resubscribe from their last cursor.
+        """
+        return False
+
     async def __aenter__(self) -> "JobUpdateSubscription":
         return self
 
@@ -156,19 +419,126 @@ class JobQueue(ABC):
 
     Design notes:
     - API handlers only need `enqueue`, `get_state`, and `subscribe_updates`.
-    - Dispatcher workers use `dequeue`, `set_state`, and `publish_update`.
+    - Dispatcher workers use `dequeue`, `transition_state`, `publish_update`,
+      and `ack` once a dequeued job has been handed off.
+    - `enqueue_many` / `dequeue_batch` have loop-based defaults; backends
+      override them to amortize round trips when work fans out.
     - Keeping this interface narrow makes it straightforward to implement in
       other languages/services while preserving behavior.
+    - Terminal states are counted in `metrics` (process-wide by default;
+      assign a `JobMetrics` to an instance to keep its numbers apart).
     """
 
+    metrics: JobMetrics = job_metrics
+
     @abstractmethod
-    async def enqueue(self, job: JobMessage) -> None:
+    async def enqueue(self, job: JobMessage, not_before: datetime | None = None) -> None:
+        """Queue `job`; with `not_before`, it is not dequeued before that time.
+
+        A job without a state gets `QUEUED`; an existing state is kept, so
+        callers re-enqueueing a job move its state first.
+        """
         raise NotImplementedError
 
     @abstractmethod
     async def dequeue(self, timeout: float | None = None) -> JobMessage | None:
         raise NotImplementedError
 
+    async def enqueue_many(
+        self,
+        jobs: list[JobMessage],
+        not_before: datetime | None = None,
+    ) -> None:
+        """Enqueue several jobs, preserving their order."""
+        for job in jobs:
+            await self.enqueue(job, not_before=not_before)
+
+    @abstractmethod
+    async def enqueue_if_absent(
+        self,
+        job: JobMessage,
+        not_before: datetime | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> DuplicateJob | None:
+        """Atomically enqueue `job` unless it duplicates an existing job.
+
+        A job is a duplicate when its `idempotency_key` was already claimed, or
+        when a state already exists for its `job_id`; the key is checked first.
+        Returns `None` when the job was enqueued, otherwise a `DuplicateJob`
+        naming the existing job and which of the two matched. Keys are kept
+        as long as the owning job's state and expire with its terminal state.
+        The job's `QUEUED` state is created with `details`, before a
+        dispatcher can see the job.
+        """
+        raise NotImplementedError
+
+    async def dequeue_batch(
+        self,
+        max_items: int,
+        timeout: float | None = None,
+    ) -> list[JobMessage]:
+        """Wait up to `timeout` for one job, then take up to `max_items` without waiting.
+
+        Returns an empty list on timeout.
+        """
+        first = await self.dequeue(timeout=timeout)
+        if first is None:
+            return []
+        jobs = [first]
+        while len(jobs) < max_items:
+            # A zero timeout means "only what is already queued" for every backend.
+            job = await self.dequeue(timeout=0)
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+
+    async def ack(self, job: JobMessage) -> None:
+        """Confirm a dequeued job was handled so it is not delivered again.
+
+        Backends that remove jobs on `dequeue` have nothing to do here.
+        """
+
+    async def remove_pending(self, job_id: str) -> bool:
+        """Remove a job that was not dequeued yet; return whether it was found.
+
+        Backends that cannot remove jobs by id return `False`; the dispatcher
+        still drops jobs whose state is `CANCELLED` when it dequeues them.
+        """
+        return False
+
+    def _observe_state(self, state: JobState) -> None:
+        if state.status in TERMINAL_JOB_STATUSES:
+            self.metrics.observe_finished(str(state.status), state.details)
+
+    @abstractmethod
+    async def queue_depth(self) -> dict[str, int]:
+        """Return the number of pending jobs per lane, delayed jobs included."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_dead_letter(self, entry: DeadLetter) -> None:
+        """Store `entry`, replacing an earlier dead letter for the same job."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_dead_letters(
+        self,
+        limit: int = 100,
+        target: str | None = None,
+    ) -> list[DeadLetter]:
+        """Return up to `limit` dead letters, oldest first, optionally for one target."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_dead_letter(self, job_id: str) -> DeadLetter | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_dead_letter(self, job_id: str) -> bool:
+        """Remove the dead letter for `job_id`; return whether this call removed it."""
+        raise NotImplementedError
+
     @abstractmethod
     async def set_state(
         self,
@@ -176,18 +546,78 @@ class JobQueue(ABC):
         status: JobStatus,
         details: dict[str, Any] | None = None,
     ) -> JobState:
+        """Overwrite the job's state unconditionally.
+
+        Concurrent writers can undo each other's transitions with this; use
+        `transition_state` wherever another process may move the job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def transition_state(
+        self,
+        job_id: str,
+        status: JobStatus,
+        details: dict[str, Any] | None = None,
+        *,
+        expected: Collection[JobStatus | None] | None = None,
+    ) -> JobState | None:
+        """Atomically move the job to `status` and merge `details` into its details.
+
+        The transition must be allowed by `can_transition`, or, with
+        `expected`, start from one of those statuses (`None` standing for "no
+        state"); `expected` may move a job backwards, as a retry does. Keys
+        of `details` set to `None` are removed. Returns the new state, or
+        `None` when the transition was refused and nothing was written.
+        """
         raise NotImplementedError
 
     @abstractmethod
     async def get_state(self, job_id: str) -> JobState | None:
         raise NotImplementedError
 
+    async def watch_state(self, job_id: str) -> AsyncIterator[JobState]:
+        """Yield the job's current state, then each later transition.
+
+        The iterator ends after yielding a terminal state. Nothing is yielded
+        until the job has a state. Built-in backends push transitions; this
+        default polls `get_state`.
+        """
+        last: JobState | None = None
+        while True:
+            state = await self.get_state(job_id)
+            if _is_state_transition(last, state):
+                last = state
+                yield state
+                if state.status in TERMINAL_JOB_STATUSES:
+                    return
+            await asyncio.sleep(STATE_WATCH_POLL_INTERVAL_S)
+
     @abstractmethod
     async def publish_update(self, update: JobUpdate) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    async def subscribe_updates(self, job_id: str) -> JobUpdateSubscription:
+    async def subscribe_updates(
+        self,
+        job_id: str,
+        from_cursor: str | None = None,
+        *,
+        overflow_policy: OverflowPolicy | None = None,
+    ) -> JobUpdateSubscription:
+        """Subscribe to updates for `job_id`.
+
+        With `from_cursor=None` only updates published after subscribing are
+        delivered. Otherwise retained updates after `from_cursor` are replayed
+        first (`JOB_UPDATES_FROM_START` replays the whole log), followed by
+        live updates without gaps or duplicates.
+
+        `overflow_policy` overrides the backend's policy for a subscriber
+        that falls behind. Consumers that must see every update pass
+        `OverflowPolicy.DISCONNECT` and resubscribe from their last cursor
+        once `disconnected` turns true. Backends that read updates from
+        storage never drop them and ignore it.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -195,29 +625,129 @@ class JobQueue(ABC):
         raise NotImplementedError
 
 
+def _is_state_transition(last: JobState | None, state: JobState | None) -> bool:
+    # Redis may deliver a change that the initial read already returned, or an
+    # older one; only strictly different, not older states count.
+    if state is None:
+        return False
+    if last is None:
+        return True
+    return state != last and state.updated_at >= last.updated_at
+
+
+class JobStateWatch:
+    """Follows `JobQueue.watch_state` in a background task.
+
+    `latest` holds the last state seen and `terminal` is set once the job
+    finishes, or once its state is removed while watched. Update consumers
+    read through `next_update`, which returns early when the job finishes
+    instead of waiting out a timeout.
+    """
+
+    def __init__(self, queue: JobQueue, job_id: str):
+        self._queue = queue
+        self._job_id = job_id
+        self.latest: JobState | None = None
+        self.terminal = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._follow())
+
+    async def next_update(
+        self,
+        subscription: JobUpdateSubscription,
+        timeout: float | None = None,
+    ) -> JobUpdate | None:
+        """Return the next update, or `None` on timeout or when the job finishes.
+
+        Once the job is terminal only updates that already arrived are
+        returned, so a loop draining them ends.
+        """
+        if self.terminal.is_set():
+            return await subscription.get(timeout=0)
+        get_task = asyncio.ensure_future(subscription.get(timeout=timeout))
+        terminal_task = asyncio.ensure_future(self.terminal.wait())
+        try:
+            await asyncio.wait({get_task, terminal_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            get_task.cancel()
+            terminal_task.cancel()
+        if get_task.done() and not get_task.cancelled():
+            return get_task.result()
+        return None
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> "JobStateWatch":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.close()
+
+    async def _follow(self) -> None:
+        try:
+            await self._consume(self._queue.watch_state(self._job_id))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("State watch for job %s failed; polling instead", self._job_id)
+            await self._consume(JobQueue.watch_state(self._queue, self._job_id))
+
+    async def _consume(self, states: AsyncIterator[JobState]) -> None:
+        async for state in states:
+            self.latest = state
+            if state.status in TERMINAL_JOB_STATUSES:
+                self.terminal.set()
+        # The iterator also ends when the state is removed; nothing follows either way.
+        self.terminal.set()
+
+
+def _cursor_sequence(cursor: str) -> int:
+    # Unparseable cursors replay the whole log rather than silently skipping it.
+    try:
+        return int(cursor)
+    except ValueError:
+        return 0
+
+
+def _progress_coalesce_key(update: JobUpdate) -> str | None:
+    return "progress" if update.event == "progress" else None
+
+
 class LocalJobUpdateSubscription(JobUpdateSubscription):
-    """In-memory subscription for `LocalJobQueue`."""
+    """In-memory subscription for `LocalJobQueue`.
+
+    `backlog` holds updates replayed from the job's update log. Like the
+    Redis backlog it is not bounded by the subscriber queue, so a replay
+    never overflows it.
+    """
 
     def __init__(
         self,
         job_id: str,
-        queue: asyncio.Queue[JobUpdate],
+        queue: SubscriberQueue[JobUpdate],
         detach_callback: Any,
+        backlog: list[JobUpdate] | None = None,
     ):
         self._job_id = job_id
         self._queue = queue
         self._detach_callback = detach_callback
+        self._backlog = deque(backlog or ())
         self._closed = False
 
+    @property
+    def disconnected(self) -> bool:
+        return self._queue.disconnected
+
     async def get(self, timeout: float | None = None) -> JobUpdate | None:
         if self._closed:
             return None
-        if timeout is None:
-            return await self._queue.get()
-        try:
-            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
-        except TimeoutError:
-            return None
+        if self._backlog:
+            return self._backlog.popleft()
+        return await self._queue.get(timeout=timeout)
 
     async def close(self) -> None:
         if self._closed:
@@ -235,24 +765,205 @@ class LocalJobQueue(JobQueue):
     - single-worker runs
 
     It is not suitable for horizontal scaling because data lives in process memory.
+
+    Each lane is a heap ordered by `(-priority, arrival)`; lanes are picked with
+    `LaneSelector`. Delayed jobs wait in a timer heap keyed by their monotonic
+    due time and move into their lane when `dequeue` finds them due.
+
+    Terminal states expire `terminal_state_ttl_s` seconds after they are set
+    (`None` keeps them forever). Expired states are dropped lazily by
+    `get_state` and in bulk by a sweeper task that runs every
+    `sweep_interval_s` while expirations are pending.
+
+    Every job keeps a ring buffer of its last `update_log_size` updates for
+    replay; cursors are a process-wide sequence number. The buffer is dropped
+    together with the job's state.
+
+    Subscribers get bounded queues of `subscriber_queue_size` updates and
+    `publish_update` never waits on them; `overflow_policy` handles a
+    subscriber that falls behind (`coalesce` merges pending `progress`
+    updates). Drops are counted in `fanout_stats`.
+
+    `watch_state` waits on an event set by every state write and removal
+    (expiry, sweeps, `close`). A state that expired before its watcher woke
+    up is still yielded, so watchers see the terminal state they waited for.
     """
 
-    def __init__(self):
-        self._jobs: asyncio.Queue[JobMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        lane_weights: dict[str, int] | None = None,
+        *,
+        terminal_state_ttl_s: float | None = DEFAULT_TERMINAL_STATE_TTL_S,
+        sweep_interval_s: float = 60.0,
+        archive_hook: JobStateArchiveHook | None = None,
+        update_log_size: int = DEFAULT_UPDATE_LOG_SIZE,
+        subscriber_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        self._lanes: dict[JobLane, list[tuple[int, int, JobMessage]]] = {
+            lane: [] for lane in JOB_LANE_ORDER
+        }
+        self._sequence = itertools.count()
+        self._delayed: list[tuple[float, int, JobMessage]] = []
+        self._selector = LaneSelector(lane_weights)
+        self._job_available = asyncio.Condition()
         self._states: dict[str, JobState] = {}
-        self._subscribers: dict[str, set[asyncio.Queue[JobUpdate]]] = defaultdict(set)
-
-    async def enqueue(self, job: JobMessage) -> None:
-        await self._jobs.put(job)
-        await self.set_state(job.job_id, JobStatus.QUEUED)
+        # Replaced on every notification; watchers wait on the one they saw.
+        self._state_changed = asyncio.Event()
+        # Idempotency key -> job id, plus the reverse map to drop keys with states.
+        self._idempotency_keys: dict[str, str] = {}
+        self._job_idempotency_keys: dict[str, str] = {}
+        self._idempotency_lock = asyncio.Lock()
+        self._terminal_state_ttl_s = terminal_state_ttl_s
+        self._sweep_interval_s = sweep_interval_s
+        self._archive_hook = archive_hook
+        # Monotonic expiry per job plus a heap of the same entries so sweeps
+        # only touch expired states. Heap entries go stale when a state is
+        # overwritten; they are skipped when their deadline no longer matches.
+        self._expires_at: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._sweeper: asyncio.Task[None] | None = None
+        self._subscribers: dict[str, set[SubscriberQueue[JobUpdate]]] = defaultdict(set)
+        self._subscriber_queue_size = subscriber_queue_size
+        self._overflow_policy = OverflowPolicy(overflow_policy)
+        self.fanout_stats = FanoutStats()
+        self._dead_letters: dict[str, DeadLetter] = {}
+        self._update_log_size = max(1, update_log_size)
+        self._update_logs: dict[str, deque[JobUpdate]] = {}
+        self._update_sequence = itertools.count(1)
+
+    async def enqueue(self, job: JobMessage, not_before: datetime | None = None) -> None:
+        await self.enqueue_many([job], not_before=not_before)
+
+    async def enqueue_many(
+        self,
+        jobs: list[JobMessage],
+        not_before: datetime | None = None,
+    ) -> None:
+        delay_s = _seconds_until(not_before)
+        async with self._job_available:
+            for job in jobs:
+                if delay_s > 0:
+                    heapq.heappush(
+                        self._delayed,
+                        (time.monotonic() + delay_s, next(self._sequence), job),
+                    )
+                else:
+                    self._push_ready(job)
+                if self._current_state(job.job_id) is None:
+                    state = JobState(job_id=job.job_id, status=JobStatus.QUEUED)
+                    self._store_state(state)
+                    await self._state_stored(state)
+            # Waiters recompute how long to sleep when a delayed job arrives.
+            self._job_available.notify_all()
+
+    async def enqueue_if_absent(
+        self,
+        job: JobMessage,
+        not_before: datetime | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> DuplicateJob | None:
+        async with self._idempotency_lock:
+            if job.idempotency_key is not None:
+                existing = self._idempotency_keys.get(job.idempotency_key)
+                if existing is not None and self._current_state(existing) is not None:
+                    return DuplicateJob(existing, DuplicateReason.IDEMPOTENCY_KEY)
+            if self._current_state(job.job_id) is not None:
+                return DuplicateJob(job.job_id, DuplicateReason.JOB_ID)
+            if job.idempotency_key is not None:
+                self._idempotency_keys[job.idempotency_key] = job.job_id
+                self._job_idempotency_keys[job.job_id] = job.idempotency_key
+            state = JobState(job_id=job.job_id, status=JobStatus.QUEUED, details=dict(details or {}))
+            self._store_state(state)
+            await self._state_stored(state)
+            await self.enqueue(job, not_before=not_before)
+            return None
 
     async def dequeue(self, timeout: float | None = None) -> JobMessage | None:
-        if timeout is None:
-            return await self._jobs.get()
-        try:
-            return await asyncio.wait_for(self._jobs.get(), timeout=timeout)
-        except TimeoutError:
-            return None
+        jobs = await self.dequeue_batch(1, timeout=timeout)
+        return jobs[0] if jobs else None
+
+    async def dequeue_batch(
+        self,
+        max_items: int,
+        timeout: float | None = None,
+    ) -> list[JobMessage]:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + max(0.0, timeout)
+        async with self._job_available:
+            while not self._promote_due_jobs():
+                wait_s = None if deadline is None else deadline - loop.time()
+                if wait_s is not None and wait_s <= 0:
+                    return []
+                if self._delayed:
+                    next_due_s = max(0.0, self._delayed[0][0] - time.monotonic())
+                    wait_s = next_due_s if wait_s is None else min(wait_s, next_due_s)
+                try:
+                    await asyncio.wait_for(self._job_available.wait(), timeout=wait_s)
+                except TimeoutError:
+                    pass
+            jobs: list[JobMessage] = []
+            while len(jobs) < max(1, max_items) and self._has_jobs():
+                lane = next(lane for lane in self._selector.order() if self._lanes[lane])
+                jobs.append(heapq.heappop(self._lanes[lane])[2])
+            return jobs
+
+    async def remove_pending(self, job_id: str) -> bool:
+        async with self._job_available:
+            removed = False
+            for heap in (*self._lanes.values(), self._delayed):
+                kept = [entry for entry in heap if entry[2].job_id != job_id]
+                if len(kept) < len(heap):
+                    heap[:] = kept
+                    heapq.heapify(heap)
+                    removed = True
+            return removed
+
+    async def add_dead_letter(self, entry: DeadLetter) -> None:
+        # Re-inserting keeps the dict ordered by the time jobs died.
+        self._dead_letters.pop(entry.job.job_id, None)
+        self._dead_letters[entry.job.job_id] = entry
+
+    async def list_dead_letters(
+        self,
+        limit: int = 100,
+        target: str | None = None,
+    ) -> list[DeadLetter]:
+        entries = (
+            entry
+            for entry in self._dead_letters.values()
+            if target is None or entry.job.target == target
+        )
+        return list(itertools.islice(entries, max(0, limit)))
+
+    async def get_dead_letter(self, job_id: str) -> DeadLetter | None:
+        return self._dead_letters.get(job_id)
+
+    async def delete_dead_letter(self, job_id: str) -> bool:
+        return self._dead_letters.pop(job_id, None) is not None
+
+    def _has_jobs(self) -> bool:
+        return any(self._lanes.values())
+
+    async def queue_depth(self) -> dict[str, int]:
+        depth = {str(lane): len(entries) for lane, entries in self._lanes.items()}
+        for _, _, job in self._delayed:
+            lane = str(_normalize_lane(job.lane))
+            depth[lane] += 1
+        return depth
+
+    def _push_ready(self, job: JobMessage) -> None:
+        heapq.heappush(
+            self._lanes[_normalize_lane(job.lane)],
+            (-job.priority, next(self._sequence), job),
+        )
+
+    def _promote_due_jobs(self) -> bool:
+        """Move due delayed jobs into their lanes; return whether any job is ready."""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            self._push_ready(heapq.heappop(self._delayed)[2])
+        return self._has_jobs()
 
     async def set_state(
         self,
@@ -265,28 +976,151 @@ class LocalJobQueue(JobQueue):
             status=status,
             details=details or {},
         )
-        self._states[job_id] = state
+        self._store_state(state)
+        await self._state_stored(state)
+        return state
+
+    async def transition_state(
+        self,
+        job_id: str,
+        status: JobStatus,
+        details: dict[str, Any] | None = None,
+        *,
+        expected: Collection[JobStatus | None] | None = None,
+    ) -> JobState | None:
+        # Reading and writing without an await in between keeps other
+        # coroutines out, which is all the locking one event loop needs.
+        state = _next_state(job_id, self._current_state(job_id), status, details, expected)
+        if state is None:
+            return None
+        self._store_state(state)
+        await self._state_stored(state)
         return state
 
     async def get_state(self, job_id: str) -> JobState | None:
+        return self._current_state(job_id)
+
+    def _current_state(self, job_id: str) -> JobState | None:
+        expires_at = self._expires_at.get(job_id)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._drop_state(job_id)
+            return None
         return self._states.get(job_id)
 
+    def _store_state(self, state: JobState) -> None:
+        job_id = state.job_id
+        self._states[job_id] = state
+        self._expires_at.pop(job_id, None)
+        if state.status in TERMINAL_JOB_STATUSES and self._terminal_state_ttl_s is not None:
+            expires_at = time.monotonic() + self._terminal_state_ttl_s
+            self._expires_at[job_id] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, job_id))
+            self._ensure_sweeper()
+
+    async def _state_stored(self, state: JobState) -> None:
+        self._notify_state_changed()
+        self._observe_state(state)
+        await _run_archive_hook(self._archive_hook, state)
+
+    async def watch_state(self, job_id: str) -> AsyncIterator[JobState]:
+        last: JobState | None = None
+        while True:
+            # Taken before reading the state, so a change in between is not missed.
+            changed = self._state_changed
+            # Not `get_state`: that would drop an expired terminal state unseen.
+            state = self._states.get(job_id)
+            if state is None and last is not None:
+                # Dropped while watched; nothing more will follow.
+                return
+            if state is not None and state is not last:
+                last = state
+                yield state
+                if state.status in TERMINAL_JOB_STATUSES:
+                    return
+            await changed.wait()
+
+    def sweep_expired_states(self) -> int:
+        """Drop every expired terminal state and return how many were removed."""
+        now = time.monotonic()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, job_id = heapq.heappop(self._expiry_heap)
+            if self._expires_at.get(job_id) == expires_at:
+                self._drop_state(job_id)
+                removed += 1
+        return removed
+
+    def _drop_state(self, job_id: str) -> None:
+        self._states.pop(job_id, None)
+        self._expires_at.pop(job_id, None)
+        self._update_logs.pop(job_id, None)
+        idempotency_key = self._job_idempotency_keys.pop(job_id, None)
+        if idempotency_key is not None and self._idempotency_keys.get(idempotency_key) == job_id:
+            del self._idempotency_keys[idempotency_key]
+        self._notify_state_changed()
+
+    def _notify_state_changed(self) -> None:
+        self._state_changed.set()
+        self._state_changed = asyncio.Event()
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_until_idle())
+
+    async def _sweep_until_idle(self) -> None:
+        while self._expiry_heap:
+            await asyncio.sleep(self._sweep_interval_s)
+            self.sweep_expired_states()
+
     async def publish_update(self, update: JobUpdate) -> None:
+        update = replace(update, cursor=str(next(self._update_sequence)))
+        log = self._update_logs.get(update.job_id)
+        if log is None:
+            log = self._update_logs[update.job_id] = deque(maxlen=self._update_log_size)
+        log.append(update)
         subscribers = self._subscribers.get(update.job_id, set())
         # Fan-out: every active subscriber for this job receives the same event.
+        # `offer` never waits, so a stalled subscriber cannot hold up the rest.
         for queue in subscribers:
-            await queue.put(update)
+            queue.offer(update)
 
-    async def subscribe_updates(self, job_id: str) -> JobUpdateSubscription:
-        queue: asyncio.Queue[JobUpdate] = asyncio.Queue()
+    async def subscribe_updates(
+        self,
+        job_id: str,
+        from_cursor: str | None = None,
+        *,
+        overflow_policy: OverflowPolicy | None = None,
+    ) -> JobUpdateSubscription:
+        queue: SubscriberQueue[JobUpdate] = SubscriberQueue(
+            self._subscriber_queue_size,
+            overflow_policy or self._overflow_policy,
+            coalesce_key=_progress_coalesce_key,
+            stats=self.fanout_stats,
+        )
+        backlog: list[JobUpdate] = []
+        if from_cursor is not None:
+            # No await between replay and registration, so nothing published
+            # in between can be missed or delivered twice.
+            after = _cursor_sequence(from_cursor)
+            backlog = [update for update in self._update_logs.get(job_id, ()) if int(update.cursor) > after]
         self._subscribers[job_id].add(queue)
-        return LocalJobUpdateSubscription(job_id, queue, self._detach_subscriber)
+        return LocalJobUpdateSubscription(job_id, queue, self._detach_subscriber, backlog)
 
     async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
         self._states.clear()
+        self._notify_state_changed()
+        self._expires_at.clear()
+        self._expiry_heap.clear()
         self._subscribers.clear()
+        self._update_logs.clear()
+        self._idempotency_keys.clear()
+        self._job_idempotency_keys.clear()
+        self._dead_letters.clear()
 
-    def _detach_subscriber(self, job_id: str, queue: asyncio.Queue[JobUpdate]) -> None:
+    def _detach_subscriber(self, job_id: str, queue: SubscriberQueue[JobUpdate]) -> None:
         subscribers = self._subscribers.get(job_id)
         if not subscribers:
             return
@@ -295,43 +1129,119 @@ class LocalJobQueue(JobQueue):
             self._subscribers.pop(job_id, None)
 
 
+def _stream_id_key(entry_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
 class RedisJobUpdateSubscription(JobUpdateSubscription):
-    """Redis Pub/Sub backed subscription for cross-worker update streaming."""
+    """Redis Pub/Sub backed subscription for cross-worker update streaming.
+
+    `backlog` holds updates replayed from the job's update log. Live messages
+    at or before the last replayed cursor are skipped, because the channel is
+    subscribed before the log is read and may repeat its tail.
+    """
 
-    def __init__(self, pubsub: Any, channel: str):
-        self._pubsub = pubsub
-        self._channel = channel
+    def __init__(
+        self,
+        subscription: PubSubSubscription,
+        backlog: list[JobUpdate] | None = None,
+        replayed_cursor: str | None = None,
+        codec: FrameCodec | None = None,
+    ):
+        self._subscription = subscription
+        self._codec = codec or FrameCodec()
+        self._backlog = deque(backlog or ())
+        self._replayed_key = _stream_id_key(replayed_cursor) if replayed_cursor else None
         self._closed = False
 
+    @property
+    def disconnected(self) -> bool:
+        return self._subscription.disconnected
+
     async def get(self, timeout: float | None = None) -> JobUpdate | None:
         if self._closed:
             return None
-        message = await self._pubsub.get_message(
-            ignore_subscribe_messages=True,
-            timeout=timeout,
-        )
-        if not message:
-            return None
-        data = message["data"]
-        if isinstance(data, bytes):
-            data = data.decode("utf-8")
-        return JobUpdate(**json.loads(data))
+        if self._backlog:
+            return self._backlog.popleft()
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            raw_update = await self._subscription.get(timeout=remaining)
+            if raw_update is None:
+                return None
+            update = JobUpdate(**self._codec.decode(raw_update))
+            if (
+                self._replayed_key is not None
+                and update.cursor is not None
+                and _stream_id_key(update.cursor) <= self._replayed_key
+            ):
+                continue
+            return update
 
     async def close(self) -> None:
         if self._closed:
             return
         self._closed = True
-        await self._pubsub.unsubscribe(self._channel)
-        await self._pubsub.close()
+        await self._subscription.close()
+
+
+# Attempts of a `WATCH` / `MULTI` check-and-set before `JobQueueConflict`,
+# and the jittered pause between them, growing with each attempt.
+_WATCH_ATTEMPTS = 10
+_WATCH_RETRY_DELAY_S = 0.005
+
+
+async def _watch_backoff(attempt: int) -> None:
+    await asyncio.sleep(random.uniform(0, _WATCH_RETRY_DELAY_S * (attempt + 1)))
 
 
 class RedisJobQueue(JobQueue):
     """Redis-backed queue for multi-worker deployments.
 
     Redis data model:
-    - Job queue: Redis list (`RPUSH` / `BLPOP`)
-    - Job states: Redis keys (`SET` / `GET`)
-    - Job updates: Redis Pub/Sub channels
+    - Job queue: one Redis list per `JobLane` (`RPUSH` / `BLPOP`, `LPOP count`
+      for batches). The `default` lane keeps `queue_name`; other lanes use
+      `{queue_name}:{lane}`. `BLPOP` takes the lane keys in `LaneSelector`
+      order, so it pops from the first non-empty lane.
+    - Delayed jobs: one sorted set per lane (`{lane key}:delayed`) scored by
+      due time. Dequeuers move due members into the lane at most every
+      `delayed_poll_interval_s`; the dequeuer whose `ZREM` removes a member
+      is the one that pushes it, so concurrent dispatchers never duplicate it.
+      Blocking pops are capped to the same interval so due jobs are noticed.
+    - Job states: Redis keys (`SET` / `GET`); terminal states are written with
+      `SET ... EX terminal_state_ttl_s` so Redis expires them. Every write is
+      also published on `{state_prefix}:changes:{job_id}` for `watch_state`,
+      so it needs no keyspace notification config on the server.
+      `transition_state` is a `WATCH` / `MULTI` check-and-set on the key,
+      retried with a jittered pause and given up with `JobQueueConflict`
+      when the state keeps changing under it.
+    - Idempotency: `enqueue_if_absent` `WATCH`es `{queue_name}:idempotency:{key}`
+      and the job's state key, and writes the key, the state, the reverse
+      mapping `{queue_name}:idempotency-of:{job_id}` and the push in one
+      `MULTI`, so only one of several concurrent submissions is pushed and
+      none is half-written. A key bound to a job without a state is stale and
+      taken over. The key and its mapping expire with the terminal state.
+    - Job updates: Redis Pub/Sub channels for live delivery, plus a capped
+      Redis Stream per job (`{updates_prefix}:log:{job_id}`, `XADD MAXLEN ~`)
+      as the replayable update log; stream entry ids are the cursors. The log
+      expires `update_log_ttl_s` seconds after the last update.
+    - Cancellation: `remove_pending` is not supported; cancelled jobs stay
+      queued and the dispatcher drops them when it dequeues them.
+    - Dead letters: a hash `{queue_name}:dead-letters` of job id -> entry,
+      ordered by a sorted set `{queue_name}:dead-letters:order` scored by the
+      time the job died.
+
+    Jobs, states and updates are serialized by `codec` (see `job_codec`);
+    the default writes plain JSON that every release can read.
+
+    Update subscriptions and state watches share `pubsub_connections`
+    pub/sub connections through a `RedisPubSubMultiplexer`, so the number of
+    Redis connections grows with processes, not with viewers. Both channels
+    of a job use the same connection, so an update published before the
+    terminal state also arrives before it. Subscribers
+    are buffered locally with `subscriber_queue_size` / `overflow_policy`.
 
     This enables stateless API workers where any worker can accept update posts
     and any other worker can stream those updates to connected clients.
@@ -343,49 +1253,154 @@ class RedisJobQueue(JobQueue):
         queue_name: str = "fair:jobs",
         updates_prefix: str = "fair:job-updates",
         state_prefix: str = "fair:job-states",
+        *,
+        lane_weights: dict[str, int] | None = None,
+        terminal_state_ttl_s: float | None = DEFAULT_TERMINAL_STATE_TTL_S,
+        archive_hook: JobStateArchiveHook | None = None,
+        update_log_size: int = DEFAULT_UPDATE_LOG_SIZE,
+        update_log_ttl_s: float = DEFAULT_TERMINAL_STATE_TTL_S,
+        delayed_poll_interval_s: float = 1.0,
+        codec: FrameCodec | None = None,
+        pubsub_connections: int = DEFAULT_PUBSUB_CONNECTIONS,
+        subscriber_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
     ):
         self._redis = redis_client
         self._queue_name = queue_name
         self._updates_prefix = updates_prefix
         self._state_prefix = state_prefix
+        self._selector = LaneSelector(lane_weights)
+        self._terminal_state_ttl_s = terminal_state_ttl_s
+        self._archive_hook = archive_hook
+        self._update_log_size = max(1, update_log_size)
+        self._update_log_ttl_s = max(1, int(update_log_ttl_s))
+        self._delayed_poll_interval_s = max(0.01, delayed_poll_interval_s)
+        self._next_promotion_at = 0.0
+        self._codec = codec or FrameCodec()
+        self._pubsub = RedisPubSubMultiplexer(
+            redis_client,
+            connections=pubsub_connections,
+            subscriber_queue_size=subscriber_queue_size,
+            overflow_policy=overflow_policy,
+        )
 
     @classmethod
-    async def from_url(
-        cls,
-        redis_url: str,
-        queue_name: str = "fair:jobs",
-        updates_prefix: str = "fair:job-updates",
-        state_prefix: str = "fair:job-states",
-    ) -> "RedisJobQueue":
+    async def from_url(cls, redis_url: str, **kwargs: Any) -> "RedisJobQueue":
         """Create a queue from a Redis URL.
 
         Import is lazy so local/dev mode can run without importing `redis` unless
-        Redis backend is actually selected.
+        Redis backend is actually selected. Extra keyword arguments are passed
+        to the constructor.
         """
 
         redis_module = importlib.import_module("redis.asyncio")
         redis_client = redis_module.from_url(redis_url, decode_responses=False)
-        return cls(
-            redis_client=redis_client,
-            queue_name=queue_name,
-            updates_prefix=updates_prefix,
-            state_prefix=state_prefix,
-        )
+        return cls(redis_client=redis_client, **kwargs)
 
-    async def enqueue(self, job: JobMessage) -> None:
-        await self._redis.rpush(self._queue_name, json.dumps(asdict(job)))
-        await self.set_state(job.job_id, JobStatus.QUEUED)
+    async def enqueue(self, job: JobMessage, not_before: datetime | None = None) -> None:
+        await self.enqueue_many([job], not_before=not_before)
+
+    async def enqueue_many(
+        self,
+        jobs: list[JobMessage],
+        not_before: datetime | None = None,
+    ) -> None:
+        if not jobs:
+            return
+        due_at = time.time() + _seconds_until(not_before) if not_before is not None else None
+        # One round trip for the pushes and the matching QUEUED states.
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job in jobs:
+                self._push_job(pipe, job, due_at)
+                state = JobState(job_id=job.job_id, status=JobStatus.QUEUED)
+                pipe.set(self._state_key(job.job_id), self._codec.encode(asdict(state)), nx=True)
+            await pipe.execute()
+
+    async def enqueue_if_absent(
+        self,
+        job: JobMessage,
+        not_before: datetime | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> DuplicateJob | None:
+        # One check-and-set for the key, the state, the reverse mapping and
+        # the push, so an interrupted submission leaves none of them behind.
+        watch_error = importlib.import_module("redis.exceptions").WatchError
+        state_key = self._state_key(job.job_id)
+        idempotency_key = None if job.idempotency_key is None else self._idempotency_key(job.idempotency_key)
+        state = JobState(job_id=job.job_id, status=JobStatus.QUEUED, details=dict(details or {}))
+        raw_state = self._codec.encode(asdict(state))
+        due_at = time.time() + _seconds_until(not_before) if not_before is not None else None
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for attempt in range(_WATCH_ATTEMPTS):
+                try:
+                    await pipe.watch(state_key)
+                    stale_owner = None
+                    if idempotency_key is not None:
+                        await pipe.watch(idempotency_key)
+                        existing = await pipe.get(idempotency_key)
+                        if existing is not None:
+                            existing = existing.decode("utf-8") if isinstance(existing, bytes) else existing
+                            await pipe.watch(self._state_key(existing))
+                            if await pipe.exists(self._state_key(existing)):
+                                return DuplicateJob(existing, DuplicateReason.IDEMPOTENCY_KEY)
+                            # Bound to a job that has no state: a submission
+                            # that never completed, or one whose state expired.
+                            stale_owner = self._idempotency_owner_key(existing)
+                    if await pipe.exists(state_key):
+                        return DuplicateJob(job.job_id, DuplicateReason.JOB_ID)
+                    pipe.multi()
+                    if stale_owner is not None:
+                        pipe.delete(stale_owner)
+                    if idempotency_key is not None:
+                        # No expiry yet: the key expires with the job's terminal state.
+                        pipe.set(idempotency_key, job.job_id)
+                        pipe.set(self._idempotency_owner_key(job.job_id), idempotency_key)
+                    pipe.set(state_key, raw_state)
+                    self._push_job(pipe, job, due_at)
+                    await pipe.execute()
+                    return None
+                except watch_error:
+                    await _watch_backoff(attempt)
+        raise JobQueueConflict(f"Could not enqueue job {job.job_id!r}: its keys kept changing")
 
     async def dequeue(self, timeout: float | None = None) -> JobMessage | None:
-        # `BLPOP timeout=0` means "block forever" in Redis.
-        redis_timeout = 0 if timeout is None else float(timeout)
-        response = await self._redis.blpop(self._queue_name, timeout=redis_timeout)
-        if response is None:
+        await self._promote_due_jobs()
+        keys = [self._lane_key(lane) for lane in self._selector.order()]
+        if timeout is not None and timeout <= 0:
+            for key in keys:
+                raw_payload = await self._redis.lpop(key)
+                if raw_payload is not None:
+                    return self._decode_job(raw_payload)
             return None
-        _, raw_payload = response
-        if isinstance(raw_payload, bytes):
-            raw_payload = raw_payload.decode("utf-8")
-        return JobMessage(**json.loads(raw_payload))
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + float(timeout)
+        while True:
+            block_s = self._delayed_poll_interval_s
+            if deadline is not None:
+                block_s = min(block_s, max(0.01, deadline - loop.time()))
+            response = await self._redis.blpop(keys, timeout=block_s)
+            if response is not None:
+                _, raw_payload = response
+                return self._decode_job(raw_payload)
+            if deadline is not None and loop.time() >= deadline:
+                return None
+            await self._promote_due_jobs()
+
+    async def dequeue_batch(
+        self,
+        max_items: int,
+        timeout: float | None = None,
+    ) -> list[JobMessage]:
+        first = await self.dequeue(timeout=timeout)
+        if first is None:
+            return []
+        jobs = [first]
+        for lane in JOB_LANE_ORDER:
+            if len(jobs) >= max_items:
+                break
+            raw_payloads = await self._redis.lpop(self._lane_key(lane), max_items - len(jobs)) or []
+            jobs.extend(self._decode_job(raw_payload) for raw_payload in raw_payloads)
+        return jobs
 
     async def set_state(
         self,
@@ -398,43 +1413,560 @@ class RedisJobQueue(JobQueue):
             status=status,
             details=details or {},
         )
-        key = self._state_key(job_id)
-        await self._redis.set(key, json.dumps(asdict(state)))
+        raw_state = self._codec.encode(asdict(state))
+        ttl = self._state_ttl(status)
+        idempotency_keys = await self._idempotency_keys_of(self._redis, job_id) if ttl is not None else []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._state_key(job_id), raw_state, ex=ttl)
+            for key in idempotency_keys:
+                pipe.expire(key, ttl)
+            pipe.publish(self._state_channel(job_id), raw_state)
+            await pipe.execute()
+        self._observe_state(state)
+        await _run_archive_hook(self._archive_hook, state)
+        return state
+
+    async def transition_state(
+        self,
+        job_id: str,
+        status: JobStatus,
+        details: dict[str, Any] | None = None,
+        *,
+        expected: Collection[JobStatus | None] | None = None,
+    ) -> JobState | None:
+        # Optimistic check-and-set: EXEC fails if the state changed after
+        # WATCH, and the transition is decided again on the fresh state.
+        # (A Lua script could not decode codec frames.)
+        watch_error = importlib.import_module("redis.exceptions").WatchError
+        state_key = self._state_key(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for attempt in range(_WATCH_ATTEMPTS):
+                try:
+                    await pipe.watch(state_key)
+                    raw_current = await pipe.get(state_key)
+                    current = None if raw_current is None else self._decode_state(raw_current)
+                    state = _next_state(job_id, current, status, details, expected)
+                    if state is None:
+                        return None
+                    raw_state = self._codec.encode(asdict(state))
+                    ttl = self._state_ttl(status)
+                    idempotency_keys = await self._idempotency_keys_of(pipe, job_id) if ttl is not None else []
+                    pipe.multi()
+                    pipe.set(state_key, raw_state, ex=ttl)
+                    for key in idempotency_keys:
+                        pipe.expire(key, ttl)
+                    pipe.publish(self._state_channel(job_id), raw_state)
+                    await pipe.execute()
+                    break
+                except watch_error:
+                    await _watch_backoff(attempt)
+            else:
+                raise JobQueueConflict(f"Could not move job {job_id!r} to {status}: its state kept changing")
+        self._observe_state(state)
+        await _run_archive_hook(self._archive_hook, state)
         return state
 
     async def get_state(self, job_id: str) -> JobState | None:
-        key = self._state_key(job_id)
-        raw_state = await self._redis.get(key)
+        raw_state = await self._redis.get(self._state_key(job_id))
         if raw_state is None:
             return None
-        if isinstance(raw_state, bytes):
-            raw_state = raw_state.decode("utf-8")
-        payload = json.loads(raw_state)
-        payload["status"] = JobStatus(payload["status"])
-        return JobState(**payload)
+        return self._decode_state(raw_state)
+
+    async def watch_state(self, job_id: str) -> AsyncIterator[JobState]:
+        # Subscribe before reading the state so no transition falls between.
+        # Only the newest state matters, so a slow watcher just drops old ones.
+        subscription = await self._pubsub.subscribe(
+            self._state_channel(job_id),
+            policy=OverflowPolicy.DROP_OLDEST,
+            shard_key=job_id,
+        )
+        try:
+            last: JobState | None = None
+            state = await self.get_state(job_id)
+            while True:
+                if _is_state_transition(last, state):
+                    last = state
+                    yield state
+                    if state.status in TERMINAL_JOB_STATUSES:
+                        return
+                raw_state = await subscription.get(timeout=STATE_WATCH_RESYNC_INTERVAL_S)
+                if raw_state is not None:
+                    state = self._decode_state(raw_state)
+                else:
+                    # Catch writes from processes that do not publish changes.
+                    state = await self.get_state(job_id)
+        finally:
+            await subscription.close()
 
     async def publish_update(self, update: JobUpdate) -> None:
-        channel = self._updates_channel(update.job_id)
-        await self._redis.publish(channel, json.dumps(asdict(update)))
+        log_key = self._updates_log_key(update.job_id)
+        entry_id = await self._redis.xadd(
+            log_key,
+            {"update": self._codec.encode(asdict(replace(update, cursor=None)))},
+            maxlen=self._update_log_size,
+            approximate=True,
+        )
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode("utf-8")
+        update = replace(update, cursor=entry_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.expire(log_key, self._update_log_ttl_s)
+            pipe.publish(self._updates_channel(update.job_id), self._codec.encode(asdict(update)))
+            await pipe.execute()
+
+    async def subscribe_updates(
+        self,
+        job_id: str,
+        from_cursor: str | None = None,
+        *,
+        overflow_policy: OverflowPolicy | None = None,
+    ) -> JobUpdateSubscription:
+        # Subscribe before reading the log so nothing falls between the two.
+        subscription = await self._pubsub.subscribe(
+            self._updates_channel(job_id),
+            policy=overflow_policy,
+            shard_key=job_id,
+        )
+        if from_cursor is None:
+            return RedisJobUpdateSubscription(subscription, codec=self._codec)
+        try:
+            entries = await self._redis.xrange(self._updates_log_key(job_id), min=f"({from_cursor}")
+        except BaseException:
+            await subscription.close()
+            raise
+        backlog = [self._decode_logged_update(entry_id, fields) for entry_id, fields in entries]
+        return RedisJobUpdateSubscription(
+            subscription,
+            backlog=backlog,
+            replayed_cursor=backlog[-1].cursor if backlog else from_cursor,
+            codec=self._codec,
+        )
 
-    async def subscribe_updates(self, job_id: str) -> JobUpdateSubscription:
-        channel = self._updates_channel(job_id)
-        pubsub = self._redis.pubsub()
-        await pubsub.subscribe(channel)
-        return RedisJobUpdateSubscription(pubsub=pubsub, channel=channel)
+    async def add_dead_letter(self, entry: DeadLetter) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._dead_letters_key, entry.job.job_id, self._codec.encode(asdict(entry)))
+            pipe.zadd(self._dead_letter_order_key, {entry.job.job_id: time.time()})
+            await pipe.execute()
+
+    async def list_dead_letters(
+        self,
+        limit: int = 100,
+        target: str | None = None,
+    ) -> list[DeadLetter]:
+        entries: list[DeadLetter] = []
+        page_size = max(limit, 100)
+        start = 0
+        while len(entries) < limit:
+            job_ids = await self._redis.zrange(self._dead_letter_order_key, start, start + page_size - 1)
+            if not job_ids:
+                break
+            start += len(job_ids)
+            for raw_entry in await self._redis.hmget(self._dead_letters_key, job_ids):
+                if raw_entry is None:
+                    continue
+                entry = DeadLetter.from_dict(self._codec.decode(raw_entry))
+                if target is None or entry.job.target == target:
+                    entries.append(entry)
+        return entries[:limit]
+
+    async def get_dead_letter(self, job_id: str) -> DeadLetter | None:
+        raw_entry = await self._redis.hget(self._dead_letters_key, job_id)
+        if raw_entry is None:
+            return None
+        return DeadLetter.from_dict(self._codec.decode(raw_entry))
+
+    async def delete_dead_letter(self, job_id: str) -> bool:
+        # HDEL decides which of several concurrent callers removed the entry.
+        removed = await self._redis.hdel(self._dead_letters_key, job_id)
+        await self._redis.zrem(self._dead_letter_order_key, job_id)
+        return bool(removed)
 
     async def close(self) -> None:
+        await self._pubsub.close()
         await self._redis.close()
 
     def _updates_channel(self, job_id: str) -> str:
         return f"{self._updates_prefix}:{job_id}"
 
+    def _updates_log_key(self, job_id: str) -> str:
+        return f"{self._updates_prefix}:log:{job_id}"
+
+    def _decode_logged_update(self, entry_id: bytes | str, fields: dict[Any, Any]) -> JobUpdate:
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode("utf-8")
+        raw_update = fields.get(b"update", fields.get("update"))
+        return replace(JobUpdate(**self._codec.decode(raw_update)), cursor=entry_id)
+
+    def _state_ttl(self, status: JobStatus) -> int | None:
+        if status not in TERMINAL_JOB_STATUSES or self._terminal_state_ttl_s is None:
+            return None
+        return max(1, int(self._terminal_state_ttl_s))
+
+    def _lane_key(self, lane: str | None) -> str:
+        lane = _normalize_lane(lane)
+        if lane == JobLane.DEFAULT:
+            return self._queue_name
+        return f"{self._queue_name}:{lane}"
+
+    @property
+    def _dead_letters_key(self) -> str:
+        return f"{self._queue_name}:dead-letters"
+
+    @property
+    def _dead_letter_order_key(self) -> str:
+        return f"{self._queue_name}:dead-letters:order"
+
+    def _idempotency_key(self, key: str) -> str:
+        return f"{self._queue_name}:idempotency:{key}"
+
+    def _idempotency_owner_key(self, job_id: str) -> str:
+        return f"{self._queue_name}:idempotency-of:{job_id}"
+
+    async def _idempotency_keys_of(self, client: Any, job_id: str) -> list[str]:
+        """The idempotency key bound to `job_id` and its reverse mapping, if any.
+
+        `client` may be a `WATCH`ed pipeline, which runs the `GET` at once.
+        """
+        owner_key = self._idempotency_owner_key(job_id)
+        key = await client.get(owner_key)
+        if key is None:
+            return []
+        return [key.decode("utf-8") if isinstance(key, bytes) else key, owner_key]
+
+    def _delayed_key(self, lane: str | None) -> str:
+        return f"{self._lane_key(lane)}:delayed"
+
+    def _push_job(self, pipe: Any, job: JobMessage, due_at: float | None) -> None:
+        raw_payload = self._codec.encode(asdict(job))
+        if due_at is not None:
+            pipe.zadd(self._delayed_key(job.lane), {raw_payload: due_at})
+        else:
+            self._push_ready(pipe, self._lane_key(job.lane), raw_payload)
+
+    def _push_ready(self, pipe: Any, lane_key: str, raw_payload: bytes | str) -> None:
+        pipe.rpush(lane_key, raw_payload)
+
+    def _ready_length(self, pipe: Any, lane_key: str) -> None:
+        pipe.llen(lane_key)
+
+    async def queue_depth(self) -> dict[str, int]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for lane in JOB_LANE_ORDER:
+                self._ready_length(pipe, self._lane_key(lane))
+                pipe.zcard(self._delayed_key(lane))
+            counts = await pipe.execute()
+        return {
+            str(lane): int(counts[2 * index] or 0) + int(counts[2 * index + 1] or 0)
+            for index, lane in enumerate(JOB_LANE_ORDER)
+        }
+
+    async def _promote_due_jobs(self) -> None:
+        """Move due delayed jobs into their lanes, at most every poll interval."""
+        now = time.monotonic()
+        if now < self._next_promotion_at:
+            return
+        self._next_promotion_at = now + self._delayed_poll_interval_s
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for lane in JOB_LANE_ORDER:
+                pipe.zrangebyscore(self._delayed_key(lane), "-inf", time.time(), start=0, num=100)
+            due_by_lane = await pipe.execute()
+        due = [
+            (lane, raw_payload)
+            for lane, raw_payloads in zip(JOB_LANE_ORDER, due_by_lane)
+            for raw_payload in raw_payloads
+        ]
+        if not due:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for lane, raw_payload in due:
+                pipe.zrem(self._delayed_key(lane), raw_payload)
+            removed = await pipe.execute()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for (lane, raw_payload), claimed in zip(due, removed):
+                if claimed:
+                    self._push_ready(pipe, self._lane_key(lane), raw_payload)
+            await pipe.execute()
+
+    def _decode_job(self, raw_payload: bytes | str) -> JobMessage:
+        return JobMessage(**self._codec.decode(raw_payload))
+
     def _state_key(self, job_id: str) -> str:
         return f"{self._state_prefix}:{job_id}"
 
+    def _state_channel(self, job_id: str) -> str:
+        return f"{self._state_prefix}:changes:{job_id}"
+
+    def _decode_state(self, raw_state: bytes | str) -> JobState:
+        payload = self._codec.decode(raw_state)
+        payload["status"] = JobStatus(payload["status"])
+        return JobState(**payload)
+
+
+# `XAUTOCLAIM` scans per lane within one visibility timeout.
+_RECLAIMS_PER_VISIBILITY_TIMEOUT = 4
+
+
+class RedisStreamJobQueue(RedisJobQueue):
+    """Redis Streams backed queue with consumer groups and at-least-once delivery.
+
+    Redis data model:
+    - Job queue: one Redis stream per `JobLane` (`XADD` / `XREADGROUP`), keyed
+      like the lists of `RedisJobQueue` and read by one consumer group
+    - Acknowledgement: `XACK` + `XDEL` once the dispatcher calls `ack`
+    - Recovery: `XAUTOCLAIM` hands jobs that stayed unacknowledged for longer
+      than `visibility_timeout_s` to another consumer. Each lane is scanned
+      at most once per `reclaim_interval_s` (a quarter of the visibility
+      timeout by default), not on every dequeue
+    - Job states and updates: same keys/channels as `RedisJobQueue`
+
+    A dispatcher that crashes mid-delivery leaves its job pending in the group,
+    so another dispatcher picks it up once the visibility timeout elapses.
+    Reclaimed jobs whose state already moved past `DISPATCHED` were delivered
+    before the crash and are acknowledged instead of being sent twice.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        queue_name: str = "fair:job-stream",
+        updates_prefix: str = "fair:job-updates",
+        state_prefix: str = "fair:job-states",
+        *,
+        lane_weights: dict[str, int] | None = None,
+        terminal_state_ttl_s: float | None = DEFAULT_TERMINAL_STATE_TTL_S,
+        archive_hook: JobStateArchiveHook | None = None,
+        update_log_size: int = DEFAULT_UPDATE_LOG_SIZE,
+        update_log_ttl_s: float = DEFAULT_TERMINAL_STATE_TTL_S,
+        delayed_poll_interval_s: float = 1.0,
+        codec: FrameCodec | None = None,
+        pubsub_connections: int = DEFAULT_PUBSUB_CONNECTIONS,
+        subscriber_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        group_name: str = "fair:dispatchers",
+        consumer_name: str | None = None,
+        visibility_timeout_s: float = 60.0,
+        reclaim_interval_s: float | None = None,
+    ):
+        super().__init__(
+            redis_client=redis_client,
+            queue_name=queue_name,
+            updates_prefix=updates_prefix,
+            state_prefix=state_prefix,
+            lane_weights=lane_weights,
+            terminal_state_ttl_s=terminal_state_ttl_s,
+            archive_hook=archive_hook,
+            update_log_size=update_log_size,
+            update_log_ttl_s=update_log_ttl_s,
+            delayed_poll_interval_s=delayed_poll_interval_s,
+            codec=codec,
+            pubsub_connections=pubsub_connections,
+            subscriber_queue_size=subscriber_queue_size,
+            overflow_policy=overflow_policy,
+        )
+        self._group_name = group_name
+        self._consumer_name = consumer_name or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        )
+        self._visibility_timeout_ms = max(0, int(visibility_timeout_s * 1000))
+        if reclaim_interval_s is None:
+            reclaim_interval_s = visibility_timeout_s / _RECLAIMS_PER_VISIBILITY_TIMEOUT
+        self._reclaim_interval_s = max(0.0, reclaim_interval_s)
+        # Monotonic time of each lane's last complete `XAUTOCLAIM` scan.
+        self._last_reclaim: dict[str, float] = {}
+        self._group_ready = False
+        # Stream key and entry id of jobs handed out by this consumer, keyed by
+        # the identity of the returned `JobMessage` so a re-enqueued copy of the
+        # same job id never acknowledges the wrong entry.
+        self._pending: dict[int, tuple[JobMessage, str, bytes | str]] = {}
+
+    async def enqueue_many(
+        self,
+        jobs: list[JobMessage],
+        not_before: datetime | None = None,
+    ) -> None:
+        if not jobs:
+            return
+        await self._ensure_group()
+        await super().enqueue_many(jobs, not_before=not_before)
+
+    async def enqueue_if_absent(
+        self,
+        job: JobMessage,
+        not_before: datetime | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> DuplicateJob | None:
+        await self._ensure_group()
+        return await super().enqueue_if_absent(job, not_before=not_before, details=details)
+
+    def _push_ready(self, pipe: Any, lane_key: str, raw_payload: bytes | str) -> None:
+        pipe.xadd(lane_key, {"job": raw_payload})
+
+    def _ready_length(self, pipe: Any, lane_key: str) -> None:
+        # Entries stay in the stream until acknowledged, so in-flight jobs count too.
+        pipe.xlen(lane_key)
+
+    async def dequeue(self, timeout: float | None = None) -> JobMessage | None:
+        jobs = await self.dequeue_batch(1, timeout=timeout)
+        return jobs[0] if jobs else None
+
+    async def dequeue_batch(
+        self,
+        max_items: int,
+        timeout: float | None = None,
+    ) -> list[JobMessage]:
+        await self._ensure_group()
+        await self._promote_due_jobs()
+        max_items = max(1, max_items)
+        jobs: list[JobMessage] = []
+        now = time.monotonic()
+        for lane in JOB_LANE_ORDER:
+            if len(jobs) >= max_items:
+                return jobs
+            stream_key = self._lane_key(lane)
+            last = self._last_reclaim.get(stream_key)
+            if last is not None and now - last < self._reclaim_interval_s:
+                continue
+            wanted = max_items - len(jobs)
+            claimed = await self._claim_stale(stream_key, wanted)
+            if len(claimed) < wanted:
+                # Scanned to the end; a full batch may have left more behind.
+                self._last_reclaim[stream_key] = now
+            jobs.extend(claimed)
+        if jobs:
+            return jobs
+
+        # Non-blocking pass in weighted lane order first, because one
+        # XREADGROUP over several streams does not prefer any of them.
+        for lane in self._selector.order():
+            if len(jobs) >= max_items:
+                break
+            jobs.extend(await self._read_group([self._lane_key(lane)], max_items - len(jobs), None))
+        if jobs or (timeout is not None and timeout <= 0):
+            return jobs
+
+        # Nothing queued: block on every lane at once. COUNT applies per
+        # stream, so ask for one entry each to stay close to `max_items`.
+        # Blocks are capped so delayed jobs are promoted once they are due.
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + float(timeout)
+        keys = [self._lane_key(lane) for lane in JOB_LANE_ORDER]
+        while True:
+            block_s = self._delayed_poll_interval_s
+            if deadline is not None:
+                block_s = min(block_s, deadline - loop.time())
+            jobs = await self._read_group(keys, 1, max(1, int(block_s * 1000)))
+            if jobs or (deadline is not None and loop.time() >= deadline):
+                return jobs
+            await self._promote_due_jobs()
+
+    async def ack(self, job: JobMessage) -> None:
+        pending = self._pending.pop(id(job), None)
+        if pending is None:
+            return
+        _, stream_key, entry_id = pending
+        await self._ack_entry(stream_key, entry_id)
+
+    async def _read_group(
+        self,
+        stream_keys: list[str],
+        count: int,
+        block_ms: int | None,
+    ) -> list[JobMessage]:
+        response = await self._redis.xreadgroup(
+            self._group_name,
+            self._consumer_name,
+            streams={key: ">" for key in stream_keys},
+            count=count,
+            block=block_ms,
+        )
+        jobs: list[JobMessage] = []
+        for raw_key, entries in response or []:
+            stream_key = raw_key.decode("utf-8") if isinstance(raw_key, bytes) else raw_key
+            jobs.extend(self._track(stream_key, entry_id, fields) for entry_id, fields in entries)
+        return jobs
+
+    async def _claim_stale(self, stream_key: str, max_items: int) -> list[JobMessage]:
+        """Take over jobs another consumer left unacknowledged for too long."""
+
+        start_id: bytes | str = "0-0"
+        jobs: list[JobMessage] = []
+        while len(jobs) < max_items:
+            response = await self._redis.xautoclaim(
+                stream_key,
+                self._group_name,
+                self._consumer_name,
+                min_idle_time=self._visibility_timeout_ms,
+                start_id=start_id,
+                count=max_items - len(jobs),
+            )
+            entries = response[1] if response else []
+            if not entries:
+                break
+            for entry_id, fields in entries:
+                if not fields:
+                    # Entry was deleted while pending; drop it from the group.
+                    await self._redis.xack(stream_key, self._group_name, entry_id)
+                    continue
+                job = self._track(stream_key, entry_id, fields)
+                state = await self.get_state(job.job_id)
+                if state is not None and state.status not in {JobStatus.QUEUED, JobStatus.DISPATCHED}:
+                    await self.ack(job)
+                    continue
+                jobs.append(job)
+            start_id = response[0]
+            if start_id in (b"0-0", "0-0"):
+                break
+        return jobs
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        for lane in JOB_LANE_ORDER:
+            try:
+                await self._redis.xgroup_create(
+                    self._lane_key(lane),
+                    self._group_name,
+                    id="0",
+                    mkstream=True,
+                )
+            except Exception as exc:
+                # Another worker created the group first.
+                if "BUSYGROUP" not in str(exc):
+                    raise
+        self._group_ready = True
+
+    async def _ack_entry(self, stream_key: str, entry_id: bytes | str) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.xack(stream_key, self._group_name, entry_id)
+            pipe.xdel(stream_key, entry_id)
+            await pipe.execute()
+
+    def _track(self, stream_key: str, entry_id: bytes | str, fields: dict[Any, Any]) -> JobMessage:
+        job = self._decode_job(fields.get(b"job", fields.get("job")))
+        self._pending[id(job)] = (job, stream_key, entry_id)
+        return job
+
+
+def _terminal_state_ttl_from_env() -> float | None:
+    raw = os.getenv("FAIR_JOB_STATE_TTL", "").strip()
+    if not raw:
+        return DEFAULT_TERMINAL_STATE_TTL_S
+    ttl = float(raw)
+    return ttl if ttl > 0 else None
+
+
+def _archive_hook_from_env() -> JobStateArchiveHook | None:
+    raw = os.getenv("FAIR_JOB_STATE_ARCHIVE", "0").strip().lower()
+    if raw not in {"1", "true", "yes", "on"}:
+        return None
+    # Lazy import keeps the queue module free of database imports by default.
+    from fair_platform.backend.services.job_state_archive import archive_job_state
+
+    return archive_job_state
+
 
 def get_job_queue_backend() -> str:
-    """Return the normalized queue backend name (`local` or `redis`)."""
+    """Return the normalized queue backend name (`local`, `redis`, `redis-streams` or `sql`)."""
     return os.getenv("FAIR_JOB_QUEUE_BACKEND", "local").strip().lower()
 
 
@@ -442,41 +1974,133 @@ async def create_job_queue() -> JobQueue:
     """Factory that builds the configured queue backend.
 
     Environment variables:
-    - `FAIR_JOB_QUEUE_BACKEND`: `local` (default) or `redis`
-    - `FAIR_REDIS_URL`: Redis connection URL for redis backend
-    - `FAIR_JOB_QUEUE_NAME`: list key for pending jobs
+    - `FAIR_JOB_QUEUE_BACKEND`: `local` (default), `redis`, `redis-streams`
+      or `sql` (tables in the `DATABASE_URL` database)
+    - `FAIR_REDIS_URL`: Redis connection URL for Redis backends
+    - `FAIR_JOB_QUEUE_NAME`: list (or stream) key for pending jobs
     - `FAIR_JOB_UPDATES_PREFIX`: pub/sub channel prefix
     - `FAIR_JOB_STATE_PREFIX`: key prefix for persisted states
+    - `FAIR_JOB_QUEUE_LANE_WEIGHTS`: lane weights, e.g.
+      `interactive=10,default=3,bulk=1`
+    - `FAIR_JOB_STATE_TTL`: seconds terminal job states are kept (default:
+      86400, `0` keeps them forever)
+    - `FAIR_JOB_STATE_ARCHIVE`: `1` copies terminal states into the
+      `job_state_archive` table
+    - `FAIR_JOB_UPDATE_LOG_SIZE`: updates kept per job for replay by the
+      `local` and Redis backends (default: 1000)
+    - `FAIR_SUBSCRIBER_QUEUE_SIZE` / `FAIR_SUBSCRIBER_OVERFLOW_POLICY`: bound
+      and overflow policy of in-process update subscribers (see `fanout`)
+    - `FAIR_REDIS_PUBSUB_CONNECTIONS`: shared pub/sub connections per Redis
+      queue (default: 1)
+    - `FAIR_JOB_QUEUE_GROUP`: consumer group name for `redis-streams`
+    - `FAIR_JOB_QUEUE_VISIBILITY_TIMEOUT`: seconds before an unacknowledged
+      job is redelivered by `redis-streams` (default: 60)
+    - `FAIR_JOB_QUEUE_POLL_INTERVAL`: seconds between `sql` polls when no
+      notification arrives, and between Redis checks for due delayed jobs
+      (default: 0.5)
+    - `FAIR_JOB_QUEUE_CODEC` / `FAIR_JOB_QUEUE_COMPRESSION_THRESHOLD`: wire
+      codec and zstd threshold of Redis backends (see `job_codec`)
     """
 
     backend = get_job_queue_backend()
+    lane_weights = parse_lane_weights(os.getenv("FAIR_JOB_QUEUE_LANE_WEIGHTS"))
+    state_options: dict[str, Any] = {
+        "terminal_state_ttl_s": _terminal_state_ttl_from_env(),
+        "archive_hook": _archive_hook_from_env(),
+    }
+    update_log_size = int(os.getenv("FAIR_JOB_UPDATE_LOG_SIZE", str(DEFAULT_UPDATE_LOG_SIZE)))
+    poll_interval_s = float(os.getenv("FAIR_JOB_QUEUE_POLL_INTERVAL", "0.5"))
     if backend == "local":
-        return LocalJobQueue()
-    if backend == "redis":
+        return LocalJobQueue(
+            lane_weights=lane_weights,
+            **state_options,
+            update_log_size=update_log_size,
+            subscriber_queue_size=subscriber_queue_size_from_env(),
+            overflow_policy=overflow_policy_from_env(),
+        )
+    if backend == "sql":
+        # Lazy import keeps SQLAlchemy models out of Redis/local deployments.
+        from fair_platform.backend.services.sql_job_queue import SqlJobQueue
+
+        return SqlJobQueue(
+            lane_weights=lane_weights,
+            **state_options,
+            poll_interval_s=poll_interval_s,
+        )
+    if backend in {"redis", "redis-streams"}:
         redis_url = os.getenv("FAIR_REDIS_URL", "redis://127.0.0.1:6379/0")
-        queue_name = os.getenv("FAIR_JOB_QUEUE_NAME", "fair:jobs")
         updates_prefix = os.getenv("FAIR_JOB_UPDATES_PREFIX", "fair:job-updates")
         state_prefix = os.getenv("FAIR_JOB_STATE_PREFIX", "fair:job-states")
-        return await RedisJobQueue.from_url(
+        codec = frame_codec_from_env()
+        pubsub_options: dict[str, Any] = {
+            "pubsub_connections": int(
+                os.getenv("FAIR_REDIS_PUBSUB_CONNECTIONS", str(DEFAULT_PUBSUB_CONNECTIONS))
+            ),
+            "subscriber_queue_size": subscriber_queue_size_from_env(),
+            "overflow_policy": overflow_policy_from_env(),
+        }
+        if backend == "redis":
+            return await RedisJobQueue.from_url(
+                redis_url=redis_url,
+                queue_name=os.getenv("FAIR_JOB_QUEUE_NAME", "fair:jobs"),
+                updates_prefix=updates_prefix,
+                state_prefix=state_prefix,
+                lane_weights=lane_weights,
+                **state_options,
+                update_log_size=update_log_size,
+                delayed_poll_interval_s=poll_interval_s,
+                codec=codec,
+                **pubsub_options,
+            )
+        return await RedisStreamJobQueue.from_url(
             redis_url=redis_url,
-            queue_name=queue_name,
+            queue_name=os.getenv("FAIR_JOB_QUEUE_NAME", "fair:job-stream"),
             updates_prefix=updates_prefix,
             state_prefix=state_prefix,
+            lane_weights=lane_weights,
+            **state_options,
+            update_log_size=update_log_size,
+            delayed_poll_interval_s=poll_interval_s,
+            codec=codec,
+            **pubsub_options,
+            group_name=os.getenv("FAIR_JOB_QUEUE_GROUP", "fair:dispatchers"),
+            visibility_timeout_s=float(os.getenv("FAIR_JOB_QUEUE_VISIBILITY_TIMEOUT", "60")),
         )
     raise ValueError(
-        f"Unsupported FAIR_JOB_QUEUE_BACKEND value: {backend!r}. Expected 'local' or 'redis'."
+        f"Unsupported FAIR_JOB_QUEUE_BACKEND value: {backend!r}. "
+        "Expected 'local', 'redis', 'redis-streams' or 'sql'."
     )
 
 
 __all__ = [
     "JobStatus",
+    "TERMINAL_JOB_STATUSES",
+    "can_transition",
+    "merge_details",
+    "DEFAULT_TERMINAL_STATE_TTL_S",
+    "DEFAULT_UPDATE_LOG_SIZE",
+    "JOB_UPDATES_FROM_START",
+    "STATE_WATCH_POLL_INTERVAL_S",
+    "STATE_WATCH_RESYNC_INTERVAL_S",
+    "JobStateArchiveHook",
+    "JobLane",
+    "JOB_LANE_ORDER",
+    "DEFAULT_LANE_WEIGHTS",
+    "LaneSelector",
+    "parse_lane_weights",
     "JobMessage",
     "JobState",
     "JobUpdate",
+    "DeadLetter",
+    "DuplicateReason",
+    "DuplicateJob",
+    "JobQueueConflict",
     "JobUpdateSubscription",
     "JobQueue",
+    "JobStateWatch",
     "LocalJobQueue",
     "RedisJobQueue",
+    "RedisStreamJobQueue",
     "get_job_queue_backend",
     "create_job_queue",
 ]
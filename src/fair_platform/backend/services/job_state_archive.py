@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from fair_platform.backend.data.database import get_session
+from fair_platform.backend.data.models import JobStateArchive
+from fair_platform.backend.services.job_queue import JobState
+
+
+def _store_job_state(state: JobState) -> None:
+    with get_session() as db:
+        row = db.get(JobStateArchive, state.job_id)
+        if row is None:
+            row = JobStateArchive(job_id=state.job_id)
+        row.status = str(state.status)
+        row.details = dict(state.details)
+        row.updated_at = state.updated_at
+        row.archived_at = datetime.now(timezone.utc)
+        db.add(row)
+        db.commit()
+
+
+async def archive_job_state(state: JobState) -> None:
+    """`JobStateArchiveHook` that upserts a terminal state into `job_state_archive`.
+
+    The write runs in a worker thread so the event loop is not blocked on the
+    synchronous SQLAlchemy session.
+    """
+    await asyncio.to_thread(_store_job_state, state)
+
+
+__all__ = ["archive_job_state"]
@@ -0,0 +1,227 @@
+"""Shared Redis pub/sub connections for job updates and state changes.
+
+Opening a `pubsub()` per subscriber costs one Redis connection per SSE viewer
+and workflow step. `RedisPubSubMultiplexer` instead keeps `connections`
+long-lived pub/sub connections per queue (so per process) and spreads
+channels over them by hash of a shard key (the channel by default). Each channel is subscribed on Redis once, with a
+reference count of local subscribers; a reader task per connection hands
+every message to the subscribers' bounded `SubscriberQueue`s without
+waiting on them, and the last subscriber to leave unsubscribes the channel.
+
+`subscribe` returns once Redis confirmed the subscription, so callers can
+subscribe first and then read persisted history without missing messages.
+Redis delivers the messages of one connection in publish order, so channels
+that must stay ordered relative to each other (a job's updates and its state
+changes) share a shard key.
+redis-py re-subscribes every channel after it reconnects a connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import zlib
+from typing import Any
+
+from fair_platform.backend.services.fanout import (
+    DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+    FanoutStats,
+    OverflowPolicy,
+    SubscriberQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUBSUB_CONNECTIONS = 1
+SUBSCRIBE_CONFIRM_TIMEOUT_S = 5.0
+_READ_TIMEOUT_S = 1.0
+_READ_ERROR_BACKOFF_S = 0.5
+
+
+def _as_str(value: bytes | str) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class PubSubSubscription:
+    """One local subscriber to a channel of a `RedisPubSubMultiplexer`."""
+
+    def __init__(self, shard: "_PubSubShard", channel: str, queue: SubscriberQueue[bytes]):
+        self._shard = shard
+        self._channel = channel
+        self._queue = queue
+        self._closed = False
+
+    @property
+    def channel(self) -> str:
+        return self._channel
+
+    @property
+    def disconnected(self) -> bool:
+        """`True` once the subscriber was dropped for falling behind."""
+        return self._queue.disconnected
+
+    async def get(self, timeout: float | None = None) -> bytes | None:
+        """Return the next raw message, or `None` on timeout or once closed."""
+        if self._closed:
+            return None
+        return await self._queue.get(timeout=timeout)
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        await self._shard.remove(self._channel, self._queue)
+
+
+class _PubSubShard:
+    """One pub/sub connection, its channel reference counts and reader task."""
+
+    def __init__(self, redis_client: Any):
+        self._pubsub = redis_client.pubsub()
+        self._subscribers: dict[str, set[SubscriberQueue[bytes]]] = {}
+        self._confirmed: dict[str, asyncio.Event] = {}
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.Task[None] | None = None
+
+    @property
+    def channel_count(self) -> int:
+        return len(self._subscribers)
+
+    async def add(self, channel: str, queue: SubscriberQueue[bytes]) -> None:
+        async with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                self._subscribers[channel] = {queue}
+                confirmed = self._confirmed[channel] = asyncio.Event()
+                await self._pubsub.subscribe(channel)
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read())
+            else:
+                subscribers.add(queue)
+                confirmed = self._confirmed[channel]
+        try:
+            await asyncio.wait_for(confirmed.wait(), timeout=SUBSCRIBE_CONFIRM_TIMEOUT_S)
+        except TimeoutError:
+            logger.warning("Redis did not confirm the subscription to %s in time", channel)
+
+    async def remove(self, channel: str, queue: SubscriberQueue[bytes]) -> None:
+        async with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                return
+            subscribers.discard(queue)
+            if subscribers:
+                return
+            del self._subscribers[channel]
+            self._confirmed.pop(channel, None)
+            await self._pubsub.unsubscribe(channel)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        self._subscribers.clear()
+        self._confirmed.clear()
+        await self._pubsub.close()
+
+    async def _read(self) -> None:
+        # Runs while channels are subscribed; `add` restarts it. Without
+        # subscriptions `get_message` can return at once and spin.
+        while self._subscribers:
+            try:
+                message = await self._pubsub.get_message(timeout=_READ_TIMEOUT_S)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Reading from the shared Redis pub/sub connection failed", exc_info=True)
+                await asyncio.sleep(_READ_ERROR_BACKOFF_S)
+                continue
+            if not message:
+                continue
+            channel = _as_str(message["channel"])
+            kind = _as_str(message["type"])
+            if kind == "subscribe":
+                confirmed = self._confirmed.get(channel)
+                if confirmed is not None:
+                    confirmed.set()
+            elif kind == "message":
+                for queue in tuple(self._subscribers.get(channel, ())):
+                    queue.offer(message["data"])
+
+
+class RedisPubSubMultiplexer:
+    """Multiplexes channel subscriptions over a few shared pub/sub connections.
+
+    Connections are opened lazily by the first subscription routed to them.
+    Subscribers get bounded queues (`subscriber_queue_size`,
+    `overflow_policy`) so one slow subscriber never holds up the others.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        connections: int = DEFAULT_PUBSUB_CONNECTIONS,
+        subscriber_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        stats: FanoutStats | None = None,
+    ):
+        self._redis = redis_client
+        self._shards: list[_PubSubShard | None] = [None] * max(1, connections)
+        self._subscriber_queue_size = subscriber_queue_size
+        self._overflow_policy = OverflowPolicy(overflow_policy)
+        self.stats = stats if stats is not None else FanoutStats()
+
+    @property
+    def connection_count(self) -> int:
+        """Pub/sub connections opened so far."""
+        return sum(1 for shard in self._shards if shard is not None)
+
+    @property
+    def channel_count(self) -> int:
+        """Channels currently subscribed on Redis."""
+        return sum(shard.channel_count for shard in self._shards if shard is not None)
+
+    async def subscribe(
+        self,
+        channel: str,
+        *,
+        maxsize: int | None = None,
+        policy: OverflowPolicy | None = None,
+        shard_key: str | None = None,
+    ) -> PubSubSubscription:
+        """Subscribe to `channel` on the connection chosen by `shard_key` (default: `channel`)."""
+        queue: SubscriberQueue[bytes] = SubscriberQueue(
+            maxsize if maxsize is not None else self._subscriber_queue_size,
+            policy if policy is not None else self._overflow_policy,
+            stats=self.stats,
+        )
+        shard = self._shard_for(shard_key if shard_key is not None else channel)
+        await shard.add(channel, queue)
+        return PubSubSubscription(shard, channel, queue)
+
+    async def close(self) -> None:
+        shards = [shard for shard in self._shards if shard is not None]
+        self._shards = [None] * len(self._shards)
+        for shard in shards:
+            await shard.close()
+
+    def _shard_for(self, shard_key: str) -> _PubSubShard:
+        # crc32 is stable across processes, unlike `hash()` of a str.
+        index = zlib.crc32(shard_key.encode("utf-8")) % len(self._shards)
+        shard = self._shards[index]
+        if shard is None:
+            shard = self._shards[index] = _PubSubShard(self._redis)
+        return shard
+
+
+__all__ = [
+    "DEFAULT_PUBSUB_CONNECTIONS",
+    "SUBSCRIBE_CONFIRM_TIMEOUT_S",
+    "PubSubSubscription",
+    "RedisPubSubMultiplexer",
+]
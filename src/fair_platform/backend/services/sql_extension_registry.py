@@ -0,0 +1,195 @@
+"""Extension registry stored in the platform's SQL database.
+
+`LocalExtensionRegistry` only lives in the API process that received the
+`connect` call, so a standalone `fair dispatcher` would never see the
+extension. `SqlExtensionRegistry` keeps registrations in the
+`extension_registrations` table instead, which every API, dispatcher and
+runner process shares through `DATABASE_URL`.
+
+Dispatchers look an extension up for every job, so `get` results are cached
+for `cache_ttl_s` seconds; a reconnect with a new webhook URL or new limits
+reaches other processes within that time.
+
+Replicas of an extension are stored in the row's `instances` column. The row
+is locked while a `connect` or heartbeat updates its instance, so replicas
+reporting at the same time through different API processes do not drop
+each other. Instances that missed their heartbeats are left out on read and
+removed by the next write. The row outlives its last instance, so the
+extension reads as offline (no instances) rather than unknown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from fair_platform.backend.data.models.extension_registration import ExtensionRegistrationRecord
+from fair_platform.backend.services.extension_registry import (
+    ExtensionInstance,
+    ExtensionRegistration,
+    expire_instances,
+    merge_registration,
+    record_heartbeat,
+)
+
+DEFAULT_CACHE_TTL_S = 2.0
+
+
+def _to_registration(record: ExtensionRegistrationRecord) -> ExtensionRegistration:
+    return ExtensionRegistration(
+        extension_id=record.extension_id,
+        webhook_url=record.webhook_url,
+        intents=list(record.intents or []),
+        capabilities=list(record.capabilities or []),
+        metadata=dict(record.metadata_ or {}),
+        enabled=record.enabled,
+        max_concurrency=record.max_concurrency,
+        rate_limit_per_s=record.rate_limit_per_s,
+        rate_limit_burst=record.rate_limit_burst,
+        batch_max_jobs=record.batch_max_jobs,
+        batch_max_wait_ms=record.batch_max_wait_ms,
+        instances=[ExtensionInstance(**instance) for instance in record.instances or []],
+    )
+
+
+class SqlExtensionRegistry:
+    """Database-backed registry with the `LocalExtensionRegistry` methods."""
+
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        *,
+        cache_ttl_s: float = DEFAULT_CACHE_TTL_S,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        if engine is None:
+            from fair_platform.backend.data.database import engine as default_engine
+
+            engine = default_engine
+        self._sessions = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, future=True)
+        self._cache_ttl_s = cache_ttl_s
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._cache: dict[str, tuple[float, ExtensionRegistration | None]] = {}
+
+    async def register(self, registration: ExtensionRegistration) -> ExtensionRegistration:
+        registration = await asyncio.to_thread(self._store, registration)
+        self._cache.pop(registration.extension_id, None)
+        return registration
+
+    async def heartbeat(
+        self,
+        extension_id: str,
+        instance_id: str,
+        *,
+        in_flight: int = 0,
+        queue_length: int = 0,
+    ) -> ExtensionInstance | None:
+        """Record a heartbeat; `None` when the instance is unknown or expired."""
+        return await asyncio.to_thread(self._store_heartbeat, extension_id, instance_id, in_flight, queue_length)
+
+    async def get(self, extension_id: str) -> ExtensionRegistration | None:
+        cached = self._cache.get(extension_id)
+        if cached is not None and self._clock() - cached[0] < self._cache_ttl_s:
+            extension = cached[1]
+        else:
+            extension = await asyncio.to_thread(self._load, extension_id)
+            self._cache[extension_id] = (self._clock(), extension)
+        if extension is not None:
+            extension = expire_instances(extension, self._wall_clock())
+        if extension is None or not extension.enabled:
+            return None
+        return extension
+
+    async def list(self) -> list[ExtensionRegistration]:
+        now = self._wall_clock()
+        extensions = [expire_instances(extension, now) for extension in await asyncio.to_thread(self._load_enabled)]
+        return [extension for extension in extensions if extension.instances]
+
+    async def unregister(self, extension_id: str) -> None:
+        await asyncio.to_thread(self._delete, extension_id)
+        self._cache.pop(extension_id, None)
+
+    def _store(self, registration: ExtensionRegistration) -> ExtensionRegistration:
+        with self._sessions() as session:
+            record = session.get(ExtensionRegistrationRecord, registration.extension_id, with_for_update=True)
+            now = self._wall_clock()
+            current = expire_instances(_to_registration(record), now) if record is not None else None
+            registration = merge_registration(current, registration, seen_at=now)
+            if record is None:
+                record = ExtensionRegistrationRecord(extension_id=registration.extension_id)
+                session.add(record)
+            record.webhook_url = registration.webhook_url
+            record.intents = list(registration.intents)
+            record.capabilities = list(registration.capabilities)
+            record.metadata_ = dict(registration.metadata)
+            record.enabled = registration.enabled
+            record.max_concurrency = registration.max_concurrency
+            record.rate_limit_per_s = registration.rate_limit_per_s
+            record.rate_limit_burst = registration.rate_limit_burst
+            record.batch_max_jobs = registration.batch_max_jobs
+            record.batch_max_wait_ms = registration.batch_max_wait_ms
+            record.instances = [asdict(instance) for instance in registration.instances]
+            record.updated_at = datetime.now(timezone.utc)
+            session.commit()
+            return registration
+
+    def _store_heartbeat(
+        self,
+        extension_id: str,
+        instance_id: str,
+        in_flight: int,
+        queue_length: int,
+    ) -> ExtensionInstance | None:
+        with self._sessions() as session:
+            record = session.get(ExtensionRegistrationRecord, extension_id, with_for_update=True)
+            if record is None:
+                return None
+            now = self._wall_clock()
+            registration = expire_instances(_to_registration(record), now)
+            if not registration.instances:
+                # Keep the expired instances stored: an empty list would
+                # read back as the default instance at `webhook_url`.
+                return None
+            registration, instance = record_heartbeat(
+                registration,
+                instance_id,
+                in_flight=in_flight,
+                queue_length=queue_length,
+                seen_at=now,
+            )
+            record.instances = [asdict(item) for item in registration.instances]
+            session.commit()
+            return instance
+
+    def _load(self, extension_id: str) -> ExtensionRegistration | None:
+        with self._sessions() as session:
+            record = session.get(ExtensionRegistrationRecord, extension_id)
+            return _to_registration(record) if record is not None else None
+
+    def _load_enabled(self) -> list[ExtensionRegistration]:
+        with self._sessions() as session:
+            records = session.scalars(
+                select(ExtensionRegistrationRecord)
+                .where(ExtensionRegistrationRecord.enabled.is_(True))
+                .order_by(ExtensionRegistrationRecord.extension_id)
+            ).all()
+            return [_to_registration(record) for record in records]
+
+    def _delete(self, extension_id: str) -> None:
+        with self._sessions() as session:
+            record = session.get(ExtensionRegistrationRecord, extension_id)
+            if record is not None:
+                session.delete(record)
+                session.commit()
+
+
+__all__ = ["DEFAULT_CACHE_TTL_S", "SqlExtensionRegistry"]
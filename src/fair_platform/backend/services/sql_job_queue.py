@@ -0,0 +1,764 @@
+"""Job queue backend stored in the platform's SQL database.
+
+`SqlJobQueue` lets a deployment run several API/dispatcher processes against
+the database it already has, without adding Redis. Jobs, states and updates
+live in the `job_queue_entries`, `job_queue_states` and `job_queue_updates`
+tables; dead letters in `job_queue_dead_letters`.
+
+- Postgres: dequeue uses `SELECT ... FOR UPDATE SKIP LOCKED` so concurrent
+  dispatchers never block on or receive the same row. Enqueues and updates
+  send `NOTIFY` on commit and a `LISTEN` connection wakes blocked waiters.
+  State writes notify `fair_job_states` for `watch_state`;
+  `transition_state` locks the state row with `SELECT ... FOR UPDATE`.
+- SQLite: dequeue runs inside `BEGIN IMMEDIATE`, which takes the database
+  write lock up front and serializes competing dispatchers (and state
+  transitions). Waiters poll.
+
+Waiters in the same process are also woken directly, so the poll interval
+only bounds cross-process latency when `LISTEN/NOTIFY` is unavailable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Collection
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from fair_platform.backend.data.models.job_queue import (
+    JobQueueDeadLetter,
+    JobQueueEntry,
+    JobQueueState,
+    JobQueueUpdate,
+)
+from fair_platform.backend.services.fanout import OverflowPolicy
+from fair_platform.backend.services.job_queue import (
+    DEFAULT_TERMINAL_STATE_TTL_S,
+    JOB_LANE_ORDER,
+    TERMINAL_JOB_STATUSES,
+    DeadLetter,
+    DuplicateJob,
+    DuplicateReason,
+    JobMessage,
+    JobQueue,
+    JobState,
+    JobStateArchiveHook,
+    JobStatus,
+    JobUpdate,
+    JobUpdateSubscription,
+    LaneSelector,
+    _cursor_sequence,
+    _is_state_transition,
+    _next_state,
+    _normalize_lane,
+    _run_archive_hook,
+    _seconds_until,
+)
+
+logger = logging.getLogger(__name__)
+
+JOBS_CHANNEL = "fair_jobs"
+UPDATES_CHANNEL = "fair_job_updates"
+STATES_CHANNEL = "fair_job_states"
+_JOBS_WAKEUP_KEY = "jobs"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite drops the timezone of stored datetimes.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _decode_update(row: JobQueueUpdate) -> JobUpdate:
+    return JobUpdate(
+        job_id=row.job_id,
+        event=row.event,
+        payload=dict(row.payload or {}),
+        created_at=row.created_at,
+        cursor=str(row.id),
+    )
+
+
+class SqlJobUpdateSubscription(JobUpdateSubscription):
+    """Reads `job_queue_updates` rows with an id above the cursor.
+
+    The table is the update log; row ids are the cursors.
+    """
+
+    def __init__(self, queue: "SqlJobQueue", job_id: str, cursor: int):
+        self._queue = queue
+        self._job_id = job_id
+        self._cursor = cursor
+        self._buffer: deque[JobUpdate] = deque()
+        self._closed = False
+
+    async def get(self, timeout: float | None = None) -> JobUpdate | None:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not self._closed:
+            if self._buffer:
+                return self._buffer.popleft()
+            rows = await asyncio.to_thread(self._queue._fetch_updates, self._job_id, self._cursor)
+            if rows:
+                self._cursor = rows[-1][0]
+                self._buffer.extend(update for _, update in rows)
+                continue
+            wait_s = self._queue._poll_interval_s
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                wait_s = min(wait_s, remaining)
+            await self._queue._wait(self._queue._updates_wakeup_key(self._job_id), wait_s)
+        return None
+
+    async def close(self) -> None:
+        self._closed = True
+        self._buffer.clear()
+
+
+class SqlJobQueue(JobQueue):
+    """Database-backed queue built on the SQLAlchemy engine.
+
+    Pending jobs are ordered by lane (`LaneSelector`), then `priority`
+    descending, then arrival. Delayed jobs carry `available_at` and are
+    skipped until it passes; waiters notice them on their next poll. A
+    dequeued row is deleted in the same transaction that selects it, so
+    delivery is at-most-once like `RedisJobQueue`; `ack` is a no-op.
+
+    `enqueue_if_absent` stores the idempotency key on the job's state row
+    under a unique index, so duplicates are rejected by the database.
+
+    Terminal states expire `terminal_state_ttl_s` seconds after they are set.
+    Published updates are kept for `update_retention_s` seconds so slow
+    subscribers can catch up and late ones can replay them. Both are cleaned
+    up by a sweeper task that runs every `sweep_interval_s` while the queue
+    is in use.
+    """
+
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        *,
+        lane_weights: dict[str, int] | None = None,
+        terminal_state_ttl_s: float | None = DEFAULT_TERMINAL_STATE_TTL_S,
+        archive_hook: JobStateArchiveHook | None = None,
+        poll_interval_s: float = 0.5,
+        update_retention_s: float = 60 * 60,
+        sweep_interval_s: float = 60.0,
+        listen: bool = True,
+    ):
+        if engine is None:
+            from fair_platform.backend.data.database import engine as default_engine
+
+            engine = default_engine
+        self._engine = engine
+        self._sessions = sessionmaker(
+            bind=engine, autoflush=False, expire_on_commit=False, future=True
+        )
+        self._dialect = engine.dialect.name
+        self._selector = LaneSelector(lane_weights)
+        self._terminal_state_ttl_s = terminal_state_ttl_s
+        self._archive_hook = archive_hook
+        self._poll_interval_s = poll_interval_s
+        self._update_retention_s = update_retention_s
+        self._sweep_interval_s = sweep_interval_s
+        self._listen = listen and self._dialect == "postgresql"
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._listener: asyncio.Task[None] | None = None
+        self._sweeper: asyncio.Task[None] | None = None
+
+    @property
+    def is_postgres(self) -> bool:
+        return self._dialect == "postgresql"
+
+    async def enqueue(self, job: JobMessage, not_before: datetime | None = None) -> None:
+        await self.enqueue_many([job], not_before=not_before)
+
+    async def enqueue_many(
+        self,
+        jobs: list[JobMessage],
+        not_before: datetime | None = None,
+    ) -> None:
+        if not jobs:
+            return
+        available_at = None
+        if not_before is not None:
+            available_at = _utc_now() + timedelta(seconds=_seconds_until(not_before))
+        await asyncio.to_thread(self._insert_jobs, jobs, available_at)
+        self._wake(_JOBS_WAKEUP_KEY)
+        self._ensure_background_tasks()
+
+    async def enqueue_if_absent(
+        self,
+        job: JobMessage,
+        not_before: datetime | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> DuplicateJob | None:
+        available_at = None
+        if not_before is not None:
+            available_at = _utc_now() + timedelta(seconds=_seconds_until(not_before))
+        existing = await asyncio.to_thread(self._insert_job_if_absent, job, available_at, details)
+        if existing is None:
+            self._wake(_JOBS_WAKEUP_KEY)
+            self._ensure_background_tasks()
+        return existing
+
+    async def dequeue(self, timeout: float | None = None) -> JobMessage | None:
+        jobs = await self.dequeue_batch(1, timeout=timeout)
+        return jobs[0] if jobs else None
+
+    async def dequeue_batch(
+        self,
+        max_items: int,
+        timeout: float | None = None,
+    ) -> list[JobMessage]:
+        self._ensure_background_tasks()
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + max(0.0, timeout)
+        while True:
+            jobs = await asyncio.to_thread(self._claim_jobs, max(1, max_items))
+            if jobs:
+                return jobs
+            wait_s = self._poll_interval_s
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return []
+                wait_s = min(wait_s, remaining)
+            await self._wait(_JOBS_WAKEUP_KEY, wait_s)
+
+    async def remove_pending(self, job_id: str) -> bool:
+        return await asyncio.to_thread(self._delete_entries, job_id)
+
+    async def add_dead_letter(self, entry: DeadLetter) -> None:
+        await asyncio.to_thread(self._write_dead_letter, entry)
+
+    async def list_dead_letters(
+        self,
+        limit: int = 100,
+        target: str | None = None,
+    ) -> list[DeadLetter]:
+        return await asyncio.to_thread(self._read_dead_letters, limit, target)
+
+    async def queue_depth(self) -> dict[str, int]:
+        return await asyncio.to_thread(self._count_entries)
+
+    async def get_dead_letter(self, job_id: str) -> DeadLetter | None:
+        entries = await asyncio.to_thread(self._read_dead_letters, 1, None, job_id)
+        return entries[0] if entries else None
+
+    async def delete_dead_letter(self, job_id: str) -> bool:
+        return await asyncio.to_thread(self._delete_dead_letter, job_id)
+
+    async def set_state(
+        self,
+        job_id: str,
+        status: JobStatus,
+        details: dict[str, Any] | None = None,
+    ) -> JobState:
+        state = JobState(job_id=job_id, status=status, details=details or {})
+        await asyncio.to_thread(self._write_states, [state])
+        self._wake(self._states_wakeup_key(job_id))
+        self._ensure_background_tasks()
+        self._observe_state(state)
+        await _run_archive_hook(self._archive_hook, state)
+        return state
+
+    async def transition_state(
+        self,
+        job_id: str,
+        status: JobStatus,
+        details: dict[str, Any] | None = None,
+        *,
+        expected: Collection[JobStatus | None] | None = None,
+    ) -> JobState | None:
+        state = await asyncio.to_thread(self._transition_state, job_id, status, details, expected)
+        if state is None:
+            return None
+        self._wake(self._states_wakeup_key(job_id))
+        self._ensure_background_tasks()
+        self._observe_state(state)
+        await _run_archive_hook(self._archive_hook, state)
+        return state
+
+    async def get_state(self, job_id: str) -> JobState | None:
+        return await asyncio.to_thread(self._read_state, job_id)
+
+    async def watch_state(self, job_id: str) -> AsyncIterator[JobState]:
+        self._ensure_background_tasks()
+        last: JobState | None = None
+        while True:
+            state = await self.get_state(job_id)
+            if _is_state_transition(last, state):
+                last = state
+                yield state
+                if state.status in TERMINAL_JOB_STATUSES:
+                    return
+            await self._wait(self._states_wakeup_key(job_id), self._poll_interval_s)
+
+    async def publish_update(self, update: JobUpdate) -> None:
+        await asyncio.to_thread(self._insert_update, update)
+        self._wake(self._updates_wakeup_key(update.job_id))
+
+    async def subscribe_updates(
+        self,
+        job_id: str,
+        from_cursor: str | None = None,
+        *,
+        overflow_policy: OverflowPolicy | None = None,
+    ) -> JobUpdateSubscription:
+        # Updates are read from the table by cursor and never dropped.
+        self._ensure_background_tasks()
+        if from_cursor is None:
+            cursor = await asyncio.to_thread(self._latest_update_id, job_id)
+        else:
+            cursor = _cursor_sequence(from_cursor)
+        return SqlJobUpdateSubscription(self, job_id, cursor)
+
+    async def sweep_expired(self) -> int:
+        """Delete expired terminal states and old updates; return rows removed."""
+        return await asyncio.to_thread(self._delete_expired)
+
+    async def close(self) -> None:
+        for task in (self._listener, self._sweeper):
+            if task is not None:
+                task.cancel()
+        self._listener = None
+        self._sweeper = None
+        for event in self._wakeups.values():
+            event.set()
+        self._wakeups.clear()
+
+    # -- database operations (run in worker threads) -------------------------
+
+    def _begin(self, session: Session) -> None:
+        if self._dialect == "sqlite":
+            # Take the write lock before reading so two dispatchers cannot
+            # select the same rows; the default deferred BEGIN only locks on
+            # the first write.
+            session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+
+    def _notify(self, session: Session, channel: str, payload: str = "") -> None:
+        if self.is_postgres:
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": channel, "payload": payload},
+            )
+
+    def _insert_jobs(self, jobs: list[JobMessage], available_at: datetime | None) -> None:
+        with self._sessions() as session:
+            self._begin(session)
+            self._add_entries(session, jobs, available_at)
+            # Re-enqueued jobs keep the state their caller already moved.
+            existing = set(
+                session.scalars(
+                    select(JobQueueState.job_id).where(
+                        JobQueueState.job_id.in_([job.job_id for job in jobs])
+                    )
+                )
+            )
+            self._upsert_states(
+                session,
+                [
+                    JobState(job_id=job.job_id, status=JobStatus.QUEUED)
+                    for job in jobs
+                    if job.job_id not in existing
+                ],
+            )
+            self._notify(session, JOBS_CHANNEL)
+            session.commit()
+
+    def _insert_job_if_absent(
+        self,
+        job: JobMessage,
+        available_at: datetime | None,
+        details: dict[str, Any] | None,
+    ) -> DuplicateJob | None:
+        now = _utc_now()
+        with self._sessions() as session:
+            self._begin(session)
+            # Expired states no longer count as duplicates; clear them so the
+            # primary key and idempotency key can be reused.
+            conflicts = [JobQueueState.job_id == job.job_id]
+            if job.idempotency_key is not None:
+                conflicts.append(JobQueueState.idempotency_key == job.idempotency_key)
+            session.execute(
+                delete(JobQueueState).where(or_(*conflicts), JobQueueState.expires_at <= now)
+            )
+            existing = session.scalars(select(JobQueueState).where(or_(*conflicts))).all()
+            if existing:
+                keyed = [row for row in existing if row.idempotency_key == job.idempotency_key]
+                if keyed:
+                    return DuplicateJob(keyed[0].job_id, DuplicateReason.IDEMPOTENCY_KEY)
+                return DuplicateJob(job.job_id, DuplicateReason.JOB_ID)
+            session.add(
+                JobQueueState(
+                    **self._state_row(
+                        JobState(job_id=job.job_id, status=JobStatus.QUEUED, details=dict(details or {}))
+                    ),
+                    idempotency_key=job.idempotency_key,
+                )
+            )
+            try:
+                # On Postgres a concurrent submission may win between the
+                # lookup and this insert; its unique key makes ours fail.
+                session.flush()
+            except IntegrityError:
+                session.rollback()
+                return self._existing_job(job)
+            self._add_entries(session, [job], available_at)
+            self._notify(session, JOBS_CHANNEL)
+            session.commit()
+            return None
+
+    def _existing_job(self, job: JobMessage) -> DuplicateJob:
+        with self._sessions() as session:
+            if job.idempotency_key is not None:
+                keyed = session.scalar(
+                    select(JobQueueState.job_id).where(
+                        JobQueueState.idempotency_key == job.idempotency_key
+                    )
+                )
+                if keyed is not None:
+                    return DuplicateJob(keyed, DuplicateReason.IDEMPOTENCY_KEY)
+            return DuplicateJob(job.job_id, DuplicateReason.JOB_ID)
+
+    def _add_entries(
+        self,
+        session: Session,
+        jobs: list[JobMessage],
+        available_at: datetime | None,
+    ) -> None:
+        now = _utc_now()
+        for job in jobs:
+            session.add(
+                JobQueueEntry(
+                    job_id=job.job_id,
+                    lane=_normalize_lane(job.lane).value,
+                    priority=job.priority,
+                    message=asdict(job),
+                    enqueued_at=now,
+                    available_at=available_at,
+                )
+            )
+
+    def _claim_jobs(self, max_items: int) -> list[JobMessage]:
+        jobs: list[JobMessage] = []
+        now = _utc_now()
+        with self._sessions() as session:
+            self._begin(session)
+            for lane in self._selector.order():
+                if len(jobs) >= max_items:
+                    break
+                stmt = (
+                    select(JobQueueEntry)
+                    .where(
+                        JobQueueEntry.lane == lane.value,
+                        or_(JobQueueEntry.available_at.is_(None), JobQueueEntry.available_at <= now),
+                    )
+                    .order_by(JobQueueEntry.priority.desc(), JobQueueEntry.id)
+                    .limit(max_items - len(jobs))
+                )
+                if self.is_postgres:
+                    stmt = stmt.with_for_update(skip_locked=True)
+                rows = session.scalars(stmt).all()
+                if rows:
+                    session.execute(
+                        delete(JobQueueEntry).where(
+                            JobQueueEntry.id.in_([row.id for row in rows])
+                        )
+                    )
+                    jobs.extend(JobMessage(**row.message) for row in rows)
+            session.commit()
+        return jobs
+
+    def _delete_entries(self, job_id: str) -> bool:
+        with self._sessions() as session:
+            self._begin(session)
+            result = session.execute(delete(JobQueueEntry).where(JobQueueEntry.job_id == job_id))
+            session.commit()
+            return bool(result.rowcount)
+
+    def _write_dead_letter(self, entry: DeadLetter) -> None:
+        with self._sessions() as session:
+            self._begin(session)
+            session.merge(
+                JobQueueDeadLetter(
+                    job_id=entry.job.job_id,
+                    target=entry.job.target,
+                    message=asdict(entry.job),
+                    error=entry.error,
+                    code=entry.code,
+                    attempts=entry.attempts,
+                    details=entry.details,
+                    dead_at=datetime.fromisoformat(entry.dead_at),
+                )
+            )
+            session.commit()
+
+    def _count_entries(self) -> dict[str, int]:
+        with self._sessions() as session:
+            rows = session.execute(
+                select(JobQueueEntry.lane, func.count()).group_by(JobQueueEntry.lane)
+            ).all()
+        depth = {str(lane): 0 for lane in JOB_LANE_ORDER}
+        for lane, count in rows:
+            depth[lane] = depth.get(lane, 0) + int(count)
+        return depth
+
+    def _read_dead_letters(
+        self,
+        limit: int,
+        target: str | None,
+        job_id: str | None = None,
+    ) -> list[DeadLetter]:
+        query = select(JobQueueDeadLetter).order_by(JobQueueDeadLetter.dead_at).limit(max(0, limit))
+        if target is not None:
+            query = query.where(JobQueueDeadLetter.target == target)
+        if job_id is not None:
+            query = query.where(JobQueueDeadLetter.job_id == job_id)
+        with self._sessions() as session:
+            return [
+                DeadLetter(
+                    job=JobMessage(**row.message),
+                    error=row.error,
+                    code=row.code,
+                    attempts=list(row.attempts or []),
+                    details=dict(row.details or {}),
+                    dead_at=_as_utc(row.dead_at).isoformat(),
+                )
+                for row in session.scalars(query)
+            ]
+
+    def _delete_dead_letter(self, job_id: str) -> bool:
+        with self._sessions() as session:
+            self._begin(session)
+            result = session.execute(
+                delete(JobQueueDeadLetter).where(JobQueueDeadLetter.job_id == job_id)
+            )
+            session.commit()
+            return bool(result.rowcount)
+
+    def _write_states(self, states: list[JobState]) -> None:
+        with self._sessions() as session:
+            self._begin(session)
+            self._upsert_states(session, states)
+            for state in states:
+                self._notify(session, STATES_CHANNEL, state.job_id)
+            session.commit()
+
+    def _transition_state(
+        self,
+        job_id: str,
+        status: JobStatus,
+        details: dict[str, Any] | None,
+        expected: Collection[JobStatus | None] | None,
+    ) -> JobState | None:
+        with self._sessions() as session:
+            # The row lock (or SQLite's write lock) holds off other writers
+            # between reading the current state and writing the next one.
+            self._begin(session)
+            stmt = select(JobQueueState).where(JobQueueState.job_id == job_id)
+            if self.is_postgres:
+                stmt = stmt.with_for_update()
+            row = session.scalars(stmt).first()
+            current = None
+            if row is not None and (row.expires_at is None or _as_utc(row.expires_at) > _utc_now()):
+                current = JobState(
+                    job_id=row.job_id,
+                    status=JobStatus(row.status),
+                    updated_at=row.updated_at,
+                    details=dict(row.details or {}),
+                )
+            state = _next_state(job_id, current, status, details, expected)
+            if state is None:
+                session.rollback()
+                return None
+            self._upsert_states(session, [state])
+            self._notify(session, STATES_CHANNEL, job_id)
+            session.commit()
+            return state
+
+    def _upsert_states(self, session: Session, states: list[JobState]) -> None:
+        if not states:
+            return
+        if self.is_postgres:
+            from sqlalchemy.dialects.postgresql import insert
+        elif self._dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for state in states:
+                session.merge(JobQueueState(**self._state_row(state)))
+            return
+        stmt = insert(JobQueueState).values([self._state_row(state) for state in states])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobQueueState.job_id],
+            set_={
+                "status": stmt.excluded.status,
+                "details": stmt.excluded.details,
+                "updated_at": stmt.excluded.updated_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        session.execute(stmt)
+
+    def _state_row(self, state: JobState) -> dict[str, Any]:
+        expires_at = None
+        if state.status in TERMINAL_JOB_STATUSES and self._terminal_state_ttl_s is not None:
+            expires_at = _utc_now() + timedelta(seconds=self._terminal_state_ttl_s)
+        return {
+            "job_id": state.job_id,
+            "status": str(state.status),
+            "details": state.details,
+            "updated_at": state.updated_at,
+            "expires_at": expires_at,
+        }
+
+    def _read_state(self, job_id: str) -> JobState | None:
+        with self._sessions() as session:
+            row = session.scalars(
+                select(JobQueueState).where(
+                    JobQueueState.job_id == job_id,
+                    or_(
+                        JobQueueState.expires_at.is_(None),
+                        JobQueueState.expires_at > _utc_now(),
+                    ),
+                )
+            ).first()
+            if row is None:
+                return None
+            return JobState(
+                job_id=row.job_id,
+                status=JobStatus(row.status),
+                updated_at=row.updated_at,
+                details=dict(row.details or {}),
+            )
+
+    def _insert_update(self, update: JobUpdate) -> None:
+        with self._sessions() as session:
+            self._begin(session)
+            session.add(
+                JobQueueUpdate(
+                    job_id=update.job_id,
+                    event=update.event,
+                    payload=update.payload,
+                    created_at=update.created_at,
+                    stored_at=_utc_now(),
+                )
+            )
+            self._notify(session, UPDATES_CHANNEL, update.job_id)
+            session.commit()
+
+    def _latest_update_id(self, job_id: str) -> int:
+        with self._sessions() as session:
+            latest = session.scalar(
+                select(func.max(JobQueueUpdate.id)).where(JobQueueUpdate.job_id == job_id)
+            )
+            return int(latest or 0)
+
+    def _fetch_updates(self, job_id: str, cursor: int) -> list[tuple[int, JobUpdate]]:
+        with self._sessions() as session:
+            rows = session.scalars(
+                select(JobQueueUpdate)
+                .where(JobQueueUpdate.job_id == job_id, JobQueueUpdate.id > cursor)
+                .order_by(JobQueueUpdate.id)
+            ).all()
+            return [(row.id, _decode_update(row)) for row in rows]
+
+    def _delete_expired(self) -> int:
+        now = _utc_now()
+        with self._sessions() as session:
+            self._begin(session)
+            states = session.execute(
+                delete(JobQueueState).where(JobQueueState.expires_at <= now)
+            )
+            updates = session.execute(
+                delete(JobQueueUpdate).where(
+                    JobQueueUpdate.stored_at <= now - timedelta(seconds=self._update_retention_s)
+                )
+            )
+            session.commit()
+            return (states.rowcount or 0) + (updates.rowcount or 0)
+
+    # -- wakeups ---------------------------------------------------------------
+
+    @staticmethod
+    def _updates_wakeup_key(job_id: str) -> str:
+        return f"updates:{job_id}"
+
+    @staticmethod
+    def _states_wakeup_key(job_id: str) -> str:
+        return f"states:{job_id}"
+
+    def _wake(self, key: str) -> None:
+        event = self._wakeups.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def _wait(self, key: str, timeout: float) -> None:
+        event = self._wakeups.setdefault(key, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except TimeoutError:
+            pass
+
+    def _ensure_background_tasks(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = loop.create_task(self._sweep_forever())
+        if self._listen and (self._listener is None or self._listener.done()):
+            self._listener = loop.create_task(self._listen_for_notifications())
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval_s)
+            try:
+                await self.sweep_expired()
+            except Exception:
+                logger.exception("Failed to sweep expired job queue rows")
+
+    async def _listen_for_notifications(self) -> None:
+        try:
+            psycopg = importlib.import_module("psycopg")
+            conninfo = self._engine.url.set(drivername="postgresql").render_as_string(
+                hide_password=False
+            )
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {JOBS_CHANNEL}")
+                await conn.execute(f"LISTEN {UPDATES_CHANNEL}")
+                await conn.execute(f"LISTEN {STATES_CHANNEL}")
+                async for notification in conn.notifies():
+                    if notification.channel == JOBS_CHANNEL:
+                        self._wake(_JOBS_WAKEUP_KEY)
+                    elif notification.channel == STATES_CHANNEL:
+                        self._wake(self._states_wakeup_key(notification.payload))
+                    else:
+                        self._wake(self._updates_wakeup_key(notification.payload))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Polling keeps the queue correct; LISTEN only lowers latency.
+            logger.exception("Job queue LISTEN connection failed; falling back to polling")
+            self._listen = False
+
+
+__all__ = [
+    "JOBS_CHANNEL",
+    "UPDATES_CHANNEL",
+    "STATES_CHANNEL",
+    "SqlJobQueue",
+    "SqlJobUpdateSubscription",
+]
@@ -0,0 +1,106 @@
+"""Coalesces job deliveries into batched webhook calls.
+
+Extensions opt in by registering `batch_max_jobs` (and optionally
+`batch_max_wait_ms`). `WebhookBatcher.post` then parks each job body for
+its webhook URL until `batch_max_jobs` bodies are waiting or the oldest has
+waited `batch_max_wait_ms`, and sends them as one request:
+
+    {"type": "batch", "jobs": [{"job_id": ..., "target": ..., "payload": ..., "metadata": ...}, ...]}
+
+Every job of the batch gets the same response, or the same exception when
+the request failed, so the dispatcher retries or fails them one by one just
+like single deliveries. The extension may reject single jobs of an accepted
+batch by listing them in the response, `{"rejected": [{"job_id": ...,
+"error": ...}]}`; `raise_for_rejection` turns that into a per-job error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+DEFAULT_BATCH_MAX_WAIT_MS = 10
+
+
+@dataclass
+class _PendingBatch:
+    bodies: list[dict[str, Any]] = field(default_factory=list)
+    waiters: list[asyncio.Future[httpx.Response]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class BatchJobRejected(Exception):
+    """The extension accepted a batch but rejected this job of it."""
+
+
+def raise_for_rejection(response: httpx.Response, job_id: str) -> None:
+    """Raise `BatchJobRejected` if a batch `response` lists `job_id` as rejected."""
+    try:
+        body = response.json()
+    except Exception:
+        return
+    rejected = body.get("rejected") if isinstance(body, dict) else None
+    if not isinstance(rejected, list):
+        return
+    for entry in rejected:
+        if isinstance(entry, dict) and entry.get("job_id") == job_id:
+            raise BatchJobRejected(str(entry.get("error") or "Job was rejected by the extension"))
+
+
+class WebhookBatcher:
+    """Batches job bodies per webhook URL; see the module docstring."""
+
+    def __init__(self, http_client: httpx.AsyncClient):
+        self._http = http_client
+        self._pending: dict[str, _PendingBatch] = {}
+        self._sending: set[asyncio.Task[None]] = set()
+
+    async def post(
+        self,
+        webhook_url: str,
+        body: dict[str, Any],
+        *,
+        max_jobs: int,
+        max_wait_ms: int | None = None,
+    ) -> httpx.Response:
+        """Add `body` to the next batch for `webhook_url` and return its response."""
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(webhook_url)
+        if batch is None:
+            batch = self._pending[webhook_url] = _PendingBatch()
+            wait_ms = DEFAULT_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+            batch.timer = loop.call_later(wait_ms / 1000, self._flush, webhook_url, batch)
+        waiter: asyncio.Future[httpx.Response] = loop.create_future()
+        batch.bodies.append(body)
+        batch.waiters.append(waiter)
+        if len(batch.bodies) >= max_jobs:
+            self._flush(webhook_url, batch)
+        return await waiter
+
+    def _flush(self, webhook_url: str, batch: _PendingBatch) -> None:
+        if self._pending.get(webhook_url) is not batch:
+            return
+        del self._pending[webhook_url]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._send(webhook_url, batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, webhook_url: str, batch: _PendingBatch) -> None:
+        try:
+            response = await self._http.post(webhook_url, json={"type": "batch", "jobs": batch.bodies})
+        except Exception as exc:
+            for waiter in batch.waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+        for waiter in batch.waiters:
+            if not waiter.done():
+                waiter.set_result(response)
+
+
+__all__ = ["DEFAULT_BATCH_MAX_WAIT_MS", "BatchJobRejected", "WebhookBatcher", "raise_for_rejection"]
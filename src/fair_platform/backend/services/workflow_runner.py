@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID, uuid4
 
+from sqlalchemy import update
 from sqlalchemy.orm import joinedload, selectinload
 
 from fair_platform.backend.api.routers.auth import create_extension_job_token
@@ -22,13 +23,27 @@ from fair_platform.backend.data.models import (
     WorkflowRun,
     WorkflowRunStatus,
 )
-from fair_platform.backend.services.job_queue import JobMessage, JobQueue, JobStatus
+from fair_platform.backend.services.fanout import (
+    DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+    FanoutStats,
+    OverflowPolicy,
+    SubscriberQueue,
+)
+from fair_platform.backend.services.job_queue import (
+    JOB_UPDATES_FROM_START,
+    JobLane,
+    JobMessage,
+    JobQueue,
+    JobStateWatch,
+    JobStatus,
+)
 from fair_platform.backend.services.settings_validator import (
     CorruptedSettingsSchemaError,
     RuntimeSettingsValidationError,
     validate_and_hydrate_runtime_settings,
 )
 from fair_platform.backend.services.submission_manager import SubmissionManager
+from fair_platform.extension_sdk.tracing import Span, Tracer, get_tracer, inject_trace_context
 
 
 def _utc_now() -> datetime:
@@ -139,18 +154,24 @@ def _step_start_status(plugin_type: str) -> SubmissionStatus | None:
     return None
 
 
+def _progress_coalesce_key(event: dict[str, Any]) -> str | None:
+    payload = event.get("payload") or {}
+    if event.get("type") == "log" and "percent" in payload:
+        return f"progress:{payload.get('step_id')}"
+    return None
+
+
 class WorkflowRunSubscription:
-    def __init__(self, queue: asyncio.Queue[dict[str, Any]], detach):
+    def __init__(self, queue: SubscriberQueue[dict[str, Any]], detach):
         self._queue = queue
         self._detach = detach
 
+    @property
+    def disconnected(self) -> bool:
+        return self._queue.disconnected
+
     async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
-        try:
-            if timeout is None:
-                return await self._queue.get()
-            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
-        except TimeoutError:
-            return None
+        return await self._queue.get(timeout=timeout)
 
     async def close(self) -> None:
         self._detach(self._queue)
@@ -163,21 +184,39 @@ class WorkflowRunSubscription:
 
 
 class WorkflowRunEventBroker:
-    def __init__(self):
-        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+    """Fans workflow run events out to SSE subscribers.
+
+    Each subscriber has a bounded queue and `publish` never waits on it, so
+    one slow client cannot stall the run; see `fanout.OverflowPolicy`.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        self._subscribers: dict[str, set[SubscriberQueue[dict[str, Any]]]] = {}
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = OverflowPolicy(overflow_policy)
+        self.fanout_stats = FanoutStats()
 
     async def publish(self, run_id: UUID | str, event: dict[str, Any]) -> None:
         key = str(run_id)
         for queue in self._subscribers.get(key, set()):
-            await queue.put(event)
+            queue.offer(event)
 
     async def subscribe(self, run_id: UUID | str) -> WorkflowRunSubscription:
         key = str(run_id)
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        queue: SubscriberQueue[dict[str, Any]] = SubscriberQueue(
+            self._max_queue_size,
+            self._overflow_policy,
+            coalesce_key=_progress_coalesce_key,
+            stats=self.fanout_stats,
+        )
         self._subscribers.setdefault(key, set()).add(queue)
         return WorkflowRunSubscription(queue, lambda q: self._detach(key, q))
 
-    def _detach(self, run_id: str, queue: asyncio.Queue[dict[str, Any]]) -> None:
+    def _detach(self, run_id: str, queue: SubscriberQueue[dict[str, Any]]) -> None:
         subscribers = self._subscribers.get(run_id)
         if not subscribers:
             return
@@ -193,10 +232,32 @@ class StepContext:
     job_id: str
 
 
+DEFAULT_RUNNER_MAX_RUNS = 8
+DEFAULT_RUNNER_POLL_INTERVAL_S = 1.0
+
+
 class WorkflowRunner:
-    def __init__(self, job_queue: JobQueue, event_broker: WorkflowRunEventBroker):
+    """Runs workflow pipelines, either in the API process or in `fair runner`.
+
+    A run is claimed by moving it from `pending` to `running` in one
+    `UPDATE`, so it runs once even when the API and any number of
+    `run_pending` loops see it.
+
+    Each run is a trace: a `workflow.run` span with one `workflow.step` span
+    per step, whose context goes into the step job's `traceparent` so the
+    dispatcher, the extension and the updates endpoint add their spans to it.
+    """
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        event_broker: WorkflowRunEventBroker,
+        *,
+        tracer: Tracer | None = None,
+    ):
         self._job_queue = job_queue
         self._broker = event_broker
+        self._tracer = tracer or get_tracer()
         self._tasks: dict[str, asyncio.Task[None]] = {}
 
     def start_run(
@@ -209,7 +270,73 @@ class WorkflowRunner:
         task = asyncio.create_task(
             self._run_pipeline(workflow_run_id, workflow_id, user_id, submission_ids)
         )
-        self._tasks[str(workflow_run_id)] = task
+        key = str(workflow_run_id)
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._forget_run(key, done))
+
+    def _forget_run(self, key: str, task: asyncio.Task[None]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    @property
+    def active_runs(self) -> int:
+        return len(self._tasks)
+
+    async def run_pending(
+        self,
+        stop: asyncio.Event,
+        *,
+        max_runs: int = DEFAULT_RUNNER_MAX_RUNS,
+        poll_interval_s: float = DEFAULT_RUNNER_POLL_INTERVAL_S,
+    ) -> None:
+        """Start `pending` runs from the database until `stop` is set.
+
+        Used by `fair runner` for runs created by API processes started with
+        `FAIR_ENABLE_WORKFLOW_RUNNER=0`. At most `max_runs` run here at once.
+        """
+        while not stop.is_set():
+            free = max(1, max_runs) - len(self._tasks)
+            if free > 0:
+                for run_id, workflow_id, user_id, submission_ids in self._pending_runs(free):
+                    self.start_run(run_id, workflow_id, user_id, submission_ids)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval_s)
+            except TimeoutError:
+                pass
+
+    async def shutdown(self, timeout_s: float) -> None:
+        """Wait up to `timeout_s` for active runs, then cancel the rest."""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout_s)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _pending_runs(self, limit: int) -> list[tuple[UUID, UUID, UUID, list[UUID]]]:
+        with get_session() as db:
+            query = (
+                db.query(WorkflowRun)
+                .options(selectinload(WorkflowRun.submissions))
+                .filter(WorkflowRun.status == WorkflowRunStatus.pending)
+            )
+            if self._tasks:
+                query = query.filter(WorkflowRun.id.notin_([UUID(run_id) for run_id in self._tasks]))
+            return [
+                (run.id, run.workflow_id, run.run_by, [submission.id for submission in run.submissions])
+                for run in query.limit(limit).all()
+            ]
+
+    @staticmethod
+    def _claim_run(db, workflow_run_id: UUID) -> bool:
+        claimed = db.execute(
+            update(WorkflowRun)
+            .where(WorkflowRun.id == workflow_run_id, WorkflowRun.status == WorkflowRunStatus.pending)
+            .values(status=WorkflowRunStatus.running, started_at=_utc_now())
+        )
+        db.commit()
+        return claimed.rowcount == 1
 
     async def _run_pipeline(
         self,
@@ -220,6 +347,8 @@ class WorkflowRunner:
     ) -> None:
         current_step_ctx: StepContext | None = None
         with get_session() as db:
+            if not self._claim_run(db, workflow_run_id):
+                return
             workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
             workflow_run = db.get(WorkflowRun, workflow_run_id)
             user = db.get(User, user_id)
@@ -233,8 +362,6 @@ class WorkflowRunner:
                 return
 
             steps = [WorkflowStep.model_validate(step) for step in (workflow.steps or [])]
-            workflow_run.status = WorkflowRunStatus.running
-            workflow_run.started_at = _utc_now()
             workflow_run.logs = workflow_run.logs or {"history": []}
             workflow_run.step_states = workflow_run.step_states or []
             db.add(workflow_run)
@@ -243,10 +370,26 @@ class WorkflowRunner:
         state_by_submission: dict[str, dict[str, Any]] = {
             str(submission_id): {} for submission_id in submission_ids
         }
+        run_span = self._tracer.start_span(
+            "workflow.run",
+            attributes={"workflow_run_id": str(workflow_run_id), "workflow_id": str(workflow_id)},
+        )
+        step_span: Span | None = None
         try:
             for index, step in enumerate(steps):
                 step_ctx = StepContext(index=index, step=step, job_id=str(uuid4()))
                 current_step_ctx = step_ctx
+                step_span = self._tracer.start_span(
+                    "workflow.step",
+                    parent=run_span.context,
+                    attributes={
+                        "workflow_run_id": str(workflow_run_id),
+                        "step_id": step.id,
+                        "step_index": index,
+                        "plugin_id": step.plugin.plugin_id,
+                        "job_id": step_ctx.job_id,
+                    },
+                )
                 await self._append_event(
                     workflow_run_id,
                     "log",
@@ -275,7 +418,7 @@ class WorkflowRunner:
                     job_id=step_ctx.job_id,
                     extension_id=step.plugin.extension_id,
                 )
-                await self._job_queue.enqueue(
+                duplicate = await self._job_queue.enqueue_if_absent(
                     JobMessage(
                         job_id=step_ctx.job_id,
                         target=step.plugin.extension_id,
@@ -287,17 +430,18 @@ class WorkflowRunner:
                                 "plugin_type": step.plugin.plugin_type,
                             },
                         },
-                        metadata={
-                            "workflow_run_id": str(workflow_run_id),
-                            "step_id": step.id,
-                            "step_index": index,
-                            "_delegation_token": delegation_token,
-                        },
-                    )
-                )
-                await self._job_queue.set_state(
-                    step_ctx.job_id,
-                    JobStatus.QUEUED,
+                        metadata=inject_trace_context(
+                            {
+                                "workflow_run_id": str(workflow_run_id),
+                                "step_id": step.id,
+                                "step_index": index,
+                                "_delegation_token": delegation_token,
+                            },
+                            step_span.context,
+                        ),
+                        lane=JobLane.BULK,
+                        idempotency_key=f"workflow-run:{workflow_run_id}:step:{step.id}",
+                    ),
                     details={
                         "target": step.plugin.extension_id,
                         "action": step.plugin.action,
@@ -308,14 +452,21 @@ class WorkflowRunner:
                         "step_index": index,
                     },
                 )
+                if duplicate is not None:
+                    # This step was already submitted for the run; follow that job.
+                    step_ctx = replace(step_ctx, job_id=duplicate.job_id)
+                    current_step_ctx = step_ctx
                 result = await self._consume_step(
                     workflow_run_id,
                     step_ctx,
                     state_by_submission,
                 )
                 self._merge_results(step.plugin.plugin_type, result, state_by_submission)
-                await self._persist_submission_results(workflow_run_id, result)
+                with self._tracer.span("workflow.persist_results", parent=step_span.context):
+                    await self._persist_submission_results(workflow_run_id, result)
+                self._tracer.end_span(step_span)
                 current_step_ctx = None
+                step_span = None
 
             with get_session() as db:
                 workflow_run = db.get(WorkflowRun, workflow_run_id)
@@ -331,6 +482,9 @@ class WorkflowRunner:
                 {"reason": "completed"},
             )
         except Exception as exc:
+            if step_span is not None:
+                self._tracer.end_span(step_span, error=exc)
+            self._tracer.end_span(run_span, error=exc)
             if current_step_ctx is not None:
                 await self._set_step_state(
                     workflow_run_id,
@@ -359,6 +513,9 @@ class WorkflowRunner:
                 {"reason": "failed"},
             )
         finally:
+            if step_span is not None:
+                self._tracer.end_span(step_span)
+            self._tracer.end_span(run_span)
             self._tasks.pop(str(workflow_run_id), None)
 
     async def _mark_step_started(
@@ -459,14 +616,39 @@ class WorkflowRunner:
         step_ctx: StepContext,
         state_by_submission: dict[str, dict[str, Any]],
     ) -> dict[str, Any]:
-        subscription = await self._job_queue.subscribe_updates(step_ctx.job_id)
+        # Replay from the start: the extension may post updates before we subscribe.
+        # Every update costs DB writes here, so a chatty extension can outrun
+        # us; with DISCONNECT a dropped update is noticed and replayed from
+        # the update log instead of silently lost.
+        last_cursor = JOB_UPDATES_FROM_START
+        subscription = await self._job_queue.subscribe_updates(
+            step_ctx.job_id,
+            from_cursor=last_cursor,
+            overflow_policy=OverflowPolicy.DISCONNECT,
+        )
         result_payload: dict[str, Any] = {}
         partial_results: dict[str, dict[str, Any]] = {}
-        async with subscription:
-            while True:
-                update = await subscription.get(timeout=1.0)
-                state = await self._job_queue.get_state(step_ctx.job_id)
-                if update is not None:
+        try:
+            async with JobStateWatch(self._job_queue, step_ctx.job_id) as watch:
+                while True:
+                    update = await watch.next_update(subscription)
+                    if update is None:
+                        if subscription.disconnected:
+                            # Dropped for falling behind: resume from the update log,
+                            # even after the job finished, so the result is not lost.
+                            await subscription.close()
+                            subscription = await self._job_queue.subscribe_updates(
+                                step_ctx.job_id,
+                                from_cursor=last_cursor,
+                                overflow_policy=OverflowPolicy.DISCONNECT,
+                            )
+                            continue
+                        if watch.terminal.is_set():
+                            # Terminal and every delivered update has been handled.
+                            break
+                        continue
+                    if update.cursor is not None:
+                        last_cursor = update.cursor
                     event_type, level, payload = _normalize_update_event(
                         step_ctx,
                         workflow_run_id,
@@ -522,23 +704,26 @@ class WorkflowRunner:
                             result=result_payload or None,
                             error=update.payload.get("error"),
                         )
-                if state and state.status in {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}:
-                    if state.status != JobStatus.COMPLETED:
-                        raise RuntimeError(state.details.get("error") or f"Step {step_ctx.step.id} failed")
-                    if not result_payload and partial_results:
-                        result_payload = {
-                            "plugin_type": step_ctx.step.plugin.plugin_type,
-                            "results": list(partial_results.values()),
-                            "metadata": {},
-                        }
-                    await self._set_step_state(
-                        workflow_run_id,
-                        step_ctx,
-                        status="completed",
-                        result=result_payload,
-                        error=None,
-                    )
-                    return result_payload
+                state = watch.latest
+        finally:
+            await subscription.close()
+        if state is None or state.status != JobStatus.COMPLETED:
+            error = state.details.get("error") if state is not None else None
+            raise RuntimeError(error or f"Step {step_ctx.step.id} failed")
+        if not result_payload and partial_results:
+            result_payload = {
+                "plugin_type": step_ctx.step.plugin.plugin_type,
+                "results": list(partial_results.values()),
+                "metadata": {},
+            }
+        await self._set_step_state(
+            workflow_run_id,
+            step_ctx,
+            status="completed",
+            result=result_payload,
+            error=None,
+        )
+        return result_payload
 
     async def _append_event(self, workflow_run_id: UUID, event_type: str, level: str, payload: dict[str, Any]) -> None:
         entry = _history_entry(event_type, level, payload)
@@ -743,4 +928,9 @@ class WorkflowRunner:
             )
 
 
-__all__ = ["WorkflowRunEventBroker", "WorkflowRunner"]
+__all__ = [
+    "DEFAULT_RUNNER_MAX_RUNS",
+    "DEFAULT_RUNNER_POLL_INTERVAL_S",
+    "WorkflowRunEventBroker",
+    "WorkflowRunner",
+]
@@ -0,0 +1,135 @@
+"""Standalone dispatcher and workflow runner processes.
+
+`fair dispatcher` and `fair runner` run the loops the API otherwise runs in
+its lifespan, so each tier scales on its own: start the API with
+`FAIR_ENABLE_JOB_DISPATCHER=0` and `FAIR_ENABLE_WORKFLOW_RUNNER=0`, then as
+many dispatcher and runner processes as the load needs. They only make
+sense against a shared queue (`redis`, `redis-streams` or `sql`) and the
+shared `sql` extension registry.
+
+Both stop on SIGINT/SIGTERM: the dispatcher drains its in-flight deliveries
+(`FAIR_DISPATCHER_DRAIN_TIMEOUT`), the runner waits for active runs up to
+`drain_timeout_s` and cancels the rest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from fair_platform.backend.services.extension_registry import (
+    create_extension_registry,
+    get_extension_registry_backend,
+)
+from fair_platform.backend.services.job_dispatcher import JobDispatcher, dispatcher_options_from_env
+from fair_platform.backend.services.job_metrics import PROMETHEUS_CONTENT_TYPE
+from fair_platform.backend.services.job_queue import JobQueue, create_job_queue, get_job_queue_backend
+from fair_platform.backend.services.workflow_runner import (
+    DEFAULT_RUNNER_MAX_RUNS,
+    DEFAULT_RUNNER_POLL_INTERVAL_S,
+    WorkflowRunEventBroker,
+    WorkflowRunner,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUNNER_DRAIN_TIMEOUT_S = 60.0
+
+
+class SharedBackendRequired(RuntimeError):
+    """Raised when a standalone process is configured with in-process backends."""
+
+
+def _require_shared_backends(*, registry: bool) -> None:
+    if get_job_queue_backend() == "local":
+        raise SharedBackendRequired(
+            "The local job queue lives inside one process; set FAIR_JOB_QUEUE_BACKEND to "
+            "'redis', 'redis-streams' or 'sql'."
+        )
+    if registry and get_extension_registry_backend() == "local":
+        raise SharedBackendRequired(
+            "The local extension registry only sees extensions connected to this process; "
+            "set FAIR_EXTENSION_REGISTRY_BACKEND=sql."
+        )
+
+
+def _stop_on_signals(stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):  # Windows, or not the main thread
+            pass
+
+
+async def _serve_metrics(queue: JobQueue, port: int) -> asyncio.Server:
+    """Answer every request on `port` with the process' job metrics."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            queue.metrics.set_queue_depth(await queue.queue_depth())
+            body = queue.metrics.render().encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                + f"Content-Type: {PROMETHEUS_CONTENT_TYPE}\r\n".encode("ascii")
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host="0.0.0.0", port=port)
+
+
+async def run_dispatcher(*, metrics_port: int | None = None, stop: asyncio.Event | None = None) -> None:
+    """Dispatch jobs from the shared queue until `stop` is set (or a signal arrives)."""
+    _require_shared_backends(registry=True)
+    stop = stop or asyncio.Event()
+    _stop_on_signals(stop)
+    queue = await create_job_queue()
+    dispatcher = JobDispatcher(queue=queue, registry=create_extension_registry(), **dispatcher_options_from_env())
+    metrics_server = await _serve_metrics(queue, metrics_port) if metrics_port else None
+    try:
+        await dispatcher.start()
+        logger.info("Job dispatcher started")
+        await stop.wait()
+    finally:
+        await dispatcher.stop()
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        await queue.close()
+
+
+async def run_workflow_runner(
+    *,
+    max_runs: int = DEFAULT_RUNNER_MAX_RUNS,
+    poll_interval_s: float = DEFAULT_RUNNER_POLL_INTERVAL_S,
+    drain_timeout_s: float = DEFAULT_RUNNER_DRAIN_TIMEOUT_S,
+    stop: asyncio.Event | None = None,
+) -> None:
+    """Run pending workflow runs from the database until `stop` is set."""
+    _require_shared_backends(registry=False)
+    stop = stop or asyncio.Event()
+    _stop_on_signals(stop)
+    queue = await create_job_queue()
+    runner = WorkflowRunner(job_queue=queue, event_broker=WorkflowRunEventBroker())
+    try:
+        logger.info("Workflow runner started (max %d runs)", max_runs)
+        await runner.run_pending(stop, max_runs=max_runs, poll_interval_s=poll_interval_s)
+    finally:
+        await runner.shutdown(drain_timeout_s)
+        await queue.close()
+
+
+__all__ = [
+    "DEFAULT_RUNNER_DRAIN_TIMEOUT_S",
+    "SharedBackendRequired",
+    "run_dispatcher",
+    "run_workflow_runner",
+]
@@ -1,6 +1,8 @@
+import asyncio
 import multiprocessing
 import subprocess
 import tomllib
+import dataclasses
 import json
 import sqlite3
 from collections import OrderedDict
@@ -131,8 +133,12 @@ def version_callback(value: bool):
 app = typer.Typer()
 db_app = typer.Typer(help="Manage database migrations")
 users_app = typer.Typer(help="Manage users")
+jobs_app = typer.Typer(help="Manage the job queue")
+dead_letters_app = typer.Typer(help="Inspect and requeue dead-lettered jobs")
 app.add_typer(db_app, name="db")
 app.add_typer(users_app, name="users")
+app.add_typer(jobs_app, name="jobs")
+jobs_app.add_typer(dead_letters_app, name="dead-letters")
 
 
 @app.callback()
@@ -434,6 +440,55 @@ def dev(
     raise typer.Exit(code=_determine_exit_code(backend_process, frontend_process))
 
 
+def _run_worker(coroutine_factory) -> None:
+    import logging
+
+    from fair_platform.backend.workers import SharedBackendRequired
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(coroutine_factory())
+    except SharedBackendRequired as exc:
+        typer.echo(f"Error: {exc}")
+        raise typer.Exit(code=1) from exc
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def dispatcher(
+    metrics_port: Annotated[
+        int | None, typer.Option("--metrics-port", help="Serve Prometheus metrics on this port")
+    ] = None,
+):
+    """Run a job dispatcher against the shared queue (scale by starting more)."""
+    from fair_platform.backend.workers import run_dispatcher
+
+    _run_worker(lambda: run_dispatcher(metrics_port=metrics_port))
+
+
+@app.command()
+def runner(
+    max_runs: Annotated[int, typer.Option("--max-runs", help="Workflow runs executed at once")] = 8,
+    poll_interval: Annotated[
+        float, typer.Option("--poll-interval", help="Seconds between checks for pending runs")
+    ] = 1.0,
+    drain_timeout: Annotated[
+        float, typer.Option("--drain-timeout", help="Seconds shutdown waits for active runs")
+    ] = 60.0,
+):
+    """Run pending workflow runs created by API processes (scale by starting more)."""
+    from fair_platform.backend.workers import run_workflow_runner
+
+    _run_worker(
+        lambda: run_workflow_runner(
+            max_runs=max_runs,
+            poll_interval_s=poll_interval,
+            drain_timeout_s=drain_timeout,
+        )
+    )
+
+
 @users_app.command("reset-password")
 def reset_user_password(
     email: Annotated[str, typer.Argument(help="Email of the user account to update")],
@@ -461,5 +516,80 @@ def reset_user_password(
     typer.echo(f"Password reset for {email}")
 
 
+def _run_with_job_queue(action):
+    from fair_platform.backend.services.job_queue import create_job_queue, get_job_queue_backend
+
+    if get_job_queue_backend() == "local":
+        typer.echo(
+            "Warning: the local job queue lives inside the server process; "
+            "set FAIR_JOB_QUEUE_BACKEND to reach a shared queue."
+        )
+
+    async def run():
+        queue = await create_job_queue()
+        try:
+            return await action(queue)
+        finally:
+            await queue.close()
+
+    return asyncio.run(run())
+
+
+@dead_letters_app.command("list")
+def dead_letters_list(
+    target: Annotated[str | None, typer.Option("--target", help="Only jobs for this extension")] = None,
+    limit: Annotated[int, typer.Option("--limit", help="Maximum number of jobs to show")] = 100,
+):
+    entries = _run_with_job_queue(lambda queue: queue.list_dead_letters(limit=limit, target=target))
+    if not entries:
+        typer.echo("No dead-lettered jobs")
+        return
+    for entry in entries:
+        typer.echo(
+            f"{entry.job.job_id}  {entry.job.target}  {entry.dead_at}  "
+            f"attempts={len(entry.attempts)}  {entry.code or '-'}: {entry.error}"
+        )
+
+
+@dead_letters_app.command("show")
+def dead_letters_show(
+    job_id: Annotated[str, typer.Argument(help="Id of the dead-lettered job")],
+):
+    entry = _run_with_job_queue(lambda queue: queue.get_dead_letter(job_id))
+    if entry is None:
+        typer.echo(f"Dead letter not found: {job_id}")
+        raise typer.Exit(code=1)
+    typer.echo(json.dumps(dataclasses.asdict(entry), indent=2, default=str))
+
+
+@dead_letters_app.command("requeue")
+def dead_letters_requeue(
+    job_ids: Annotated[list[str] | None, typer.Argument(help="Ids of the jobs to requeue")] = None,
+    requeue_all: Annotated[
+        bool, typer.Option("--all", help="Requeue the oldest dead letters (see --limit)")
+    ] = False,
+    target: Annotated[str | None, typer.Option("--target", help="With --all, only this extension")] = None,
+    limit: Annotated[int, typer.Option("--limit", help="With --all, maximum number of jobs")] = 100,
+    rate: Annotated[float, typer.Option("--rate", help="Jobs requeued per second (0 = no limit)")] = 10.0,
+):
+    from fair_platform.backend.services.dead_letters import requeue_dead_letters
+
+    if not job_ids and not requeue_all:
+        typer.echo("Error: pass job ids or --all")
+        raise typer.Exit(code=1)
+    requeued = _run_with_job_queue(
+        lambda queue: requeue_dead_letters(
+            queue,
+            None if requeue_all else list(job_ids),
+            target=target,
+            limit=limit,
+            rate_per_s=rate,
+        )
+    )
+    typer.echo(f"Requeued {len(requeued)} job(s)")
+    for job_id in requeued:
+        typer.echo(f"  {job_id}")
+
+
 if __name__ == "__main__":
     app()
@@ -23,6 +23,11 @@ from fair_platform.extension_sdk.settings import (
     SwitchField,
     TextField,
 )
+from fair_platform.extension_sdk.tracing import (
+    InMemorySpanExporter,
+    JsonFileSpanExporter,
+    Tracer,
+)
 
 __all__ = [
     "ExtensionCredentials",
@@ -44,4 +49,7 @@ __all__ = [
     "ArtifactRefField",
     "RubricRefField",
     "SettingsSchema",
+    "Tracer",
+    "InMemorySpanExporter",
+    "JsonFileSpanExporter",
 ]
@@ -1,4 +1,6 @@
 import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any, Optional
 
 import httpx
@@ -21,6 +23,14 @@ from fair_platform.extension_sdk.contracts.job import (
     SubmissionResultPayload,
     TokenPayload,
 )
+from fair_platform.extension_sdk.tracing import (
+    Span,
+    Tracer,
+    current_trace_context,
+    extract_trace_context,
+    get_tracer,
+    inject_trace_context,
+)
 
 
 class JobContext:
@@ -31,6 +41,7 @@ class JobContext:
         credentials: ExtensionCredentials,
         timeout: float = 20.0,
         metadata: dict[str, Any] | None = None,
+        tracer: Tracer | None = None,
     ):
         self.job_id = job_id
         self._platform_url = platform_url.rstrip("/")
@@ -39,6 +50,32 @@ class JobContext:
         self._metadata: dict[str, Any] = metadata or {}
         self._delegation_token: str | None = self._metadata.get("_delegation_token")
         self._api = build_platform_client(platform_url=platform_url, credentials=credentials, timeout=timeout)
+        self._cancelled = False
+        self._tracer = tracer or get_tracer()
+        # The platform's delivery span; updates and `span()` continue its trace.
+        self.trace_context = extract_trace_context(self._metadata)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the platform cancelled this job.
+
+        The handler task is cancelled as well; check this flag in code that
+        catches `asyncio.CancelledError` or runs blocking work in threads.
+        """
+        return self._cancelled
+
+    def _mark_cancelled(self) -> None:
+        self._cancelled = True
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time a part of the handler, e.g. an LLM call, as a span of the job's trace."""
+        with self._tracer.span(
+            name,
+            parent=current_trace_context() or self.trace_context,
+            attributes={"job_id": self.job_id, **attributes},
+        ) as span:
+            yield span
 
     async def __aenter__(self) -> "JobContext":
         return self
@@ -86,11 +123,13 @@ class JobContext:
             )
 
     async def _post_update(self, request: JobUpdateRequest) -> None:
-        response = await self._api.post(
-            f"/api/jobs/{self.job_id}/updates",
-            json=request.model_dump(by_alias=True, mode="json"),
-        )
-        response.raise_for_status()
+        with self.span("job.update", event=request.update.event) as span:
+            response = await self._api.post(
+                f"/api/jobs/{self.job_id}/updates",
+                json=request.model_dump(by_alias=True, mode="json"),
+                headers=inject_trace_context({}, span.context),
+            )
+            response.raise_for_status()
 
     async def progress(self, percent: int, message: str | None = None, status: str | None = None) -> None:
         await self._post_update(
@@ -1,4 +1,6 @@
 from fair_platform.extension_sdk.contracts.extension import (
+    ExtensionHeartbeatRequest,
+    ExtensionInstanceRead,
     ExtensionRead,
     ExtensionRegisterRequest,
 )
@@ -57,11 +59,13 @@ from .plugin import (
     WorkflowStepExecutionRequest,
     WorkflowStepExecutionResult,
 )
-from .extension import ExtensionRead, ExtensionRegisterRequest
+from .extension import ExtensionHeartbeatRequest, ExtensionInstanceRead, ExtensionRead, ExtensionRegisterRequest
 from .job import ActionPayload, JobUpdateRequest
 
 __all__ = [
     "ActionPayload",
+    "ExtensionHeartbeatRequest",
+    "ExtensionInstanceRead",
     "ExtensionRead",
     "ExtensionRegisterRequest",
     "GraderSubmissionResult",
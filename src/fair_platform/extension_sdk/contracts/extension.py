@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -14,6 +15,37 @@ class ExtensionRegisterRequest(BaseModel):
     capabilities: list[str] = Field(default_factory=list)
     requested_scopes: list[str] = Field(default_factory=list)
     metadata: dict[str, Any] = Field(default_factory=dict)
+    max_concurrency: int | None = Field(default=None, ge=1)
+    rate_limit_per_s: float | None = Field(default=None, gt=0)
+    rate_limit_burst: int | None = Field(default=None, ge=1)
+    batch_max_jobs: int | None = Field(default=None, ge=1)
+    batch_max_wait_ms: int | None = Field(default=None, ge=0)
+    # Replicas connect with their own webhook; defaults to `webhook_url`.
+    instance_id: str | None = Field(default=None, min_length=1)
+    weight: int = Field(default=1, ge=1)
+    # Instances that advertise an interval expire when they stop sending heartbeats.
+    heartbeat_interval_s: float | None = Field(default=None, gt=0)
+
+
+class ExtensionHeartbeatRequest(BaseModel):
+    model_config = contract_model_config
+
+    extension_id: str = Field(min_length=1)
+    instance_id: str = Field(min_length=1)
+    in_flight: int = Field(default=0, ge=0)
+    queue_length: int = Field(default=0, ge=0)
+
+
+class ExtensionInstanceRead(BaseModel):
+    model_config = contract_model_config
+
+    instance_id: str
+    webhook_url: str
+    weight: int = 1
+    heartbeat_interval_s: float | None = None
+    last_seen_at: datetime | None = None
+    in_flight: int | None = None
+    queue_length: int | None = None
 
 
 class ExtensionRead(BaseModel):
@@ -26,6 +58,12 @@ class ExtensionRead(BaseModel):
     requested_scopes: list[str] = Field(default_factory=list)
     metadata: dict[str, Any]
     enabled: bool
+    max_concurrency: int | None = None
+    rate_limit_per_s: float | None = None
+    rate_limit_burst: int | None = None
+    batch_max_jobs: int | None = None
+    batch_max_wait_ms: int | None = None
+    instances: list[ExtensionInstanceRead] = Field(default_factory=list)
 
 
-__all__ = ["ExtensionRegisterRequest", "ExtensionRead"]
+__all__ = ["ExtensionRegisterRequest", "ExtensionHeartbeatRequest", "ExtensionInstanceRead", "ExtensionRead"]
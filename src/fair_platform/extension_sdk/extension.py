@@ -1,5 +1,6 @@
 import asyncio
 import inspect
+import logging
 import traceback
 from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
@@ -13,8 +14,17 @@ from fair_platform.extension_sdk.auth import ExtensionCredentials
 from fair_platform.extension_sdk.auth import build_extension_auth_headers
 from fair_platform.extension_sdk.client import build_platform_client
 from fair_platform.extension_sdk.context import JobContext
-from fair_platform.extension_sdk.contracts.extension import ExtensionRead, ExtensionRegisterRequest
+from fair_platform.extension_sdk.contracts.extension import (
+    ExtensionHeartbeatRequest,
+    ExtensionRead,
+    ExtensionRegisterRequest,
+)
 from fair_platform.extension_sdk.contracts.plugin import PluginDescriptor
+from fair_platform.extension_sdk.tracing import Tracer, extract_trace_context, get_tracer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEARTBEAT_INTERVAL_S = 10.0
 
 
 class FairExtension:
@@ -32,6 +42,16 @@ class FairExtension:
         capabilities: list[str] | None = None,
         metadata: dict[str, Any] | None = None,
         plugins: list[PluginDescriptor] | None = None,
+        max_concurrency: int | None = None,
+        rate_limit_per_s: float | None = None,
+        rate_limit_burst: int | None = None,
+        batch_max_jobs: int | None = None,
+        batch_max_wait_ms: int | None = None,
+        instance_id: str | None = None,
+        weight: int = 1,
+        heartbeat_interval_s: float | None = DEFAULT_HEARTBEAT_INTERVAL_S,
+        queue_length: Callable[[], int] | None = None,
+        tracer: Tracer | None = None,
     ):
         self.extension_id = extension_id
         self.platform_url = platform_url.rstrip("/")
@@ -44,27 +64,94 @@ class FairExtension:
         self._capabilities = list(capabilities or [])
         self._metadata = dict(metadata or {})
         self._plugins = list(plugins or [])
+        # Advertised on connect; the platform defers jobs above these limits.
+        self.max_concurrency = max_concurrency
+        self.rate_limit_per_s = rate_limit_per_s
+        self.rate_limit_burst = rate_limit_burst
+        # Opt-in: the platform posts up to `batch_max_jobs` jobs per webhook call.
+        self.batch_max_jobs = batch_max_jobs
+        self.batch_max_wait_ms = batch_max_wait_ms
+        # Replicas of one extension each connect as an instance; the platform
+        # spreads jobs over them by `weight`.
+        self.instance_id = instance_id
+        self.weight = weight
+        # After connecting, the load is reported this often; the platform
+        # stops routing to instances that miss a few heartbeats. `None`
+        # disables heartbeats and expiry.
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self._queue_length = queue_length
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._connected_webhook_url: str | None = None
+        # Each job runs in an `extension.execute` span under the platform's delivery span.
+        self.tracer = tracer or get_tracer()
         self._actions: dict[str, tuple[Callable[..., Awaitable[Any]], type[BaseModel]]] = {}
+        # Running jobs, so cancel signals can stop them.
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._contexts: dict[str, JobContext] = {}
 
         @asynccontextmanager
         async def lifespan(_app: FastAPI):
             if auto_connect:
                 await self.connect()
-            yield
+            try:
+                yield
+            finally:
+                await self.stop_heartbeats()
 
         self.app = FastAPI(title=f"FAIR Extension: {extension_id}", lifespan=lifespan)
 
         @self.app.post(self.webhook_path)
         async def _handle_webhook(request: Request):
             body = await request.json()
+            if body.get("type") == "batch":
+                # Parse every job before starting any: failing the request
+                # halfway would make the platform redeliver the jobs that
+                # already started. Malformed jobs are rejected one by one.
+                parsed: list[tuple[str, str, dict[str, Any], dict[str, Any]]] = []
+                rejected: list[dict[str, Any]] = []
+                for job in body.get("jobs") or []:
+                    try:
+                        parsed.append(_parse_job(job))
+                    except (KeyError, TypeError, ValueError) as exc:
+                        job_id = job.get("job_id") if isinstance(job, dict) else None
+                        rejected.append({"job_id": job_id, "error": f"Malformed job: {exc!r}"})
+                for job in parsed:
+                    self._schedule(*job)
+                if rejected:
+                    return {"accepted": True, "jobs": len(parsed), "rejected": rejected}
+                return {"accepted": True, "jobs": len(parsed)}
             job_id = str(body["job_id"])
-            payload = body.get("payload", {})
-            action_name = str(payload["action"])
-            raw_params = payload.get("params", {})
-            metadata = body.get("metadata") or {}
-            asyncio.create_task(self._execute(job_id=job_id, action_name=action_name, raw_params=raw_params, metadata=metadata))
+            if body.get("type") == "cancel":
+                return {"accepted": True, "cancelled": self.cancel(job_id)}
+            self._schedule(*_parse_job(body))
             return {"accepted": True}
 
+    def _schedule(self, job_id: str, action_name: str, raw_params: dict[str, Any], metadata: dict[str, Any]) -> None:
+        """Start the action for one delivered job in the background."""
+        task = asyncio.create_task(self._execute(job_id=job_id, action_name=action_name, raw_params=raw_params, metadata=metadata))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda done: self._forget_task(job_id, done))
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel the running job `job_id`; return `False` if it is not running here.
+
+        The handler's task is cancelled, so awaited calls (LLM requests,
+        platform updates) stop right away, and `ctx.cancelled` turns true.
+        """
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            return False
+        context = self._contexts.get(job_id)
+        if context is not None:
+            context._mark_cancelled()
+        task.cancel()
+        return True
+
+    def _forget_task(self, job_id: str, task: asyncio.Task[None]) -> None:
+        # A redelivered job may have replaced this task already.
+        if self._tasks.get(job_id) is task:
+            del self._tasks[job_id]
+
     def action(self, name: str):
         def decorator(func: Callable[..., Awaitable[Any]]):
             signature = inspect.signature(func)
@@ -99,6 +186,14 @@ class FairExtension:
             intents=intents if intents is not None else self._intents,
             capabilities=capabilities if capabilities is not None else self._capabilities,
             metadata=self._build_metadata(metadata),
+            max_concurrency=self.max_concurrency,
+            rate_limit_per_s=self.rate_limit_per_s,
+            rate_limit_burst=self.rate_limit_burst,
+            batch_max_jobs=self.batch_max_jobs,
+            batch_max_wait_ms=self.batch_max_wait_ms,
+            instance_id=self.instance_id,
+            weight=self.weight,
+            heartbeat_interval_s=self.heartbeat_interval_s,
         )
 
         owns_client = client is None
@@ -110,10 +205,62 @@ class FairExtension:
                 headers=build_extension_auth_headers(self.credentials),
             )
             response.raise_for_status()
-            return ExtensionRead.model_validate(response.json())
+            registered = ExtensionRead.model_validate(response.json())
         finally:
             if owns_client:
                 await http.aclose()
+        self._connected_webhook_url = resolved_webhook_url
+        if self.heartbeat_interval_s is not None and (self._heartbeat_task is None or self._heartbeat_task.done()):
+            self._heartbeat_task = asyncio.create_task(self._send_heartbeats(self.heartbeat_interval_s))
+        return registered
+
+    def load_stats(self) -> dict[str, int]:
+        """The load reported in heartbeats: running jobs and jobs waiting to run."""
+        in_flight = sum(1 for task in self._tasks.values() if not task.done())
+        return {"in_flight": in_flight, "queue_length": self._queue_length() if self._queue_length else 0}
+
+    async def heartbeat(self, *, client: httpx.AsyncClient | None = None) -> bool:
+        """Report this instance's load; reconnect if the platform expired it.
+
+        Returns whether the platform still knew the instance.
+        """
+        if self._connected_webhook_url is None:
+            raise ValueError("extension.connect() must succeed before heartbeats are sent")
+        payload = ExtensionHeartbeatRequest(
+            extension_id=self.extension_id,
+            instance_id=self.instance_id or self._connected_webhook_url,
+            **self.load_stats(),
+        )
+        owns_client = client is None
+        http = client or build_platform_client(self.platform_url, self.credentials)
+        try:
+            response = await http.post(
+                "/api/extensions/heartbeat",
+                json=payload.model_dump(by_alias=True, mode="json"),
+                headers=build_extension_auth_headers(self.credentials),
+            )
+            if response.status_code == 404:
+                await self.connect(webhook_url=self._connected_webhook_url, client=http)
+                return False
+            response.raise_for_status()
+            return True
+        finally:
+            if owns_client:
+                await http.aclose()
+
+    async def stop_heartbeats(self) -> None:
+        task, self._heartbeat_task = self._heartbeat_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _send_heartbeats(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await self.heartbeat()
+            except Exception:
+                logger.warning("Heartbeat for extension %s failed", self.extension_id, exc_info=True)
 
     def _build_metadata(self, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
         resolved = dict(self._metadata)
@@ -126,24 +273,59 @@ class FairExtension:
         return resolved
 
     async def _execute(self, job_id: str, action_name: str, raw_params: dict[str, Any], metadata: dict[str, Any] | None = None) -> None:
-        async with JobContext(job_id=job_id, platform_url=self.platform_url, credentials=self.credentials, metadata=metadata) as ctx:
-            try:
-                if action_name not in self._actions:
-                    raise ValueError(f"Action '{action_name}' is not registered")
-                handler, schema = self._actions[action_name]
-                params = schema.model_validate(raw_params)
-                result = await handler(ctx, params)
-                if result is None:
-                    return
-                if isinstance(result, BaseModel):
-                    result_data = result.model_dump(by_alias=True, mode="json")
-                elif isinstance(result, dict):
-                    result_data = result
-                else:
-                    raise ValueError(f"Action '{action_name}' returned unsupported result type: {type(result)}")
-                await ctx.result(result_data, status="completed")
-            except Exception as exc:
-                await ctx.error(error=str(exc), traceback=traceback.format_exc(), status="failed")
-
-
-__all__ = ["FairExtension"]
+        async with JobContext(
+            job_id=job_id,
+            platform_url=self.platform_url,
+            credentials=self.credentials,
+            metadata=metadata,
+            tracer=self.tracer,
+        ) as ctx:
+            self._contexts[job_id] = ctx
+            with self.tracer.span(
+                "extension.execute",
+                parent=extract_trace_context(metadata),
+                attributes={"job_id": job_id, "extension_id": self.extension_id, "action": action_name},
+            ) as span:
+                ctx.trace_context = span.context
+                try:
+                    if action_name not in self._actions:
+                        raise ValueError(f"Action '{action_name}' is not registered")
+                    handler, schema = self._actions[action_name]
+                    params = schema.model_validate(raw_params)
+                    result = await handler(ctx, params)
+                    if result is None:
+                        return
+                    if isinstance(result, BaseModel):
+                        result_data = result.model_dump(by_alias=True, mode="json")
+                    elif isinstance(result, dict):
+                        result_data = result
+                    else:
+                        raise ValueError(f"Action '{action_name}' returned unsupported result type: {type(result)}")
+                    await ctx.result(result_data, status="completed")
+                except asyncio.CancelledError:
+                    span.record_error("cancelled")
+                    # The platform already marked the job cancelled; nothing to report.
+                    if not ctx.cancelled:
+                        raise
+                except Exception as exc:
+                    span.record_error(exc)
+                    await ctx.error(error=str(exc), traceback=traceback.format_exc(), status="failed")
+                finally:
+                    self._contexts.pop(job_id, None)
+
+
+def _parse_job(body: Any) -> tuple[str, str, dict[str, Any], dict[str, Any]]:
+    """Job id, action, params and metadata of one delivered job body."""
+    if not isinstance(body, dict):
+        raise TypeError(f"expected a job object, got {type(body).__name__}")
+    payload = body.get("payload", {})
+    if not isinstance(payload, dict):
+        raise TypeError("payload must be an object")
+    raw_params = payload.get("params", {})
+    metadata = body.get("metadata") or {}
+    if not isinstance(raw_params, dict) or not isinstance(metadata, dict):
+        raise TypeError("params and metadata must be objects")
+    return str(body["job_id"]), str(payload["action"]), raw_params, metadata
+
+
+__all__ = ["DEFAULT_HEARTBEAT_INTERVAL_S", "FairExtension"]
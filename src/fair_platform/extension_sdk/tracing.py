@@ -0,0 +1,353 @@
+"""Minimal W3C trace-context tracing shared by the platform and extensions.
+
+A job crosses several processes: the workflow runner enqueues it, a
+dispatcher delivers it, the extension runs it and posts updates back to the
+API. Each hop opens a span and hands its context to the next one as a
+`traceparent` (https://www.w3.org/TR/trace-context/):
+
+- in `JobMessage.metadata["traceparent"]`, which the dispatcher forwards in
+  the webhook body's `metadata` (batched deliveries carry one per job);
+- in the `traceparent` header of the extension's `/api/jobs/{id}/updates`
+  calls.
+
+Spans go to the tracer's exporter: `InMemorySpanExporter` (the latest
+spans only) for tests and notebooks, `JsonFileSpanExporter` for one JSON
+object per span in a file, written by a background thread, or anything
+with an `export(span)` method; `export` is called on the event loop, so it
+must not block. Without an exporter contexts are
+still propagated, so traces stay connected across processes that do export.
+Every process picks its exporter from the environment (see
+`tracer_from_env`); join the files on `trace_id` to see where a job's time
+went.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_KEY = "traceparent"
+DEFAULT_TRACE_FILE = "fair-traces.jsonl"
+DEFAULT_MEMORY_SPAN_LIMIT = 10_000
+DEFAULT_FILE_EXPORT_BACKLOG = 10_000
+
+_TRACEPARENT_RE = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    """The part of a span that crosses process boundaries."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def parse(cls, traceparent: str | None) -> TraceContext | None:
+        """Parse a `traceparent` value; `None` when it is missing or malformed."""
+        if not traceparent:
+            return None
+        match = _TRACEPARENT_RE.match(traceparent.strip().lower())
+        if match is None:
+            return None
+        version, trace_id, span_id, flags = match.groups()
+        if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+            return None
+        return cls(trace_id=trace_id, span_id=span_id, sampled=bool(int(flags, 16) & 0x01))
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    start_time: float
+    end_time: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: str | None = None
+    sampled: bool = True
+
+    @property
+    def context(self) -> TraceContext:
+        return TraceContext(trace_id=self.trace_id, span_id=self.span_id, sampled=self.sampled)
+
+    @property
+    def duration_s(self) -> float | None:
+        return None if self.end_time is None else self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException | str) -> None:
+        self.status = "error"
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict[str, Any]:
+        duration_s = self.duration_s
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": None if duration_s is None else round(duration_s * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class InMemorySpanExporter:
+    """Keeps the last `max_spans` finished spans (all with `None`) in `spans`."""
+
+    def __init__(self, max_spans: int | None = DEFAULT_MEMORY_SPAN_LIMIT):
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def by_name(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+
+class JsonFileSpanExporter:
+    """Appends every finished span to `path` as one JSON object per line.
+
+    `export` only queues the line; a daemon thread keeps the file open and
+    writes it, so ending a span never waits on the disk. Up to `max_backlog`
+    lines wait to be written, later ones are dropped (counted in `dropped`).
+    `flush` waits until the queued lines are written; `close` also stops the
+    thread and runs at interpreter exit.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, max_backlog: int = DEFAULT_FILE_EXPORT_BACKLOG):
+        self.path = Path(path)
+        self.dropped = 0
+        self._lines: queue.Queue[str | None] = queue.Queue(maxsize=max(1, max_backlog))
+        self._lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        self._closes_at_exit = False
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        self._start_writer()
+        try:
+            self._lines.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        self._lines.join()
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._lines.put(None)
+            writer.join()
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._write, name="fair-span-writer", daemon=True)
+            self._writer.start()
+            if not self._closes_at_exit:
+                self._closes_at_exit = True
+                atexit.register(self.close)
+
+    def _write(self) -> None:
+        file = None
+        try:
+            while True:
+                line = self._lines.get()
+                try:
+                    if line is None:
+                        return
+                    if file is None:
+                        file = self.path.open("a", encoding="utf-8")
+                    file.write(line + "\n")
+                    if self._lines.empty():
+                        file.flush()
+                except OSError:
+                    logger.warning("Failed to write a span to %s", self.path, exc_info=True)
+                finally:
+                    self._lines.task_done()
+        finally:
+            if file is not None:
+                file.close()
+
+
+_current_span: ContextVar[Span | None] = ContextVar("fair_current_span", default=None)
+
+
+def current_trace_context() -> TraceContext | None:
+    """The context of the span opened with `Tracer.span` in this task, if any."""
+    span = _current_span.get()
+    return span.context if span is not None else None
+
+
+def extract_trace_context(carrier: Mapping[str, Any] | None) -> TraceContext | None:
+    """Read the `traceparent` from job metadata or HTTP headers."""
+    if not carrier:
+        return None
+    value = carrier.get(TRACEPARENT_KEY)
+    return TraceContext.parse(value) if isinstance(value, str) else None
+
+
+def inject_trace_context(carrier: Mapping[str, Any], context: TraceContext | None) -> dict[str, Any]:
+    """A copy of `carrier` (job metadata or headers) carrying `context`."""
+    injected = dict(carrier)
+    if context is not None:
+        injected[TRACEPARENT_KEY] = context.traceparent
+    return injected
+
+
+class Tracer:
+    """Creates spans and hands finished ones to `exporter`."""
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter
+
+    def start_span(
+        self,
+        name: str,
+        *,
+        parent: TraceContext | None = None,
+        attributes: Mapping[str, Any] | None = None,
+        start_time: float | None = None,
+    ) -> Span:
+        """Open a span under `parent` (default: the current span, else a new trace).
+
+        Finish it with `end_span`. Use `span` to also make it the current span.
+        """
+        if parent is None:
+            parent = current_trace_context()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent is not None else None,
+            start_time=time.time() if start_time is None else start_time,
+            attributes=dict(attributes or {}),
+            sampled=parent.sampled if parent is not None else True,
+        )
+
+    def end_span(self, span: Span, *, error: BaseException | str | None = None) -> None:
+        if span.end_time is not None:
+            return
+        span.end_time = time.time()
+        if error is not None:
+            span.record_error(error)
+        if self.exporter is None or not span.sampled:
+            return
+        try:
+            self.exporter.export(span)
+        except Exception:
+            logger.warning("Failed to export span %s", span.name, exc_info=True)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        *,
+        parent: TraceContext | None = None,
+        attributes: Mapping[str, Any] | None = None,
+    ) -> Iterator[Span]:
+        """Run the block in a new span that is the current one meanwhile."""
+        span = self.start_span(name, parent=parent, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            self.end_span(span, error=exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+
+def tracer_from_env() -> Tracer:
+    """Build a tracer from `FAIR_TRACE_EXPORTER`.
+
+    - unset or `none`: propagate contexts, export nothing
+    - `memory`: keep the latest spans in an `InMemorySpanExporter`
+    - `json`: append spans to `FAIR_TRACE_FILE` (default `fair-traces.jsonl`)
+    """
+    raw = os.getenv("FAIR_TRACE_EXPORTER", "").strip().lower()
+    if raw in {"", "none"}:
+        return Tracer()
+    if raw == "memory":
+        return Tracer(InMemorySpanExporter())
+    if raw == "json":
+        return Tracer(JsonFileSpanExporter(os.getenv("FAIR_TRACE_FILE", DEFAULT_TRACE_FILE)))
+    raise ValueError(f"Unsupported FAIR_TRACE_EXPORTER={raw!r}. Expected 'none', 'memory' or 'json'.")
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, built from the environment on first use."""
+    global _tracer
+    if _tracer is None:
+        _tracer = tracer_from_env()
+    return _tracer
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Replace the process-wide tracer; `None` rebuilds it from the environment."""
+    global _tracer
+    _tracer = tracer
+
+
+__all__ = [
+    "DEFAULT_FILE_EXPORT_BACKLOG",
+    "DEFAULT_MEMORY_SPAN_LIMIT",
+    "DEFAULT_TRACE_FILE",
+    "InMemorySpanExporter",
+    "JsonFileSpanExporter",
+    "Span",
+    "SpanExporter",
+    "TRACEPARENT_KEY",
+    "TraceContext",
+    "Tracer",
+    "current_trace_context",
+    "extract_trace_context",
+    "get_tracer",
+    "inject_trace_context",
+    "set_tracer",
+    "tracer_from_env",
+]
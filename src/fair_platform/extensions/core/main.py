@@ -136,7 +136,9 @@ async def _call_llm(
     resolved_max_tokens = max_tokens if max_tokens is not None else FAIR_CORE_LLM_MAX_TOKENS
     if resolved_max_tokens:
         params["max_tokens"] = resolved_max_tokens
-    response = await client.chat.completions.create(**params)
+    # Runs inside the job's `extension.execute` span, so the call joins its trace.
+    with core_extension.tracer.span("llm.call", attributes={"model": params["model"]}):
+        response = await client.chat.completions.create(**params)
     content = response.choices[0].message.content if response.choices else None
     if not content:
         raise RuntimeError("LLM returned empty response.")
@@ -314,6 +316,12 @@ def _core_webhook_url() -> str:
     return f"http://{host}:{port}/hooks/jobs"
 
 
+def _core_max_concurrency() -> int | None:
+    # LLM calls are slow and rate limited upstream; 0 lifts the limit.
+    raw = os.getenv("FAIR_CORE_EXTENSION_MAX_CONCURRENCY", "4").strip() or "4"
+    return int(raw) or None
+
+
 core_extension = FairExtension(
     extension_id=os.getenv("FAIR_CORE_EXTENSION_ID", "fair.core"),
     platform_url=os.getenv("FAIR_CORE_PLATFORM_URL", "http://127.0.0.1:8000"),
@@ -324,6 +332,7 @@ core_extension = FairExtension(
     intents=["rubric.create"],
     capabilities=["rubrics"],
     metadata={"builtin": True, "name": "FAIR Core"},
+    max_concurrency=_core_max_concurrency(),
     plugins=[
         PluginDescriptor(
             plugin_id="fair.core.transcriber.simple",
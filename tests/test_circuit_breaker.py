@@ -0,0 +1,104 @@
+from fair_platform.backend.services.circuit_breaker import BreakerState, CircuitBreaker, CircuitBreakers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _call(breaker: CircuitBreaker, ok: bool, latency_s: float = 0.1) -> None:
+    permit, wait_s = breaker.try_acquire()
+    assert permit is not None and wait_s == 0.0
+    breaker.record(permit, ok, latency_s)
+
+
+def test_breaker_opens_on_failure_rate_and_closes_after_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_s=10, min_calls=4, failure_rate_threshold=0.5, open_s=5, clock=clock)
+
+    for ok in (True, False, True):
+        _call(breaker, ok)
+    assert breaker.state == BreakerState.CLOSED
+    _call(breaker, False)
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.try_acquire() == (None, 5.0)
+
+    clock.now += 5
+    assert breaker.state == BreakerState.HALF_OPEN
+    probe, _ = breaker.try_acquire()
+    assert probe is not None and probe.probe
+    # One probe at a time.
+    permit, wait_s = breaker.try_acquire()
+    assert permit is None and wait_s > 0
+    breaker.record(probe, False, 0.1)
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now += 5
+    _call(breaker, True)
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.try_acquire()[0] is not None
+
+
+def test_breaker_counts_slow_calls_and_forgets_old_ones():
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_s=10, min_calls=2, failure_rate_threshold=1.0, slow_call_s=1.0, clock=clock)
+
+    _call(breaker, True, 2.0)
+    clock.now += 11
+    _call(breaker, True, 2.0)
+    assert breaker.state == BreakerState.CLOSED
+    _call(breaker, True, 5.0)
+    assert breaker.state == BreakerState.OPEN
+
+
+def test_abandoned_probe_lets_the_next_call_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=1, open_s=1, clock=clock)
+    _call(breaker, False)
+    clock.now += 1
+
+    probe, _ = breaker.try_acquire()
+    breaker.abandon(probe)
+    assert probe.settled
+    assert breaker.try_acquire()[0] is not None
+
+
+def test_only_the_current_probe_settles_a_half_open_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=1, open_s=1, clock=clock)
+    # A call let through while closed is still in flight when the breaker opens.
+    slow_call, _ = breaker.try_acquire()
+    _call(breaker, False)
+    clock.now += 1
+    probe, _ = breaker.try_acquire()
+
+    # It finishes while the breaker is half-open; that is not the probe's result.
+    breaker.record(slow_call, True, 0.1)
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.try_acquire()[0] is None
+
+    # Giving back some other permit does not free the probe either.
+    breaker.abandon(slow_call)
+    assert breaker.try_acquire()[0] is None
+
+    breaker.record(probe, False, 0.1)
+    assert breaker.state == BreakerState.OPEN
+    # A stale probe from before the breaker reopened is ignored as well.
+    clock.now += 1
+    new_probe, _ = breaker.try_acquire()
+    breaker.record(probe, True, 0.1)
+    assert breaker.state == BreakerState.HALF_OPEN
+    breaker.record(new_probe, True, 0.1)
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_breakers_are_kept_per_target():
+    breakers = CircuitBreakers(min_calls=1)
+    _call(breakers.get("down.ext"), False)
+
+    assert breakers.get("down.ext").state == BreakerState.OPEN
+    assert breakers.get("up.ext").try_acquire()[0] is not None
+    assert breakers.states() == {"down.ext": BreakerState.OPEN, "up.ext": BreakerState.CLOSED}
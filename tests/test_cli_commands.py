@@ -288,3 +288,28 @@ def test_users_reset_password_returns_error_for_unknown_email(monkeypatch):
 
     assert result.exit_code == 1
     assert "User not found: missing@test.com" in result.output
+
+
+def test_dispatcher_command_requires_a_shared_queue(monkeypatch):
+    monkeypatch.setenv("FAIR_JOB_QUEUE_BACKEND", "local")
+
+    result = CliRunner().invoke(cli_main.app, ["dispatcher"])
+
+    assert result.exit_code == 1
+    assert "FAIR_JOB_QUEUE_BACKEND" in result.output
+
+
+def test_runner_command_runs_workflow_runner_with_options(monkeypatch):
+    import fair_platform.backend.workers as workers
+
+    calls = {}
+
+    async def run_workflow_runner(**kwargs):
+        calls.update(kwargs)
+
+    monkeypatch.setattr(workers, "run_workflow_runner", run_workflow_runner)
+
+    result = CliRunner().invoke(cli_main.app, ["runner", "--max-runs", "3", "--poll-interval", "0.5"])
+
+    assert result.exit_code == 0
+    assert calls == {"max_runs": 3, "poll_interval_s": 0.5, "drain_timeout_s": 60.0}
@@ -0,0 +1,47 @@
+from fair_platform.backend.services.dispatch_limits import ExtensionLimiter, TokenBucket
+from fair_platform.backend.services.extension_registry import ExtensionRegistration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_bursts_then_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_s=2.0, burst=3, clock=clock)
+
+    assert [bucket.try_take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_take() == 0.5
+
+    clock.now += 0.5
+    assert bucket.try_take() == 0.0
+    clock.now += 10
+    assert [bucket.try_take() for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+
+def test_extension_limiter_enforces_concurrency_and_rate_per_target():
+    clock = FakeClock()
+    limiter = ExtensionLimiter(concurrency_defer_s=0.25, clock=clock)
+    llm = ExtensionRegistration(extension_id="llm", webhook_url="http://llm", max_concurrency=2)
+    ocr = ExtensionRegistration(extension_id="ocr", webhook_url="http://ocr", rate_limit_per_s=1.0)
+
+    assert limiter.try_acquire(llm) == 0.0
+    assert limiter.try_acquire(llm) == 0.0
+    assert limiter.try_acquire(llm) == 0.25
+    assert limiter.in_flight("llm") == 2
+    limiter.release("llm")
+    assert limiter.try_acquire(llm) == 0.0
+
+    # Other targets are not affected by llm's limit.
+    assert limiter.try_acquire(ocr) == 0.0
+    limiter.release("ocr")
+    assert limiter.try_acquire(ocr) == 1.0
+    assert limiter.in_flight("ocr") == 0
+
+    # Reconnecting with a higher limit applies at once.
+    llm.max_concurrency = 3
+    assert limiter.try_acquire(llm) == 0.0
@@ -1,11 +1,22 @@
 import pytest
 
 from fair_platform.backend.services.extension_registry import (
+    ExtensionInstance,
     ExtensionRegistration,
     LocalExtensionRegistry,
 )
 
 
+def _replica(port: int, weight: int = 1, **fields) -> ExtensionRegistration:
+    url = f"http://localhost:{port}/hooks/jobs"
+    return ExtensionRegistration(
+        extension_id="fairgrade.core",
+        webhook_url=url,
+        instances=[ExtensionInstance(instance_id=f"replica-{port}", webhook_url=url, weight=weight)],
+        **fields,
+    )
+
+
 @pytest.mark.asyncio
 async def test_local_extension_registry_register_get_list_unregister():
     registry = LocalExtensionRegistry()
@@ -28,3 +39,149 @@ async def test_local_extension_registry_register_get_list_unregister():
 
     await registry.unregister("fairgrade.core")
     assert await registry.get("fairgrade.core") is None
+
+
+@pytest.mark.asyncio
+async def test_second_replica_joins_the_registration_instead_of_replacing_it():
+    registry = LocalExtensionRegistry()
+
+    await registry.register(_replica(9000, max_concurrency=2))
+    await registry.register(_replica(9001, weight=3, max_concurrency=4))
+    await registry.register(_replica(9000, weight=2, max_concurrency=4))
+
+    fetched = await registry.get("fairgrade.core")
+    assert [(i.instance_id, i.weight) for i in fetched.instances] == [("replica-9000", 2), ("replica-9001", 3)]
+    assert fetched.webhook_url == "http://localhost:9000/hooks/jobs"
+    assert fetched.max_concurrency == 4
+
+    # Registrations without explicit instances are one instance at their webhook.
+    single = ExtensionRegistration(extension_id="solo", webhook_url="http://solo/jobs")
+    assert single.instances == [ExtensionInstance(instance_id="http://solo/jobs", webhook_url="http://solo/jobs")]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _heartbeating_replica(port: int) -> ExtensionRegistration:
+    registration = _replica(port)
+    registration.instances[0].heartbeat_interval_s = 10.0
+    return registration
+
+
+@pytest.mark.asyncio
+async def test_instances_that_miss_heartbeats_expire():
+    clock = FakeClock()
+    registry = LocalExtensionRegistry(clock=clock)
+    await registry.register(_heartbeating_replica(9000))
+    await registry.register(_heartbeating_replica(9001))
+
+    clock.now += 20
+    beat = await registry.heartbeat("fairgrade.core", "replica-9001", in_flight=3, queue_length=1)
+    assert (beat.in_flight, beat.queue_length, beat.last_seen_at) == (3, 1, clock.now)
+
+    # replica-9000 has now missed three 10s heartbeats; replica-9001 has not.
+    clock.now += 15
+    fetched = await registry.get("fairgrade.core")
+    assert [instance.instance_id for instance in fetched.instances] == ["replica-9001"]
+    assert await registry.heartbeat("fairgrade.core", "replica-9000") is None
+
+    # Without live instances the extension is offline, not unknown.
+    clock.now += 31
+    offline = await registry.get("fairgrade.core")
+    assert offline is not None and offline.instances == []
+    assert await registry.heartbeat("fairgrade.core", "replica-9001") is None
+    assert await registry.list() == []
+
+    # Instances without a heartbeat interval never expire.
+    await registry.register(_replica(9002))
+    clock.now += 3600
+    assert await registry.get("fairgrade.core") is not None
+
+
+@pytest.mark.asyncio
+async def test_sql_extension_registry_is_shared_between_instances(test_db):
+    from fair_platform.backend.services.sql_extension_registry import SqlExtensionRegistry
+
+    engine = test_db.kw["bind"]
+    api_registry = SqlExtensionRegistry(engine)
+    dispatcher_registry = SqlExtensionRegistry(engine, cache_ttl_s=0)
+
+    await api_registry.register(
+        ExtensionRegistration(
+            extension_id="fairgrade.core",
+            webhook_url="http://localhost:9000/hooks/jobs",
+            intents=["rubrics.generate"],
+            metadata={"sdk": "python"},
+            max_concurrency=4,
+            batch_max_jobs=8,
+        )
+    )
+
+    fetched = await dispatcher_registry.get("fairgrade.core")
+    assert fetched is not None
+    assert fetched.webhook_url == "http://localhost:9000/hooks/jobs"
+    assert fetched.intents == ["rubrics.generate"]
+    assert fetched.metadata == {"sdk": "python"}
+    assert fetched.max_concurrency == 4
+    assert fetched.batch_max_jobs == 8
+    assert [item.extension_id for item in await dispatcher_registry.list()] == ["fairgrade.core"]
+
+    fetched.webhook_url = "http://localhost:9001/hooks/jobs"
+    await api_registry.register(fetched)
+    assert (await dispatcher_registry.get("fairgrade.core")).webhook_url == "http://localhost:9001/hooks/jobs"
+
+    await api_registry.register(_replica(9002, weight=2))
+    replicas = (await dispatcher_registry.get("fairgrade.core")).instances
+    assert [(i.instance_id, i.webhook_url, i.weight) for i in replicas] == [
+        ("http://localhost:9000/hooks/jobs", "http://localhost:9000/hooks/jobs", 1),
+        ("replica-9002", "http://localhost:9002/hooks/jobs", 2),
+    ]
+
+    await api_registry.unregister("fairgrade.core")
+    assert await dispatcher_registry.get("fairgrade.core") is None
+
+
+@pytest.mark.asyncio
+async def test_sql_extension_registry_records_heartbeats_and_expires_instances(test_db):
+    from fair_platform.backend.services.sql_extension_registry import SqlExtensionRegistry
+
+    clock = FakeClock()
+    registry = SqlExtensionRegistry(test_db.kw["bind"], cache_ttl_s=0, wall_clock=clock)
+    await registry.register(_heartbeating_replica(9000))
+    await registry.register(_heartbeating_replica(9001))
+
+    clock.now += 25
+    beat = await registry.heartbeat("fairgrade.core", "replica-9001", in_flight=2)
+    assert beat is not None and beat.in_flight == 2
+
+    clock.now += 10
+    fetched = await registry.get("fairgrade.core")
+    assert [(instance.instance_id, instance.in_flight) for instance in fetched.instances] == [("replica-9001", 2)]
+    assert await registry.heartbeat("fairgrade.core", "replica-9000") is None
+
+    clock.now += 31
+    offline = await registry.get("fairgrade.core")
+    assert offline is not None and offline.instances == []
+    assert await registry.heartbeat("fairgrade.core", "replica-9001") is None
+    assert await registry.list() == []
+
+    await registry.register(_heartbeating_replica(9002))
+    fetched = await registry.get("fairgrade.core")
+    assert [instance.instance_id for instance in fetched.instances] == ["replica-9002"]
+
+
+def test_extension_registry_backend_follows_the_job_queue(monkeypatch):
+    from fair_platform.backend.services.extension_registry import get_extension_registry_backend
+
+    monkeypatch.delenv("FAIR_EXTENSION_REGISTRY_BACKEND", raising=False)
+    monkeypatch.setenv("FAIR_JOB_QUEUE_BACKEND", "local")
+    assert get_extension_registry_backend() == "local"
+    monkeypatch.setenv("FAIR_JOB_QUEUE_BACKEND", "redis-streams")
+    assert get_extension_registry_backend() == "sql"
+    monkeypatch.setenv("FAIR_EXTENSION_REGISTRY_BACKEND", "local")
+    assert get_extension_registry_backend() == "local"
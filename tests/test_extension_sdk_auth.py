@@ -2,6 +2,7 @@ import asyncio
 import json
 
 import httpx
+from pydantic import BaseModel
 
 from fair_platform.backend.main import app
 from fair_platform.extension_sdk import ExtensionCredentials, FairExtension, JobContext, build_extension_auth_headers
@@ -66,3 +67,189 @@ def test_fair_extension_connect_returns_registered_extension(extension_client_cr
     registered = asyncio.run(_run())
     assert registered.extension_id == extension_client_credentials["extension_id"]
     assert registered.requested_scopes == ["jobs:write"]
+
+
+def test_fair_extension_cancel_signal_stops_running_action(extension_client_credentials):
+    class Params(BaseModel):
+        pass
+
+    extension = FairExtension(
+        extension_id=extension_client_credentials["extension_id"],
+        platform_url="http://platform.test",
+        extension_secret=extension_client_credentials["extension_secret"],
+    )
+    started = asyncio.Event()
+    contexts: list[JobContext] = []
+
+    @extension.action("slow")
+    async def slow(ctx: JobContext, params: Params):
+        contexts.append(ctx)
+        started.set()
+        await asyncio.sleep(60)
+
+    async def _run():
+        transport = httpx.ASGITransport(app=extension.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://extension.test") as client:
+            accepted = await client.post(
+                "/hooks/jobs",
+                json={"job_id": "job-slow", "payload": {"action": "slow", "params": {}}},
+            )
+            assert accepted.json() == {"accepted": True}
+            await asyncio.wait_for(started.wait(), timeout=1.0)
+            task = extension._tasks["job-slow"]
+
+            cancelled = await client.post("/hooks/jobs", json={"type": "cancel", "job_id": "job-slow"})
+            assert cancelled.json() == {"accepted": True, "cancelled": True}
+            await asyncio.wait_for(asyncio.wait({task}), timeout=1.0)
+
+            unknown = await client.post("/hooks/jobs", json={"type": "cancel", "job_id": "job-slow"})
+            assert unknown.json() == {"accepted": True, "cancelled": False}
+
+    asyncio.run(_run())
+    assert contexts[0].cancelled is True
+    assert extension._tasks == {}
+
+
+def test_fair_extension_schedules_every_job_of_a_batch(extension_client_credentials):
+    class Params(BaseModel):
+        value: int
+
+    extension = FairExtension(
+        extension_id=extension_client_credentials["extension_id"],
+        platform_url="http://platform.test",
+        extension_secret=extension_client_credentials["extension_secret"],
+        batch_max_jobs=8,
+    )
+    seen: list[tuple[str, int]] = []
+    release = asyncio.Event()
+
+    @extension.action("echo")
+    async def echo(ctx: JobContext, params: Params):
+        seen.append((ctx.job_id, params.value))
+        await release.wait()
+
+    async def _run():
+        transport = httpx.ASGITransport(app=extension.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://extension.test") as client:
+            accepted = await client.post(
+                "/hooks/jobs",
+                json={
+                    "type": "batch",
+                    "jobs": [
+                        {"job_id": f"job-batch-{index}", "payload": {"action": "echo", "params": {"value": index}}}
+                        for index in range(3)
+                    ],
+                },
+            )
+            assert accepted.json() == {"accepted": True, "jobs": 3}
+            for _ in range(100):
+                if len(seen) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            assert set(extension._tasks) == {"job-batch-0", "job-batch-1", "job-batch-2"}
+            for task in list(extension._tasks.values()):
+                task.cancel()
+            await asyncio.gather(*extension._tasks.values(), return_exceptions=True)
+
+    asyncio.run(_run())
+    assert sorted(seen) == [("job-batch-0", 0), ("job-batch-1", 1), ("job-batch-2", 2)]
+
+
+def test_fair_extension_rejects_a_malformed_job_without_failing_its_batch(extension_client_credentials):
+    class Params(BaseModel):
+        value: int
+
+    extension = FairExtension(
+        extension_id=extension_client_credentials["extension_id"],
+        platform_url="http://platform.test",
+        extension_secret=extension_client_credentials["extension_secret"],
+        batch_max_jobs=8,
+    )
+    seen: list[str] = []
+
+    @extension.action("echo")
+    async def echo(ctx: JobContext, params: Params):
+        seen.append(ctx.job_id)
+
+    async def _run():
+        transport = httpx.ASGITransport(app=extension.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://extension.test") as client:
+            response = await client.post(
+                "/hooks/jobs",
+                json={
+                    "type": "batch",
+                    "jobs": [
+                        {"job_id": "job-good-0", "payload": {"action": "echo", "params": {"value": 0}}},
+                        {"job_id": "job-bad", "payload": {"params": {"value": 1}}},
+                        {"job_id": "job-good-2", "payload": {"action": "echo", "params": {"value": 2}}},
+                    ],
+                },
+            )
+            assert response.status_code == 200
+            body = response.json()
+            assert body["jobs"] == 2
+            assert [entry["job_id"] for entry in body["rejected"]] == ["job-bad"]
+            await asyncio.gather(*extension._tasks.values(), return_exceptions=True)
+
+    asyncio.run(_run())
+    assert sorted(seen) == ["job-good-0", "job-good-2"]
+
+
+def test_fair_extension_heartbeat_reports_load_and_reconnects_when_expired(extension_client_credentials):
+    requests: list[tuple[str, dict]] = []
+    expired = True
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        nonlocal expired
+        body = json.loads(request.content.decode("utf-8"))
+        requests.append((request.url.path, body))
+        if request.url.path == "/api/extensions/heartbeat" and expired:
+            expired = False
+            return httpx.Response(404, json={"detail": "Extension instance is not registered"})
+        if request.url.path == "/api/extensions/connect":
+            return httpx.Response(
+                201,
+                json={
+                    "extensionId": body["extensionId"],
+                    "webhookUrl": body["webhookUrl"],
+                    "intents": [],
+                    "capabilities": [],
+                    "metadata": {},
+                    "enabled": True,
+                },
+            )
+        return httpx.Response(200, json={})
+
+    extension = FairExtension(
+        extension_id=extension_client_credentials["extension_id"],
+        platform_url="http://platform.test",
+        extension_secret=extension_client_credentials["extension_secret"],
+        webhook_url="http://localhost:9102/hooks/jobs",
+        heartbeat_interval_s=30,
+        queue_length=lambda: 4,
+    )
+
+    async def _run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(_handler), base_url="http://platform.test"
+        ) as client:
+            await extension.connect(client=client)
+            assert await extension.heartbeat(client=client) is False
+            assert await extension.heartbeat(client=client) is True
+        await extension.stop_heartbeats()
+
+    asyncio.run(_run())
+    paths = [path for path, _ in requests]
+    assert paths == [
+        "/api/extensions/connect",
+        "/api/extensions/heartbeat",
+        "/api/extensions/connect",
+        "/api/extensions/heartbeat",
+    ]
+    assert requests[0][1]["heartbeatIntervalS"] == 30
+    assert requests[3][1] == {
+        "extensionId": extension_client_credentials["extension_id"],
+        "instanceId": "http://localhost:9102/hooks/jobs",
+        "inFlight": 0,
+        "queueLength": 4,
+    }
@@ -16,6 +16,9 @@ def test_register_and_list_extensions(test_client, extension_client_credentials)
             "capabilities": ["rubrics", "chat"],
             "requestedScopes": ["jobs:write"],
             "metadata": {"sdk": "python"},
+            "maxConcurrency": 3,
+            "rateLimitPerS": 5,
+            "batchMaxJobs": 10,
         },
         headers=extension_auth_headers(extension_client_credentials),
     )
@@ -23,6 +26,14 @@ def test_register_and_list_extensions(test_client, extension_client_credentials)
     created = response.json()
     assert created["extensionId"] == extension_client_credentials["extension_id"]
     assert created["enabled"] is True
+    assert created["maxConcurrency"] == 3
+    assert created["rateLimitPerS"] == 5
+    assert created["rateLimitBurst"] is None
+    assert created["batchMaxJobs"] == 10
+    assert created["batchMaxWaitMs"] is None
+    assert ("http://localhost:9000/hooks/jobs", "http://localhost:9000/hooks/jobs", 1) in [
+        (item["instanceId"], item["webhookUrl"], item["weight"]) for item in created["instances"]
+    ]
     assert created["requestedScopes"] == ["jobs:write"]
     assert created["metadata"]["approved_scopes"] == ["extensions:connect", "jobs:read", "jobs:write"]
     assert created["metadata"]["effective_scopes"] == ["jobs:write"]
@@ -34,6 +45,61 @@ def test_register_and_list_extensions(test_client, extension_client_credentials)
     assert len(data) >= 1
     assert any(item["extensionId"] == extension_client_credentials["extension_id"] for item in data)
 
+    replica = test_client.post(
+        "/api/extensions/connect",
+        json={
+            "extensionId": extension_client_credentials["extension_id"],
+            "webhookUrl": "http://localhost:9001/hooks/jobs",
+            "instanceId": "replica-2",
+            "weight": 2,
+        },
+        headers=extension_auth_headers(extension_client_credentials),
+    )
+    assert replica.status_code == 201
+    instances = [(item["instanceId"], item["weight"]) for item in replica.json()["instances"]]
+    assert ("http://localhost:9000/hooks/jobs", 1) in instances
+    assert ("replica-2", 2) in instances
+
+
+def test_extension_heartbeat_reports_load_for_connected_instances(test_client, extension_client_credentials):
+    extension_id = extension_client_credentials["extension_id"]
+    headers = extension_auth_headers(extension_client_credentials)
+    connected = test_client.post(
+        "/api/extensions/connect",
+        json={
+            "extensionId": extension_id,
+            "webhookUrl": "http://localhost:9002/hooks/jobs",
+            "instanceId": "replica-heartbeat",
+            "heartbeatIntervalS": 10,
+        },
+        headers=headers,
+    )
+    assert connected.status_code == 201
+
+    beat = test_client.post(
+        "/api/extensions/heartbeat",
+        json={"extensionId": extension_id, "instanceId": "replica-heartbeat", "inFlight": 2, "queueLength": 5},
+        headers=headers,
+    )
+    assert beat.status_code == 200
+    body = beat.json()
+    assert (body["inFlight"], body["queueLength"], body["heartbeatIntervalS"]) == (2, 5, 10)
+    assert body["lastSeenAt"] is not None
+
+    unknown = test_client.post(
+        "/api/extensions/heartbeat",
+        json={"extensionId": extension_id, "instanceId": "replica-never-connected"},
+        headers=headers,
+    )
+    assert unknown.status_code == 404
+
+    other = test_client.post(
+        "/api/extensions/heartbeat",
+        json={"extensionId": "someone.else", "instanceId": "replica-heartbeat"},
+        headers=headers,
+    )
+    assert other.status_code == 403
+
 
 def test_admin_can_get_and_update_extension_client(
     test_client, admin_user, extension_client_credentials
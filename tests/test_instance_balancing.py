@@ -0,0 +1,57 @@
+from fair_platform.backend.services.extension_registry import ExtensionInstance
+from fair_platform.backend.services.instance_balancing import BalancingStrategy, InstanceBalancer
+
+
+def _instances(*weights: int) -> list[ExtensionInstance]:
+    return [
+        ExtensionInstance(instance_id=f"r{index}", webhook_url=f"http://r{index}/jobs", weight=weight)
+        for index, weight in enumerate(weights)
+    ]
+
+
+def test_least_in_flight_prefers_idle_instances_relative_to_weight():
+    balancer = InstanceBalancer()
+    instances = _instances(1, 2)
+
+    picks = []
+    for _ in range(6):
+        instance = balancer.choose("ext", instances)
+        balancer.acquire("ext", instance.instance_id)
+        picks.append(instance.instance_id)
+    assert picks.count("r0") == 2
+    assert picks.count("r1") == 4
+
+    # r0 finishing its jobs makes it the emptiest again.
+    balancer.release("ext", "r0")
+    balancer.release("ext", "r0")
+    assert balancer.in_flight("ext", "r0") == 0
+    assert balancer.choose("ext", instances).instance_id == "r0"
+
+
+def test_least_in_flight_breaks_ties_round_robin():
+    balancer = InstanceBalancer(BalancingStrategy.LEAST_IN_FLIGHT)
+    instances = _instances(1, 1, 1)
+
+    assert [balancer.choose("ext", instances).instance_id for _ in range(4)] == ["r0", "r1", "r2", "r0"]
+
+
+def test_weighted_round_robin_interleaves_by_weight():
+    balancer = InstanceBalancer("weighted-round-robin")
+    instances = _instances(5, 1, 1)
+
+    picks = [balancer.choose("ext", instances).instance_id for _ in range(7)]
+    assert picks == ["r0", "r0", "r1", "r0", "r2", "r0", "r0"]
+
+
+def test_least_in_flight_uses_the_load_reported_in_heartbeats():
+    balancer = InstanceBalancer()
+    busy, idle = _instances(1, 1)
+    busy.in_flight, busy.queue_length = 3, 2
+    idle.in_flight = 1
+
+    balancer.acquire("ext", "r1")
+    balancer.acquire("ext", "r1")
+    # r1 has two jobs from this dispatcher, r0 reports five from everyone.
+    assert balancer.load("ext", idle) == 2
+    assert balancer.load("ext", busy) == 5
+    assert [balancer.choose("ext", [busy, idle]).instance_id for _ in range(2)] == ["r1", "r1"]
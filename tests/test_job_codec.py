@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from fair_platform.backend.services.job_codec import (
+    FRAME_MAGIC,
+    FrameCodec,
+    JsonCodec,
+    WireFormat,
+    get_job_codec,
+)
+from fair_platform.backend.services.job_queue import (
+    JobMessage,
+    JobStatus,
+    JobUpdate,
+    RedisJobQueue,
+)
+
+DOCUMENT = {"job_id": "job-1", "payload": {"submissions": [{"id": i} for i in range(50)]}}
+
+
+def test_json_frames_stay_untagged_for_older_readers():
+    frame = FrameCodec(JsonCodec()).encode(DOCUMENT)
+
+    assert json.loads(frame) == DOCUMENT
+
+
+def test_orjson_frames_are_readable_by_json_codec():
+    pytest.importorskip("orjson")
+    frame = FrameCodec(get_job_codec("orjson")).encode(DOCUMENT)
+
+    assert FrameCodec(JsonCodec()).decode(frame) == DOCUMENT
+
+
+def test_msgpack_frames_are_tagged_and_decoded_by_any_codec():
+    pytest.importorskip("msgpack")
+    frame = FrameCodec(get_job_codec("msgpack")).encode(DOCUMENT)
+
+    assert frame[0] == FRAME_MAGIC
+    assert frame[2] == WireFormat.MSGPACK
+    assert FrameCodec(JsonCodec()).decode(frame) == DOCUMENT
+
+
+def test_frames_above_threshold_are_compressed():
+    pytest.importorskip("zstandard")
+    codec = FrameCodec(JsonCodec(), compression_threshold=256)
+
+    small = codec.encode({"job_id": "job-1"})
+    large = codec.encode(DOCUMENT)
+
+    assert small[0] != FRAME_MAGIC
+    assert large[0] == FRAME_MAGIC
+    assert FrameCodec().decode(large) == DOCUMENT
+
+
+def test_unknown_frame_version_is_rejected():
+    frame = bytes((FRAME_MAGIC, 99, WireFormat.JSON, 0)) + b"{}"
+
+    with pytest.raises(ValueError, match="version 99"):
+        FrameCodec().decode(frame)
+
+
+def test_unknown_codec_name_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported job codec"):
+        get_job_codec("pickle")
+
+
+@pytest.mark.asyncio
+async def test_redis_job_queues_with_different_codecs_share_a_queue():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("orjson")
+    redis_client = fakeredis.FakeAsyncRedis()
+    writer = RedisJobQueue(redis_client, codec=FrameCodec(get_job_codec("orjson")))
+    reader = RedisJobQueue(redis_client)
+
+    job = JobMessage(job_id="job-codec", target="ext", payload=DOCUMENT)
+    await writer.enqueue(job)
+    await writer.set_state("job-codec", JobStatus.RUNNING, {"attempt": 1})
+    await writer.publish_update(JobUpdate(job_id="job-codec", event="progress", payload={"pct": 5}))
+
+    assert await reader.dequeue(timeout=0.1) == job
+    state = await reader.get_state("job-codec")
+    assert state.status == JobStatus.RUNNING
+    assert state.details == {"attempt": 1}
+    subscription = await reader.subscribe_updates("job-codec", from_cursor="0")
+    async with subscription:
+        update = await subscription.get(timeout=0.5)
+    assert update.payload == {"pct": 5}
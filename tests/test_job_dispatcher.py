@@ -1,13 +1,20 @@
+import asyncio
+import random
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from fair_platform.backend.services.circuit_breaker import CircuitBreakers
+from fair_platform.backend.services.dispatch_limits import ExtensionLimiter
 from fair_platform.backend.services.extension_registry import (
+    ExtensionInstance,
     ExtensionRegistration,
     LocalExtensionRegistry,
 )
-from fair_platform.backend.services.job_dispatcher import JobDispatcher
+from fair_platform.backend.services.dead_letters import requeue_dead_letter
+from fair_platform.backend.services.job_dispatcher import JobDispatcher, retry_backoff_s
 from fair_platform.backend.services.job_queue import JobMessage, JobStatus, LocalJobQueue
+from fair_platform.extension_sdk.tracing import InMemorySpanExporter, Tracer
 
 
 @pytest.mark.asyncio
@@ -76,6 +83,7 @@ async def test_dispatcher_retries_then_fails():
         registry=registry,
         http_client=http_client,
         max_retries=1,
+        retry_base_delay_s=0.01,
     )
     await queue.enqueue(JobMessage(job_id="job-d-3", target="fairgrade.core", payload={"x": 1}))
 
@@ -94,3 +102,728 @@ async def test_dispatcher_retries_then_fails():
     assert state_after_second is not None
     assert state_after_second.status == JobStatus.FAILED
     assert state_after_second.details["code"] == "dispatch_error"
+
+    dead_letter = await queue.get_dead_letter("job-d-3")
+    assert dead_letter is not None
+    assert dead_letter.code == "dispatch_error"
+    assert [attempt["attempt"] for attempt in dead_letter.attempts] == [1, 2]
+    assert all(attempt["error"] == "network error" for attempt in dead_letter.attempts)
+
+
+@pytest.mark.asyncio
+async def test_requeued_dead_letter_is_dispatched_with_a_fresh_retry_budget():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(
+            extension_id="fairgrade.core",
+            webhook_url="http://extension/jobs",
+        )
+    )
+    http_client = AsyncMock()
+    http_client.post.side_effect = RuntimeError("network error")
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, max_retries=0)
+    await queue.enqueue(JobMessage(job_id="job-d-dead", target="fairgrade.core", payload={"x": 1}))
+    await queue.set_state("job-d-dead", JobStatus.QUEUED, {"target": "fairgrade.core"})
+    await dispatcher.run_once(timeout=0.1)
+    assert (await queue.get_state("job-d-dead")).status == JobStatus.FAILED
+
+    assert await requeue_dead_letter(queue, "job-d-dead") is True
+    assert await requeue_dead_letter(queue, "job-d-dead") is False
+    assert await queue.get_dead_letter("job-d-dead") is None
+    state = await queue.get_state("job-d-dead")
+    assert state.status == JobStatus.QUEUED
+    assert state.details["target"] == "fairgrade.core"
+    assert "requeued_at" in state.details
+
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client.post.side_effect = None
+    http_client.post.return_value = response
+    result = await dispatcher.run_once(timeout=0.1)
+
+    assert result is not None and result.ok is True
+    assert (await queue.get_state("job-d-dead")).status == JobStatus.RUNNING
+    sent_metadata = http_client.post.await_args.kwargs["json"]["metadata"]
+    assert "_dispatch_attempt" not in sent_metadata
+    assert "_dispatch_errors" not in sent_metadata
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_run_batch_dispatches_every_dequeued_job():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(
+            extension_id="fairgrade.core",
+            webhook_url="http://extension/jobs",
+        )
+    )
+
+    http_client = AsyncMock()
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client.post.return_value = response
+
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, batch_size=2)
+    await queue.enqueue_many(
+        [JobMessage(job_id=f"job-batch-{i}", target="fairgrade.core", payload={}) for i in range(3)]
+    )
+
+    first = await dispatcher.run_batch(timeout=0.1)
+    second = await dispatcher.run_batch(timeout=0.1)
+
+    assert [result.job_id for result in first] == ["job-batch-0", "job-batch-1"]
+    assert [result.job_id for result in second] == ["job-batch-2"]
+    assert http_client.post.await_count == 3
+
+
+def test_retry_backoff_grows_exponentially_with_bounded_jitter():
+    rng = random.Random(7)
+    for attempt, ceiling in ((1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)):
+        delay = retry_backoff_s(attempt, base_delay_s=1.0, max_delay_s=30.0, rng=rng)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_delays_retry_instead_of_hot_looping():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(
+            extension_id="fairgrade.core",
+            webhook_url="http://extension/jobs",
+        )
+    )
+    http_client = AsyncMock()
+    http_client.post.side_effect = RuntimeError("extension down")
+    dispatcher = JobDispatcher(
+        queue=queue,
+        registry=registry,
+        http_client=http_client,
+        max_retries=3,
+        retry_base_delay_s=0.2,
+    )
+    await queue.enqueue(JobMessage(job_id="job-backoff", target="fairgrade.core", payload={}))
+
+    first = await dispatcher.run_once(timeout=0.1)
+    assert first is not None and first.ok is False
+    state = await queue.get_state("job-backoff")
+    assert state.status == JobStatus.QUEUED
+    assert "retry_at" in state.details
+
+    # The retry is not available before its backoff (at least 0.1s) elapses.
+    assert await dispatcher.run_once(timeout=0.05) is None
+    assert http_client.post.await_count == 1
+
+    second = await dispatcher.run_once(timeout=1.0)
+    assert second is not None
+    assert http_client.post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_drops_cancelled_job_and_sends_cancel_signal():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="fairgrade.core", webhook_url="http://extension/jobs")
+    )
+    http_client = AsyncMock()
+    response = Mock()
+    response.raise_for_status = Mock(return_value=None)
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+
+    await queue.enqueue(JobMessage(job_id="job-cancel", target="fairgrade.core", payload={}))
+    await queue.set_state("job-cancel", JobStatus.CANCELLED)
+    result = await dispatcher.run_once(timeout=0.1)
+
+    assert result.ok is False
+    http_client.post.assert_not_awaited()
+    assert (await queue.get_state("job-cancel")).status == JobStatus.CANCELLED
+
+    assert await dispatcher.send_cancel("job-cancel", "fairgrade.core") is True
+    http_client.post.assert_awaited_once_with(
+        "http://extension/jobs",
+        json={"type": "cancel", "job_id": "job-cancel", "target": "fairgrade.core"},
+    )
+    assert await dispatcher.send_cancel("job-cancel", "missing.extension") is False
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_keeps_submitter_details_across_transitions():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="fairgrade.core", webhook_url="http://extension/jobs")
+    )
+    http_client = AsyncMock()
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+
+    await queue.enqueue(JobMessage(job_id="job-details", target="fairgrade.core", payload={}))
+    await queue.set_state("job-details", JobStatus.QUEUED, {"owner_user_id": "u1", "target": "fairgrade.core"})
+    await dispatcher.run_once(timeout=0.1)
+
+    state = await queue.get_state("job-details")
+    assert state.status == JobStatus.RUNNING
+    assert "dispatched_at" in state.details
+    assert {key: value for key, value in state.details.items() if key != "dispatched_at"} == {
+        "owner_user_id": "u1",
+        "target": "fairgrade.core",
+        "attempt": 1,
+        "dispatch_status": 202,
+        "instance_id": "http://extension/jobs",
+    }
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_does_not_overwrite_cancel_during_delivery():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="fairgrade.core", webhook_url="http://extension/jobs")
+    )
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+
+    async def cancel_while_delivering(*_args, **_kwargs):
+        await queue.transition_state("job-d-race", JobStatus.CANCELLED)
+        return response
+
+    http_client = AsyncMock()
+    http_client.post.side_effect = cancel_while_delivering
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+    await queue.enqueue(JobMessage(job_id="job-d-race", target="fairgrade.core", payload={}))
+
+    result = await dispatcher.run_once(timeout=0.1)
+
+    assert result.ok is True
+    assert (await queue.get_state("job-d-race")).status == JobStatus.CANCELLED
+
+
+async def _wait_until(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_pool_keeps_slow_extension_from_blocking_others():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(ExtensionRegistration(extension_id="slow.ext", webhook_url="http://slow/jobs"))
+    await registry.register(ExtensionRegistration(extension_id="fast.ext", webhook_url="http://fast/jobs"))
+    release_slow = asyncio.Event()
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+
+    async def post(url, **_kwargs):
+        if url == "http://slow/jobs":
+            await release_slow.wait()
+        return response
+
+    http_client = AsyncMock()
+    http_client.post.side_effect = post
+    dispatcher = JobDispatcher(
+        queue=queue,
+        registry=registry,
+        http_client=http_client,
+        concurrency=2,
+        dequeue_timeout_s=0.05,
+    )
+    for index in range(3):
+        await queue.enqueue(JobMessage(job_id=f"job-slow-{index}", target="slow.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-fast", target="fast.ext", payload={}))
+    await dispatcher.start()
+
+    # Two slow deliveries fill the pool; nothing else is dequeued meanwhile.
+    await _wait_until(lambda: dispatcher.in_flight == 2)
+    await asyncio.sleep(0.1)
+    assert dispatcher.in_flight == 2
+    assert (await queue.get_state("job-fast")).status == JobStatus.QUEUED
+
+    release_slow.set()
+    await _wait_until(lambda: queue._states["job-fast"].status == JobStatus.RUNNING)
+    await dispatcher.stop()
+    for index in range(3):
+        assert (await queue.get_state(f"job-slow-{index}")).status == JobStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_stop_drains_in_flight_deliveries():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(ExtensionRegistration(extension_id="fairgrade.core", webhook_url="http://ext/jobs"))
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+
+    async def post(*_args, **_kwargs):
+        await asyncio.sleep(0.2)
+        return response
+
+    http_client = AsyncMock()
+    http_client.post.side_effect = post
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, dequeue_timeout_s=0.05)
+    await queue.enqueue(JobMessage(job_id="job-drain", target="fairgrade.core", payload={}))
+    await dispatcher.start()
+    await _wait_until(lambda: dispatcher.in_flight == 1)
+
+    await dispatcher.stop()
+
+    assert dispatcher.in_flight == 0
+    assert (await queue.get_state("job-drain")).status == JobStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_parks_jobs_over_extension_concurrency_until_slot_frees():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="llm.ext", webhook_url="http://llm/jobs", max_concurrency=1)
+    )
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    limiter = ExtensionLimiter()
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, limiter=limiter)
+    await queue.enqueue(JobMessage(job_id="job-limit-1", target="llm.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-limit-2", target="llm.ext", payload={}))
+
+    first, second = await dispatcher.run_batch(timeout=0.1)
+
+    assert first.ok is True
+    assert second.deferred is True
+    assert second.parked is True
+    assert http_client.post.await_count == 1
+    assert limiter.in_flight("llm.ext") == 1
+    # Parked in the dispatcher rather than put back on the queue.
+    assert await dispatcher.run_once(timeout=0.05) is None
+
+    await queue.transition_state("job-limit-1", JobStatus.COMPLETED)
+    await _wait_until(lambda: http_client.post.await_count == 2)
+    await _wait_until(lambda: limiter.in_flight("llm.ext") == 1)
+    assert http_client.post.await_args.kwargs["json"]["job_id"] == "job-limit-2"
+    # Parking does not use up retries.
+    assert (await queue.get_state("job-limit-2")).details["attempt"] == 1
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_resumes_parked_jobs_in_arrival_order():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="llm.ext", webhook_url="http://llm/jobs", max_concurrency=1)
+    )
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    delivered = []
+
+    async def post(_url, **kwargs):
+        delivered.append(kwargs["json"]["job_id"])
+        return response
+
+    http_client = AsyncMock()
+    http_client.post.side_effect = post
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+    job_ids = [f"job-order-{index}" for index in range(4)]
+    for job_id in job_ids:
+        await queue.enqueue(JobMessage(job_id=job_id, target="llm.ext", payload={}))
+
+    for _job_id in job_ids:
+        await dispatcher.run_once(timeout=0.1)
+    for index, job_id in enumerate(job_ids[:-1]):
+        await _wait_until(lambda: len(delivered) == index + 1)
+        await queue.transition_state(job_id, JobStatus.COMPLETED)
+    await _wait_until(lambda: len(delivered) == len(job_ids))
+
+    assert delivered == job_ids
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_puts_back_jobs_parked_for_too_long():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="llm.ext", webhook_url="http://llm/jobs", max_concurrency=1)
+    )
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, max_park_s=0.05)
+    await queue.enqueue(JobMessage(job_id="job-park-1", target="llm.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-park-2", target="llm.ext", payload={}))
+
+    _first, second = await dispatcher.run_batch(timeout=0.1)
+    assert second.parked is True
+
+    requeued = await queue.dequeue(timeout=1.0)
+    assert requeued is not None
+    assert requeued.job_id == "job-park-2"
+    assert http_client.post.await_count == 1
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_defers_jobs_while_circuit_is_open_and_recovers_with_a_probe():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(ExtensionRegistration(extension_id="down.ext", webhook_url="http://down/jobs"))
+    await registry.register(ExtensionRegistration(extension_id="up.ext", webhook_url="http://up/jobs"))
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    webhook_down = True
+
+    async def post(url, **_kwargs):
+        if url == "http://down/jobs" and webhook_down:
+            raise RuntimeError("connection refused")
+        return response
+
+    http_client = AsyncMock()
+    http_client.post.side_effect = post
+    dispatcher = JobDispatcher(
+        queue=queue,
+        registry=registry,
+        http_client=http_client,
+        max_retries=5,
+        retry_base_delay_s=0.01,
+        retry_max_delay_s=0.01,
+        circuit_breakers=CircuitBreakers(min_calls=2, open_s=0.2),
+    )
+    await queue.enqueue(JobMessage(job_id="job-cb-1", target="down.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-cb-2", target="down.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-cb-3", target="up.ext", payload={}))
+    first, second, healthy = await dispatcher.run_batch(timeout=0.1)
+    assert not first.ok and not first.deferred
+    assert not second.ok and not second.deferred
+    assert healthy.ok
+
+    # Open: the retries are put back without calling the webhook.
+    await asyncio.sleep(0.02)
+    parked = await dispatcher.run_batch(timeout=0.1)
+    assert [result.deferred for result in parked] == [True, True]
+    assert http_client.post.await_count == 3
+    assert queue.metrics.dispatches.value(target="down.ext", outcome="circuit_open") == 2
+    assert queue.metrics.circuit_state.value(target="down.ext", instance="http://down/jobs") == 2
+
+    # After `open_s` one probe goes out; it succeeds and closes the breaker.
+    webhook_down = False
+    results = []
+    while len([result for result in results if result.ok]) < 2:
+        result = await dispatcher.run_once(timeout=1.0)
+        assert result is not None
+        results.append(result)
+    assert http_client.post.await_count == 5
+    assert queue.metrics.circuit_state.value(target="down.ext", instance="http://down/jobs") == 0
+    for job_id in ("job-cb-1", "job-cb-2"):
+        assert (await queue.get_state(job_id)).status == JobStatus.RUNNING
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_coalesces_jobs_into_batched_webhook_calls():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(
+            extension_id="batch.ext",
+            webhook_url="http://batch/jobs",
+            batch_max_jobs=3,
+            batch_max_wait_ms=20,
+        )
+    )
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, batch_size=8)
+    for index in range(5):
+        await queue.enqueue(JobMessage(job_id=f"job-batch-{index}", target="batch.ext", payload={"i": index}))
+
+    results = await dispatcher.run_batch(timeout=0.1)
+
+    assert all(result.ok for result in results)
+    # Three jobs fill the first batch; the other two go out after `batch_max_wait_ms`.
+    batches = [call.kwargs["json"] for call in http_client.post.await_args_list]
+    assert [batch["type"] for batch in batches] == ["batch", "batch"]
+    assert sorted(len(batch["jobs"]) for batch in batches) == [2, 3]
+    assert {job["job_id"] for batch in batches for job in batch["jobs"]} == {f"job-batch-{i}" for i in range(5)}
+    for index in range(5):
+        assert (await queue.get_state(f"job-batch-{index}")).status == JobStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retries_each_job():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="batch.ext", webhook_url="http://batch/jobs", batch_max_jobs=2)
+    )
+    http_client = AsyncMock()
+    http_client.post.side_effect = RuntimeError("connection reset")
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, retry_base_delay_s=0.01)
+    await queue.enqueue(JobMessage(job_id="job-batch-a", target="batch.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-batch-b", target="batch.ext", payload={}))
+
+    results = await dispatcher.run_batch(timeout=0.1)
+
+    assert [result.error for result in results] == ["connection reset", "connection reset"]
+    assert http_client.post.await_count == 1
+    for job_id in ("job-batch-a", "job-batch-b"):
+        state = await queue.get_state(job_id)
+        assert state.status == JobStatus.QUEUED
+        assert state.details["retrying"] is True
+
+
+@pytest.mark.asyncio
+async def test_job_rejected_in_a_batch_response_is_retried_alone():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="batch.ext", webhook_url="http://batch/jobs", batch_max_jobs=2)
+    )
+    response = Mock()
+    response.status_code = 200
+    response.raise_for_status = Mock(return_value=None)
+    response.json = Mock(
+        return_value={"accepted": True, "jobs": 1, "rejected": [{"job_id": "job-batch-bad", "error": "Malformed job"}]}
+    )
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, retry_base_delay_s=0.01)
+    await queue.enqueue(JobMessage(job_id="job-batch-good", target="batch.ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-batch-bad", target="batch.ext", payload={}))
+
+    results = {result.job_id: result for result in await dispatcher.run_batch(timeout=0.1)}
+
+    assert results["job-batch-good"].ok is True
+    assert results["job-batch-bad"].error == "Malformed job"
+    assert (await queue.get_state("job-batch-good")).status == JobStatus.RUNNING
+    assert (await queue.get_state("job-batch-bad")).details["retrying"] is True
+    # The extension answered, so the rejection does not count against its breaker.
+    assert queue.metrics.circuit_state.value(target="batch.ext", instance="http://batch/jobs") == 0
+    await dispatcher.stop()
+
+
+def _replica(name: str, weight: int = 1) -> ExtensionRegistration:
+    url = f"http://{name}/jobs"
+    return ExtensionRegistration(
+        extension_id="replicated.ext",
+        webhook_url=url,
+        instances=[ExtensionInstance(instance_id=name, webhook_url=url, weight=weight)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_spreads_jobs_over_instances_until_they_finish():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(_replica("replica-a"))
+    await registry.register(_replica("replica-b"))
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+    for index in range(4):
+        await queue.enqueue(JobMessage(job_id=f"job-replica-{index}", target="replicated.ext", payload={}))
+
+    for _ in range(4):
+        assert (await dispatcher.run_once(timeout=0.1)).running
+    urls = [call.args[0] for call in http_client.post.await_args_list]
+    assert sorted(urls) == ["http://replica-a/jobs"] * 2 + ["http://replica-b/jobs"] * 2
+    assert (await queue.get_state("job-replica-0")).details["instance_id"] == "replica-a"
+
+    # Both jobs on replica-a finish, so it is the least busy for the next one.
+    for job_id in [f"job-replica-{i}" for i, url in enumerate(urls) if url == "http://replica-a/jobs"]:
+        await queue.transition_state(job_id, JobStatus.COMPLETED)
+    await _wait_until(lambda: dispatcher._balancer.in_flight("replicated.ext", "replica-a") == 0)
+    await queue.enqueue(JobMessage(job_id="job-replica-next", target="replicated.ext", payload={}))
+    await dispatcher.run_once(timeout=0.1)
+    assert http_client.post.await_args.args[0] == "http://replica-a/jobs"
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_routes_around_an_instance_whose_circuit_is_open():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(_replica("replica-down"))
+    await registry.register(_replica("replica-up"))
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+
+    async def post(url, **_kwargs):
+        if url == "http://replica-down/jobs":
+            raise RuntimeError("connection refused")
+        return response
+
+    http_client = AsyncMock()
+    http_client.post.side_effect = post
+    dispatcher = JobDispatcher(
+        queue=queue,
+        registry=registry,
+        http_client=http_client,
+        retry_base_delay_s=0.01,
+        retry_max_delay_s=0.01,
+        circuit_breakers=CircuitBreakers(min_calls=1, open_s=60),
+    )
+    for index in range(4):
+        await queue.enqueue(JobMessage(job_id=f"job-route-{index}", target="replicated.ext", payload={}))
+
+    results = []
+    while len([result for result in results if result.ok]) < 4:
+        result = await dispatcher.run_once(timeout=1.0)
+        assert result is not None and not result.deferred
+        results.append(result)
+
+    # One failed call opened replica-down's breaker; everything else went to replica-up.
+    assert [call.args[0] for call in http_client.post.await_args_list].count("http://replica-down/jobs") == 1
+    assert queue.metrics.circuit_state.value(target="replicated.ext", instance="replica-down") == 2
+    assert queue.metrics.circuit_state.value(target="replicated.ext", instance="replica-up") == 0
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_skips_instances_that_stopped_sending_heartbeats():
+    now = [1_700_000_000.0]
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry(clock=lambda: now[0])
+    for name in ("replica-dead", "replica-alive"):
+        replica = _replica(name)
+        replica.instances[0].heartbeat_interval_s = 5.0
+        await registry.register(replica)
+    now[0] += 10
+    await registry.heartbeat("replicated.ext", "replica-alive", in_flight=0)
+    now[0] += 10
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+    for index in range(3):
+        await queue.enqueue(JobMessage(job_id=f"job-healthy-{index}", target="replicated.ext", payload={}))
+
+    results = await dispatcher.run_batch(timeout=0.1)
+
+    assert all(result.ok for result in results)
+    assert {call.args[0] for call in http_client.post.await_args_list} == {"http://replica-alive/jobs"}
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_holds_jobs_while_every_instance_of_an_extension_expired():
+    now = [1_700_000_000.0]
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry(clock=lambda: now[0])
+    replica = _replica("replica-restarting")
+    replica.instances[0].heartbeat_interval_s = 5.0
+    await registry.register(replica)
+    now[0] += 30
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client = AsyncMock()
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, offline_defer_s=0.05)
+    await queue.enqueue(JobMessage(job_id="job-offline", target="replicated.ext", payload={}))
+
+    result = await dispatcher.run_once(timeout=0.1)
+
+    assert result is not None and result.deferred is True
+    assert (await queue.get_state("job-offline")).status == JobStatus.QUEUED
+    assert await queue.list_dead_letters() == []
+    assert queue.metrics.dispatches.value(target="replicated.ext", outcome="offline") == 1
+    http_client.post.assert_not_awaited()
+
+    # The instance reconnects and the held job is delivered.
+    await registry.register(_replica("replica-restarting"))
+    result = await dispatcher.run_once(timeout=1.0)
+    assert result is not None and result.ok is True
+    assert (await queue.get_state("job-offline")).status == JobStatus.RUNNING
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_dead_letters_jobs_for_an_extension_that_stays_offline():
+    now = [1_700_000_000.0]
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry(clock=lambda: now[0])
+    replica = _replica("replica-gone")
+    replica.instances[0].heartbeat_interval_s = 5.0
+    await registry.register(replica)
+    now[0] += 30
+    http_client = AsyncMock()
+    dispatcher = JobDispatcher(
+        queue=queue,
+        registry=registry,
+        http_client=http_client,
+        offline_defer_s=0.01,
+        max_offline_s=0.1,
+    )
+    await queue.enqueue(JobMessage(job_id="job-stranded", target="replicated.ext", payload={}))
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + 2.0
+    while (await queue.get_state("job-stranded")).status == JobStatus.QUEUED:
+        assert loop.time() < deadline, "job was never dead-lettered"
+        await dispatcher.run_once(timeout=0.1)
+
+    state = await queue.get_state("job-stranded")
+    assert state.status == JobStatus.FAILED
+    assert state.details["code"] == "extension_offline"
+    (dead_letter,) = await queue.list_dead_letters()
+    assert dead_letter.code == "extension_offline"
+    http_client.post.assert_not_awaited()
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_traces_queue_wait_and_delivery_under_the_job_trace():
+    queue = LocalJobQueue()
+    registry = LocalExtensionRegistry()
+    await registry.register(ExtensionRegistration(extension_id="fairgrade.core", webhook_url="http://extension/jobs"))
+    http_client = AsyncMock()
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client.post.return_value = response
+    exporter = InMemorySpanExporter()
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client, tracer=Tracer(exporter))
+    parent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    await queue.enqueue(
+        JobMessage(job_id="job-trace-1", target="fairgrade.core", payload={}, metadata={"traceparent": parent})
+    )
+    result = await dispatcher.run_once(timeout=0.1)
+
+    assert result is not None and result.ok is True
+    queue_wait = exporter.by_name("job.queue_wait")[0]
+    deliver = exporter.by_name("job.deliver")[0]
+    assert queue_wait.trace_id == deliver.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert queue_wait.parent_span_id == deliver.parent_span_id == "00f067aa0ba902b7"
+    assert deliver.attributes["http.status_code"] == 202
+    body = http_client.post.await_args.kwargs["json"]
+    assert body["metadata"]["traceparent"] == deliver.context.traceparent
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from fair_platform.backend.services.extension_registry import (
+    ExtensionRegistration,
+    LocalExtensionRegistry,
+)
+from fair_platform.backend.services.job_dispatcher import JobDispatcher
+from fair_platform.backend.services.job_metrics import Counter, Histogram, JobMetrics
+from fair_platform.backend.services.job_queue import JobLane, JobMessage, JobStatus, LocalJobQueue
+
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    histogram = Histogram("wait_seconds", "Wait.", ("target",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, target="ext")
+    histogram.observe(0.5, target="ext")
+    histogram.observe(5.0, target="ext")
+
+    assert histogram.render() == [
+        "# HELP wait_seconds Wait.",
+        "# TYPE wait_seconds histogram",
+        'wait_seconds_bucket{target="ext",le="0.1"} 1',
+        'wait_seconds_bucket{target="ext",le="1.0"} 2',
+        'wait_seconds_bucket{target="ext",le="+Inf"} 3',
+        'wait_seconds_sum{target="ext"} 5.55',
+        'wait_seconds_count{target="ext"} 3',
+    ]
+
+
+def test_counter_escapes_label_values_and_checks_label_names():
+    counter = Counter("jobs_total", "Jobs.", ("target",))
+    counter.inc(target='ext"a\\b')
+
+    assert counter.render()[-1] == 'jobs_total{target="ext\\"a\\\\b"} 1.0'
+    with pytest.raises(ValueError):
+        counter.inc(lane="default")
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_and_queue_record_job_metrics():
+    queue = LocalJobQueue()
+    queue.metrics = JobMetrics()
+    registry = LocalExtensionRegistry()
+    await registry.register(
+        ExtensionRegistration(extension_id="fairgrade.core", webhook_url="http://extension/jobs")
+    )
+    http_client = AsyncMock()
+    response = Mock()
+    response.status_code = 202
+    response.raise_for_status = Mock(return_value=None)
+    http_client.post.return_value = response
+    dispatcher = JobDispatcher(queue=queue, registry=registry, http_client=http_client)
+
+    created_at = (datetime.now(timezone.utc) - timedelta(seconds=2)).isoformat()
+    await queue.enqueue(
+        JobMessage(job_id="job-m-1", target="fairgrade.core", payload={}, created_at=created_at)
+    )
+    await queue.enqueue(JobMessage(job_id="job-m-2", target="fairgrade.core", payload={}, lane=JobLane.BULK))
+    await queue.set_state("job-m-1", JobStatus.QUEUED, {"target": "fairgrade.core"})
+    assert await queue.queue_depth() == {"interactive": 0, "default": 1, "bulk": 1}
+
+    await dispatcher.run_once(timeout=0.1)
+    state = await queue.get_state("job-m-1")
+    await queue.set_state("job-m-1", JobStatus.COMPLETED, state.details)
+
+    metrics = queue.metrics
+    assert metrics.dispatch_wait.count(target="fairgrade.core", lane="default") == 1
+    assert metrics.dispatches.value(target="fairgrade.core", outcome="delivered") == 1
+    assert metrics.finished.value(target="fairgrade.core", status="completed") == 1
+    assert metrics.run_time.count(target="fairgrade.core", status="completed") == 1
+    wait_line = next(
+        line
+        for line in metrics.render().splitlines()
+        if line.startswith("fair_job_dispatch_wait_seconds_bucket") and 'le="1.0"' in line
+    )
+    # The job had been waiting for two seconds when it was dispatched.
+    assert wait_line.endswith(" 0")
+    await queue.close()
+
+
+def test_metrics_endpoint_serves_prometheus_text(test_client):
+    response = test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE fair_job_queue_depth gauge" in response.text
+    assert 'fair_job_queue_depth{lane="default"}' in response.text
+    assert "# TYPE fair_jobs_finished_total counter" in response.text
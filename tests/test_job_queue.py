@@ -1,14 +1,33 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
 
+from fair_platform.backend.data.models import JobStateArchive
+from fair_platform.backend.services import job_state_archive
+
 from fair_platform.backend.services.job_queue import (
+    JOB_LANE_ORDER,
+    JOB_UPDATES_FROM_START,
+    DeadLetter,
+    DuplicateJob,
+    DuplicateReason,
+    JobLane,
     JobMessage,
+    JobQueueConflict,
+    JobState,
+    JobStateWatch,
     JobStatus,
     JobUpdate,
+    LaneSelector,
     LocalJobQueue,
+    RedisJobQueue,
+    RedisStreamJobQueue,
     create_job_queue,
+    parse_lane_weights,
 )
+from fair_platform.backend.services.sql_job_queue import SqlJobQueue
 
 
 @pytest.mark.asyncio
@@ -57,3 +76,765 @@ async def test_create_job_queue_factory_local():
     with patch.dict("os.environ", {"FAIR_JOB_QUEUE_BACKEND": "local"}, clear=False):
         queue = await create_job_queue()
         assert isinstance(queue, LocalJobQueue)
+
+
+@pytest.mark.asyncio
+async def test_redis_stream_job_queue_redelivers_unacked_job_after_visibility_timeout():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    crashed = RedisStreamJobQueue(redis_client, consumer_name="dispatcher-a", visibility_timeout_s=0)
+    survivor = RedisStreamJobQueue(redis_client, consumer_name="dispatcher-b", visibility_timeout_s=0)
+    job = JobMessage(job_id="job-s-1", target="fairgrade.core", payload={"x": 1})
+
+    await crashed.enqueue(job)
+    first = await crashed.dequeue(timeout=0.01)
+    # `crashed` never acknowledges, so `survivor` claims the same job.
+    second = await survivor.dequeue(timeout=0.01)
+    assert first == job
+    assert second == job
+
+    await survivor.ack(second)
+    assert await survivor.dequeue(timeout=0.01) is None
+    assert await redis_client.xlen("fair:job-stream") == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_stream_job_queue_skips_reclaimed_job_that_was_already_delivered():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    crashed = RedisStreamJobQueue(redis_client, consumer_name="dispatcher-a", visibility_timeout_s=0)
+    survivor = RedisStreamJobQueue(redis_client, consumer_name="dispatcher-b", visibility_timeout_s=0)
+
+    await crashed.enqueue(JobMessage(job_id="job-s-2", target="fairgrade.core", payload={}))
+    assert await crashed.dequeue(timeout=0.01) is not None
+    await crashed.set_state("job-s-2", JobStatus.RUNNING)
+
+    assert await survivor.dequeue(timeout=0.01) is None
+    assert await redis_client.xlen("fair:job-stream") == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_stream_job_queue_reclaims_each_lane_on_a_timer():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    crashed = RedisStreamJobQueue(redis_client, consumer_name="dispatcher-a", visibility_timeout_s=0)
+    survivor = RedisStreamJobQueue(
+        redis_client,
+        consumer_name="dispatcher-b",
+        visibility_timeout_s=0,
+        reclaim_interval_s=0.2,
+    )
+    claims: list[str] = []
+    xautoclaim = redis_client.xautoclaim
+
+    async def counting_xautoclaim(name, groupname, consumername, *args, **kwargs):
+        if consumername == "dispatcher-b":
+            claims.append(name)
+        return await xautoclaim(name, groupname, consumername, *args, **kwargs)
+
+    redis_client.xautoclaim = counting_xautoclaim
+    assert await survivor.dequeue(timeout=0) is None
+    assert len(claims) == len(JOB_LANE_ORDER)
+
+    await crashed.enqueue(JobMessage(job_id="job-s-3", target="fairgrade.core", payload={}))
+    assert await crashed.dequeue(timeout=0) is not None
+    # Within the interval no lane is scanned again, so the stale job waits.
+    for _ in range(5):
+        assert await survivor.dequeue(timeout=0) is None
+    assert len(claims) == len(JOB_LANE_ORDER)
+
+    await asyncio.sleep(0.25)
+    reclaimed = await survivor.dequeue(timeout=0)
+    assert reclaimed is not None and reclaimed.job_id == "job-s-3"
+
+
+@pytest.mark.asyncio
+async def test_create_job_queue_factory_redis_streams():
+    pytest.importorskip("fakeredis")
+    with patch.dict(
+        "os.environ",
+        {"FAIR_JOB_QUEUE_BACKEND": "redis-streams", "FAIR_JOB_QUEUE_VISIBILITY_TIMEOUT": "5"},
+        clear=False,
+    ):
+        queue = await create_job_queue()
+        assert isinstance(queue, RedisStreamJobQueue)
+        assert queue._visibility_timeout_ms == 5000
+        await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_enqueue_many_and_dequeue_batch():
+    queue = LocalJobQueue()
+    jobs = [JobMessage(job_id=f"job-b-{i}", target="fairgrade.core", payload={"i": i}) for i in range(5)]
+
+    await queue.enqueue_many(jobs)
+    first = await queue.dequeue_batch(3, timeout=0.1)
+    rest = await queue.dequeue_batch(10, timeout=0.1)
+    empty = await queue.dequeue_batch(10, timeout=0.01)
+
+    assert first == jobs[:3]
+    assert rest == jobs[3:]
+    assert empty == []
+    state = await queue.get_state("job-b-4")
+    assert state is not None
+    assert state.status == JobStatus.QUEUED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_enqueue_many_and_dequeue_batch(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis())
+    jobs = [JobMessage(job_id=f"job-rb-{i}", target="fairgrade.core", payload={"i": i}) for i in range(5)]
+
+    await queue.enqueue_many(jobs)
+    first = await queue.dequeue_batch(3, timeout=0.1)
+    rest = await queue.dequeue_batch(10, timeout=0.1)
+    empty = await queue.dequeue_batch(10, timeout=0.01)
+
+    assert first == jobs[:3]
+    assert rest == jobs[3:]
+    assert empty == []
+    state = await queue.get_state("job-rb-0")
+    assert state is not None
+    assert state.status == JobStatus.QUEUED
+
+
+def test_lane_selector_prefers_interactive_without_starving_bulk():
+    selector = LaneSelector({"interactive": 2, "default": 1, "bulk": 1})
+    preferred = [selector.order()[0] for _ in range(8)]
+
+    assert preferred.count(JobLane.INTERACTIVE) == 4
+    assert preferred.count(JobLane.DEFAULT) == 2
+    assert preferred.count(JobLane.BULK) == 2
+    assert parse_lane_weights("interactive=5, bulk=0,unknown=3") == {"interactive": 5, "bulk": 0}
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_serves_interactive_lane_before_bulk_backlog():
+    queue = LocalJobQueue(lane_weights={"default": 0, "bulk": 0})
+    await queue.enqueue_many(
+        [JobMessage(job_id=f"bulk-{i}", target="fair.core", payload={}, lane=JobLane.BULK) for i in range(3)]
+    )
+    await queue.enqueue(JobMessage(job_id="rubric", target="fair.core", payload={}, lane=JobLane.INTERACTIVE))
+    await queue.enqueue(
+        JobMessage(job_id="urgent-bulk", target="fair.core", payload={}, lane=JobLane.BULK, priority=5)
+    )
+
+    order = [job.job_id for job in await queue.dequeue_batch(10, timeout=0.1)]
+
+    assert order == ["rubric", "urgent-bulk", "bulk-0", "bulk-1", "bulk-2"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_serve_interactive_lane_before_bulk_backlog(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis(), lane_weights={"default": 0, "bulk": 0})
+    await queue.enqueue_many(
+        [JobMessage(job_id=f"bulk-{i}", target="fair.core", payload={}, lane=JobLane.BULK) for i in range(3)]
+    )
+    await queue.enqueue(JobMessage(job_id="rubric", target="fair.core", payload={}, lane=JobLane.INTERACTIVE))
+
+    first = await queue.dequeue(timeout=0.1)
+    rest = await queue.dequeue_batch(10, timeout=0.1)
+
+    assert first is not None
+    assert first.job_id == "rubric"
+    assert [job.job_id for job in rest] == ["bulk-0", "bulk-1", "bulk-2"]
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_expires_terminal_states_and_archives_them():
+    archived = []
+
+    async def archive(state):
+        archived.append(state)
+
+    queue = LocalJobQueue(terminal_state_ttl_s=0.01, sweep_interval_s=0.01, archive_hook=archive)
+    await queue.set_state("job-ttl-running", JobStatus.RUNNING)
+    await queue.set_state("job-ttl-done", JobStatus.COMPLETED, details={"ok": True})
+    await queue.set_state("job-ttl-failed", JobStatus.FAILED)
+
+    await asyncio.sleep(0.05)
+
+    assert queue._states.keys() == {"job-ttl-running"}
+    assert await queue.get_state("job-ttl-done") is None
+    assert (await queue.get_state("job-ttl-running")).status == JobStatus.RUNNING
+    assert [state.job_id for state in archived] == ["job-ttl-done", "job-ttl-failed"]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_job_queue_sets_expiry_only_on_terminal_states():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    queue = RedisJobQueue(redis_client, terminal_state_ttl_s=120)
+
+    await queue.set_state("job-ttl-1", JobStatus.RUNNING)
+    assert await redis_client.ttl("fair:job-states:job-ttl-1") == -1
+
+    await queue.set_state("job-ttl-1", JobStatus.COMPLETED)
+    assert 0 < await redis_client.ttl("fair:job-states:job-ttl-1") <= 120
+
+
+@pytest.mark.asyncio
+async def test_archive_job_state_upserts_terminal_state_into_database(test_db, monkeypatch):
+    monkeypatch.setattr(job_state_archive, "get_session", test_db)
+
+    await job_state_archive.archive_job_state(
+        JobState(job_id="job-archive-1", status=JobStatus.FAILED, details={"error": "boom"})
+    )
+    await job_state_archive.archive_job_state(
+        JobState(job_id="job-archive-1", status=JobStatus.COMPLETED, details={})
+    )
+
+    with test_db() as session:
+        row = session.get(JobStateArchive, "job-archive-1")
+        assert row is not None
+        assert row.status == JobStatus.COMPLETED
+        assert row.details == {}
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_orders_lanes_priority_and_tracks_state(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await queue.enqueue_many(
+        [
+            JobMessage(job_id="sql-bulk", target="ext", payload={}, lane=JobLane.BULK),
+            JobMessage(job_id="sql-low", target="ext", payload={"n": 1}),
+            JobMessage(job_id="sql-high", target="ext", payload={}, priority=5),
+            JobMessage(job_id="sql-ui", target="ext", payload={}, lane=JobLane.INTERACTIVE),
+        ]
+    )
+
+    jobs = await queue.dequeue_batch(10, timeout=0)
+    assert [job.job_id for job in jobs] == ["sql-ui", "sql-high", "sql-low", "sql-bulk"]
+    assert jobs[2].payload == {"n": 1}
+    assert await queue.dequeue(timeout=0.02) is None
+
+    assert (await queue.get_state("sql-low")).status == JobStatus.QUEUED
+    await queue.set_state("sql-low", JobStatus.RUNNING, details={"attempt": 1})
+    state = await queue.get_state("sql-low")
+    assert state.status == JobStatus.RUNNING
+    assert state.details == {"attempt": 1}
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_wakes_blocked_dequeue_and_subscribers(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=5.0)
+
+    waiter = asyncio.create_task(queue.dequeue(timeout=2.0))
+    await asyncio.sleep(0.05)
+    await queue.enqueue(JobMessage(job_id="sql-wake", target="ext", payload={}))
+    assert (await asyncio.wait_for(waiter, timeout=1.0)).job_id == "sql-wake"
+
+    await queue.publish_update(JobUpdate(job_id="sql-wake", event="log", payload={"n": 0}))
+    subscription = await queue.subscribe_updates("sql-wake")
+    async with subscription:
+        reader = asyncio.create_task(subscription.get(timeout=2.0))
+        await asyncio.sleep(0.05)
+        await queue.publish_update(JobUpdate(job_id="sql-wake", event="log", payload={"n": 1}))
+        update = await asyncio.wait_for(reader, timeout=1.0)
+    # Updates published before subscribing are not replayed.
+    assert update.payload == {"n": 1}
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_expires_terminal_states(test_db):
+    archived = []
+
+    async def archive(state):
+        archived.append(state.job_id)
+
+    queue = SqlJobQueue(test_db.kw["bind"], terminal_state_ttl_s=0.01, archive_hook=archive)
+    await queue.set_state("sql-ttl-running", JobStatus.RUNNING)
+    await queue.set_state("sql-ttl-done", JobStatus.COMPLETED)
+    await asyncio.sleep(0.05)
+
+    assert await queue.get_state("sql-ttl-done") is None
+    assert await queue.sweep_expired() == 1
+    assert (await queue.get_state("sql-ttl-running")).status == JobStatus.RUNNING
+    assert archived == ["sql-ttl-done"]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_create_job_queue_factory_sql(monkeypatch):
+    monkeypatch.setenv("FAIR_JOB_QUEUE_BACKEND", "sql")
+    queue = await create_job_queue()
+    assert isinstance(queue, SqlJobQueue)
+    await queue.close()
+
+
+async def _assert_update_log_replays_then_goes_live(queue):
+    for n in range(3):
+        await queue.publish_update(JobUpdate(job_id="job-log", event="log", payload={"n": n}))
+
+    full = await queue.subscribe_updates("job-log", from_cursor=JOB_UPDATES_FROM_START)
+    async with full:
+        replayed = [await full.get(timeout=0.5) for _ in range(3)]
+        assert [update.payload["n"] for update in replayed] == [0, 1, 2]
+        assert all(update.cursor for update in replayed)
+
+        resumed = await queue.subscribe_updates("job-log", from_cursor=replayed[0].cursor)
+        async with resumed:
+            await queue.publish_update(JobUpdate(job_id="job-log", event="log", payload={"n": 3}))
+            tail = [await resumed.get(timeout=0.5) for _ in range(3)]
+            assert [update.payload["n"] for update in tail] == [1, 2, 3]
+            assert await resumed.get(timeout=0.05) is None
+
+        live = await full.get(timeout=0.5)
+        assert live.payload == {"n": 3}
+        assert await full.get(timeout=0.05) is None
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_update_log_replays_then_goes_live():
+    queue = LocalJobQueue()
+    await _assert_update_log_replays_then_goes_live(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_update_log_is_bounded():
+    queue = LocalJobQueue(update_log_size=2)
+    for n in range(5):
+        await queue.publish_update(JobUpdate(job_id="job-ring", event="log", payload={"n": n}))
+
+    subscription = await queue.subscribe_updates("job-ring", from_cursor=JOB_UPDATES_FROM_START)
+    async with subscription:
+        assert (await subscription.get(timeout=0.1)).payload == {"n": 3}
+        assert (await subscription.get(timeout=0.1)).payload == {"n": 4}
+        assert await subscription.get(timeout=0) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_job_queue_update_log_replays_then_goes_live():
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = RedisJobQueue(fakeredis.FakeAsyncRedis())
+    await _assert_update_log_replays_then_goes_live(queue)
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_update_log_replays_then_goes_live(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await _assert_update_log_replays_then_goes_live(queue)
+    await queue.close()
+
+
+def _in(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+async def _assert_delayed_job_waits_until_due(queue):
+    await queue.enqueue(JobMessage(job_id="job-later", target="ext", payload={}), not_before=_in(0.3))
+    await queue.enqueue(JobMessage(job_id="job-now", target="ext", payload={}))
+
+    assert (await queue.dequeue(timeout=0.1)).job_id == "job-now"
+    assert await queue.dequeue(timeout=0.05) is None
+    assert (await queue.get_state("job-later")).status == JobStatus.QUEUED
+
+    delayed = await queue.dequeue(timeout=2.0)
+    assert delayed is not None
+    assert delayed.job_id == "job-later"
+    await queue.ack(delayed)
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_delays_job_until_not_before():
+    queue = LocalJobQueue()
+    await _assert_delayed_job_waits_until_due(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_delay_job_until_not_before(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis(), delayed_poll_interval_s=0.05)
+    await _assert_delayed_job_waits_until_due(queue)
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_delays_job_until_not_before(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.05)
+    await _assert_delayed_job_waits_until_due(queue)
+    await queue.close()
+
+
+async def _assert_enqueue_if_absent_deduplicates(queue):
+    def job(job_id, key=None):
+        return JobMessage(job_id=job_id, target="ext", payload={}, idempotency_key=key)
+
+    results = await asyncio.gather(*(queue.enqueue_if_absent(job(f"job-idem-{i}", "k1")) for i in range(5)))
+    winners = [f"job-idem-{i}" for i, existing in enumerate(results) if existing is None]
+    assert len(winners) == 1
+    key_hit = DuplicateJob(winners[0], DuplicateReason.IDEMPOTENCY_KEY)
+    assert all(existing in (None, key_hit) for existing in results)
+
+    collision = DuplicateJob(winners[0], DuplicateReason.JOB_ID)
+    assert await queue.enqueue_if_absent(job(winners[0])) == collision
+    # A job id collision does not leave the new key bound to the rejected job.
+    assert await queue.enqueue_if_absent(job(winners[0], "k3")) == collision
+    assert await queue.enqueue_if_absent(job("job-idem-k3", "k3")) is None
+    assert await queue.enqueue_if_absent(job("job-idem-other", "k2")) is None
+
+    queued = await queue.dequeue_batch(10, timeout=0.5)
+    assert sorted(j.job_id for j in queued) == sorted([winners[0], "job-idem-k3", "job-idem-other"])
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_enqueue_if_absent_deduplicates():
+    queue = LocalJobQueue()
+    await _assert_enqueue_if_absent_deduplicates(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_enqueue_if_absent_deduplicates(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis())
+    await _assert_enqueue_if_absent_deduplicates(queue)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("terminal", [False, True])
+async def test_redis_idempotency_key_expires_with_the_terminal_state(terminal):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    queue = RedisJobQueue(redis_client, terminal_state_ttl_s=60)
+    job = JobMessage(job_id="job-idem-ttl", target="ext", payload={}, idempotency_key="k-ttl")
+    assert await queue.enqueue_if_absent(job) is None
+
+    keys = ["fair:jobs:idempotency:k-ttl", "fair:jobs:idempotency-of:job-idem-ttl"]
+    assert [await redis_client.ttl(key) for key in keys] == [-1, -1]
+
+    await queue.transition_state(job.job_id, JobStatus.RUNNING)
+    assert [await redis_client.ttl(key) for key in keys] == [-1, -1]
+    if terminal:
+        await queue.transition_state(job.job_id, JobStatus.COMPLETED)
+    else:
+        await queue.set_state(job.job_id, JobStatus.FAILED)
+    assert all(0 < ttl <= 60 for ttl in [await redis_client.ttl(key) for key in keys])
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_idempotency_key_bound_to_a_job_without_state_is_taken_over(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    queue = queue_cls(redis_client, queue_name="fair:jobs")
+    # Left behind by a submission that stopped after claiming the key.
+    await redis_client.set("fair:jobs:idempotency:k-stale", "job-never-enqueued")
+    await redis_client.set("fair:jobs:idempotency-of:job-never-enqueued", "fair:jobs:idempotency:k-stale")
+    job = JobMessage(job_id="job-idem-retry", target="ext", payload={}, idempotency_key="k-stale")
+
+    assert await queue.enqueue_if_absent(job) is None
+
+    assert (await queue.get_state(job.job_id)).status == JobStatus.QUEUED
+    assert await redis_client.get("fair:jobs:idempotency:k-stale") == b"job-idem-retry"
+    assert await redis_client.exists("fair:jobs:idempotency-of:job-never-enqueued") == 0
+    assert (await queue.dequeue(timeout=0)).job_id == job.job_id
+    retry = JobMessage(job_id="job-idem-retry-2", target="ext", payload={}, idempotency_key="k-stale")
+    assert await queue.enqueue_if_absent(retry) == DuplicateJob(job.job_id, DuplicateReason.IDEMPOTENCY_KEY)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_enqueue_if_absent_deduplicates(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await _assert_enqueue_if_absent_deduplicates(queue)
+    await queue.close()
+
+
+async def _assert_watch_state_follows_transitions(queue):
+    seen: list[JobStatus] = []
+
+    async def watch():
+        async for state in queue.watch_state("job-watch"):
+            seen.append(state.status)
+
+    async def wait_until_seen(status):
+        async def seen_status():
+            while not seen or seen[-1] != status:
+                await asyncio.sleep(0.005)
+
+        await asyncio.wait_for(seen_status(), timeout=2.0)
+
+    watcher = asyncio.create_task(watch())
+    await asyncio.sleep(0.05)
+    assert seen == []
+
+    for status in (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.COMPLETED):
+        await queue.set_state("job-watch", status)
+        await wait_until_seen(status)
+
+    # The iterator ends after the terminal state.
+    await asyncio.wait_for(watcher, timeout=1.0)
+    assert seen == [JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.COMPLETED]
+
+    # A watch on a finished job yields its terminal state and ends.
+    states = [state async for state in queue.watch_state("job-watch")]
+    assert [state.status for state in states] == [JobStatus.COMPLETED]
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_watch_state_follows_transitions():
+    queue = LocalJobQueue()
+    await _assert_watch_state_follows_transitions(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_watch_state_follows_transitions(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis())
+    await _assert_watch_state_follows_transitions(queue)
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_watch_state_follows_transitions(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=5.0)
+    # In-process wakeups deliver transitions well before the poll interval.
+    await _assert_watch_state_follows_transitions(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_job_state_watch_ends_update_wait_on_terminal_state():
+    queue = LocalJobQueue()
+    await queue.set_state("job-watch", JobStatus.RUNNING)
+    subscription = await queue.subscribe_updates("job-watch")
+    async with subscription, JobStateWatch(queue, "job-watch") as watch:
+        await queue.publish_update(JobUpdate(job_id="job-watch", event="result", payload={}))
+        update = await asyncio.wait_for(watch.next_update(subscription), timeout=1.0)
+        assert update is not None and update.event == "result"
+
+        waiting = asyncio.create_task(watch.next_update(subscription))
+        await asyncio.sleep(0.05)
+        await queue.set_state("job-watch", JobStatus.COMPLETED)
+        assert await asyncio.wait_for(waiting, timeout=1.0) is None
+        assert watch.terminal.is_set()
+        assert watch.latest.status == JobStatus.COMPLETED
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_local_job_state_watch_sees_terminal_states_across_expiry_and_removal():
+    # With a zero TTL the terminal state expires as soon as it is written.
+    queue = LocalJobQueue(terminal_state_ttl_s=0, sweep_interval_s=0.01)
+    await queue.set_state("job-expiring", JobStatus.RUNNING)
+    async with JobStateWatch(queue, "job-expiring") as watch:
+        await asyncio.sleep(0.01)
+        await queue.set_state("job-expiring", JobStatus.COMPLETED)
+        await asyncio.wait_for(watch.terminal.wait(), timeout=1.0)
+        assert await queue.get_state("job-expiring") is None
+        assert watch.latest.status == JobStatus.COMPLETED
+
+    await queue.set_state("job-removed", JobStatus.RUNNING)
+    async with JobStateWatch(queue, "job-removed") as watch:
+        await asyncio.sleep(0.01)
+        await queue.close()
+        await asyncio.wait_for(watch.terminal.wait(), timeout=1.0)
+        assert watch.latest.status == JobStatus.RUNNING
+
+
+async def _assert_remove_pending_drops_queued_job(queue):
+    await queue.enqueue(JobMessage(job_id="job-keep", target="ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-drop", target="ext", payload={}))
+    await queue.enqueue(
+        JobMessage(job_id="job-drop-later", target="ext", payload={}),
+        not_before=datetime.now(timezone.utc) + timedelta(seconds=60),
+    )
+
+    assert await queue.remove_pending("job-drop") is True
+    assert await queue.remove_pending("job-drop-later") is True
+    assert await queue.remove_pending("job-missing") is False
+    queued = await queue.dequeue_batch(10, timeout=0.1)
+    assert [job.job_id for job in queued] == ["job-keep"]
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_remove_pending_drops_queued_job():
+    queue = LocalJobQueue()
+    await _assert_remove_pending_drops_queued_job(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_remove_pending_drops_queued_job(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await _assert_remove_pending_drops_queued_job(queue)
+    await queue.close()
+
+
+async def _assert_dead_letters_round_trip(queue):
+    first = DeadLetter(
+        job=JobMessage(job_id="job-dead-1", target="ext.a", payload={"x": 1}, lane=JobLane.BULK),
+        error="boom",
+        code="dispatch_error",
+        attempts=[{"attempt": 1, "error": "boom", "failed_at": "2026-01-01T00:00:00+00:00"}],
+        details={"owner_user_id": "user-1"},
+        dead_at="2026-01-01T00:00:01+00:00",
+    )
+    second = DeadLetter(
+        job=JobMessage(job_id="job-dead-2", target="ext.b", payload={}),
+        error="missing",
+        code="extension_not_found",
+        dead_at="2026-01-01T00:00:02+00:00",
+    )
+    await queue.add_dead_letter(first)
+    await queue.add_dead_letter(second)
+
+    assert await queue.get_dead_letter("job-dead-1") == first
+    assert [entry.job.job_id for entry in await queue.list_dead_letters()] == ["job-dead-1", "job-dead-2"]
+    assert await queue.list_dead_letters(target="ext.b") == [second]
+    assert len(await queue.list_dead_letters(limit=1)) == 1
+
+    assert await queue.delete_dead_letter("job-dead-1") is True
+    assert await queue.delete_dead_letter("job-dead-1") is False
+    assert await queue.get_dead_letter("job-dead-1") is None
+    assert await queue.list_dead_letters() == [second]
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_keeps_dead_letters():
+    queue = LocalJobQueue()
+    await _assert_dead_letters_round_trip(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_keep_dead_letters(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis())
+    await _assert_dead_letters_round_trip(queue)
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_keeps_dead_letters(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await _assert_dead_letters_round_trip(queue)
+    await queue.close()
+
+
+async def _assert_queue_depth_counts_pending_jobs(queue):
+    assert await queue.queue_depth() == {"interactive": 0, "default": 0, "bulk": 0}
+    await queue.enqueue(JobMessage(job_id="job-depth-1", target="ext", payload={}))
+    await queue.enqueue(JobMessage(job_id="job-depth-2", target="ext", payload={}, lane=JobLane.BULK))
+    await queue.enqueue(
+        JobMessage(job_id="job-depth-3", target="ext", payload={}, lane=JobLane.BULK),
+        not_before=datetime.now(timezone.utc) + timedelta(seconds=60),
+    )
+    assert await queue.queue_depth() == {"interactive": 0, "default": 1, "bulk": 2}
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_reports_queue_depth():
+    queue = LocalJobQueue()
+    await _assert_queue_depth_counts_pending_jobs(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_report_queue_depth(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis())
+    await _assert_queue_depth_counts_pending_jobs(queue)
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_reports_queue_depth(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await _assert_queue_depth_counts_pending_jobs(queue)
+    await queue.close()
+
+
+async def _assert_transitions_are_monotonic(queue):
+    assert await queue.enqueue_if_absent(
+        JobMessage(job_id="job-cas", target="ext", payload={}),
+        details={"owner_user_id": "u1"},
+    ) is None
+    await queue.enqueue(JobMessage(job_id="job-cas", target="ext", payload={}))
+    assert (await queue.get_state("job-cas")).details == {"owner_user_id": "u1"}
+
+    # Concurrent writers each merge their keys; none of them is lost.
+    results = await asyncio.gather(
+        *(
+            queue.transition_state("job-cas", JobStatus.RUNNING, details={f"k{index}": index})
+            for index in range(5)
+        )
+    )
+    assert all(result is not None for result in results)
+    running = await queue.get_state("job-cas")
+    assert running.status == JobStatus.RUNNING
+    assert running.details == {"owner_user_id": "u1", **{f"k{index}": index for index in range(5)}}
+
+    assert await queue.transition_state("job-cas", JobStatus.DISPATCHED) is None
+    completed = await queue.transition_state("job-cas", JobStatus.COMPLETED, details={"k0": None})
+    assert completed.details == {"owner_user_id": "u1", **{f"k{index}": index for index in range(1, 5)}}
+    # A late progress update cannot revive a finished job.
+    assert await queue.transition_state("job-cas", JobStatus.RUNNING) is None
+    assert await queue.transition_state("job-cas", JobStatus.CANCELLED) is None
+    assert (await queue.get_state("job-cas")).status == JobStatus.COMPLETED
+
+    assert await queue.transition_state("job-cas", JobStatus.QUEUED, expected={JobStatus.FAILED}) is None
+    requeued = await queue.transition_state("job-cas", JobStatus.QUEUED, expected={JobStatus.COMPLETED})
+    assert requeued.status == JobStatus.QUEUED
+    assert await queue.transition_state("job-missing", JobStatus.QUEUED, expected={JobStatus.FAILED}) is None
+    assert await queue.transition_state("job-missing", JobStatus.QUEUED, expected={None}) is not None
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_transitions_are_monotonic():
+    queue = LocalJobQueue()
+    await _assert_transitions_are_monotonic(queue)
+    await queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_cls", [RedisJobQueue, RedisStreamJobQueue])
+async def test_redis_job_queues_transitions_are_monotonic(queue_cls):
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = queue_cls(fakeredis.FakeAsyncRedis())
+    await _assert_transitions_are_monotonic(queue)
+
+
+@pytest.mark.asyncio
+async def test_redis_transition_state_gives_up_when_the_state_keeps_changing():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    queue = RedisJobQueue(redis_client)
+    await queue.enqueue(JobMessage(job_id="job-hot", target="ext", payload={}))
+    raw_queued = await redis_client.get("fair:job-states:job-hot")
+    writes = 0
+
+    async def write_in_between(_client, _job_id):
+        # Another writer touches the state after every WATCH.
+        nonlocal writes
+        writes += 1
+        await redis_client.set("fair:job-states:job-hot", raw_queued)
+        return []
+
+    with patch.object(queue, "_idempotency_keys_of", write_in_between):
+        with pytest.raises(JobQueueConflict):
+            await queue.transition_state("job-hot", JobStatus.COMPLETED)
+
+    assert writes == 10
+    assert (await queue.get_state("job-hot")).status == JobStatus.QUEUED
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_sql_job_queue_transitions_are_monotonic(test_db):
+    queue = SqlJobQueue(test_db.kw["bind"], poll_interval_s=0.01)
+    await _assert_transitions_are_monotonic(queue)
+    await queue.close()
@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.job_queue.bench import compare, percentile, run_case
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workload", ["enqueue", "enqueue_dequeue", "publish_subscribe"])
+async def test_benchmark_workloads_complete_on_local_backend(workload):
+    record = await run_case("local", workload, 40, 4, {"subscriber_queue_size": 1000})
+
+    assert record["completed"] == 40
+    assert record["throughput_ops_s"] > 0
+    assert record["latency_ms"]["p50"] <= record["latency_ms"]["p99"]
+    [line] = compare({"results": [record]}, {"results": [record]})
+    assert "throughput +0.0%" in line
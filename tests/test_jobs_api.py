@@ -1,8 +1,11 @@
+import asyncio
 from datetime import datetime, timezone
 
 from fair_platform.backend.data.models import ExtensionClient
 from fair_platform.backend.services.extension_auth import hash_extension_secret
-from fair_platform.backend.services.job_queue import JobStatus
+from fair_platform.backend.main import app
+from fair_platform.backend.services.job_queue import DeadLetter, JobMessage, JobStatus
+from fair_platform.extension_sdk.tracing import InMemorySpanExporter, Tracer, set_tracer
 from tests.conftest import extension_auth_headers, get_auth_token
 
 
@@ -44,6 +47,57 @@ def test_create_duplicate_job_id_returns_409(test_client, extension_client_crede
     assert second.status_code == 409
 
 
+def test_create_job_with_taken_job_id_and_new_idempotency_key_returns_409(
+    test_client,
+    extension_client_credentials,
+    student_user,
+):
+    user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
+    payload = {
+        "target": extension_client_credentials["extension_id"],
+        "payload": {"action": "submission.grade", "params": {"submissionId": "sub-3"}},
+        "jobId": "job-dup-2",
+    }
+    first = test_client.post("/api/jobs/", json=payload, headers={**user_headers, "Idempotency-Key": "dup-2-a"})
+    second = test_client.post("/api/jobs/", json=payload, headers={**user_headers, "Idempotency-Key": "dup-2-b"})
+
+    assert first.status_code == 202
+    assert second.status_code == 409
+
+
+def test_create_job_with_idempotency_key_returns_existing_job(
+    test_client,
+    extension_client_credentials,
+    student_user,
+):
+    user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
+    payload = {
+        "target": extension_client_credentials["extension_id"],
+        "payload": {"action": "submission.grade", "params": {"submissionId": "sub-idem-1"}},
+    }
+    first = test_client.post(
+        "/api/jobs/",
+        json=payload,
+        headers={**user_headers, "Idempotency-Key": "grade-sub-idem-1"},
+    )
+    retried = test_client.post(
+        "/api/jobs/",
+        json={**payload, "idempotencyKey": "grade-sub-idem-1"},
+        headers=user_headers,
+    )
+    other = test_client.post(
+        "/api/jobs/",
+        json={**payload, "idempotencyKey": "grade-sub-idem-2"},
+        headers=user_headers,
+    )
+
+    assert first.status_code == 202
+    assert retried.status_code == 202
+    assert retried.json()["jobId"] == first.json()["jobId"]
+    assert retried.json()["status"] == JobStatus.QUEUED
+    assert other.json()["jobId"] != first.json()["jobId"]
+
+
 def test_publish_update_with_status_transition(test_client, extension_client_credentials, student_user):
     user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
     extension_headers = extension_auth_headers(extension_client_credentials)
@@ -80,6 +134,127 @@ def test_publish_update_with_status_transition(test_client, extension_client_cre
     assert state["details"]["owner_extension_id"] == extension_client_credentials["extension_id"]
 
 
+def test_submit_and_update_spans_continue_the_callers_trace(test_client, extension_client_credentials, student_user):
+    exporter = InMemorySpanExporter()
+    set_tracer(Tracer(exporter))
+    try:
+        created = test_client.post(
+            "/api/jobs/",
+            json={
+                "target": extension_client_credentials["extension_id"],
+                "payload": {"action": "submission.grade", "params": {"submissionId": "sub-trace"}},
+                "jobId": "job-trace-api-1",
+            },
+            headers={
+                "Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}",
+                "traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+            },
+        )
+        assert created.status_code == 202
+        submit = exporter.by_name("job.submit")[0]
+
+        updated = test_client.post(
+            "/api/jobs/job-trace-api-1/updates",
+            json={"update": {"event": "progress", "payload": {"percent": 10}}, "status": JobStatus.RUNNING},
+            headers={**extension_auth_headers(extension_client_credentials), "traceparent": submit.context.traceparent},
+        )
+        assert updated.status_code == 200
+    finally:
+        set_tracer(None)
+
+    assert submit.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert submit.parent_span_id == "00f067aa0ba902b7"
+    ingest = exporter.by_name("job.update.ingest")[0]
+    assert ingest.trace_id == submit.trace_id
+    assert ingest.parent_span_id == submit.span_id
+    assert ingest.attributes["status"] == JobStatus.RUNNING
+
+
+def test_late_running_update_does_not_reopen_completed_job(
+    test_client,
+    extension_client_credentials,
+    student_user,
+):
+    user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
+    extension_headers = extension_auth_headers(extension_client_credentials)
+    created = test_client.post(
+        "/api/jobs/",
+        json={
+            "target": extension_client_credentials["extension_id"],
+            "payload": {"action": "submission.grade", "params": {"submissionId": "sub-late"}},
+            "jobId": "job-late-1",
+        },
+        headers=user_headers,
+    )
+    assert created.status_code == 202
+
+    completed = test_client.post(
+        "/api/jobs/job-late-1/updates",
+        json={
+            "update": {"event": "result", "payload": {"data": {"score": 1}}},
+            "status": JobStatus.COMPLETED,
+            "details": {"score": 1},
+        },
+        headers=extension_headers,
+    )
+    assert completed.json()["status"] == JobStatus.COMPLETED
+    late = test_client.post(
+        "/api/jobs/job-late-1/updates",
+        json={
+            "update": {"event": "progress", "payload": {"percent": 90}},
+            "status": JobStatus.RUNNING,
+            "details": {"score": 0},
+        },
+        headers=extension_headers,
+    )
+    assert late.status_code == 200
+    assert late.json()["status"] is None
+
+    state = test_client.get("/api/jobs/job-late-1", headers=user_headers).json()
+    assert state["status"] == JobStatus.COMPLETED
+    assert state["details"]["score"] == 1
+    assert state["details"]["owner_user_id"] == str(student_user.id)
+
+
+def test_cancel_job_marks_it_cancelled_and_ignores_later_status(
+    test_client,
+    extension_client_credentials,
+    student_user,
+):
+    user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
+    extension_headers = extension_auth_headers(extension_client_credentials)
+    created = test_client.post(
+        "/api/jobs/",
+        json={
+            "target": extension_client_credentials["extension_id"],
+            "payload": {"action": "submission.grade", "params": {"submissionId": "sub-cancel"}},
+            "jobId": "job-cancel-1",
+        },
+        headers=user_headers,
+    )
+    assert created.status_code == 202
+
+    cancelled = test_client.post("/api/jobs/job-cancel-1/cancel", headers=user_headers)
+    assert cancelled.status_code == 200
+    assert cancelled.json()["status"] == JobStatus.CANCELLED
+    assert cancelled.json()["details"]["cancelled_by"] == str(student_user.id)
+
+    late_update = test_client.post(
+        "/api/jobs/job-cancel-1/updates",
+        json={"update": {"event": "progress", "payload": {"percent": 90}}, "status": JobStatus.RUNNING},
+        headers=extension_headers,
+    )
+    assert late_update.status_code == 200
+    assert late_update.json()["status"] is None
+    state = test_client.get("/api/jobs/job-cancel-1", headers=user_headers).json()
+    assert state["status"] == JobStatus.CANCELLED
+
+    again = test_client.post("/api/jobs/job-cancel-1/cancel", headers=user_headers)
+    assert again.status_code == 409
+    missing = test_client.post("/api/jobs/does-not-exist/cancel", headers=user_headers)
+    assert missing.status_code == 404
+
+
 def test_unknown_job_returns_404_for_state_update_and_stream(test_client, extension_client_credentials, student_user):
     user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
     extension_headers = extension_auth_headers(extension_client_credentials)
@@ -265,3 +440,91 @@ def test_stream_returns_end_event_for_terminal_job_state(
     assert stream_response.headers["content-type"].startswith("text/event-stream")
     assert "event: end" in stream_response.text
     assert '"status": "completed"' in stream_response.text
+
+
+def test_stream_replays_update_log_and_resumes_from_last_event_id(
+    test_client,
+    extension_client_credentials,
+    student_user,
+):
+    user_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
+    extension_headers = extension_auth_headers(extension_client_credentials)
+
+    created = test_client.post(
+        "/api/jobs/",
+        json={
+            "target": extension_client_credentials["extension_id"],
+            "payload": {"action": "submission.grade", "params": {"submissionId": "sub-replay-1"}},
+            "jobId": "job-stream-replay-1",
+        },
+        headers=user_headers,
+    )
+    assert created.status_code == 202
+    for update in (
+        {"update": {"event": "progress", "payload": {"percent": 50}}, "status": JobStatus.RUNNING},
+        {"update": {"event": "result", "payload": {"data": {"ok": True}}}, "status": JobStatus.COMPLETED},
+    ):
+        posted = test_client.post(
+            "/api/jobs/job-stream-replay-1/updates",
+            json=update,
+            headers=extension_headers,
+        )
+        assert posted.status_code == 200
+
+    replayed = test_client.get("/api/jobs/job-stream-replay-1/stream", headers=user_headers)
+    assert replayed.status_code == 200
+    assert "event: progress" in replayed.text
+    assert "event: result" in replayed.text
+    assert replayed.text.index("event: result") < replayed.text.index("event: end")
+
+    progress_id = next(
+        line.removeprefix("id:").strip()
+        for line in replayed.text.splitlines()
+        if line.startswith("id:")
+    )
+    resumed = test_client.get(
+        "/api/jobs/job-stream-replay-1/stream",
+        headers={**user_headers, "Last-Event-ID": progress_id},
+    )
+    assert resumed.status_code == 200
+    assert "event: progress" not in resumed.text
+    assert "event: result" in resumed.text
+    assert "event: end" in resumed.text
+
+
+def test_admin_can_list_inspect_and_requeue_dead_letters(test_client, admin_user, student_user):
+    admin_headers = {"Authorization": f"Bearer {get_auth_token(test_client, admin_user.email)}"}
+    student_headers = {"Authorization": f"Bearer {get_auth_token(test_client, student_user.email)}"}
+    assert test_client.get("/api/dead-letters/", headers=admin_headers).status_code == 200
+    queue = app.state.job_queue
+    asyncio.run(
+        queue.add_dead_letter(
+            DeadLetter(
+                job=JobMessage(job_id="job-dead-api", target="ext.dead", payload={}),
+                error="network error",
+                code="dispatch_error",
+                attempts=[{"attempt": 1, "error": "network error", "failed_at": "2026-01-01T00:00:00+00:00"}],
+            )
+        )
+    )
+
+    assert test_client.get("/api/dead-letters/", headers=student_headers).status_code == 403
+
+    listed = test_client.get("/api/dead-letters/", params={"target": "ext.dead"}, headers=admin_headers)
+    assert listed.status_code == 200
+    assert [entry["jobId"] for entry in listed.json()] == ["job-dead-api"]
+
+    inspected = test_client.get("/api/dead-letters/job-dead-api", headers=admin_headers)
+    assert inspected.status_code == 200
+    assert inspected.json()["code"] == "dispatch_error"
+    assert len(inspected.json()["attempts"]) == 1
+
+    requeued = test_client.post(
+        "/api/dead-letters/requeue",
+        json={"jobIds": ["job-dead-api", "job-unknown"], "ratePerS": 0},
+        headers=admin_headers,
+    )
+    assert requeued.status_code == 200
+    assert requeued.json() == {"requeued": ["job-dead-api"]}
+    assert test_client.get("/api/dead-letters/job-dead-api", headers=admin_headers).status_code == 404
+    assert asyncio.run(queue.get_state("job-dead-api")).status == JobStatus.QUEUED
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from fair_platform.backend.services.fanout import OverflowPolicy
+from fair_platform.backend.services.job_queue import JobUpdate, RedisJobQueue
+from fair_platform.backend.services.redis_pubsub import RedisPubSubMultiplexer
+
+
+def _counting_pubsub(redis_client):
+    opened = []
+    original = redis_client.pubsub
+
+    def pubsub(*args, **kwargs):
+        opened.append(1)
+        return original(*args, **kwargs)
+
+    redis_client.pubsub = pubsub
+    return opened
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_shares_one_connection_and_refcounts_channels():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    opened = _counting_pubsub(redis_client)
+    multiplexer = RedisPubSubMultiplexer(redis_client)
+
+    first = await multiplexer.subscribe("chan:a")
+    second = await multiplexer.subscribe("chan:a")
+    other = await multiplexer.subscribe("chan:b")
+    assert len(opened) == 1
+    assert multiplexer.channel_count == 2
+
+    await redis_client.publish("chan:a", b"hello")
+    assert await first.get(timeout=1.0) == b"hello"
+    assert await second.get(timeout=1.0) == b"hello"
+    assert await other.get(timeout=0.05) is None
+
+    await first.close()
+    assert multiplexer.channel_count == 2
+    await redis_client.publish("chan:a", b"still here")
+    assert await second.get(timeout=1.0) == b"still here"
+
+    await second.close()
+    await other.close()
+    assert multiplexer.channel_count == 0
+    await multiplexer.close()
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_spreads_channels_over_its_connections():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    opened = _counting_pubsub(redis_client)
+    multiplexer = RedisPubSubMultiplexer(redis_client, connections=2)
+
+    subscriptions = [await multiplexer.subscribe(f"chan:{index}") for index in range(20)]
+    assert len(opened) == multiplexer.connection_count == 2
+
+    for index in range(20):
+        await redis_client.publish(f"chan:{index}", str(index).encode())
+    received = [await subscription.get(timeout=1.0) for subscription in subscriptions]
+    assert received == [str(index).encode() for index in range(20)]
+    await multiplexer.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_overflows_without_blocking_others():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    multiplexer = RedisPubSubMultiplexer(redis_client)
+    slow = await multiplexer.subscribe("chan:a", maxsize=2, policy=OverflowPolicy.DISCONNECT)
+    fast = await multiplexer.subscribe("chan:a")
+
+    for index in range(5):
+        await redis_client.publish("chan:a", str(index).encode())
+    received = [await fast.get(timeout=1.0) for _ in range(5)]
+
+    assert received == [str(index).encode() for index in range(5)]
+    assert slow.disconnected
+    await multiplexer.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_job_queue_viewers_share_one_pubsub_connection():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    opened = _counting_pubsub(redis_client)
+    queue = RedisJobQueue(redis_client)
+
+    subscriptions = [await queue.subscribe_updates(f"job-{index % 3}") for index in range(12)]
+    watches = [queue.watch_state(f"job-{index}") for index in range(3)]
+    watch_tasks = [asyncio.create_task(anext(watch)) for watch in watches]
+    await asyncio.sleep(0.05)
+
+    await queue.publish_update(JobUpdate(job_id="job-1", event="progress", payload={"pct": 10}))
+    updates = await asyncio.gather(*(subscription.get(timeout=1.0) for subscription in subscriptions[1::3]))
+
+    assert len(opened) == 1
+    assert [update.payload for update in updates] == [{"pct": 10}] * 4
+    for task in watch_tasks:
+        task.cancel()
+    await asyncio.gather(*watch_tasks, return_exceptions=True)
+    for watch in watches:
+        await watch.aclose()
+    for subscription in subscriptions:
+        await subscription.close()
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_job_queue_keeps_a_jobs_channels_on_one_connection():
+    fakeredis = pytest.importorskip("fakeredis")
+    for index in range(8):
+        queue = RedisJobQueue(fakeredis.FakeAsyncRedis(), pubsub_connections=8)
+        job_id = f"job-shard-{index}"
+        subscription = await queue.subscribe_updates(job_id)
+        watch = queue.watch_state(job_id)
+        watch_task = asyncio.create_task(anext(watch))
+        await asyncio.sleep(0.02)
+
+        # Updates and state changes of a job stay in publish order.
+        assert queue._pubsub.connection_count == 1
+        watch_task.cancel()
+        await asyncio.gather(watch_task, return_exceptions=True)
+        await watch.aclose()
+        await subscription.close()
+        await queue.close()
@@ -0,0 +1,96 @@
+import pytest
+
+from fair_platform.backend.services.fanout import OverflowPolicy, SubscriberQueue
+from fair_platform.backend.services.job_queue import JobUpdate, LocalJobQueue
+from fair_platform.backend.services.workflow_runner import WorkflowRunEventBroker
+
+
+def _progress(percent: int) -> JobUpdate:
+    return JobUpdate(job_id="job-fanout", event="progress", payload={"percent": percent})
+
+
+def _log(message: str) -> JobUpdate:
+    return JobUpdate(job_id="job-fanout", event="log", payload={"message": message})
+
+
+async def _drain(subscription) -> list:
+    items = []
+    while (item := await subscription.get(timeout=0)) is not None:
+        items.append(item)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_drop_oldest_keeps_newest_items():
+    queue = SubscriberQueue(2, OverflowPolicy.DROP_OLDEST)
+    for n in range(4):
+        assert queue.offer(n)
+
+    assert await _drain(queue) == [2, 3]
+    assert queue._stats.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_coalesces_pending_progress():
+    queue = SubscriberQueue(
+        2,
+        OverflowPolicy.COALESCE,
+        coalesce_key=lambda update: update.event if update.event == "progress" else None,
+    )
+    queue.offer(_log("started"))
+    queue.offer(_progress(10))
+    queue.offer(_progress(20))
+    queue.offer(_progress(30))
+
+    drained = await _drain(queue)
+    assert [update.payload for update in drained] == [{"message": "started"}, {"percent": 30}]
+    assert queue._stats.coalesced == 2
+    assert queue._stats.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_disconnect_policy_drops_slow_consumer():
+    queue = SubscriberQueue(1, OverflowPolicy.DISCONNECT)
+    assert queue.offer("a")
+    assert not queue.offer("b")
+    assert not queue.offer("c")
+
+    assert queue.disconnected
+    assert await queue.get(timeout=1.0) is None
+    assert queue._stats.disconnected == 1
+
+
+@pytest.mark.asyncio
+async def test_local_job_queue_slow_subscriber_does_not_block_publish():
+    queue = LocalJobQueue(subscriber_queue_size=2, overflow_policy=OverflowPolicy.DISCONNECT)
+    slow = await queue.subscribe_updates("job-fanout")
+    fast = await queue.subscribe_updates("job-fanout")
+
+    for n in range(3):
+        await queue.publish_update(_log(f"line {n}"))
+        if n < 2:
+            assert (await fast.get(timeout=0.1)).payload == {"message": f"line {n}"}
+
+    assert slow.disconnected
+    assert not fast.disconnected
+    assert (await fast.get(timeout=0.1)).payload == {"message": "line 2"}
+    assert queue.fanout_stats.disconnected == 1
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_workflow_run_event_broker_bounds_subscriber_queue():
+    broker = WorkflowRunEventBroker(max_queue_size=3, overflow_policy=OverflowPolicy.COALESCE)
+    subscription = await broker.subscribe("run-1")
+    async with subscription:
+        await broker.publish("run-1", {"type": "log", "payload": {"message": "start"}})
+        for percent in (10, 20, 30, 40):
+            await broker.publish(
+                "run-1",
+                {"type": "log", "payload": {"step_id": "s1", "percent": percent}},
+            )
+
+        events = await _drain(subscription)
+
+    assert [event["payload"].get("percent") for event in events] == [None, 30, 40]
+    assert broker.fanout_stats.coalesced == 2
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from fair_platform.extension_sdk import FairExtension, JobContext
+from fair_platform.extension_sdk.tracing import (
+    InMemorySpanExporter,
+    JsonFileSpanExporter,
+    TraceContext,
+    Tracer,
+    current_trace_context,
+    extract_trace_context,
+    inject_trace_context,
+    tracer_from_env,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01"
+
+
+def test_traceparent_round_trips_and_rejects_malformed_values():
+    context = TraceContext.parse(TRACEPARENT)
+
+    assert context == TraceContext(trace_id=TRACE_ID, span_id=PARENT_SPAN_ID, sampled=True)
+    assert context.traceparent == TRACEPARENT
+    assert TraceContext.parse(f"00-{TRACE_ID}-{PARENT_SPAN_ID}-00").sampled is False
+    assert TraceContext.parse(None) is None
+    assert TraceContext.parse("not-a-traceparent") is None
+    assert TraceContext.parse(f"00-{'0' * 32}-{PARENT_SPAN_ID}-01") is None
+    assert TraceContext.parse(f"ff-{TRACE_ID}-{PARENT_SPAN_ID}-01") is None
+
+
+def test_inject_copies_the_carrier_and_extract_reads_it_back():
+    metadata = {"step_id": "s1"}
+    injected = inject_trace_context(metadata, TraceContext.parse(TRACEPARENT))
+
+    assert metadata == {"step_id": "s1"}
+    assert injected == {"step_id": "s1", "traceparent": TRACEPARENT}
+    assert extract_trace_context(injected) == TraceContext.parse(TRACEPARENT)
+    assert extract_trace_context({"traceparent": 42}) is None
+    assert inject_trace_context(metadata, None) == metadata
+
+
+def test_span_context_manager_nests_spans_and_records_errors():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.span("outer", parent=TraceContext.parse(TRACEPARENT)) as outer:
+        assert current_trace_context() == outer.context
+        with tracer.span("inner") as inner:
+            pass
+        with pytest.raises(RuntimeError):
+            with tracer.span("failing"):
+                raise RuntimeError("boom")
+    assert current_trace_context() is None
+
+    assert [span.name for span in exporter.spans] == ["inner", "failing", "outer"]
+    assert {span.trace_id for span in exporter.spans} == {TRACE_ID}
+    assert outer.parent_span_id == PARENT_SPAN_ID
+    assert inner.parent_span_id == outer.span_id
+    failing = exporter.by_name("failing")[0]
+    assert failing.status == "error"
+    assert failing.error == "RuntimeError: boom"
+    assert outer.status == "ok"
+
+
+def test_unsampled_traces_propagate_without_exporting():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.span("quiet", parent=TraceContext.parse(f"00-{TRACE_ID}-{PARENT_SPAN_ID}-00")) as span:
+        assert span.context.sampled is False
+
+    assert list(exporter.spans) == []
+
+
+def test_json_file_exporter_writes_one_span_per_line(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("FAIR_TRACE_EXPORTER", "json")
+    monkeypatch.setenv("FAIR_TRACE_FILE", str(path))
+    tracer = tracer_from_env()
+    assert isinstance(tracer.exporter, JsonFileSpanExporter)
+
+    with tracer.span("first", attributes={"job_id": "job-1"}):
+        pass
+    with tracer.span("second"):
+        pass
+    tracer.exporter.flush()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["name"] for line in lines] == ["first", "second"]
+    assert lines[0]["attributes"] == {"job_id": "job-1"}
+    assert lines[0]["duration_ms"] >= 0
+    assert lines[0]["trace_id"] != lines[1]["trace_id"]
+
+
+def test_json_file_exporter_writes_off_the_calling_thread(tmp_path):
+    exporter = JsonFileSpanExporter(tmp_path / "traces.jsonl")
+    tracer = Tracer(exporter)
+    written_by = []
+    real_write = exporter._write
+
+    def write():
+        written_by.append(threading.current_thread())
+        real_write()
+
+    exporter._write = write
+    for index in range(3):
+        with tracer.span(f"span-{index}"):
+            pass
+    exporter.close()
+
+    assert written_by and threading.current_thread() not in written_by
+    lines = (tmp_path / "traces.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["span-0", "span-1", "span-2"]
+
+
+def test_memory_exporter_keeps_only_the_latest_spans():
+    exporter = InMemorySpanExporter(max_spans=2)
+    tracer = Tracer(exporter)
+
+    for index in range(5):
+        with tracer.span(f"span-{index}"):
+            pass
+
+    assert [span.name for span in exporter.spans] == ["span-3", "span-4"]
+
+
+def test_tracer_from_env_rejects_unknown_exporters(monkeypatch):
+    monkeypatch.setenv("FAIR_TRACE_EXPORTER", "zipkin")
+    with pytest.raises(ValueError):
+        tracer_from_env()
+    monkeypatch.delenv("FAIR_TRACE_EXPORTER")
+    assert tracer_from_env().exporter is None
+
+
+def test_fair_extension_continues_the_delivery_trace_in_handler_and_updates(extension_client_credentials):
+    class Params(BaseModel):
+        value: int
+
+    exporter = InMemorySpanExporter()
+    extension = FairExtension(
+        extension_id=extension_client_credentials["extension_id"],
+        platform_url="http://platform.test",
+        extension_secret=extension_client_credentials["extension_secret"],
+        tracer=Tracer(exporter),
+    )
+    update_headers: list[str | None] = []
+    done = asyncio.Event()
+
+    def _platform(request: httpx.Request) -> httpx.Response:
+        update_headers.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json={"accepted": True})
+
+    @extension.action("echo")
+    async def echo(ctx: JobContext, params: Params):
+        original = ctx._api
+        ctx._api = httpx.AsyncClient(
+            transport=httpx.MockTransport(_platform),
+            base_url="http://platform.test",
+            headers=original.headers,
+        )
+        await original.aclose()
+        with ctx.span("llm.call", model="test-model"):
+            await asyncio.sleep(0)
+        done.set()
+        return {"value": params.value}
+
+    async def _run():
+        transport = httpx.ASGITransport(app=extension.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://extension.test") as client:
+            await client.post(
+                "/hooks/jobs",
+                json={
+                    "job_id": "job-traced-1",
+                    "payload": {"action": "echo", "params": {"value": 3}},
+                    "metadata": {"traceparent": TRACEPARENT},
+                },
+            )
+            await asyncio.wait_for(done.wait(), timeout=1)
+            await asyncio.gather(*extension._tasks.values())
+
+    asyncio.run(_run())
+
+    execute = exporter.by_name("extension.execute")[0]
+    llm_call = exporter.by_name("llm.call")[0]
+    update = exporter.by_name("job.update")[0]
+    assert {span.trace_id for span in exporter.spans} == {TRACE_ID}
+    assert execute.parent_span_id == PARENT_SPAN_ID
+    assert execute.attributes["action"] == "echo"
+    assert llm_call.parent_span_id == execute.span_id
+    assert llm_call.attributes == {"job_id": "job-traced-1", "model": "test-model"}
+    assert update.parent_span_id == execute.span_id
+    assert update_headers == [update.context.traceparent]
@@ -1,5 +1,6 @@
+import asyncio
 from datetime import datetime
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi.testclient import TestClient
@@ -14,10 +15,12 @@ from fair_platform.backend.data.models import (
     WorkflowRun,
     WorkflowRunStatus,
 )
+from fair_platform.backend.api.schema.workflow import WorkflowStep
 from fair_platform.backend.data.models.submitter import Submitter
-from fair_platform.backend.services.job_queue import LocalJobQueue
+from fair_platform.backend.services.fanout import OverflowPolicy
+from fair_platform.backend.services.job_queue import JobStatus, JobUpdate, LocalJobQueue
 from fair_platform.backend.services import workflow_runner as workflow_runner_module
-from fair_platform.backend.services.workflow_runner import WorkflowRunEventBroker, WorkflowRunner
+from fair_platform.backend.services.workflow_runner import StepContext, WorkflowRunEventBroker, WorkflowRunner
 from tests.conftest import get_auth_token
 
 
@@ -91,6 +94,49 @@ def _create_workflow_run_fixture(test_db, *, instructor_id, runner_id):
         }
 
 
+def _grader_step_context(job_id: str) -> StepContext:
+    step = WorkflowStep.model_validate(
+        {
+            "id": "grade",
+            "order": 0,
+            "pluginType": "grader",
+            "plugin": {
+                "pluginId": "core.grade",
+                "extensionId": "fair.core",
+                "name": "Grade",
+                "pluginType": "grader",
+                "action": "plugin.grade.simple",
+            },
+        }
+    )
+    return StepContext(index=0, step=step, job_id=job_id)
+
+
+async def _run_chatty_step(queue: LocalJobQueue, data, job_id: str) -> dict:
+    """Consume a step whose extension posts more updates than the runner's queue holds."""
+    runner = WorkflowRunner(queue, WorkflowRunEventBroker())
+    await queue.set_state(job_id, JobStatus.RUNNING)
+    consuming = asyncio.create_task(runner._consume_step(data["run"].id, _grader_step_context(job_id), {}))
+    await asyncio.sleep(0.05)
+    # Published without yielding, so the runner reads nothing before the result.
+    for index in range(5):
+        await queue.publish_update(JobUpdate(job_id=job_id, event="log", payload={"message": f"line {index}"}))
+    await queue.publish_update(
+        JobUpdate(
+            job_id=job_id,
+            event="result",
+            payload={
+                "data": {
+                    "plugin_type": "grader",
+                    "results": [{"submission_id": str(data["submission"].id), "grade": 77}],
+                }
+            },
+        )
+    )
+    await queue.transition_state(job_id, JobStatus.COMPLETED)
+    return await asyncio.wait_for(consuming, timeout=5.0)
+
+
 class TestWorkflowRunsAPI:
     @pytest.mark.asyncio
     async def test_workflow_runner_persists_grader_results_into_submission_state(
@@ -138,6 +184,84 @@ class TestWorkflowRunsAPI:
             assert result.score == 91
             assert result.feedback == "Strong work"
 
+    @pytest.mark.asyncio
+    async def test_standalone_runners_claim_each_pending_run_once(self, test_db, professor_user, monkeypatch):
+        monkeypatch.setattr(workflow_runner_module, "get_session", test_db)
+        data = _create_workflow_run_fixture(
+            test_db,
+            instructor_id=professor_user.id,
+            runner_id=professor_user.id,
+        )
+        with test_db() as session:
+            run = session.get(WorkflowRun, data["run"].id)
+            run.status = WorkflowRunStatus.pending
+            run.started_at = None
+            session.commit()
+        runners = [WorkflowRunner(LocalJobQueue(), WorkflowRunEventBroker()) for _ in range(2)]
+        stop = asyncio.Event()
+        loops = [asyncio.create_task(runner.run_pending(stop, poll_interval_s=0.01)) for runner in runners]
+
+        try:
+            for _ in range(200):
+                with test_db() as session:
+                    finished = session.get(WorkflowRun, data["run"].id)
+                    if finished.status == WorkflowRunStatus.success:
+                        break
+                await asyncio.sleep(0.01)
+        finally:
+            stop.set()
+            await asyncio.gather(*loops)
+            for runner in runners:
+                await runner.shutdown(1.0)
+
+        with test_db() as session:
+            finished = session.get(WorkflowRun, data["run"].id)
+            assert finished.status == WorkflowRunStatus.success
+            assert finished.started_at is not None
+            closes = [entry for entry in finished.logs["history"] if entry["type"] == "close"]
+            assert len(closes) == 1
+
+    @pytest.mark.asyncio
+    async def test_runner_resumes_a_disconnected_step_stream_and_keeps_the_result(
+        self, test_db, professor_user, monkeypatch
+    ):
+        monkeypatch.setattr(workflow_runner_module, "get_session", test_db)
+        data = _create_workflow_run_fixture(
+            test_db,
+            instructor_id=professor_user.id,
+            runner_id=professor_user.id,
+        )
+        queue = LocalJobQueue(subscriber_queue_size=2, overflow_policy=OverflowPolicy.DISCONNECT)
+
+        result = await _run_chatty_step(queue, data, "job-step-disconnect")
+
+        assert result["results"] == [{"submission_id": str(data["submission"].id), "grade": 77}]
+        with test_db() as session:
+            run = session.get(WorkflowRun, data["run"].id)
+            assert run.step_states[0]["status"] == "completed"
+            assert run.step_states[0]["result"]["results"][0]["grade"] == 77
+            logged = [entry for entry in run.logs["history"] if entry["type"] == "log"]
+            assert len(logged) == 5
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_runner_replays_updates_a_drop_oldest_queue_would_lose(self, test_db, professor_user, monkeypatch):
+        monkeypatch.setattr(workflow_runner_module, "get_session", test_db)
+        data = _create_workflow_run_fixture(
+            test_db,
+            instructor_id=professor_user.id,
+            runner_id=professor_user.id,
+        )
+        queue = LocalJobQueue(subscriber_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+
+        result = await _run_chatty_step(queue, data, "job-step-chatty")
+
+        assert result["results"] == [{"submission_id": str(data["submission"].id), "grade": 77}]
+        with test_db() as session:
+            run = session.get(WorkflowRun, data["run"].id)
+            assert len([entry for entry in run.logs["history"] if entry["type"] == "log"]) == 5
+        await queue.close()
+
     def test_create_workflow_run_returns_pending_run_for_step_workflow(
         self, test_client: TestClient, test_db, professor_user
     ):
@@ -223,6 +347,30 @@ class TestWorkflowRunsAPI:
         assert body["status"] == "pending"
         assert body["stepStates"] == []
 
+    def test_api_leaves_runs_pending_when_runner_is_disabled(
+        self, test_client: TestClient, test_db, professor_user
+    ):
+        data = _create_workflow_run_fixture(
+            test_db,
+            instructor_id=professor_user.id,
+            runner_id=professor_user.id,
+        )
+        test_client.app.state.workflow_runner_enabled = False
+        try:
+            token = get_auth_token(test_client, professor_user.email)
+            response = test_client.post(
+                "/api/workflow-runs",
+                json={"workflowId": str(data["workflow"].id), "submissionIds": [str(data["submission"].id)]},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        finally:
+            test_client.app.state.workflow_runner_enabled = True
+        assert response.status_code == 202
+        with test_db() as session:
+            run = session.get(WorkflowRun, UUID(response.json()["id"]))
+            assert run.status == WorkflowRunStatus.pending
+            assert run.started_at is None
+
     def test_professor_can_list_course_runs(self, test_client: TestClient, test_db, professor_user, admin_user):
         data = _create_workflow_run_fixture(
             test_db, instructor_id=professor_user.id, runner_id=admin_user.id